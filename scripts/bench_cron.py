@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Cron-Auswertung (``CronSchedule.next_after``) für pathologische Regeln.
+
+Vergleicht den feldweise springenden Algorithmus mit dem früheren
+Minuten-Scan (Referenz hier im Skript) — pro Ausdruck die mittlere Zeit
+für die nächsten N Laufzeitpunkte, wie sie ``/api/cron/preview`` berechnet.
+
+    python scripts/bench_cron.py
+    python scripts/bench_cron.py -n 10 --tz America/New_York
+    python scripts/bench_cron.py --no-legacy          # nur der neue Algorithmus
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from zoneinfo import ZoneInfo
+
+from wsb_crawler.cron import CronSchedule
+
+# (Ausdruck, Beschreibung) — sortiert von harmlos bis pathologisch
+EXPRESSIONS = (
+    ("*/15 * * * *", "alle 15 Minuten"),
+    ("*/15 13-20 * * 1-5", "US-Handelszeiten (UTC)"),
+    ("0 0 1 1 *", "jährlich"),
+    ("59 23 31 12 *", "letzte Minute des Jahres"),
+    ("0 9 29 2 *", "Schalttag (bis 4 Jahre)"),
+    ("0 0 13 * 5", "13. ODER Freitag"),
+    ("0 0 31 2,4,6,9,11 *", "31. in kurzen Monaten (nie)"),
+)
+
+
+def _legacy_next_after(schedule: CronSchedule, after: datetime) -> datetime:
+    """Der frühere Algorithmus: Minute für Minute, höchstens ein Jahr."""
+    candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(366 * 24 * 60):
+        if (
+            candidate.minute in schedule.minute
+            and candidate.hour in schedule.hour
+            and candidate.month in schedule.month
+            and schedule._day_matches(candidate.date())
+        ):
+            return candidate
+        candidate += timedelta(minutes=1)
+    raise ValueError("kein Treffer innerhalb eines Jahres")
+
+
+def _time_ms(func: Callable[[], datetime], runs: int) -> tuple[float, str]:
+    """→ (ms pro Preview, letzter Zeitpunkt oder Fehlermeldung)"""
+    start = time.perf_counter()
+    result = ""
+    for _ in range(runs):
+        try:
+            result = func().isoformat(timespec="minutes")
+        except ValueError as exc:
+            result = f"ValueError ({str(exc)[:24]}…)"
+    return (time.perf_counter() - start) * 1000 / runs, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-n", "--count", type=int, default=3, help="Laufzeitpunkte pro Preview")
+    parser.add_argument("-r", "--runs", type=int, default=5, help="Wiederholungen")
+    parser.add_argument("--tz", default="UTC", help="IANA-Zeitzone (nur neuer Algorithmus)")
+    parser.add_argument("--no-legacy", action="store_true", help="Minuten-Scan überspringen")
+    args = parser.parse_args()
+
+    zone = ZoneInfo(args.tz)
+    start = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+    def preview(schedule: CronSchedule, legacy: bool) -> datetime:
+        moment = start
+        for _ in range(args.count):
+            if legacy:
+                moment = _legacy_next_after(schedule, moment)
+            else:
+                moment = schedule.next_after(moment, zone)
+        return moment
+
+    print(f"{'Ausdruck':<22}{'Beschreibung':<30}{'neu ms':>10}{'alt ms':>11}  letzter Treffer")
+    for expression, label in EXPRESSIONS:
+        schedule = CronSchedule(expression)
+        new_ms, result = _time_ms(partial(preview, schedule, False), args.runs)
+        old = "-"
+        if not args.no_legacy:
+            old_ms, _ = _time_ms(partial(preview, schedule, True), max(1, args.runs // 5))
+            old = f"{old_ms:.1f}"
+        print(f"{expression:<22}{label:<30}{new_ms:>10.3f}{old:>11}  {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Bytes-on-Wire und Latenz der Dashboard-Auslieferung.
+
+Misst index.html und einige JSON-Endpunkte je Accept-Encoding (identity,
+gzip, br) sowie den Revalidierungs-Fall (If-None-Match → 304).
+
+    python scripts/bench_static.py                    # In-Process (ASGI, ohne Netzwerk)
+    python scripts/bench_static.py --url http://nas:8080 --token geheim
+
+In-Process misst nur die Server-Seite; gegen eine echte URL kommen
+Netzwerk-Latenz und Bandbreite dazu (interessant hinter VPN/Unraid).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+PATHS = ("/dashboard", "/api/tickers", "/api/alerts", "/api/runs")
+ENCODINGS = ("identity", "gzip", "br")
+
+
+async def _measure(
+    client: httpx.AsyncClient, path: str, encoding: str, requests: int
+) -> tuple[int, float, float, str]:
+    """→ (Bytes auf der Leitung, Median-ms, Median-ms bei 304, tatsächliches Encoding)"""
+    headers = {"Accept-Encoding": encoding}
+    timings: list[float] = []
+    wire_bytes = 0
+    etag = None
+    used = "identity"
+    for _ in range(requests):
+        start = time.perf_counter()
+        async with client.stream("GET", path, headers=headers) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+        timings.append((time.perf_counter() - start) * 1000)
+        wire_bytes = len(raw)
+        etag = response.headers.get("ETag")
+        used = response.headers.get("Content-Encoding", "identity")
+
+    revalidate: list[float] = []
+    if etag:
+        for _ in range(requests):
+            start = time.perf_counter()
+            await client.get(path, headers={**headers, "If-None-Match": etag})
+            revalidate.append((time.perf_counter() - start) * 1000)
+    return (
+        wire_bytes,
+        statistics.median(timings),
+        statistics.median(revalidate) if revalidate else float("nan"),
+        used,
+    )
+
+
+async def _run(url: str | None, token: str | None, requests: int) -> None:
+    if url:
+        client = httpx.AsyncClient(base_url=url, auth=("wsb", token) if token else None)
+    else:
+        from pathlib import Path
+
+        from wsb_crawler.api.server import app, set_database
+        from wsb_crawler.storage.database import Database
+
+        db = Database(Path("/tmp/wsb-bench.db"))
+        await db.init()
+        set_database(db)
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        client = httpx.AsyncClient(transport=transport, base_url="http://bench")
+
+    try:
+        await _print_table(client, requests)
+    finally:
+        if not url:
+            await db.close()
+
+
+async def _print_table(client: httpx.AsyncClient, requests: int) -> None:
+    print(f"{'Pfad':<16}{'Accept':<10}{'Encoding':<10}{'Bytes':>10}{'ms':>9}{'304 ms':>9}")
+    async with client:
+        for path in PATHS:
+            for encoding in ENCODINGS:
+                size, ms, ms_304, used = await _measure(client, path, encoding, requests)
+                print(f"{path:<16}{encoding:<10}{used:<10}{size:>10}{ms:>9.2f}{ms_304:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="laufende Instanz statt In-Process-App")
+    parser.add_argument("--token", help="WSB_AUTH_TOKEN der Instanz")
+    parser.add_argument("-n", "--requests", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(_run(args.url, args.token, args.requests))
+
+
+if __name__ == "__main__":
+    main()
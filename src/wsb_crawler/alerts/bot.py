@@ -21,18 +21,18 @@ from loguru import logger
 from wsb_crawler.alerts.discord import send_top_tickers
 from wsb_crawler.analysis.trends import get_ticker_chart_data, get_top_tickers
 from wsb_crawler.config import get_settings
-from wsb_crawler.storage.database import Database
+from wsb_crawler.storage.base import Storage
 
 # Wird beim Start gesetzt (dependency injection statt global)
-_db: Database | None = None
+_db: Storage | None = None
 
 
-def set_database(db: Database) -> None:
+def set_database(db: Storage) -> None:
     global _db
     _db = db
 
 
-def _get_db() -> Database:
+def _get_db() -> Storage:
     if _db is None:
         raise RuntimeError("Bot-Datenbank nicht initialisiert")
     return _db
@@ -2,7 +2,8 @@
 Discord-Integration: Alerts als Rich Embeds, Heartbeat-Status-Updates.
 
 Nutzt httpx direkt (kein discord.py für Webhooks nötig).
-Rate-Limit-Handling: Discord erlaubt 5 Requests pro 2 Sekunden pro Webhook.
+Rate-Limit-Handling: Discord erlaubt 5 Requests pro 2 Sekunden pro Webhook
+(siehe ratelimit.py — Limiter pro Webhook, gespeist aus den Antwort-Headern).
 """
 
 from __future__ import annotations
@@ -15,21 +16,23 @@ import httpx
 from loguru import logger
 
 from wsb_crawler.__version__ import __version__
+from wsb_crawler.alerts.ratelimit import discord_limiter
 from wsb_crawler.config import Settings, get_settings
 from wsb_crawler.models import Alert, AlertReason, MarketStatus, RunStatus, TrendEntry
+from wsb_crawler.runtime.metrics import API_CALLS, RATE_LIMITED
 
 if TYPE_CHECKING:
-    from wsb_crawler.storage.database import Database
+    from wsb_crawler.storage.base import Storage
 
-_db: Database | None = None
+_db: Storage | None = None
 
 
-def set_database(db: Database) -> None:
+def set_database(db: Storage) -> None:
     global _db
     _db = db
 
 
-def _get_db() -> Database:
+def _get_db() -> Storage:
     if _db is None:
         raise RuntimeError("Datenbank nicht gesetzt — set_database() zuerst aufrufen")
     return _db
@@ -42,6 +45,11 @@ COLOR_PRICE_MOVE = 0xFFAA00  # Amber
 COLOR_HEARTBEAT = 0x2B2D31  # Discord-Dunkel
 COLOR_SUCCESS = 0x57F287  # Grün
 
+# Discord-Limits pro Nachricht: max. 10 Embeds, zusammen max. 6000 Zeichen
+# (Titel, Beschreibung, Feldnamen/-werte, Footer, Autor)
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
 TREND_EMOJI = {"up": "📈", "down": "📉", "flat": "➡️"}
 MARKET_LABEL = {
     MarketStatus.PRE_MARKET: "Pre-Market",
@@ -232,16 +240,22 @@ async def _send_webhook(
               Bei Fehler wird False zurückgegeben.
     """
     url = f"{webhook_url}?wait=true" if wait else webhook_url
+    limiter = discord_limiter(webhook_url)
 
     for attempt in range(retries):
         try:
+            await limiter.acquire()
             async with httpx.AsyncClient(timeout=10.0) as client:
+                API_CALLS.inc(api="discord")
                 response = await client.post(url, json=payload)
+                limiter.update_from_headers(response.headers)
 
                 if response.status_code == 429:
+                    RATE_LIMITED.inc(api="discord")
                     retry_after = float(response.json().get("retry_after", 2.0))
                     logger.warning(f"Discord Rate-Limit — warte {retry_after}s")
-                    await asyncio.sleep(retry_after)
+                    # Nächstes acquire() wartet die Sperre ab
+                    limiter.block_for(retry_after)
                     continue
 
                 response.raise_for_status()
@@ -269,17 +283,24 @@ async def _edit_webhook_message(
     """
     # Webhook-URL: https://discord.com/api/webhooks/{id}/{token}
     edit_url = f"{webhook_url}/messages/{message_id}"
+    limiter = discord_limiter(webhook_url)
     try:
+        await limiter.acquire()
         async with httpx.AsyncClient(timeout=10.0) as client:
+            API_CALLS.inc(api="discord")
             response = await client.patch(edit_url, json=payload)
+            limiter.update_from_headers(response.headers)
             if response.status_code == 404:
                 logger.debug("Heartbeat-Nachricht nicht mehr vorhanden — wird neu erstellt")
                 return False
             if response.status_code == 429:
+                RATE_LIMITED.inc(api="discord")
                 retry_after = float(response.json().get("retry_after", 2.0))
                 logger.warning(f"Discord Rate-Limit beim Editieren — warte {retry_after}s")
-                await asyncio.sleep(retry_after)
+                limiter.block_for(retry_after)
                 # Einmal wiederholen
+                await limiter.acquire()
+                API_CALLS.inc(api="discord")
                 response = await client.patch(edit_url, json=payload)
             response.raise_for_status()
             return True
@@ -308,19 +329,69 @@ async def send_alert(alert: Alert) -> bool:
 
 async def send_alerts(alerts: list[Alert]) -> int:
     """
-    Sendet mehrere Alerts nacheinander (nicht parallel, wegen Rate-Limits).
+    Sendet mehrere Alerts nacheinander; das Tempo bestimmt der Webhook-Limiter.
     Gibt Anzahl erfolgreich gesendeter Alerts zurück.
     """
     sent = 0
     for alert in alerts:
         if await send_alert(alert):
             sent += 1
-        # Kurze Pause zwischen Alerts
-        if len(alerts) > 1:
-            await asyncio.sleep(1.0)
     return sent
 
 
+def _embed_chars(embed: dict[str, Any]) -> int:
+    """Zeichen, die Discord auf das 6000er-Limit einer Nachricht anrechnet."""
+    total = len(embed.get("title", "")) + len(embed.get("description", ""))
+    total += len(embed.get("footer", {}).get("text", ""))
+    total += len(embed.get("author", {}).get("name", ""))
+    for f in embed.get("fields", []):
+        total += len(f.get("name", "")) + len(f.get("value", ""))
+    return total
+
+
+def _pack_embeds(embeds: list[dict[str, Any]]) -> list[list[int]]:
+    """Verteilt Embeds (als Indizes) greedy auf Nachrichten innerhalb der Discord-Limits."""
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    chars = 0
+    for idx, embed in enumerate(embeds):
+        size = _embed_chars(embed)
+        full = len(current) >= MAX_EMBEDS_PER_MESSAGE or chars + size > MAX_EMBED_CHARS_PER_MESSAGE
+        if current and full:
+            chunks.append(current)
+            current, chars = [], 0
+        current.append(idx)
+        chars += size
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def send_alert_digest(alerts: list[Alert]) -> list[bool]:
+    """Sendet alle Alerts gebündelt (bis zu 10 Embeds pro Webhook-Call).
+
+    Gibt pro Alert zurück, ob er zugestellt wurde. Eine Webhook-Nachricht wird
+    von Discord atomar angelegt — liefert der Call (mit ?wait=true) die
+    Message-ID, sind alle Embeds dieser Nachricht zugestellt.
+    """
+    if not alerts:
+        return []
+    cfg = await get_settings(_get_db())
+    embeds = [_build_alert_embed(alert, cfg) for alert in alerts]
+    delivered = [False] * len(alerts)
+    for chunk in _pack_embeds(embeds):
+        payload = {"username": "WSB-Crawler", "embeds": [embeds[i] for i in chunk]}
+        message_id = await _send_webhook(payload, cfg.discord.webhook_url, wait=True)
+        tickers = ", ".join(f"${alerts[i].ticker}" for i in chunk)
+        if message_id:
+            for i in chunk:
+                delivered[i] = True
+            logger.info(f"Alert-Digest gesendet ({len(chunk)} Alerts): {tickers}")
+        else:
+            logger.error(f"Alert-Digest konnte nicht gesendet werden: {tickers}")
+    return delivered
+
+
 async def send_heartbeat(status: RunStatus) -> None:
     """Sendet ein stilles Status-Update (kein @everyone Ping).
 
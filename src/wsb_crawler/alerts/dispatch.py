@@ -5,29 +5,124 @@ Discord (Webhook) ist der Pflicht-Kanal, Telegram optional (aktiv sobald
 Token + Chat-ID gesetzt sind). Ein Alert gilt als gesendet (`alert.sent`),
 sobald mindestens ein Kanal erfolgreich war — davon hängen Cooldown und
 History-Speicherung im Runner ab.
+
+Jeder Kanal hat eine eigene Queue mit eigenem Worker: Discord und Telegram
+liefern parallel, jeweils so schnell wie ihr Rate-Limit (ratelimit.py) es
+erlaubt. Innerhalb eines Kanals bleibt die Reihenfolge der Alerts erhalten.
+
+Im Digest-Modus (``alert_digest``) bündelt jeder Kanal alle Alerts in so
+wenige Nachrichten wie seine Limits erlauben (Discord: 10 Embeds / 6000
+Zeichen, Telegram: 4096 Zeichen); der Zustellstatus gilt pro Alert.
 """
 
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import Awaitable, Callable
+
+from loguru import logger
 
 from wsb_crawler.alerts import discord, telegram
 from wsb_crawler.config import Settings
 from wsb_crawler.models import Alert
+from wsb_crawler.runtime.metrics import ALERT_SECONDS, QUEUE_DEPTH
+
+ChannelSender = Callable[[Alert], Awaitable[bool]]
+DigestSender = Callable[[list[Alert]], Awaitable[list[bool]]]
+
+
+def _channels(cfg: Settings) -> dict[str, ChannelSender]:
+    """Aktive Kanäle → Sende-Funktion (zur Laufzeit nachgeschlagen, damit patchbar)."""
+
+    async def _discord(alert: Alert) -> bool:
+        return await discord.send_alert(alert)
+
+    async def _telegram(alert: Alert) -> bool:
+        return await telegram.send_alert(alert, cfg)
+
+    channels: dict[str, ChannelSender] = {"discord": _discord}
+    if cfg.telegram.enabled:
+        channels["telegram"] = _telegram
+    return channels
+
+
+def _digest_channels(cfg: Settings) -> dict[str, DigestSender]:
+    """Wie _channels(), aber mit den Sammel-Sendern der Kanäle."""
+
+    async def _discord(alerts: list[Alert]) -> list[bool]:
+        return await discord.send_alert_digest(alerts)
+
+    async def _telegram(alerts: list[Alert]) -> list[bool]:
+        return await telegram.send_alert_digest(alerts, cfg)
+
+    channels: dict[str, DigestSender] = {"discord": _discord}
+    if cfg.telegram.enabled:
+        channels["telegram"] = _telegram
+    return channels
+
+
+def _record(alert: Alert, channel: str, started: float) -> None:
+    alert.sent = True
+    alert.delivery_ms[channel] = (time.perf_counter() - started) * 1000
+
+
+async def _digest_worker(
+    name: str, send: DigestSender, alerts: list[Alert], started: float
+) -> None:
+    """Ein Kanal im Digest-Modus: alle Alerts in einem Aufruf, Status pro Alert."""
+    try:
+        with ALERT_SECONDS.time(channel=name):
+            delivered = await send(alerts)
+    except Exception as e:
+        logger.warning(f"{name}: Alert-Digest fehlgeschlagen: {e}")
+        return
+    for alert, ok in zip(alerts, delivered, strict=False):
+        if ok:
+            _record(alert, name, started)
+
+
+async def _channel_worker(
+    name: str, send: ChannelSender, queue: asyncio.Queue[Alert], started: float
+) -> None:
+    """Arbeitet die Queue eines Kanals ab und misst die Zustell-Latenz pro Alert."""
+    QUEUE_DEPTH.track(queue.qsize, queue=f"alerts_{name}")
+    while not queue.empty():
+        alert = queue.get_nowait()
+        try:
+            with ALERT_SECONDS.time(channel=name):
+                ok = await send(alert)
+        except Exception as e:
+            logger.warning(f"{name}: Alert ${alert.ticker} fehlgeschlagen: {e}")
+            ok = False
+        if ok:
+            _record(alert, name, started)
+        queue.task_done()
 
 
 async def send_alerts(alerts: list[Alert], cfg: Settings) -> int:
     """Sendet mehrere Alerts an alle aktiven Kanäle. Gibt die Anzahl gesendeter zurück."""
-    sent = 0
-    for alert in alerts:
-        discord_ok = await discord.send_alert(alert)
-        telegram_ok = await telegram.send_alert(alert, cfg) if cfg.telegram.enabled else False
+    if not alerts:
+        return 0
+    started = time.perf_counter()
+    workers = []
+    if cfg.alerts.digest and len(alerts) > 1:
+        for name, send_digest in _digest_channels(cfg).items():
+            workers.append(_digest_worker(name, send_digest, alerts, started))
+    else:
+        for name, send in _channels(cfg).items():
+            queue: asyncio.Queue[Alert] = asyncio.Queue()
+            for alert in alerts:
+                queue.put_nowait(alert)
+            workers.append(_channel_worker(name, send, queue, started))
+    await asyncio.gather(*workers)
 
-        if discord_ok or telegram_ok:
-            alert.sent = True
-            sent += 1
-
-        # Kurze Pause zwischen Alerts (Rate-Limits beider Kanäle)
-        if len(alerts) > 1:
-            await asyncio.sleep(1.0)
+    for alert in alerts:
+        if alert.delivery_ms:
+            channels = ", ".join(f"{k} {v:.0f} ms" for k, v in alert.delivery_ms.items())
+            logger.debug(f"Alert ${alert.ticker} zugestellt: {channels}")
+    sent = sum(1 for alert in alerts if alert.sent)
+    logger.info(
+        f"{sent}/{len(alerts)} Alert(s) zugestellt in {(time.perf_counter() - started):.1f}s"
+    )
     return sent
@@ -0,0 +1,204 @@
+"""
+Persistente Alert-Outbox.
+
+Der Crawl schreibt ausgelöste Alerts nur noch in ``alert_outbox`` und ist
+damit fertig — Webhook-Latenz und -Ausfälle bremsen ihn nicht mehr. Ein
+eigener Worker (asyncio-Task aus main.py) stellt zu:
+
+- Idempotenz-Key ``run_id:ticker`` — doppeltes Einstellen ist ein No-op.
+- Fällige Einträge werden reserviert (Lease), dann über ``dispatch.send_alerts``
+  an alle Kanäle geschickt. Erfolg = mindestens ein Kanal.
+- Fehlschlag (auch eine Exception aus ``send_alerts``) → exponentielles
+  Backoff; nach ``OUTBOX_MAX_ATTEMPTS`` Dead-Letter, der den Cooldown des
+  Tickers wieder freigibt.
+- Erfolgreiche Alerts landen wie bisher in der Alert-History.
+
+Nach einem Neustart wird die Outbox einfach weiter abgearbeitet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from dataclasses import asdict
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from loguru import logger
+
+from wsb_crawler.alerts.dispatch import send_alerts
+from wsb_crawler.config import Settings, get_settings
+from wsb_crawler.models import (
+    Alert,
+    AlertReason,
+    MarketStatus,
+    NewsArticle,
+    PriceData,
+    SpikeResult,
+    TickerHistory,
+    TickerSignal,
+)
+from wsb_crawler.storage.base import Storage
+
+OUTBOX_POLL_SECONDS = 15.0
+OUTBOX_BATCH_SIZE = 20
+OUTBOX_MAX_ATTEMPTS = 8
+OUTBOX_BACKOFF_BASE_SECONDS = 30.0
+OUTBOX_BACKOFF_MAX_SECONDS = 3600.0
+# Reservierung während der Zustellung (inkl. Retries in discord/telegram)
+OUTBOX_LEASE_SECONDS = 300.0
+
+# Weckt den Worker direkt nach dem Einstellen (statt bis zum nächsten Poll)
+_wakeup: asyncio.Event | None = None
+
+
+# ── Serialisierung ─────────────────────────────────────────────────────────
+
+
+def _json_default(value: object) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Nicht serialisierbar: {type(value).__name__}")
+
+
+def encode_alert(alert: Alert) -> str:
+    """Alert → JSON (für die Outbox-Spalte ``payload``)."""
+    return json.dumps(asdict(alert), default=_json_default)
+
+
+def _dt(value: str) -> datetime:
+    return datetime.fromisoformat(value)
+
+
+def decode_alert(payload: str) -> Alert:
+    """Gegenstück zu encode_alert()."""
+    data = json.loads(payload)
+    spike = data["spike"]
+    price = spike.get("price_data")
+    history = spike.get("history")
+    signal = spike.get("signal")
+    return Alert(
+        ticker=data["ticker"],
+        reason=AlertReason(data["reason"]),
+        spike=SpikeResult(
+            ticker=spike["ticker"],
+            current_mentions=spike["current_mentions"],
+            avg_mentions=spike["avg_mentions"],
+            ratio=spike["ratio"],
+            delta=spike["delta"],
+            is_new=spike["is_new"],
+            reason=AlertReason(spike["reason"]) if spike.get("reason") else None,
+            price_data=PriceData(
+                **{
+                    **price,
+                    "market_status": MarketStatus(price["market_status"]),
+                    "fetched_at": _dt(price["fetched_at"]),
+                }
+            )
+            if price
+            else None,
+            news=[
+                NewsArticle(**{**a, "published_at": _dt(a["published_at"])})
+                for a in spike.get("news", [])
+            ],
+            history=TickerHistory(
+                ticker=history["ticker"],
+                mention_counts=[(_dt(ts), count) for ts, count in history["mention_counts"]],
+            )
+            if history
+            else None,
+            signal=TickerSignal(**signal) if signal else None,
+            confidence=spike.get("confidence", 0),
+        ),
+        triggered_at=_dt(data["triggered_at"]),
+        cooldown_until=_dt(data["cooldown_until"]) if data.get("cooldown_until") else None,
+    )
+
+
+# ── Einstellen + Zustellen ─────────────────────────────────────────────────
+
+
+def _backoff_seconds(attempts: int) -> float:
+    """Wartezeit nach dem N-ten Fehlversuch: 30 s, 60 s, 2 min, … max. 1 h."""
+    return min(OUTBOX_BACKOFF_MAX_SECONDS, OUTBOX_BACKOFF_BASE_SECONDS * 2.0 ** (attempts - 1))
+
+
+async def enqueue_alerts(db: Storage, run_id: str, alerts: list[Alert]) -> int:
+    """Stellt Alerts in die Outbox. Gibt die Anzahl neu eingestellter zurück."""
+    queued = 0
+    for alert in alerts:
+        key = f"{run_id}:{alert.ticker}"
+        if await db.enqueue_alert(key, run_id, alert.ticker, encode_alert(alert)):
+            queued += 1
+    if queued and _wakeup is not None:
+        _wakeup.set()
+    return queued
+
+
+async def deliver_due(db: Storage, cfg: Settings) -> int:
+    """Stellt alle fälligen Outbox-Einträge zu. Gibt die Anzahl zugestellter zurück."""
+    rows = await db.claim_due_alerts(OUTBOX_BATCH_SIZE, OUTBOX_LEASE_SECONDS)
+    if not rows:
+        return 0
+
+    batch: list[tuple[dict[str, Any], Alert]] = []
+    for row in rows:
+        try:
+            batch.append((row, decode_alert(row["payload"])))
+        except (KeyError, TypeError, ValueError) as e:
+            # Kaputter Payload wird durch Retries nicht besser
+            logger.error(f"Outbox-Eintrag {row['idempotency_key']} unlesbar: {e}")
+            await db.mark_alert_failed(row["id"], f"Payload unlesbar: {e}", None)
+
+    error = "Kein Kanal erfolgreich"
+    try:
+        await send_alerts([alert for _, alert in batch], cfg)
+    except Exception as e:
+        # Ohne Fehlversuch kämen die Einträge nach jeder Lease-Zeit wieder und
+        # erreichten nie den Dead-Letter — schon gesendete bleiben gesendet
+        logger.exception(f"Outbox-Zustellung abgebrochen: {e}")
+        error = f"Zustellung abgebrochen: {e}"
+
+    delivered = 0
+    for row, alert in batch:
+        if alert.sent:
+            await db.mark_alert_sent(row["id"])
+            await db.save_alert(alert)
+            delivered += 1
+            continue
+        attempts = row["attempts"] + 1
+        if attempts >= OUTBOX_MAX_ATTEMPTS:
+            logger.error(
+                f"Alert ${alert.ticker} nach {attempts} Versuchen aufgegeben (Dead-Letter)"
+            )
+            await db.mark_alert_failed(row["id"], error, None)
+        else:
+            retry_in = _backoff_seconds(attempts)
+            logger.warning(
+                f"Alert ${alert.ticker} nicht zugestellt (Versuch {attempts}) — "
+                f"neuer Versuch in {retry_in:.0f}s"
+            )
+            await db.mark_alert_failed(row["id"], error, retry_in)
+    return delivered
+
+
+async def outbox_worker(db: Storage) -> None:
+    """Dauerläufer (asyncio-Task aus main.py): arbeitet die Outbox ab."""
+    global _wakeup
+    _wakeup = asyncio.Event()
+    while True:
+        try:
+            cfg = await get_settings(db)
+            while await deliver_due(db, cfg):
+                pass  # volle Batches direkt nacharbeiten
+        except RuntimeError:
+            pass  # noch nicht konfiguriert (Setup-Wizard)
+        except Exception as e:
+            logger.warning(f"Outbox-Zustellung fehlgeschlagen: {e}")
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(_wakeup.wait(), timeout=OUTBOX_POLL_SECONDS)
+        _wakeup.clear()
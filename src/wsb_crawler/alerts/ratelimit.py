@@ -0,0 +1,104 @@
+"""
+Rate-Limit-Modelle der Alert-Kanäle.
+
+Statt fester ``sleep``-Pausen zwischen Alerts wartet jeder Kanal nur so lange,
+wie sein Limit es verlangt:
+
+- Discord: 5 Requests / 2 s pro Webhook. Die Antwort-Header
+  ``X-RateLimit-Remaining``/``X-RateLimit-Reset-After`` korrigieren das Modell
+  (z.B. wenn Heartbeat und Alerts denselben Webhook teilen).
+- Telegram: ~1 Nachricht/s pro Chat, in Gruppen/Kanälen 20 / Minute.
+
+Ein 429 blockiert den Limiter für ``retry_after`` Sekunden.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Mapping
+
+DISCORD_WEBHOOK_LIMIT = 5
+DISCORD_WEBHOOK_PERIOD_SECONDS = 2.0
+TELEGRAM_CHAT_LIMIT = 1
+TELEGRAM_CHAT_PERIOD_SECONDS = 1.0
+TELEGRAM_GROUP_LIMIT = 20
+TELEGRAM_GROUP_PERIOD_SECONDS = 60.0
+
+
+class RateLimiter:
+    """Sliding-Window-Limiter: höchstens ``limit`` Requests pro ``period`` Sekunden.
+
+    Kommt ohne Lock aus: zwischen der letzten Prüfung und dem Eintragen des
+    Requests liegt kein ``await``, parallele Aufrufer prüfen nach jedem
+    Schlafen neu.
+    """
+
+    def __init__(self, limit: int, period: float) -> None:
+        self.limit = limit
+        self.period = period
+        self._sent: deque[float] = deque()
+        self._blocked_until = 0.0
+
+    def _wait_time(self, now: float) -> float:
+        while self._sent and now - self._sent[0] >= self.period:
+            self._sent.popleft()
+        wait = self._blocked_until - now
+        if len(self._sent) >= self.limit:
+            wait = max(wait, self._sent[0] + self.period - now)
+        return max(0.0, wait)
+
+    async def acquire(self) -> float:
+        """Wartet auf einen freien Slot. Gibt die gewartete Zeit in Sekunden zurück."""
+        waited = 0.0
+        while (wait := self._wait_time(time.monotonic())) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        self._sent.append(time.monotonic())
+        return waited
+
+    def block_for(self, seconds: float) -> None:
+        """Sperrt den Limiter (429 / erschöpfter Bucket) für mindestens N Sekunden."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + max(0.0, seconds))
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Übernimmt Discords Bucket-Status aus den Antwort-Headern."""
+        try:
+            remaining = int(headers.get("X-RateLimit-Remaining", ""))
+            reset_after = float(headers.get("X-RateLimit-Reset-After", ""))
+        except (TypeError, ValueError):
+            return
+        if remaining <= 0:
+            self.block_for(reset_after)
+
+
+_discord_limiters: dict[str, RateLimiter] = {}
+_telegram_limiters: dict[str, RateLimiter] = {}
+
+
+def discord_limiter(webhook_url: str) -> RateLimiter:
+    """Limiter pro Webhook (Discord zählt pro Webhook, nicht global)."""
+    limiter = _discord_limiters.get(webhook_url)
+    if limiter is None:
+        limiter = RateLimiter(DISCORD_WEBHOOK_LIMIT, DISCORD_WEBHOOK_PERIOD_SECONDS)
+        _discord_limiters[webhook_url] = limiter
+    return limiter
+
+
+def telegram_limiter(chat_id: str) -> RateLimiter:
+    """Limiter pro Chat — Gruppen/Kanäle (negative IDs) sind deutlich strenger."""
+    limiter = _telegram_limiters.get(chat_id)
+    if limiter is None:
+        if chat_id.startswith("-") or chat_id.startswith("@"):
+            limiter = RateLimiter(TELEGRAM_GROUP_LIMIT, TELEGRAM_GROUP_PERIOD_SECONDS)
+        else:
+            limiter = RateLimiter(TELEGRAM_CHAT_LIMIT, TELEGRAM_CHAT_PERIOD_SECONDS)
+        _telegram_limiters[chat_id] = limiter
+    return limiter
+
+
+def reset_limiters() -> None:
+    """Vergisst alle Limiter (Tests, Config-Wechsel)."""
+    _discord_limiters.clear()
+    _telegram_limiters.clear()
@@ -4,6 +4,7 @@ Telegram-Alert-Kanal (optional, parallel zu Discord).
 Sendet Alerts via Telegram Bot API (`sendMessage`) als HTML-formatierte
 Nachricht. Aktiv, sobald `telegram_bot_token` **und** `telegram_chat_id`
 konfiguriert sind. Async über httpx wie der Rest des Projekts.
+Tempo pro Chat über den Limiter aus ratelimit.py.
 """
 
 from __future__ import annotations
@@ -14,10 +15,15 @@ import html
 import httpx
 from loguru import logger
 
+from wsb_crawler.alerts.ratelimit import telegram_limiter
 from wsb_crawler.config import Settings
 from wsb_crawler.models import Alert, AlertReason
+from wsb_crawler.runtime.metrics import API_CALLS, RATE_LIMITED
 
 _API_BASE = "https://api.telegram.org"
+# Telegram begrenzt eine Textnachricht auf 4096 Zeichen
+MAX_MESSAGE_CHARS = 4096
+DIGEST_SEPARATOR = "\n\n"
 
 _REASON_LABEL = {
     AlertReason.NEW_TICKER: "🆕 Neuer Ticker",
@@ -86,36 +92,88 @@ def _build_message(alert: Alert) -> str:
     return "\n".join(lines)
 
 
-async def send_alert(alert: Alert, cfg: Settings, retries: int = 3) -> bool:
-    """Sendet einen Alert an Telegram. Gibt True bei Erfolg zurück."""
+async def _send_message(text: str, cfg: Settings, retries: int = 3) -> bool:
+    """sendMessage mit Rate-Limit pro Chat und Retries. True bei Erfolg."""
     tg = cfg.telegram
-    if not tg.enabled:
-        return False
-
     url = f"{_API_BASE}/bot{tg.bot_token}/sendMessage"
     payload = {
         "chat_id": tg.chat_id,
-        "text": _build_message(alert),
+        "text": text,
         "parse_mode": "HTML",
         "disable_web_page_preview": True,
     }
 
+    limiter = telegram_limiter(str(tg.chat_id))
     for attempt in range(retries):
         try:
+            await limiter.acquire()
             async with httpx.AsyncClient(timeout=10.0) as client:
+                API_CALLS.inc(api="telegram")
                 response = await client.post(url, json=payload)
                 if response.status_code == 429:
+                    RATE_LIMITED.inc(api="telegram")
                     retry_after = float(response.json().get("parameters", {}).get("retry_after", 2))
                     logger.warning(f"Telegram Rate-Limit — warte {retry_after}s")
-                    await asyncio.sleep(retry_after)
+                    limiter.block_for(retry_after)
                     continue
                 response.raise_for_status()
-                logger.info(f"Telegram-Alert gesendet: ${alert.ticker}")
                 return True
         except Exception as e:
             logger.warning(f"Telegram-Fehler (Versuch {attempt + 1}/{retries}): {e}")
             if attempt < retries - 1:
                 await asyncio.sleep(2**attempt)
+    return False
+
 
+async def send_alert(alert: Alert, cfg: Settings, retries: int = 3) -> bool:
+    """Sendet einen Alert an Telegram. Gibt True bei Erfolg zurück."""
+    if not cfg.telegram.enabled:
+        return False
+
+    if await _send_message(_build_message(alert), cfg, retries):
+        logger.info(f"Telegram-Alert gesendet: ${alert.ticker}")
+        return True
     logger.error(f"Telegram-Alert konnte nicht gesendet werden: ${alert.ticker}")
     return False
+
+
+def _pack_messages(messages: list[str], max_chars: int = MAX_MESSAGE_CHARS) -> list[list[int]]:
+    """Verteilt Einzel-Nachrichten (als Indizes) auf möglichst wenige Telegram-Nachrichten."""
+    chunks: list[list[int]] = []
+    current: list[int] = []
+    length = 0
+    for idx, text in enumerate(messages):
+        added = len(text) if not current else len(text) + len(DIGEST_SEPARATOR)
+        if current and length + added > max_chars:
+            chunks.append(current)
+            current, length = [], 0
+            added = len(text)
+        current.append(idx)
+        length += added
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+async def send_alert_digest(alerts: list[Alert], cfg: Settings) -> list[bool]:
+    """Sendet alle Alerts gebündelt (bis 4096 Zeichen pro Nachricht).
+
+    Gibt pro Alert zurück, ob er zugestellt wurde (alle Alerts einer
+    Nachricht teilen deren Ergebnis).
+    """
+    if not cfg.telegram.enabled or not alerts:
+        return [False] * len(alerts)
+    # Das Limit zählt den sichtbaren Text — die Rohlänge inkl. HTML-Tags ist
+    # also eine sichere Obergrenze
+    messages = [_build_message(alert) for alert in alerts]
+    delivered = [False] * len(alerts)
+    for chunk in _pack_messages(messages):
+        text = DIGEST_SEPARATOR.join(messages[i] for i in chunk)
+        tickers = ", ".join(f"${alerts[i].ticker}" for i in chunk)
+        if await _send_message(text, cfg):
+            for i in chunk:
+                delivered[i] = True
+            logger.info(f"Telegram-Digest gesendet ({len(chunk)} Alerts): {tickers}")
+        else:
+            logger.error(f"Telegram-Digest konnte nicht gesendet werden: {tickers}")
+    return delivered
@@ -3,21 +3,44 @@ Spike-Detektor: erkennt ungewöhnliche Ticker-Aktivität.
 
 Vergleicht aktuelle Mentions mit historischem Durchschnitt (30 Tage).
 Berücksichtigt Cooldowns damit derselbe Ticker nicht spammt.
+
+Welche Kandidaten einen Alert bekommen, steht vor der Enrichment fest
+(Spike-Check, Cooldown, Ranking). Danach läuft jeder Kandidat für sich
+durch Kurs, Name → News und Versand: der erste Alert wartet nicht mehr auf
+die Kurse aller anderen (Yahoo ist auf eine Anfrage alle 1,5 s gedrosselt).
+
+Was die Enrichment schon geholt hat, steht in einem ``PendingEnrichment``
+des Aufrufers; ein fortgesetzter Lauf übergibt es wieder und spart sich
+diese Anfragen.
 """
 
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable
 
 from loguru import logger
 
-from wsb_crawler.config import get_settings
-from wsb_crawler.enrichment.news import get_news_bulk
+from wsb_crawler.config import AlertSettings, get_settings
+from wsb_crawler.enrichment.news import NewsBatcher, get_news_bulk
 from wsb_crawler.enrichment.prices import get_prices_bulk
 from wsb_crawler.enrichment.resolver import resolve_names_bulk
-from wsb_crawler.models import Alert, AlertReason, SpikeResult, TickerSignal
+from wsb_crawler.models import (
+    Alert,
+    AlertReason,
+    NewsArticle,
+    PendingEnrichment,
+    PriceData,
+    SpikeResult,
+    TickerSignal,
+)
 from wsb_crawler.runtime.progress import add_diagnostic, update_run
-from wsb_crawler.storage.database import Database
+from wsb_crawler.storage.base import Storage
+
+# Wird pro Alert aufgerufen, sobald dessen Kandidat fertig angereichert ist
+AlertCallback = Callable[[Alert], Awaitable[None]]
+# Wird aufgerufen, sobald neue Enrichment-Daten im PendingEnrichment stehen
+EnrichedCallback = Callable[[], Awaitable[None]]
 
 # Implizite 3-Buchstaben-Ticker sind die häufigste Restquelle für False Positives.
 # Bekannte WSB-/Mega-Cap-Ticker dürfen normal durch. Unbekannte neue 3-Letter-
@@ -125,9 +148,14 @@ def _alert_preview(alerts: list[Alert]) -> list[dict[str, object]]:
 
 async def analyze_mentions(
     mention_counts: dict[str, int],
-    db: Database,
+    db: Storage,
     run_id: str | None = None,
     signals: dict[str, TickerSignal] | None = None,
+    *,
+    limit: int | None = None,
+    on_alert: AlertCallback | None = None,
+    enrichment: PendingEnrichment | None = None,
+    on_enriched: EnrichedCallback | None = None,
 ) -> list[Alert]:
     """
     Analysiert Ticker-Nennungen und gibt ausgelöste Alerts zurück.
@@ -135,15 +163,19 @@ async def analyze_mentions(
     Ablauf:
     1. Für jeden Ticker: historischen Avg aus DB holen
     2. Spike-Check: ratio und delta berechnen
-    3. Cooldown prüfen
-    4. Für Alert-Kandidaten: Kurs + News parallel holen
-    5. Alerts erstellen
+    3. Cooldown prüfen, nach Relevanz auf max_per_run (bzw. ``limit``) kürzen
+    4. Pro Kandidat unabhängig: Kurs und Name parallel, dann News
+    5. Alert erstellen und sofort an ``on_alert`` übergeben
 
     run_id: ID des aktuellen Laufs. Dessen Mentions sind beim Aufruf bereits
     gespeichert und müssen aus History-Queries ausgeschlossen werden — sonst
     ist jeder Ticker "bekannt" und NEW_TICKER-Alerts können nie auslösen.
 
-    Gibt maximal alert_max_per_run Alerts zurück.
+    enrichment: schon geholte Kurse/Namen/News (werden nicht erneut
+    angefragt); neu geholte landen ebenfalls darin, danach ``on_enriched``.
+
+    Gibt maximal alert_max_per_run Alerts zurück, in Ranking-Reihenfolge.
+    Wird der Aufruf abgebrochen, brechen alle laufenden Kandidaten mit ab.
     """
     cfg = (await get_settings(db)).alerts
     alerts: list[Alert] = []
@@ -264,7 +296,8 @@ async def analyze_mentions(
     # Auf max_per_run begrenzen (nach Relevanz sortieren: Spike-Stärke +
     # Engagement + Volumen, damit virale Nennungen bei Gleichstand gewinnen)
     active_candidates.sort(key=_candidate_rank, reverse=True)
-    active_candidates = active_candidates[: cfg.max_per_run]
+    max_alerts = cfg.max_per_run if limit is None else min(cfg.max_per_run, limit)
+    active_candidates = active_candidates[:max_alerts]
 
     tickers_to_enrich = [s.ticker for s in active_candidates]
     update_run(
@@ -275,41 +308,46 @@ async def analyze_mentions(
         active_candidate_count=len(active_candidates),
     )
 
-    # Kurs + Namen parallel holen, danach News mit Firmennamen
-    # (die News-Suche findet mit "GameStop" deutlich mehr als nur mit "$GME")
-    prices, names = await asyncio.gather(
-        get_prices_bulk(tickers_to_enrich),
-        resolve_names_bulk(tickers_to_enrich),
-    )
-    update_run(
-        message="Kurse und Firmennamen geladen. Hole passende News…",
-        progress=83,
-    )
-    news_map = await get_news_bulk(tickers_to_enrich, company_names=names)
-
-    for spike in active_candidates:
-        t = spike.ticker
-        price_data = prices.get(t)
-        spike.price_data = price_data
-        spike.news = news_map.get(t, [])
-
-        # Optionaler Kurs-Alert Check
-        if (
-            price_data
-            and price_data.primary_change is not None
-            and abs(price_data.primary_change) >= cfg.min_price_move
-            and spike.reason == AlertReason.SPIKE
-        ):
-            spike.reason = AlertReason.PRICE_MOVE
-
-        spike.confidence = _confidence_score(spike)
-        alert = Alert(ticker=t, reason=spike.reason, spike=spike)  # type: ignore[arg-type]
-        alerts.append(alert)
-
-        logger.info(
-            f"Alert: {t} | {spike.reason} | "
-            f"{spike.current_mentions} Nennungen ({spike.ratio:.1f}x Avg)"
+    # Namen einmal für alle Kandidaten: Lookups außerhalb der Symbol-Tabelle
+    # dauern unterschiedlich lang — pro Kandidat aufgelöst, kämen die
+    # News-Anfragen zu verstreut für eine gemeinsame NewsAPI-Batch-Query
+    pending = enrichment if enrichment is not None else PendingEnrichment()
+
+    async def _enriched() -> None:
+        if on_enriched is not None:
+            await on_enriched()
+
+    async def _names() -> dict[str, str | None]:
+        missing = [t for t in tickers_to_enrich if t not in pending.names]
+        if missing:
+            pending.names.update(await resolve_names_bulk(missing))
+            await _enriched()
+        return {t: pending.names.get(t) for t in tickers_to_enrich}
+
+    names = asyncio.create_task(_names())
+    news = NewsBatcher(get_news_bulk)
+    ready: list[Alert] = []
+
+    async def _candidate(spike: SpikeResult) -> Alert:
+        alert = await _enrich_candidate(spike, cfg, names, news, pending, _enriched)
+        ready.append(alert)
+        update_run(
+            message=f"{len(ready)}/{len(active_candidates)} Alert(s) vorbereitet…",
+            alert_preview=_alert_preview(ready),
         )
+        if on_alert is not None:
+            await on_alert(alert)
+        return alert
+
+    tasks = [asyncio.create_task(_candidate(spike)) for spike in active_candidates]
+    try:
+        alerts = list(await asyncio.gather(*tasks))
+    finally:
+        # Abbruch oder Fehler eines Kandidaten: die anderen nicht weiterlaufen lassen
+        for task in tasks:
+            task.cancel()
+        names.cancel()
+        news.cancel()
 
     update_run(
         phase="enrich",
@@ -319,3 +357,57 @@ async def analyze_mentions(
         alert_preview=_alert_preview(alerts),
     )
     return alerts
+
+
+async def _enrich_candidate(
+    spike: SpikeResult,
+    cfg: AlertSettings,
+    names: asyncio.Future[dict[str, str | None]],
+    news: NewsBatcher,
+    pending: PendingEnrichment,
+    enriched: EnrichedCallback,
+) -> Alert:
+    """Ein Kandidat: Kurs und Namen parallel, News mit Firmennamen, dann der Alert.
+
+    Die News-Suche findet mit "GameStop" deutlich mehr als nur mit "$GME" —
+    deshalb wartet sie auf die (gemeinsam aufgelösten) Namen, nicht aber auf
+    den Kurs. Was schon in ``pending`` steht, wird nicht erneut geholt; ein
+    fehlender Kurs wird beim nächsten Mal wieder versucht.
+    """
+    t = spike.ticker
+
+    async def _price() -> PriceData | None:
+        if t not in pending.prices:
+            price = (await get_prices_bulk([t])).get(t)
+            if price is None:
+                return None
+            pending.prices[t] = price
+            await enriched()
+        return pending.prices[t]
+
+    async def _news() -> list[NewsArticle]:
+        if t not in pending.news:
+            # shield: ein abgebrochener Kandidat darf die Namen der anderen nicht abbrechen
+            resolved = await asyncio.shield(names)
+            pending.news[t] = await news.get(t, resolved.get(t))
+            await enriched()
+        return pending.news[t]
+
+    price_data, spike.news = await asyncio.gather(_price(), _news())
+    spike.price_data = price_data
+
+    # Optionaler Kurs-Alert Check
+    if (
+        price_data
+        and price_data.primary_change is not None
+        and abs(price_data.primary_change) >= cfg.min_price_move
+        and spike.reason == AlertReason.SPIKE
+    ):
+        spike.reason = AlertReason.PRICE_MOVE
+
+    spike.confidence = _confidence_score(spike)
+    logger.info(
+        f"Alert: {t} | {spike.reason} | "
+        f"{spike.current_mentions} Nennungen ({spike.ratio:.1f}x Avg)"
+    )
+    return Alert(ticker=t, reason=spike.reason, spike=spike)  # type: ignore[arg-type]
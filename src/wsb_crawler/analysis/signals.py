@@ -17,7 +17,7 @@ Alert-Anzeige.
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 from wsb_crawler.models import TickerMention, TickerSignal
 
@@ -131,3 +131,26 @@ def compute_signals(mentions: list[TickerMention]) -> dict[str, TickerSignal]:
         )
         for ticker, a in acc.items()
     }
+
+
+def merge_signals(
+    target: dict[str, TickerSignal], signals: dict[str, TickerSignal]
+) -> dict[str, TickerSignal]:
+    """Addiert die Signale einer weiteren Crawl-Einheit in ``target`` (in place).
+
+    Ergibt dasselbe wie compute_signals über die Nennungen beider Einheiten.
+    """
+    for ticker, signal in signals.items():
+        current = target.get(ticker)
+        if current is None:
+            target[ticker] = replace(signal)
+            continue
+        target[ticker] = TickerSignal(
+            ticker=ticker,
+            mention_count=current.mention_count + signal.mention_count,
+            total_score=current.total_score + signal.total_score,
+            max_score=max(current.max_score, signal.max_score),
+            bull_hits=current.bull_hits + signal.bull_hits,
+            bear_hits=current.bear_hits + signal.bear_hits,
+        )
+    return target
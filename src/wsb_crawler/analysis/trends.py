@@ -14,11 +14,11 @@ from loguru import logger
 from wsb_crawler.enrichment.prices import get_prices_bulk
 from wsb_crawler.enrichment.resolver import resolve_names_bulk
 from wsb_crawler.models import TickerHistory, TrendDirection, TrendEntry
+from wsb_crawler.storage.base import Storage
 from wsb_crawler.storage.cache import name_cache, price_cache
-from wsb_crawler.storage.database import Database
 
 
-async def get_top_tickers(db: Database, days: int = 7, limit: int = 10) -> list[TrendEntry]:
+async def get_top_tickers(db: Storage, days: int = 7, limit: int = 10) -> list[TrendEntry]:
     """
     Gibt die Top-Ticker der letzten N Tage zurück,
     angereichert mit Firmennamen und Kursdaten.
@@ -64,14 +64,15 @@ async def get_top_tickers(db: Database, days: int = 7, limit: int = 10) -> list[
     return enriched
 
 
-async def get_top_tickers_cached(db: Database, days: int = 7, limit: int = 20) -> list[TrendEntry]:
+async def get_top_tickers_cached(db: Storage, days: int = 7, limit: int = 20) -> list[TrendEntry]:
     """
     Wie ``get_top_tickers``, aber **netzwerkfrei** — gedacht für den gepollten
     Web-Endpunkt ``/api/tickers``.
 
     - Trend wird aus der DB-History berechnet (statt hartkodiert FLAT).
-    - Firmenname und Kurs werden **nur aus dem Cache** gelesen (nicht-blockierend):
-      warm für zuletzt angereicherte Ticker (z. B. Alerts), sonst ``None``.
+    - Firmenname und Kurs werden **nur aus dem Cache** gelesen (nicht-blockierend),
+      auch wenn sie schon abgelaufen sind (Stale-While-Revalidate): warm gehalten
+      vom Hintergrund-Refresher (enrichment/refresher.py), sonst ``None``.
 
     So löst ein Dashboard-Refresh keine yfinance-Bursts aus (anders als die
     voll anreichernde ``get_top_tickers`` für die seltenen Discord-Commands).
@@ -80,11 +81,11 @@ async def get_top_tickers_cached(db: Database, days: int = 7, limit: int = 20) -
     enriched: list[TrendEntry] = []
     for entry in entries:
         history = await db.get_ticker_history(entry.ticker, days=days)
-        price = price_cache.get(entry.ticker)
+        price = price_cache.get_stale(entry.ticker)
         enriched.append(
             TrendEntry(
                 ticker=entry.ticker,
-                company_name=name_cache.get(entry.ticker),
+                company_name=name_cache.get_stale(entry.ticker) or None,
                 total_mentions=entry.total_mentions,
                 avg_daily_mentions=entry.avg_daily_mentions,
                 peak_day=entry.peak_day,
@@ -123,6 +124,6 @@ def _calculate_trend(history: TickerHistory) -> TrendDirection:
     return TrendDirection.FLAT
 
 
-async def get_ticker_chart_data(db: Database, ticker: str, days: int = 30) -> TickerHistory:
+async def get_ticker_chart_data(db: Storage, ticker: str, days: int = 30) -> TickerHistory:
     """Gibt die Mention-History für einen Ticker zurück (für /chart Command)."""
     return await db.get_ticker_history(ticker, days=days)
@@ -0,0 +1,137 @@
+"""
+Response-Cache + ETag für die gepollten Dashboard-Endpunkte.
+
+``/api/tickers``, ``/api/mentions/daily``, ``/api/runs`` und ``/api/alerts``
+ändern sich praktisch nur, wenn ein Crawl Daten schreibt. Statt bei jedem
+Poll neu aus SQLite zu rechnen, wird die fertige Antwort pro Pfad + Query
+gehalten und erst verworfen, wenn
+
+- die Daten-Version steigt (DB-Change-Listener: Run-Start/-Ende, Mentions,
+  Alerts, Settings, Purge),
+- endpunkt-spezifische Quellen sich ändern (``/api/tickers`` liest Kurse und
+  Namen aus den In-Memory-Caches, die der Refresher auffrischt),
+- oder ``CACHE_MAX_AGE_SECONDS`` um sind (rollierende Zeitfenster wie "letzte
+  7 Tage" verschieben sich auch ohne Schreibzugriff).
+
+Jede Antwort bekommt einen starken ETag (Hash des Bodys); ``If-None-Match``
+mit passendem ETag wird mit 304 ohne Body beantwortet. Große Antworten liegen
+bereits gzip-komprimiert im Cache (getrennt nach Accept-Encoding) und werden
+so nur einmal pro Daten-Version komprimiert.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from wsb_crawler.storage.cache import name_cache, price_cache
+
+CACHE_MAX_AGE_SECONDS = 300.0
+CACHE_MAX_ENTRIES = 256
+# Antwort-Header, die mit dem Body gecacht werden (Pagination-Cursor)
+PASSTHROUGH_HEADERS = ("x-next-cursor",)
+
+# Gecachte Pfade → zusätzliche Versionsquellen neben der Daten-Version
+CACHED_ENDPOINTS: dict[str, Callable[[], tuple[int, ...]]] = {
+    "/api/tickers": lambda: (price_cache.version, name_cache.version),
+    "/api/mentions/daily": tuple,
+    "/api/runs": tuple,
+    "/api/alerts": tuple,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    version: tuple[int, ...]
+    created_at: float  # monotonic
+    body: bytes
+    etag: str
+    media_type: str
+    content_encoding: str | None = None  # "gzip", wenn die GZip-Middleware komprimiert hat
+    extra_headers: tuple[tuple[str, str], ...] = ()
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def is_cacheable(request: Request) -> bool:
+    """GET auf einen gecachten Pfad; gestreamtes NDJSON läuft immer direkt durch."""
+    return (
+        request.method == "GET"
+        and request.url.path in CACHED_ENDPOINTS
+        and request.query_params.get("format") != "ndjson"
+    )
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match-Vergleich (RFC 9110: schwacher Vergleich, ``*`` passt immer)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """Antworten pro Pfad + Query, gültig solange sich die Versionen nicht ändern."""
+
+    def __init__(self) -> None:
+        self.data_version = 0
+        self._entries: dict[str, CachedResponse] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self) -> None:
+        """Daten haben sich geändert — alle Einträge werden beim nächsten Zugriff neu gebaut."""
+        self.data_version += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @staticmethod
+    def key(request: Request) -> str:
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        # Gleiche Prüfung wie die GZip-Middleware: gezippte und rohe Bodies getrennt halten
+        encoding = "gzip" if "gzip" in request.headers.get("Accept-Encoding", "") else "identity"
+        return f"{request.url.path}?{query}#{encoding}"
+
+    def current_version(self, path: str) -> tuple[int, ...]:
+        return (self.data_version, *CACHED_ENDPOINTS[path]())
+
+    def get(self, key: str, version: tuple[int, ...]) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.version != version or time.monotonic() - entry.created_at > CACHE_MAX_AGE_SECONDS:
+            del self._entries[key]
+            return None
+        return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        self._entries.pop(key, None)
+        if len(self._entries) >= CACHE_MAX_ENTRIES:
+            # dict-Reihenfolge = Einfügereihenfolge → ältesten Eintrag verwerfen
+            del self._entries[next(iter(self._entries))]
+        self._entries[key] = entry
+
+
+response_cache = ResponseCache()
+
+
+def cached_response(entry: CachedResponse, request: Request) -> Response:
+    """200 mit Body oder 304, falls der Client die Version schon hat."""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    headers.update(entry.extra_headers)
+    if etag_matches(request.headers.get("If-None-Match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    if entry.content_encoding:
+        headers["Content-Encoding"] = entry.content_encoding
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
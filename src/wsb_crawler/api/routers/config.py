@@ -8,17 +8,25 @@ per Default nur auf localhost und Secrets werden in GET-Responses maskiert.
 from __future__ import annotations
 
 from typing import Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field, field_validator
 
 from wsb_crawler.__version__ import __version__
 from wsb_crawler.alerts.discord import _send_webhook
-from wsb_crawler.config import get_settings, is_configured
-from wsb_crawler.storage.database import Database
+from wsb_crawler.config import (
+    CRAWL_BACKENDS,
+    get_settings,
+    is_configured,
+    parse_subreddit_overrides,
+)
+from wsb_crawler.market_calendar import EXCHANGES
+from wsb_crawler.schedule import SCHEDULE_MODES
+from wsb_crawler.storage.base import Storage
 
 router = APIRouter(tags=["config"])
-db: Database = None  # type: ignore[assignment]  # wird in server.py::set_database gesetzt
+db: Storage = None  # type: ignore[assignment]  # wird in server.py::set_database gesetzt
 
 MASK = "••••••••"
 
@@ -50,6 +58,10 @@ class ConfigPayload(BaseModel):
     newsapi_lang: str | None = None
     newsapi_window_hours: int | None = Field(default=None, ge=1, le=168)
 
+    # Lokale News-Feeds (optional, RSS/Atom; NewsAPI dient dann als Fallback)
+    news_feeds: str | None = None  # komma- oder zeilenweise getrennte URLs
+    news_feed_refresh_minutes: int | None = Field(default=None, ge=1, le=1440)
+
     # Discord (Pflicht)
     discord_webhook_url: str | None = None
     discord_bot_token: str | None = None
@@ -67,14 +79,23 @@ class ConfigPayload(BaseModel):
     alert_min_price_move: float | None = Field(default=None, ge=0)
     alert_max_per_run: int | None = Field(default=None, ge=1, le=25)
     alert_cooldown_h: int | None = Field(default=None, ge=0)
+    alert_digest: str | None = None  # "true" = Alerts eines Laufs gebündelt senden
 
     # Crawler
     subreddits: str | None = None  # komma-separiert
     crawl_interval_minutes: int | None = Field(default=None, ge=1)
-    schedule_mode: str | None = None  # "interval" oder "cron"
+    schedule_mode: str | None = None  # "interval", "cron", "market" oder "adaptive"
     cron_expression: str | None = None  # 5-Feld-Cron
+    schedule_timezone: str | None = None  # IANA, z.B. America/New_York
+    market_calendar: str | None = None  # NYSE oder XETRA
+    market_dense_minutes: int | None = Field(default=None, ge=1, le=1440)
+    market_sparse_minutes: int | None = Field(default=None, ge=1, le=1440)
+    adaptive_min_minutes: int | None = Field(default=None, ge=1, le=1440)
+    adaptive_max_minutes: int | None = Field(default=None, ge=1, le=1440)
     posts_limit: int | None = Field(default=None, ge=1, le=1000)
     comments_limit: int | None = Field(default=None, ge=0, le=500)
+    subreddit_overrides: str | None = None  # "sub posts=200 comments=50 interval=60" pro Zeile
+    crawl_backend: str | None = None  # "local" oder "workers"
     log_level: str | None = None
     alphavantage_api_key: str | None = None
 
@@ -85,13 +106,53 @@ class ConfigPayload(BaseModel):
             raise ValueError("Webhook-URL muss mit https://discord.com/api/webhooks/ beginnen")
         return v
 
+    @field_validator("news_feeds")
+    @classmethod
+    def validate_news_feeds(cls, v: str | None) -> str | None:
+        if v:
+            for url in v.replace(",", " ").split():
+                if not url.startswith(("http://", "https://")):
+                    raise ValueError(f"Feed-URL muss mit http:// oder https:// beginnen: {url}")
+        return v
+
     @field_validator("schedule_mode")
     @classmethod
     def validate_schedule_mode(cls, v: str | None) -> str | None:
-        if v and v not in ("interval", "cron"):
-            raise ValueError("schedule_mode muss 'interval' oder 'cron' sein")
+        if v and v not in SCHEDULE_MODES:
+            raise ValueError(f"schedule_mode muss eines von {', '.join(SCHEDULE_MODES)} sein")
         return v
 
+    @field_validator("schedule_timezone")
+    @classmethod
+    def validate_schedule_timezone(cls, v: str | None) -> str | None:
+        if v and v.strip():
+            try:
+                ZoneInfo(v.strip())
+            except (ZoneInfoNotFoundError, ValueError) as exc:
+                raise ValueError(f"Unbekannte Zeitzone: {v}") from exc
+        return v
+
+    @field_validator("market_calendar")
+    @classmethod
+    def validate_market_calendar(cls, v: str | None) -> str | None:
+        if v and v.strip().upper() not in EXCHANGES:
+            raise ValueError(f"market_calendar muss eines von {', '.join(EXCHANGES)} sein")
+        return v.strip().upper() if v else v
+
+    @field_validator("subreddit_overrides")
+    @classmethod
+    def validate_subreddit_overrides(cls, v: str | None) -> str | None:
+        if v:
+            parse_subreddit_overrides(v)
+        return v
+
+    @field_validator("crawl_backend")
+    @classmethod
+    def validate_crawl_backend(cls, v: str | None) -> str | None:
+        if v and v.strip().lower() not in CRAWL_BACKENDS:
+            raise ValueError(f"crawl_backend muss eines von {', '.join(CRAWL_BACKENDS)} sein")
+        return v.strip().lower() if v else v
+
     @field_validator("cron_expression")
     @classmethod
     def validate_cron_expression(cls, v: str | None) -> str | None:
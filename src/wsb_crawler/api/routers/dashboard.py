@@ -5,11 +5,15 @@ Dashboard-Router: Daten für Charts, Ticker-Übersicht und Alert-History.
 from __future__ import annotations
 
 import asyncio
+import json
 import os
+from collections.abc import AsyncIterator, Callable
 from datetime import UTC, datetime
-from typing import Any
+from typing import Annotated, Any, Literal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from loguru import logger
 
 from wsb_crawler.__version__ import __version__
@@ -25,13 +29,22 @@ from wsb_crawler.crawler.runner import (
 from wsb_crawler.cron import CronSchedule
 from wsb_crawler.enrichment.prices import get_price
 from wsb_crawler.enrichment.resolver import resolve_name
-from wsb_crawler.storage.database import Database
+from wsb_crawler.runtime.profiler import load_profile_summary, profile_path
+from wsb_crawler.storage.base import Storage
+from wsb_crawler.storage.pagination import decode_cursor, encode_cursor
 
 router = APIRouter(tags=["dashboard"])
-db: Database = None  # type: ignore[assignment]  # wird in server.py::set_database gesetzt
+db: Storage = None  # type: ignore[assignment]  # wird in server.py::set_database gesetzt
 
 _crawl_task: asyncio.Task[None] | None = None
 
+# Seitengrößen der History-Endpunkte (NDJSON wird zeilenweise gesendet → größere Seiten ok)
+JSON_PAGE_MAX = 500
+NDJSON_PAGE_MAX = 10_000
+RUN_MENTIONS_PAGE = 100
+
+PageFormat = Literal["json", "ndjson"]
+
 
 def is_crawl_running() -> bool:
     return runner_is_crawl_running() or (_crawl_task is not None and not _crawl_task.done())
@@ -132,14 +145,90 @@ async def get_ticker_history(
     }
 
 
-@router.get("/alerts")
+def _cursor_or_400(cursor: str | None, arity: int) -> tuple[Any, ...] | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, arity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+def _check_page_size(limit: int, fmt: PageFormat) -> None:
+    if fmt == "json" and limit > JSON_PAGE_MAX:
+        raise HTTPException(
+            status_code=422,
+            detail=f"limit > {JSON_PAGE_MAX} nur mit format=ndjson",
+        )
+
+
+async def _paged_response(
+    rows: AsyncIterator[dict[str, Any]],
+    limit: int,
+    fmt: PageFormat,
+    cursor_of: Callable[[dict[str, Any]], str],
+) -> Response:
+    """Eine Seite als JSON-Liste (+ Header ``X-Next-Cursor``) oder als NDJSON-Stream.
+
+    ``rows`` liefert bis zu ``limit + 1`` Zeilen — die zusätzliche zeigt nur
+    an, dass es eine weitere Seite gibt. Im NDJSON-Stream steht der Cursor
+    dann als letzte Zeile ``{"next_cursor": "..."}``.
+
+    Die Seite wird vor dem Senden komplett gelesen: ein offener DB-Cursor
+    hielte sonst, solange ein langsamer Client liest, ein Statement auf der
+    gemeinsamen Verbindung offen, über die auch der Crawler schreibt.
+    """
+    page = [row async for row in rows]
+    next_cursor = cursor_of(page[limit - 1]) if len(page) > limit else None
+    page = page[:limit]
+
+    if fmt == "ndjson":
+
+        async def _lines() -> AsyncIterator[bytes]:
+            for row in page:
+                yield _ndjson(row)
+            if next_cursor is not None:
+                yield _ndjson({"next_cursor": next_cursor})
+
+        return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else {}
+    return JSONResponse(page, headers=headers)
+
+
+def _ndjson(obj: dict[str, Any]) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+@router.get("/alerts", response_model=None)
 async def get_alerts(
-    limit: int = Query(default=50, ge=1, le=500),
+    limit: Annotated[int, Query(ge=1, le=NDJSON_PAGE_MAX)] = 50,
     ticker: str | None = None,
-) -> list[dict[str, Any]]:
-    """Alert-History, optional gefiltert nach Ticker."""
-    rows = await db.get_alert_history(limit=limit, ticker=ticker)
-    return rows
+    reason: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    min_confidence: Annotated[int | None, Query(ge=0, le=100)] = None,
+    cursor: str | None = None,
+    format: PageFormat = "json",
+) -> Response:
+    """Alert-History (neueste zuerst), Keyset-paginiert über ``cursor``.
+
+    Die Antwort ist eine Liste; gibt es weitere Seiten, steht der Cursor für
+    die nächste im Header ``X-Next-Cursor``.
+    """
+    _check_page_size(limit, format)
+    rows = db.iter_alert_history(
+        limit=limit + 1,
+        after=_cursor_or_400(cursor, 2),
+        ticker=ticker,
+        reason=reason,
+        since=since,
+        until=until,
+        min_confidence=min_confidence,
+    )
+    return await _paged_response(
+        rows, limit, format, lambda r: encode_cursor(r["sent_at"], r["id"])
+    )
 
 
 @router.get("/mentions/daily")
@@ -154,45 +243,116 @@ async def get_daily_mentions(
     }
 
 
-@router.get("/runs")
+@router.get("/runs", response_model=None)
 async def get_runs(
-    limit: int = Query(default=20, ge=1, le=100),
-) -> list[dict[str, Any]]:
-    """Letzte Crawl-Runs mit Statistiken."""
-    rows = await db.get_recent_runs(limit=limit)
-    return rows
+    limit: Annotated[int, Query(ge=1, le=NDJSON_PAGE_MAX)] = 20,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    format: PageFormat = "json",
+) -> Response:
+    """Crawl-Runs mit Statistiken (neueste zuerst), Keyset-paginiert wie /alerts."""
+    _check_page_size(limit, format)
+    rows = db.iter_runs(
+        limit=limit + 1,
+        after=_cursor_or_400(cursor, 2),
+        since=since,
+        until=until,
+    )
+    return await _paged_response(
+        rows, limit, format, lambda r: encode_cursor(r["started_at"], r["id"])
+    )
 
 
 @router.get("/runs/{run_id}")
-async def get_run_detail(run_id: str) -> dict[str, Any]:
-    """Einzelner Crawl-Run inklusive Ticker-Mentions."""
-    detail = await db.get_run_detail(run_id)
+async def get_run_detail(
+    run_id: str,
+    mentions_limit: Annotated[int, Query(ge=1, le=JSON_PAGE_MAX)] = RUN_MENTIONS_PAGE,
+) -> dict[str, Any]:
+    """Einzelner Crawl-Run inklusive der meistgenannten Ticker.
+
+    Weitere Mentions (``mentions_total`` > geliefert) über
+    ``/runs/{run_id}/mentions?cursor=…`` mit ``mentions_next_cursor``.
+    """
+    detail = await db.get_run_detail(run_id, mentions_limit=mentions_limit)
     if detail is None:
         raise HTTPException(status_code=404, detail="Run nicht gefunden")
+    mentions = detail["mentions"]
+    detail["mentions_next_cursor"] = (
+        encode_cursor(mentions[-1]["mentions"], mentions[-1]["ticker"])
+        if mentions and detail["mentions_total"] > len(mentions)
+        else None
+    )
+    # Nur bei profilierten Läufen (POST /crawl?profile=true)
+    summary = await asyncio.to_thread(load_profile_summary, run_id)
+    detail["profile"] = (
+        {"flamegraph_url": f"/api/runs/{run_id}/profile", "summary": summary} if summary else None
+    )
     return detail
 
 
+@router.get("/runs/{run_id}/profile", response_model=None)
+async def get_run_profile(run_id: str) -> FileResponse:
+    """Profil eines Laufs als Collapsed-Stacks (flamegraph.pl, inferno, speedscope)."""
+    path = await asyncio.to_thread(profile_path, run_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Kein Profil für diesen Run")
+    return FileResponse(path, media_type="text/plain; charset=utf-8", filename=path.name)
+
+
+@router.get("/runs/{run_id}/mentions")
+async def get_run_mentions(
+    run_id: str,
+    limit: Annotated[int, Query(ge=1, le=JSON_PAGE_MAX)] = RUN_MENTIONS_PAGE,
+    cursor: str | None = None,
+) -> dict[str, Any]:
+    """Eine Seite der Ticker-Mentions eines Runs (meistgenannte zuerst)."""
+    after = _cursor_or_400(cursor, 2)
+    rows = await db.get_run_mentions(
+        run_id,
+        limit=limit + 1,
+        after=after,
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["mentions"], rows[-1]["ticker"])
+    return {"run_id": run_id, "mentions": rows, "next_cursor": next_cursor}
+
+
 @router.get("/cron/preview")
 async def preview_cron(
     expression: str = Query(..., min_length=1),
     count: int = Query(default=3, ge=1, le=10),
+    tz: Annotated[str, Query(description="IANA-Zeitzone, z.B. America/New_York")] = "UTC",
 ) -> dict[str, Any]:
     """Berechnet die naechsten Cron-Laufzeiten fuer die UI-Vorschau."""
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError) as exc:
+        raise HTTPException(status_code=400, detail=f"Unbekannte Zeitzone: {tz}") from exc
     try:
         schedule = CronSchedule(expression.strip())
         moment = datetime.now(tz=UTC)
         runs = []
         for _ in range(count):
-            moment = schedule.next_after(moment)
+            moment = schedule.next_after(moment, zone)
             runs.append(moment.isoformat())
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
-    return {"expression": expression.strip(), "next_runs": runs}
+    return {"expression": expression.strip(), "timezone": tz, "next_runs": runs}
 
 
 @router.post("/crawl")
-async def trigger_crawl(dry_run: bool = Query(default=False)) -> dict[str, Any]:
-    """Startet einen Crawl-Lauf manuell (fire-and-forget als asyncio-Task)."""
+async def trigger_crawl(
+    dry_run: bool = Query(default=False), profile: bool = Query(default=False)
+) -> dict[str, Any]:
+    """Startet einen Crawl-Lauf manuell (fire-and-forget als asyncio-Task).
+
+    Manuelle Läufe crawlen alle Subreddits, auch wenn deren eigener Takt
+    (``subreddit_overrides``) noch nicht fällig ist. ``profile`` lässt den
+    Lauf unter dem Sampling-Profiler laufen (Ergebnis in ``/runs/{id}``).
+    """
     global _crawl_task
     if not await is_configured(db):
         raise HTTPException(
@@ -201,9 +361,11 @@ async def trigger_crawl(dry_run: bool = Query(default=False)) -> dict[str, Any]:
         )
     if is_crawl_running():
         raise HTTPException(status_code=409, detail="Crawl läuft bereits")
-    _crawl_task = asyncio.create_task(run_single_crawl(db, dry_run=dry_run))
+    _crawl_task = asyncio.create_task(
+        run_single_crawl(db, dry_run=dry_run, force=True, profile=profile)
+    )
     _crawl_task.add_done_callback(_log_crawl_outcome)
-    return {"ok": True, "dry_run": dry_run}
+    return {"ok": True, "dry_run": dry_run, "profile": profile}
 
 
 @router.post("/crawl/stop")
@@ -0,0 +1,45 @@
+"""
+Export-Router: komplette History als Datei-Download (CSV, NDJSON, Parquet).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from wsb_crawler.storage.base import Storage
+from wsb_crawler.storage.export import (
+    MEDIA_TYPES,
+    ExportFormat,
+    export_filename,
+    export_stream,
+    parquet_available,
+)
+
+router = APIRouter(tags=["export"])
+db: Storage = None  # type: ignore[assignment]  # wird in server.py::set_database gesetzt
+
+ExportName = Literal["mentions", "alerts", "runs"]
+
+
+@router.get("/export/{dataset}")
+async def export_dataset(
+    dataset: ExportName,
+    format: ExportFormat = "csv",
+    since: Annotated[datetime | None, Query()] = None,
+    until: Annotated[datetime | None, Query()] = None,
+) -> StreamingResponse:
+    """Streamt den Datensatz chronologisch; ``since`` inklusive, ``until`` exklusive."""
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(501, "Parquet-Export braucht pyarrow (wsb-crawler[parquet])")
+    return StreamingResponse(
+        export_stream(db, dataset, format, since=since, until=until),
+        media_type=MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(dataset, format)}"',
+            "Cache-Control": "no-store",
+        },
+    )
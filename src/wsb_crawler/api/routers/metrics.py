@@ -0,0 +1,21 @@
+"""
+Metrics-Router: Prometheus-Scrape-Endpunkt unter ``/metrics`` (ohne /api-Präfix).
+
+Liefert die Zähler, Histogramme und Queue-Tiefen aus runtime/metrics.py im
+Text-Format. Hinter derselben optionalen Basic-Auth wie das Dashboard.
+"""
+
+from __future__ import annotations
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from wsb_crawler.runtime.metrics import CONTENT_TYPE, render
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics() -> Response:
+    """Alle Metriken des Prozesses im Prometheus-Text-Format."""
+    return Response(content=render(), media_type=CONTENT_TYPE)
@@ -6,79 +6,39 @@ from __future__ import annotations
 
 import asyncio
 import datetime as dt
-from collections import deque
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 from loguru import logger
 
+from wsb_crawler import schedule
 from wsb_crawler.api.routers.dashboard import is_crawl_running
-from wsb_crawler.config import Settings, get_settings, is_configured
-from wsb_crawler.cron import next_run as cron_next_run
+from wsb_crawler.config import get_settings, is_configured
+from wsb_crawler.runtime import progress
+from wsb_crawler.runtime.log_hub import log_hub
+from wsb_crawler.runtime.metrics import QUEUE_DEPTH
 from wsb_crawler.runtime.progress import snapshot as progress_snapshot
-from wsb_crawler.storage.database import Database
+from wsb_crawler.runtime.status_hub import StatusHub
+from wsb_crawler.storage.base import Storage
 
 router = APIRouter(tags=["status"])
-db: Database = None  # type: ignore[assignment]  # wird in server.py::set_database gesetzt
-
-# Ring-Buffer für letzte 200 Log-Zeilen (für WebSocket-Clients die sich verbinden)
-_log_buffer: deque[str] = deque(maxlen=200)
-_ws_clients: list[WebSocket] = []
-# Starke Referenzen auf Broadcast-Tasks — sonst kann der GC laufende Tasks einsammeln
-_broadcast_tasks: set[asyncio.Task[None]] = set()
-
-
-def _next_run_at(cfg: Settings, now: datetime) -> datetime:
-    """Calculate the next scheduled crawl for API status responses."""
-    crawler = cfg.crawler
-    interval_at = now + dt.timedelta(minutes=crawler.crawl_interval_minutes)
-    if crawler.schedule_mode == "cron" and crawler.cron_expression.strip():
-        try:
-            return cron_next_run(crawler.cron_expression.strip(), now)
-        except ValueError as exc:
-            logger.error(
-                f"Ungueltiger Cron-Ausdruck '{crawler.cron_expression}': {exc} - Intervall"
-            )
-    return interval_at
+db: Storage = None  # type: ignore[assignment]  # wird in server.py::set_database gesetzt
 
 
 def setup_ws_log_sink() -> None:
-    """Loguru-Sink der Log-Messages in den WebSocket-Buffer schreibt.
+    """Loguru-Sink, der Log-Messages an den Log-Hub (runtime/log_hub.py) übergibt.
 
     Muss explizit NACH logger.remove() / _setup_logging() aufgerufen werden,
     da logger.remove() alle Sinks entfernt — auch diesen.
     """
+    logger.add(log_hub.emit, format="{time:HH:mm:ss} | {level: <8} | {message}", level="INFO")
+
 
-    async def _broadcast(message: str) -> None:
-        disconnected = []
-        for ws in _ws_clients:
-            try:
-                await ws.send_text(message)
-            except Exception:
-                disconnected.append(ws)
-        for ws in disconnected:
-            _ws_clients.remove(ws)
-
-    def _sink(message: object) -> None:
-        line = str(message).rstrip("\n")
-        if not line:
-            return
-
-        # Immer im Ring-Buffer halten, damit neue Clients sofort Verlauf sehen.
-        _log_buffer.append(line)
-
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            # Log-Aufruf außerhalb des Event-Loops (z.B. aus to_thread) —
-            # Zeile bleibt im Buffer, Broadcast holt der nächste Reconnect nach
-            return
-        task = loop.create_task(_broadcast(line))
-        _broadcast_tasks.add(task)
-        task.add_done_callback(_broadcast_tasks.discard)
-
-    logger.add(_sink, format="{time:HH:mm:ss} | {level: <8} | {message}", level="INFO")
+def attach_status_hub(database: Storage) -> None:
+    """Verbindet den Status-Hub mit Fortschritts- und DB-Änderungen."""
+    database.add_change_listener(status_hub.notify)
+    progress.add_listener(status_hub.notify)
 
 
 @router.get("/status")
@@ -87,14 +47,24 @@ async def get_status() -> dict[str, Any]:
     return await _status_payload()
 
 
+@router.get("/status/progress")
+async def get_progress(since: int = Query(default=0, ge=0)) -> dict[str, Any]:
+    """Fortschritt des aktuellen Laufs — mit ``since`` nur die Änderungen seit dieser Version."""
+    return progress.changes_since(since)
+
+
 async def _status_payload() -> dict[str, Any]:
     """Build the status payload shared by HTTP and WebSocket clients."""
     run_status = await db.get_run_status()
     configured = await is_configured(db)
-    next_run_at = None
+    decision = None
     if configured:
         cfg = await get_settings(db)
-        next_run_at = _next_run_at(cfg, datetime.now(tz=dt.UTC))
+        decision = schedule.last_decision()
+        if decision is None or decision.mode != cfg.crawler.schedule_mode:
+            # Scheduler hat (mit dieser Einstellung) noch nicht geplant → Vorschau
+            decision = await schedule.plan_next_run(db, cfg, datetime.now(tz=dt.UTC))
+    next_run_at = decision.next_run_at if decision else None
     return {
         "configured": configured,
         "last_run_at": run_status.last_run_at.isoformat() if run_status.last_run_at else None,
@@ -103,50 +73,76 @@ async def _status_payload() -> dict[str, Any]:
         "total_alerts": run_status.total_alerts_sent,
         "tracked_tickers": run_status.tracked_tickers,
         "next_run_at": next_run_at.isoformat() if next_run_at else None,
+        "schedule": decision.to_dict() if decision else None,
         "is_healthy": run_status.is_healthy,
         "crawl_running": is_crawl_running(),
         "current_run": progress_snapshot(),
     }
 
 
+# Ein Producer für alle Status-WebSockets (siehe runtime/status_hub.py)
+status_hub = StatusHub(_status_payload)
+QUEUE_DEPTH.track(lambda: status_hub.pending_messages, queue="status_clients")
+
+
 @router.websocket("/ws/logs")
 async def websocket_logs(websocket: WebSocket) -> None:
-    """WebSocket-Endpoint für Live-Log-Stream."""
+    """WebSocket-Endpoint für Live-Log-Stream.
+
+    Erst ``{"type": "history", "lines": [...]}`` (ersetzt beim Reconnect die
+    Anzeige), danach gebündelte ``{"type": "lines", "lines": [...], "dropped": n}``.
+    """
     await websocket.accept()
-    _ws_clients.append(websocket)
-    try:
-        # Clear-Signal + Buffer senden. Das Clear stellt sicher, dass beim
-        # Reconnect die Logs nicht doppelt angezeigt werden.
-        await websocket.send_text("__LOGS_CLEAR__")
-        for line in list(_log_buffer):
-            await websocket.send_text(line)
-        # Verbindung offen halten
+    sub = log_hub.subscribe()
+
+    async def _send() -> None:
+        await websocket.send_json({"type": "history", "lines": sub.history})
+        while True:
+            await websocket.send_json(await log_hub.next_batch(sub))
+
+    async def _receive() -> None:
         while True:
             await websocket.receive_text()
-    except WebSocketDisconnect:
-        pass
+
+    tasks = [asyncio.create_task(_send()), asyncio.create_task(_receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.exception()  # Disconnect/Sendefehler abholen, Ende ist Ende
     finally:
-        if websocket in _ws_clients:
-            _ws_clients.remove(websocket)
+        for task in tasks:
+            task.cancel()
+        log_hub.unsubscribe(sub)
 
 
 @router.websocket("/ws/status")
 async def websocket_status(websocket: WebSocket) -> None:
-    """WebSocket-Endpoint fuer den Live-Dashboard-Status."""
+    """WebSocket-Endpoint fuer den Live-Dashboard-Status.
+
+    Erst ein ``{"type": "snapshot", "data": ...}``, danach nur
+    ``{"type": "patch", "ops": [...]}`` (JSON-Patch) bei Änderungen.
+    """
     await websocket.accept()
-    last_payload: dict[str, Any] | None = None
-    last_sent_at = 0.0
-    try:
+    sub = await status_hub.subscribe()
+
+    async def _send() -> None:
         while True:
-            payload = await _status_payload()
-            now = asyncio.get_running_loop().time()
-            if payload != last_payload or now - last_sent_at >= 30:
-                await websocket.send_json(payload)
-                last_payload = payload
-                last_sent_at = now
-            await asyncio.sleep(1)
-    except WebSocketDisconnect:
-        pass
-    except Exception:
-        # Browser disconnects can surface as send errors depending on timing.
-        logger.debug("Dashboard-Status-WebSocket getrennt")
+            await websocket.send_json(await sub.queue.get())
+
+    async def _receive() -> None:
+        # Erkennt Disconnects auch, wenn gerade nichts zu senden ist
+        while True:
+            await websocket.receive_text()
+
+    tasks = [asyncio.create_task(_send()), asyncio.create_task(_receive())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                # Browser disconnects can surface as send errors depending on timing.
+                logger.debug("Dashboard-Status-WebSocket getrennt")
+    finally:
+        for task in tasks:
+            task.cancel()
+        status_hub.unsubscribe(sub)
@@ -2,32 +2,93 @@
 FastAPI-Server für das WSB-Crawler Dashboard.
 
 Läuft als asyncio-Task parallel zum Crawler-Scheduler.
-Serviert das statische HTML-Dashboard (api/static/) unter / und die API unter /api/.
+Serviert das statische HTML-Dashboard (api/static/) unter / und die API unter /api/,
+Prometheus-Metriken unter /metrics.
 """
 
 from __future__ import annotations
 
+import time
 from pathlib import Path
 from typing import cast
 
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, RedirectResponse, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import RedirectResponse, Response
 from loguru import logger
 from starlette.middleware.base import RequestResponseEndpoint
 
 from wsb_crawler.__version__ import __version__
 from wsb_crawler.api.auth import REALM, get_auth_token, request_is_authorized
-from wsb_crawler.api.routers import config, dashboard, status
+from wsb_crawler.api.response_cache import (
+    PASSTHROUGH_HEADERS,
+    CachedResponse,
+    cached_response,
+    is_cacheable,
+    make_etag,
+    response_cache,
+)
+from wsb_crawler.api.routers import config, dashboard, export, metrics, status
+from wsb_crawler.api.static_assets import StaticAsset, asset_response, load_asset
 from wsb_crawler.config import is_configured
-from wsb_crawler.storage.database import Database
+from wsb_crawler.storage.base import Storage
 
 STATIC_DIR = Path(__file__).parent / "static"
+# JSON-Antworten ab dieser Größe komprimiert die GZip-Middleware
+GZIP_MINIMUM_SIZE = 1024
 
 app = FastAPI(title="WSB-Crawler Dashboard", version=__version__, docs_url="/api/docs")
 
 
+# Zuerst registriert → innerste Schicht: sieht die Antworten der Router noch
+# als einen Body (Schwelle greift) und komprimiert vor dem Response-Cache,
+# der so fertig gezippte Bodies hält. Bereits vorkomprimierte Antworten
+# (mit Content-Encoding, z.B. index.html) bleiben unangetastet.
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+
+
+# Vor auth_middleware registriert → läuft innerhalb der Auth-Prüfung
+@app.middleware("http")
+async def response_cache_middleware(
+    request: Request, call_next: RequestResponseEndpoint
+) -> Response:
+    """Beantwortet gepollte Lese-Endpunkte aus dem Response-Cache (inkl. ETag/304)."""
+    if not is_cacheable(request):
+        return await call_next(request)
+
+    key = response_cache.key(request)
+    # Version VOR dem Berechnen festhalten: ändern sich die Daten währenddessen,
+    # passt der Eintrag beim nächsten Abruf schon nicht mehr
+    version = response_cache.current_version(request.url.path)
+    entry = response_cache.get(key, version)
+    if entry is not None:
+        response_cache.hits += 1
+        return cached_response(entry, request)
+
+    response_cache.misses += 1
+    response = await call_next(request)
+    if response.status_code != 200:
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])  # type: ignore[attr-defined]
+    entry = CachedResponse(
+        version=version,
+        created_at=time.monotonic(),
+        body=body,
+        etag=make_etag(body),
+        media_type=response.headers.get("content-type", "application/json"),
+        content_encoding=response.headers.get("content-encoding"),
+        extra_headers=tuple(
+            (name, response.headers[name])
+            for name in PASSTHROUGH_HEADERS
+            if name in response.headers
+        ),
+    )
+    response_cache.put(key, entry)
+    return cached_response(entry, request)
+
+
 @app.middleware("http")
 async def auth_middleware(request: Request, call_next: RequestResponseEndpoint) -> Response:
     """Erzwingt HTTP-Basic-Auth, sobald WSB_AUTH_TOKEN gesetzt ist (sonst No-Op)."""
@@ -58,35 +119,52 @@ app.add_middleware(
 
 app.include_router(config.router, prefix="/api")
 app.include_router(dashboard.router, prefix="/api")
+app.include_router(export.router, prefix="/api")
 app.include_router(status.router, prefix="/api")
+# Prometheus erwartet /metrics an der Wurzel
+app.include_router(metrics.router)
 
 
 # Statisches HTML-Dashboard servieren (Single-File, kein Assets-Ordner nötig)
+_index_asset: StaticAsset | None = None
+
+
+def index_asset() -> StaticAsset:
+    """index.html inkl. gzip/br-Varianten — einmal gebaut, danach aus dem Speicher."""
+    global _index_asset
+    if _index_asset is None:
+        _index_asset = load_asset(STATIC_DIR / "index.html")
+    return _index_asset
+
+
 if (STATIC_DIR / "index.html").exists():
 
     @app.get("/", include_in_schema=False, response_model=None)
-    async def serve_root() -> Response:
+    async def serve_root(request: Request) -> Response:
         """Startseite: beim Erststart direkt zum Setup weiterleiten."""
-        db = cast(Database | None, getattr(app.state, "db", None))
+        db = cast(Storage | None, getattr(app.state, "db", None))
         if db is not None and not await is_configured(db):
             return RedirectResponse(url="/setup", status_code=307)
-        return FileResponse(STATIC_DIR / "index.html")
+        return asset_response(index_asset(), request)
 
     @app.get("/{full_path:path}", include_in_schema=False, response_model=None)
-    async def serve_spa(full_path: str) -> Response:
+    async def serve_spa(full_path: str, request: Request) -> Response:
         """Alle sonstigen nicht-API-Routen → index.html (SPA-Routing via Hash)."""
-        return FileResponse(STATIC_DIR / "index.html")
+        return asset_response(index_asset(), request)
 
 
-def set_database(db: Database) -> None:
+def set_database(db: Storage) -> None:
     """Gibt die DB-Instanz an alle Router weiter (wird in main.py aufgerufen)."""
     config.db = db
     dashboard.db = db
+    export.db = db
     status.db = db
+    status.attach_status_hub(db)
+    db.add_change_listener(response_cache.bump)
     app.state.db = db
 
 
-async def run_server(db: Database, host: str = "127.0.0.1", port: int = 80) -> None:
+async def run_server(db: Storage, host: str = "127.0.0.1", port: int = 80) -> None:
     """Startet den uvicorn Server als asyncio-Task.
 
     Default-Bind ist localhost, weil das Dashboard ohne WSB_AUTH_TOKEN keine
@@ -94,6 +172,8 @@ async def run_server(db: Database, host: str = "127.0.0.1", port: int = 80) -> N
     und dringend WSB_AUTH_TOKEN vergeben.
     """
     set_database(db)
+    if (STATIC_DIR / "index.html").exists():
+        index_asset()  # Komprimierung beim Start statt beim ersten Seitenaufruf
     if host not in ("127.0.0.1", "::1", "localhost") and not get_auth_token():
         logger.warning(
             f"Dashboard lauscht auf {host} OHNE WSB_AUTH_TOKEN — die API "
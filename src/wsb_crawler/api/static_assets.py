@@ -0,0 +1,105 @@
+"""
+Vorkomprimierte Auslieferung des Single-File-Dashboards.
+
+``index.html`` wird einmal beim Start gelesen und als gzip- (und, falls das
+optionale Paket ``brotli`` installiert ist, als br-)Variante im Speicher
+gehalten. Jede SPA-Route bekommt dann die passende Variante laut
+``Accept-Encoding`` — ohne Dateizugriff und ohne Komprimieren pro Request.
+
+Caching: ``Cache-Control: no-cache`` + ETag. Der Browser fragt bei jedem
+Seitenaufruf kurz nach (Updates sind sofort sichtbar), bekommt bei
+unveränderter Datei aber nur ein leeres 304.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+from wsb_crawler.api.response_cache import etag_matches
+
+_brotli: ModuleType | None
+try:
+    _brotli = importlib.import_module("brotli")
+except ImportError:  # optional: pip install wsb-crawler[brotli]
+    _brotli = None
+
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+@dataclass(frozen=True, slots=True)
+class StaticAsset:
+    """Eine Datei in allen vorberechneten Content-Encodings."""
+
+    media_type: str
+    etag: str  # der unkomprimierten Variante, z.B. "\"abc123\""
+    variants: dict[str, bytes]  # Encoding → Body ("identity", "gzip", "br")
+
+    def etag_for(self, encoding: str) -> str:
+        """Starke ETags unterscheiden sich pro Encoding (RFC 9110 8.8.3)."""
+        if encoding == "identity":
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+
+def build_asset(data: bytes, media_type: str) -> StaticAsset:
+    variants = {
+        "identity": data,
+        # mtime=0 → identische Bytes bei jedem Start (stabile Länge/Hashes)
+        "gzip": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0),
+    }
+    if _brotli is not None:
+        variants["br"] = _brotli.compress(data, quality=BROTLI_QUALITY)
+    etag = '"' + hashlib.blake2b(data, digest_size=16).hexdigest() + '"'
+    return StaticAsset(media_type=media_type, etag=etag, variants=variants)
+
+
+def load_asset(path: Path, media_type: str = "text/html; charset=utf-8") -> StaticAsset:
+    return build_asset(path.read_bytes(), media_type)
+
+
+def _accepted_encodings(header: str | None) -> dict[str, float]:
+    """Accept-Encoding → {encoding: q}. Fehlender Header = nur identity."""
+    accepted: dict[str, float] = {}
+    for part in (header or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(asset: StaticAsset, accept_encoding: str | None) -> str:
+    """Kleinste Variante, die der Client akzeptiert (br vor gzip vor identity)."""
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    for encoding in ("br", "gzip"):
+        if encoding in asset.variants and accepted.get(encoding, wildcard) > 0:
+            return encoding
+    return "identity"
+
+
+def asset_response(asset: StaticAsset, request: Request) -> Response:
+    encoding = choose_encoding(asset, request.headers.get("Accept-Encoding"))
+    etag = asset.etag_for(encoding)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=asset.variants[encoding], media_type=asset.media_type, headers=headers)
@@ -18,7 +18,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from wsb_crawler.storage.database import Database
+    from wsb_crawler.storage.base import Storage
 
 
 # Datenbank-Pfad.
@@ -35,13 +35,16 @@ def _resolve_db_path() -> Path:
 
 
 DB_PATH = _resolve_db_path()
+# Optional: Postgres/TimescaleDB statt der SQLite-Datei (storage/postgres.py),
+# z.B. wenn mehrere Crawler-Knoten in dieselbe History schreiben.
+DATABASE_DSN = os.getenv("WSB_DATABASE_DSN", "").strip() or None
 
 # Mindest-Konfiguration, damit Scheduler und manuelle Crawls starten dürfen.
 # ENV-Variablen haben denselben Namen in uppercase, z.B. REDDIT_CLIENT_ID.
 REQUIRED_CONFIG_KEYS = ("reddit_client_id", "reddit_client_secret", "discord_webhook_url")
 
 
-async def is_configured(db: Database) -> bool:
+async def is_configured(db: Storage) -> bool:
     """True, wenn Pflichtwerte in DB oder ENV vorhanden sind.
 
     Wichtig für Docker/Unraid: get_settings() akzeptiert ENV-Overrides.
@@ -73,6 +76,20 @@ class NewsAPISettings:
     window_hours: int = 48
 
 
+@dataclass
+class FeedSettings:
+    """Lokale News-Quelle: RSS-/Atom-Feeds, per FTS5 durchsucht."""
+
+    urls: list[str] = field(default_factory=list)
+    refresh_minutes: int = 15
+    retention_days: int = 14
+
+    @property
+    def enabled(self) -> bool:
+        """True, sobald mindestens ein Feed konfiguriert ist."""
+        return bool(self.urls)
+
+
 @dataclass
 class DiscordSettings:
     webhook_url: str
@@ -100,16 +117,76 @@ class AlertSettings:
     min_price_move: float = 5.0
     max_per_run: int = 3
     cooldown_h: int = 4
+    # Digest: alle Alerts eines Laufs in möglichst wenigen Nachrichten pro Kanal
+    digest: bool = False
+
+
+# "local": Crawl im eigenen Prozess, "workers": Jobs für `wsb-crawler worker`
+CRAWL_BACKENDS = ("local", "workers")
+
+
+@dataclass(frozen=True)
+class SubredditOverride:
+    """Eigene Limits / eigener Takt für einen Subreddit (None = globaler Wert)."""
+
+    posts_limit: int | None = None
+    comments_limit: int | None = None
+    interval_minutes: int | None = None  # Mindestabstand zwischen zwei Crawls
+
+
+# Schlüssel im Override-Format → (Feld, Minimum, Maximum)
+_OVERRIDE_KEYS: dict[str, tuple[str, int, int]] = {
+    "posts": ("posts_limit", 1, 1000),
+    "comments": ("comments_limit", 0, 500),
+    "interval": ("interval_minutes", 1, 10080),
+}
+
+
+def parse_subreddit_overrides(raw: str) -> dict[str, SubredditOverride]:
+    """Parst ``subreddit_overrides``: eine Zeile (oder ``;``) pro Subreddit.
+
+    Beispiel: ``wallstreetbetsGER posts=200 comments=50 interval=60``.
+    ValueError bei unbekannten Schlüsseln oder ungültigen Zahlen.
+    """
+    overrides: dict[str, SubredditOverride] = {}
+    for line in raw.replace(";", "\n").splitlines():
+        tokens = line.split()
+        if not tokens:
+            continue
+        name = tokens[0].removeprefix("r/")
+        values: dict[str, int] = {}
+        for token in tokens[1:]:
+            key, _, value = token.partition("=")
+            if key not in _OVERRIDE_KEYS:
+                raise ValueError(f"r/{name}: unbekannter Schlüssel '{key}'")
+            attr, low, high = _OVERRIDE_KEYS[key]
+            try:
+                number = int(value)
+            except ValueError as exc:
+                raise ValueError(f"r/{name}: {key} muss eine Zahl sein") from exc
+            if not low <= number <= high:
+                raise ValueError(f"r/{name}: {key} muss zwischen {low} und {high} liegen")
+            values[attr] = number
+        overrides[name] = SubredditOverride(**values)
+    return overrides
 
 
 @dataclass
 class CrawlerSettings:
     subreddits: list[str] = field(default_factory=lambda: ["wallstreetbets", "wallstreetbetsGER"])
     crawl_interval_minutes: int = 30
-    schedule_mode: str = "interval"  # "interval" oder "cron"
+    schedule_mode: str = "interval"  # "interval", "cron", "market" oder "adaptive"
     cron_expression: str = ""  # 5-Feld-Cron, nur bei schedule_mode == "cron"
+    schedule_timezone: str = "UTC"  # IANA-Zone, in der der Cron-Ausdruck gilt
+    market_calendar: str = "NYSE"  # Börsenkalender für schedule_mode == "market"
+    market_dense_minutes: int = 15  # Pre-Market + Handelszeit
+    market_sparse_minutes: int = 120  # Nacht, Wochenende, Feiertag
+    adaptive_min_minutes: int = 5  # Grenzen für schedule_mode == "adaptive"
+    adaptive_max_minutes: int = 120
     posts_limit: int = 500
     comments_limit: int = 100
+    subreddit_overrides: dict[str, SubredditOverride] = field(default_factory=dict)
+    crawl_backend: str = "local"  # siehe CRAWL_BACKENDS
     alphavantage_api_key: str | None = None
     db_path: Path = field(default_factory=lambda: DB_PATH)
     log_level: str = "INFO"
@@ -123,9 +200,89 @@ class Settings:
     alerts: AlertSettings
     crawler: CrawlerSettings
     telegram: TelegramSettings = field(default_factory=TelegramSettings)
+    feeds: FeedSettings = field(default_factory=FeedSettings)
+
+
+# Bekannte Setting-Keys — für jeden gilt ein ENV-Override (KEY_NAME → key_name)
+_ENV_KEYS = (
+    "reddit_client_id",
+    "reddit_client_secret",
+    "reddit_user_agent",
+    "reddit_username",
+    "reddit_password",
+    "discord_webhook_url",
+    "discord_bot_token",
+    "discord_command_channel_id",
+    "discord_status_update",
+    "telegram_bot_token",
+    "telegram_chat_id",
+    "newsapi_key",
+    "newsapi_lang",
+    "newsapi_window_hours",
+    "news_feeds",
+    "news_feed_refresh_minutes",
+    "alert_min_abs",
+    "alert_min_delta",
+    "alert_ratio",
+    "alert_min_price_move",
+    "alert_max_per_run",
+    "alert_cooldown_h",
+    "alert_digest",
+    "subreddits",
+    "crawl_interval_minutes",
+    "schedule_mode",
+    "cron_expression",
+    "schedule_timezone",
+    "market_calendar",
+    "market_dense_minutes",
+    "market_sparse_minutes",
+    "adaptive_min_minutes",
+    "adaptive_max_minutes",
+    "posts_limit",
+    "comments_limit",
+    "subreddit_overrides",
+    "crawl_backend",
+    "alphavantage_api_key",
+    "log_level",
+)
+
+
+async def _merged_settings(db: Storage) -> dict[str, str]:
+    """DB-Settings mit ENV-Overrides."""
+    s = await db.get_all_settings()
+    for key in set(s.keys()) | set(_ENV_KEYS):
+        env_val = os.getenv(key.upper(), "").strip()
+        if env_val:
+            s[key] = env_val
+    return s
+
+
+def _required(s: dict[str, str], key: str) -> str:
+    val = s.get(key)
+    if not val:
+        raise RuntimeError(
+            f"Pflichtfeld '{key}' nicht konfiguriert. "
+            "Bitte Setup-Wizard unter http://localhost ausführen."
+        )
+    return val
+
+
+def _reddit_settings(s: dict[str, str]) -> RedditSettings:
+    return RedditSettings(
+        client_id=_required(s, "reddit_client_id"),
+        client_secret=_required(s, "reddit_client_secret"),
+        user_agent=s.get("reddit_user_agent") or "python:wsb-crawler:v2.0.0 (by /u/youruser)",
+        username=s.get("reddit_username") or None,
+        password=s.get("reddit_password") or None,
+    )
+
 
+async def get_reddit_settings(db: Storage) -> RedditSettings:
+    """Nur die Reddit-Zugangsdaten — für Crawl-Worker, die keinen Discord-Webhook brauchen."""
+    return _reddit_settings(await _merged_settings(db))
 
-async def get_settings(db: Database) -> Settings:
+
+async def get_settings(db: Storage) -> Settings:
     """
     Liest alle Settings aus der DB und gibt ein Settings-Objekt zurück.
     Wirft RuntimeError wenn Pflichtfelder fehlen (→ Setup-Wizard nötig).
@@ -134,66 +291,21 @@ async def get_settings(db: Database) -> Settings:
     Beispiel: REDDIT_CLIENT_SECRET=xxx überschreibt den DB-Eintrag.
     Nützlich für Docker-Deployments wo Secrets per Environment injiziert werden.
     """
-    s = await db.get_all_settings()
-
-    # ENV-Variablen auf DB-Dict mergen: REDDIT_CLIENT_ID → reddit_client_id
-    for key in set(s.keys()) | {
-        "reddit_client_id",
-        "reddit_client_secret",
-        "reddit_user_agent",
-        "reddit_username",
-        "reddit_password",
-        "discord_webhook_url",
-        "discord_bot_token",
-        "discord_command_channel_id",
-        "discord_status_update",
-        "telegram_bot_token",
-        "telegram_chat_id",
-        "newsapi_key",
-        "newsapi_lang",
-        "newsapi_window_hours",
-        "alert_min_abs",
-        "alert_min_delta",
-        "alert_ratio",
-        "alert_min_price_move",
-        "alert_max_per_run",
-        "alert_cooldown_h",
-        "subreddits",
-        "crawl_interval_minutes",
-        "schedule_mode",
-        "cron_expression",
-        "posts_limit",
-        "comments_limit",
-        "alphavantage_api_key",
-        "log_level",
-    }:
-        env_val = os.getenv(key.upper(), "").strip()
-        if env_val:
-            s[key] = env_val
+    s = await _merged_settings(db)
 
     def req(key: str) -> str:
-        val = s.get(key)
-        if not val:
-            raise RuntimeError(
-                f"Pflichtfeld '{key}' nicht konfiguriert. "
-                "Bitte Setup-Wizard unter http://localhost ausführen."
-            )
-        return val
+        return _required(s, key)
 
     def opt(key: str, default: str | None = None) -> str | None:
         return s.get(key) or default
 
     subreddits_raw = opt("subreddits", "wallstreetbets,wallstreetbetsGER") or ""
     subreddits = [r.strip() for r in subreddits_raw.split(",") if r.strip()]
+    # Feeds: komma- oder zeilenweise getrennt (URLs enthalten keine Kommas/Leerzeichen)
+    feed_urls = [u for u in (opt("news_feeds") or "").replace(",", " ").split() if u]
 
     return Settings(
-        reddit=RedditSettings(
-            client_id=req("reddit_client_id"),
-            client_secret=req("reddit_client_secret"),
-            user_agent=opt("reddit_user_agent") or "python:wsb-crawler:v2.0.0 (by /u/youruser)",
-            username=opt("reddit_username"),
-            password=opt("reddit_password"),
-        ),
+        reddit=_reddit_settings(s),
         newsapi=NewsAPISettings(
             key=opt("newsapi_key") or "",
             lang=opt("newsapi_lang") or "en",
@@ -211,6 +323,10 @@ async def get_settings(db: Database) -> Settings:
             bot_token=opt("telegram_bot_token"),
             chat_id=opt("telegram_chat_id"),
         ),
+        feeds=FeedSettings(
+            urls=feed_urls,
+            refresh_minutes=int(opt("news_feed_refresh_minutes") or "15"),
+        ),
         alerts=AlertSettings(
             min_abs=int(opt("alert_min_abs") or "20"),
             min_delta=int(opt("alert_min_delta") or "10"),
@@ -218,14 +334,23 @@ async def get_settings(db: Database) -> Settings:
             min_price_move=float(opt("alert_min_price_move") or "5.0"),
             max_per_run=int(opt("alert_max_per_run") or "3"),
             cooldown_h=int(opt("alert_cooldown_h") or "4"),
+            digest=s.get("alert_digest", "false").lower() == "true",
         ),
         crawler=CrawlerSettings(
             subreddits=subreddits,
             crawl_interval_minutes=int(opt("crawl_interval_minutes") or "30"),
             schedule_mode=(opt("schedule_mode") or "interval").lower(),
             cron_expression=opt("cron_expression") or "",
+            schedule_timezone=opt("schedule_timezone") or "UTC",
+            market_calendar=(opt("market_calendar") or "NYSE").upper(),
+            market_dense_minutes=int(opt("market_dense_minutes") or "15"),
+            market_sparse_minutes=int(opt("market_sparse_minutes") or "120"),
+            adaptive_min_minutes=int(opt("adaptive_min_minutes") or "5"),
+            adaptive_max_minutes=int(opt("adaptive_max_minutes") or "120"),
             posts_limit=int(opt("posts_limit") or "500"),
             comments_limit=int(opt("comments_limit") or "100"),
+            subreddit_overrides=parse_subreddit_overrides(opt("subreddit_overrides") or ""),
+            crawl_backend=(opt("crawl_backend") or "local").lower(),
             alphavantage_api_key=opt("alphavantage_api_key"),
             db_path=DB_PATH,
             log_level=opt("log_level") or "INFO",
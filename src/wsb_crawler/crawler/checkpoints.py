@@ -0,0 +1,250 @@
+"""
+Checkpoints für fortsetzbare Crawl-Läufe.
+
+Pro Lauf und Crawl-Einheit liegt in ``crawl_checkpoints`` der letzte
+Zwischenstand:
+
+- ``fetching``: Listing-Cursor (``after``), schon gelesene Post-IDs und die
+  bis dahin extrahierten Zähler und Signale — alle ``CHECKPOINT_EVERY_POSTS``
+  Posts aktualisiert
+- ``saved``: Einheit fertig, ihre Mentions stehen in ``ticker_mentions``
+
+Dazu ein Lauf-Checkpoint (Einheit ``""``) mit Modus, Zahl der Fortsetzungen,
+den schon eingestellten Alerts und der Enrichment noch nicht eingestellter
+Kandidaten (Kurse, Firmennamen, News). Er wird nach jeder neu geholten
+Enrichment gespeichert; ein fortgesetzter Lauf fragt Yahoo und die News-Quellen
+dafür nicht erneut an. Kurse behalten ihr ``fetched_at``.
+
+Wird ein Lauf gestoppt, scheitert er oder startet der Prozess neu, setzt der
+nächste Lauf ihn mit derselben run_id fort: fertige Einheiten werden nicht
+neu gecrawlt, angefangene lesen ab dem Cursor weiter (schon gelesene Posts
+werden übersprungen, falls sich das Hot-Listing verschoben hat), und die
+Analyse läuft über alles Gesammelte. Outbox-Keys (``run_id:ticker``) und
+Cooldowns verhindern doppelte Alerts. Fortgesetzt wird nur innerhalb von
+``RESUME_MAX_AGE_MINUTES`` und höchstens ``MAX_RESUMES``-mal — ältere
+Zwischenstände taugen nicht mehr für die Spike-Erkennung.
+
+Ein regulär abgeschlossener Lauf löscht seine Checkpoints; fehlgeschlagene
+Einheiten darin wiederholt wie bisher der nächste Lauf (``due_units``).
+"""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from loguru import logger
+
+from wsb_crawler.analysis.signals import compute_signals, merge_signals
+from wsb_crawler.crawler.jobs import result_from_payload, result_to_payload
+from wsb_crawler.crawler.ticker import aggregate_mentions
+from wsb_crawler.models import (
+    CrawlResult,
+    MarketStatus,
+    NewsArticle,
+    PendingEnrichment,
+    PriceData,
+    TickerMention,
+)
+from wsb_crawler.storage.base import Storage
+
+CHECKPOINT_EVERY_POSTS = 25
+RESUME_MAX_AGE_MINUTES = 60
+MAX_RESUMES = 3
+
+RUN_UNIT = ""  # Schlüssel des Lauf-Checkpoints
+PHASE_RUN = "run"
+PHASE_FETCHING = "fetching"
+PHASE_SAVED = "saved"
+
+
+@dataclass
+class UnitCheckpoint:
+    """Zwischenstand einer Crawl-Einheit."""
+
+    subreddit: str
+    result: CrawlResult  # Zähler und Signale aller bisher gelesenen Posts
+    phase: str = PHASE_FETCHING
+    after: str | None = None  # Fullname des letzten gelesenen Posts (t3_…)
+    seen_ids: set[str] = field(default_factory=set)
+
+    @classmethod
+    def start(cls, run_id: str, subreddit: str) -> UnitCheckpoint:
+        return cls(
+            subreddit,
+            CrawlResult(run_id=run_id, started_at=datetime.now(tz=UTC), subreddits=[subreddit]),
+        )
+
+    def advance(
+        self,
+        post_ids: list[str],
+        comments_scanned: int,
+        mentions: list[TickerMention],
+    ) -> None:
+        """Rechnet einen Batch gelesener Posts ein (Zähler und Signale sind additiv)."""
+        if not post_ids:
+            return
+        counts = Counter(self.result.mention_counts)
+        counts.update(aggregate_mentions(mentions))
+        self.result.mention_counts = dict(counts.most_common())
+        merge_signals(self.result.mention_signals, compute_signals(mentions))
+        self.result.mentions.extend(mentions)
+        self.result.posts_scanned += len(post_ids)
+        self.result.comments_scanned += comments_scanned
+        self.seen_ids.update(post_ids)
+        self.after = f"t3_{post_ids[-1]}"
+
+    def to_state(self) -> str:
+        return json.dumps(
+            {
+                **result_to_payload(self.result),
+                "after": self.after,
+                "seen_ids": sorted(self.seen_ids),
+            }
+        )
+
+    @classmethod
+    def from_row(cls, run_id: str, subreddit: str, row: dict[str, Any]) -> UnitCheckpoint:
+        state = json.loads(row["state"])
+        return cls(
+            subreddit,
+            result_from_payload(run_id, subreddit, state),
+            phase=row["phase"],
+            after=state.get("after"),
+            seen_ids=set(state.get("seen_ids", [])),
+        )
+
+
+def _enrichment_to_payload(enrichment: PendingEnrichment) -> dict[str, Any]:
+    return {
+        "names": enrichment.names,
+        "prices": {
+            t: {
+                **asdict(p),
+                "market_status": p.market_status.value,
+                "fetched_at": p.fetched_at.isoformat(),
+            }
+            for t, p in enrichment.prices.items()
+        },
+        "news": {
+            t: [{**asdict(a), "published_at": a.published_at.isoformat()} for a in articles]
+            for t, articles in enrichment.news.items()
+        },
+    }
+
+
+def _enrichment_from_payload(payload: dict[str, Any]) -> PendingEnrichment:
+    return PendingEnrichment(
+        names=dict(payload.get("names", {})),
+        prices={
+            t: PriceData(
+                **{
+                    **p,
+                    "market_status": MarketStatus(p["market_status"]),
+                    "fetched_at": datetime.fromisoformat(p["fetched_at"]),
+                }
+            )
+            for t, p in payload.get("prices", {}).items()
+        },
+        news={
+            t: [
+                NewsArticle(**{**a, "published_at": datetime.fromisoformat(a["published_at"])})
+                for a in articles
+            ]
+            for t, articles in payload.get("news", {}).items()
+        },
+    )
+
+
+@dataclass
+class RunCheckpoint:
+    """Lauf-weiter Zwischenstand: Modus, Fortsetzungen, eingestellte Alerts, Enrichment."""
+
+    dry_run: bool
+    resumes: int = 0
+    alerted: set[str] = field(default_factory=set)
+    enqueued_count: int = 0
+    enrichment: PendingEnrichment = field(default_factory=PendingEnrichment)
+
+    def to_state(self) -> str:
+        return json.dumps(
+            {
+                "dry_run": self.dry_run,
+                "resumes": self.resumes,
+                "alerted": sorted(self.alerted),
+                "enqueued_count": self.enqueued_count,
+                "enrichment": _enrichment_to_payload(self.enrichment),
+            }
+        )
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> RunCheckpoint:
+        state = json.loads(row["state"])
+        return cls(
+            dry_run=bool(state.get("dry_run")),
+            resumes=int(state.get("resumes", 0)),
+            alerted=set(state.get("alerted", [])),
+            enqueued_count=int(state.get("enqueued_count", 0)),
+            enrichment=_enrichment_from_payload(state.get("enrichment", {})),
+        )
+
+
+@dataclass
+class ResumePoint:
+    """Ein unterbrochener Lauf, den der nächste Lauf fortsetzt."""
+
+    run_id: str
+    subreddits: list[str]
+    run: RunCheckpoint
+    units: dict[str, UnitCheckpoint]
+
+    @property
+    def saved(self) -> dict[str, UnitCheckpoint]:
+        return {sub: cp for sub, cp in self.units.items() if cp.phase == PHASE_SAVED}
+
+
+async def save_unit(db: Storage, run_id: str, checkpoint: UnitCheckpoint) -> None:
+    await db.save_checkpoint(run_id, checkpoint.subreddit, checkpoint.phase, checkpoint.to_state())
+
+
+async def save_run(db: Storage, run_id: str, checkpoint: RunCheckpoint) -> None:
+    await db.save_checkpoint(run_id, RUN_UNIT, PHASE_RUN, checkpoint.to_state())
+
+
+def _unit_checkpoints(run_id: str, rows: dict[str, dict[str, Any]]) -> dict[str, UnitCheckpoint]:
+    return {
+        unit: UnitCheckpoint.from_row(run_id, unit, row)
+        for unit, row in rows.items()
+        if unit != RUN_UNIT
+    }
+
+
+async def load_units(db: Storage, run_id: str) -> dict[str, UnitCheckpoint]:
+    """Einheiten-Checkpoints eines Laufs (ohne Lauf-Checkpoint)."""
+    return _unit_checkpoints(run_id, await db.get_checkpoints(run_id))
+
+
+async def find_resume_point(db: Storage, *, dry_run: bool) -> ResumePoint | None:
+    """Der fortzusetzende Lauf — oder ``None``, dann startet ein neuer.
+
+    Zu alte, zu oft fortgesetzte oder in anderem Modus (Dry-Run/Live)
+    begonnene Läufe werden verworfen.
+    """
+    found = await db.get_resumable_run(RESUME_MAX_AGE_MINUTES)
+    if found is None:
+        return None
+    run_id = found["id"]
+    rows = await db.get_checkpoints(run_id)
+    run = RunCheckpoint.from_row(rows[RUN_UNIT]) if RUN_UNIT in rows else RunCheckpoint(dry_run)
+    if run.dry_run != dry_run:
+        logger.info(f"Unterbrochener Lauf [{run_id[:8]}] lief in anderem Modus — nicht fortgesetzt")
+        return None
+    if run.resumes >= MAX_RESUMES:
+        logger.warning(
+            f"Unterbrochener Lauf [{run_id[:8]}] schon {run.resumes}x fortgesetzt — starte neu"
+        )
+        return None
+    return ResumePoint(run_id, list(found["subreddits"]), run, _unit_checkpoints(run_id, rows))
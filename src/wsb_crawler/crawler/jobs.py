@@ -0,0 +1,450 @@
+"""
+Job-Tabelle für verteilte Crawls (``crawl_backend=workers``).
+
+Der Koordinator (Prozess mit API und Scheduler) legt pro fälliger
+Crawl-Einheit einen Job an. ``wsb-crawler worker``-Prozesse leasen Jobs,
+verlängern den Lease per Heartbeat und liefern das Ergebnis (Mention-Counts
+und Signale, keine Einzel-Nennungen) als JSON zurück. Speichern, Analyse
+und Alerts bleiben beim Koordinator — er ist der einzige Schreiber der
+History.
+
+Leasing ist prozessübergreifend atomar:
+
+- **SQLite** (Default, dieselbe DB-Datei): ``BEGIN IMMEDIATE`` holt die
+  Schreibsperre *vor* dem Lesen, zwei Worker sehen denselben freien Job
+  also nie gleichzeitig. Eigene Verbindung im Autocommit-Modus, damit die
+  Transaktion nicht mit anderen Zugriffen des Prozesses vermischt wird.
+- **Postgres** (``WSB_JOBS_DSN``, optional ``wsb-crawler[postgres]``):
+  ``FOR UPDATE SKIP LOCKED`` — Worker brauchen dann keinen Zugriff auf die
+  SQLite-Datei des Koordinators.
+
+Stirbt ein Worker, läuft sein Lease ab und der Job wird neu vergeben,
+höchstens ``MAX_JOB_ATTEMPTS``-mal.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Protocol
+
+import aiosqlite
+
+from wsb_crawler.crawler.units import CrawlUnit
+from wsb_crawler.models import CrawlResult, TickerSignal
+from wsb_crawler.storage.postgres import load_asyncpg, rowcount
+
+JOB_LEASE_SECONDS = 120
+JOB_HEARTBEAT_SECONDS = 30
+MAX_JOB_ATTEMPTS = 3
+JOB_RETENTION_DAYS = 7
+SQLITE_BUSY_TIMEOUT_MS = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class CrawlJob:
+    id: int
+    run_id: str
+    unit: CrawlUnit
+    attempts: int  # inklusive des aktuellen Leases
+
+
+@dataclass(frozen=True, slots=True)
+class FinishedJob:
+    id: int
+    subreddit: str
+    result: dict[str, Any] | None  # None bei Fehler
+    error: str | None
+
+
+class JobQueue(Protocol):
+    """Gemeinsame Schnittstelle der Job-Backends (SQLite, Postgres)."""
+
+    async def enqueue(self, run_id: str, units: list[CrawlUnit]) -> None: ...
+
+    async def lease(self, worker_id: str) -> CrawlJob | None: ...
+
+    async def heartbeat(self, job_id: int, worker_id: str) -> bool: ...
+
+    async def complete(self, job_id: int, worker_id: str, result: dict[str, Any]) -> bool: ...
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> bool: ...
+
+    async def collect(self, run_id: str) -> list[FinishedJob]: ...
+
+    async def cancel(self, run_id: str) -> int: ...
+
+    async def purge(self, days: int = JOB_RETENTION_DAYS) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+def result_to_payload(result: CrawlResult) -> dict[str, Any]:
+    """CrawlResult → JSON-taugliches Dict (ohne Einzel-Nennungen)."""
+    return {
+        "posts_scanned": result.posts_scanned,
+        "comments_scanned": result.comments_scanned,
+        "mention_counts": result.mention_counts,
+        "mention_signals": {t: asdict(s) for t, s in result.mention_signals.items()},
+        "started_at": result.started_at.isoformat(),
+        "finished_at": result.finished_at.isoformat() if result.finished_at else None,
+    }
+
+
+def result_from_payload(run_id: str, subreddit: str, payload: dict[str, Any]) -> CrawlResult:
+    finished_at = payload.get("finished_at")
+    return CrawlResult(
+        run_id=run_id,
+        started_at=datetime.fromisoformat(payload["started_at"]),
+        finished_at=datetime.fromisoformat(finished_at) if finished_at else None,
+        subreddits=[subreddit],
+        posts_scanned=int(payload["posts_scanned"]),
+        comments_scanned=int(payload["comments_scanned"]),
+        mention_counts={t: int(n) for t, n in payload["mention_counts"].items()},
+        mention_signals={
+            t: TickerSignal(**s) for t, s in payload.get("mention_signals", {}).items()
+        },
+    )
+
+
+def _now() -> datetime:
+    return datetime.now(tz=UTC)
+
+
+# Erneutes Einstellen derselben Einheit (fortgesetzter Lauf, gleiche run_id):
+# abgebrochene, fehlgeschlagene und schon abgeholte Jobs beginnen von vorn.
+# Laufende und fertige, noch nicht abgeholte Jobs bleiben unangetastet.
+_REQUEUE = """status = 'pending', posts_limit = excluded.posts_limit,
+       comments_limit = excluded.comments_limit, worker_id = NULL,
+       lease_expires_at = NULL, attempts = 0, result = NULL, error = NULL,
+       finished_at = NULL, collected_at = NULL
+   WHERE crawl_jobs.status IN ('cancelled', 'failed')
+      OR crawl_jobs.collected_at IS NOT NULL"""
+
+
+def _expired_error() -> str:
+    return f"Lease {MAX_JOB_ATTEMPTS}x abgelaufen — Worker nicht erreichbar?"
+
+
+class SQLiteJobQueue:
+    """Jobs in der ``crawl_jobs``-Tabelle der SQLite-DB (angelegt von ``Database.init``)."""
+
+    def __init__(self, path: Path, *, lease_seconds: float = JOB_LEASE_SECONDS) -> None:
+        self._path = path
+        self._lease = timedelta(seconds=lease_seconds)
+        self._conn: aiosqlite.Connection | None = None
+        # Eine Verbindung pro Prozess: Coroutinen dürfen sich nicht in eine
+        # offene Transaktion einer anderen mischen
+        self._lock = asyncio.Lock()
+
+    async def open(self) -> SQLiteJobQueue:
+        # isolation_level=None: Transaktionen nur explizit (BEGIN IMMEDIATE)
+        self._conn = await aiosqlite.connect(self._path, isolation_level=None)
+        self._conn.row_factory = aiosqlite.Row
+        await self._conn.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        return self
+
+    async def close(self) -> None:
+        if self._conn:
+            await self._conn.close()
+            self._conn = None
+
+    @property
+    def conn(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            raise RuntimeError("Job-Queue nicht geöffnet. Bitte zuerst open() aufrufen.")
+        return self._conn
+
+    @contextlib.asynccontextmanager
+    async def _immediate(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Schreibtransaktion, die die DB-Sperre schon beim Start hält."""
+        conn = self.conn
+        async with self._lock:
+            await conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                await conn.execute("ROLLBACK")
+                raise
+            await conn.execute("COMMIT")
+
+    async def _update(self, sql: str, params: tuple[Any, ...]) -> int:
+        async with self._lock, self.conn.execute(sql, params) as cur:
+            return cur.rowcount
+
+    async def enqueue(self, run_id: str, units: list[CrawlUnit]) -> None:
+        now = _now().isoformat()
+        async with self._immediate() as conn:
+            await conn.executemany(
+                f"""INSERT INTO crawl_jobs
+                       (run_id, subreddit, posts_limit, comments_limit, created_at)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (run_id, subreddit) DO UPDATE SET {_REQUEUE}""",
+                [(run_id, u.subreddit, u.posts_limit, u.comments_limit, now) for u in units],
+            )
+
+    async def lease(self, worker_id: str) -> CrawlJob | None:
+        now = _now()
+        async with self._immediate() as conn:
+            async with conn.execute(
+                """SELECT id, run_id, subreddit, posts_limit, comments_limit, attempts
+                   FROM crawl_jobs
+                   WHERE (status = 'pending' OR (status = 'leased' AND lease_expires_at < ?))
+                     AND attempts < ?
+                   ORDER BY id LIMIT 1""",
+                (now.isoformat(), MAX_JOB_ATTEMPTS),
+            ) as cur:
+                row = await cur.fetchone()
+            if row is None:
+                return None
+            await conn.execute(
+                """UPDATE crawl_jobs
+                   SET status = 'leased', worker_id = ?, lease_expires_at = ?,
+                       attempts = attempts + 1
+                   WHERE id = ?""",
+                (worker_id, (now + self._lease).isoformat(), row["id"]),
+            )
+        return CrawlJob(
+            id=row["id"],
+            run_id=row["run_id"],
+            unit=CrawlUnit(row["subreddit"], row["posts_limit"], row["comments_limit"]),
+            attempts=row["attempts"] + 1,
+        )
+
+    async def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        return (
+            await self._update(
+                """UPDATE crawl_jobs SET lease_expires_at = ?
+                   WHERE id = ? AND worker_id = ? AND status = 'leased'""",
+                ((_now() + self._lease).isoformat(), job_id, worker_id),
+            )
+            == 1
+        )
+
+    async def _finish(
+        self, job_id: int, worker_id: str, status: str, result: str | None, error: str | None
+    ) -> bool:
+        return (
+            await self._update(
+                """UPDATE crawl_jobs
+                   SET status = ?, result = ?, error = ?, finished_at = ?
+                   WHERE id = ? AND worker_id = ? AND status = 'leased'""",
+                (status, result, error, _now().isoformat(), job_id, worker_id),
+            )
+            == 1
+        )
+
+    async def complete(self, job_id: int, worker_id: str, result: dict[str, Any]) -> bool:
+        return await self._finish(job_id, worker_id, "done", json.dumps(result), None)
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        return await self._finish(job_id, worker_id, "failed", None, error)
+
+    async def collect(self, run_id: str) -> list[FinishedJob]:
+        """Fertige, noch nicht abgeholte Jobs eines Laufs (jeder genau einmal)."""
+        now = _now().isoformat()
+        async with self._immediate() as conn:
+            await conn.execute(
+                """UPDATE crawl_jobs SET status = 'failed', error = ?, finished_at = ?
+                   WHERE run_id = ? AND status = 'leased' AND lease_expires_at < ?
+                     AND attempts >= ?""",
+                (_expired_error(), now, run_id, now, MAX_JOB_ATTEMPTS),
+            )
+            async with conn.execute(
+                """SELECT id, subreddit, result, error FROM crawl_jobs
+                   WHERE run_id = ? AND status IN ('done', 'failed') AND collected_at IS NULL""",
+                (run_id,),
+            ) as cur:
+                rows = await cur.fetchall()
+            await conn.executemany(
+                "UPDATE crawl_jobs SET collected_at = ? WHERE id = ?",
+                [(now, row["id"]) for row in rows],
+            )
+        return [
+            FinishedJob(
+                id=row["id"],
+                subreddit=row["subreddit"],
+                result=json.loads(row["result"]) if row["result"] else None,
+                error=row["error"],
+            )
+            for row in rows
+        ]
+
+    async def cancel(self, run_id: str) -> int:
+        return await self._update(
+            """UPDATE crawl_jobs SET status = 'cancelled', finished_at = ?
+               WHERE run_id = ? AND status IN ('pending', 'leased')""",
+            (_now().isoformat(), run_id),
+        )
+
+    async def purge(self, days: int = JOB_RETENTION_DAYS) -> int:
+        cutoff = (_now() - timedelta(days=days)).isoformat()
+        return await self._update(
+            "DELETE FROM crawl_jobs WHERE created_at < ? AND status NOT IN ('pending', 'leased')",
+            (cutoff,),
+        )
+
+
+_POSTGRES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_jobs (
+    id                  BIGSERIAL PRIMARY KEY,
+    run_id              TEXT NOT NULL,
+    subreddit           TEXT NOT NULL,
+    posts_limit         INTEGER NOT NULL,
+    comments_limit      INTEGER NOT NULL,
+    status              TEXT NOT NULL DEFAULT 'pending',
+    worker_id           TEXT,
+    lease_expires_at    TIMESTAMPTZ,
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    result              TEXT,
+    error               TEXT,
+    created_at          TIMESTAMPTZ NOT NULL DEFAULT now(),
+    finished_at         TIMESTAMPTZ,
+    collected_at        TIMESTAMPTZ,
+    UNIQUE (run_id, subreddit)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON crawl_jobs(status, id);
+"""
+
+
+class PostgresJobQueue:
+    """Jobs in Postgres — für Worker ohne Zugriff auf die SQLite-Datei."""
+
+    def __init__(self, dsn: str, *, lease_seconds: float = JOB_LEASE_SECONDS) -> None:
+        self._dsn = dsn
+        self._lease_seconds = lease_seconds
+        self._pool: Any = None
+
+    async def open(self) -> PostgresJobQueue:
+        asyncpg = load_asyncpg()
+        if asyncpg is None:
+            raise RuntimeError("WSB_JOBS_DSN braucht asyncpg (pip install 'wsb-crawler[postgres]')")
+        self._pool = await asyncpg.create_pool(self._dsn, min_size=1, max_size=4)
+        async with self._pool.acquire() as conn:
+            await conn.execute(_POSTGRES_SCHEMA)
+        return self
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def enqueue(self, run_id: str, units: list[CrawlUnit]) -> None:
+        await self._pool.executemany(
+            f"""INSERT INTO crawl_jobs (run_id, subreddit, posts_limit, comments_limit)
+               VALUES ($1, $2, $3, $4)
+               ON CONFLICT (run_id, subreddit) DO UPDATE SET {_REQUEUE}""",
+            [(run_id, u.subreddit, u.posts_limit, u.comments_limit) for u in units],
+        )
+
+    async def lease(self, worker_id: str) -> CrawlJob | None:
+        row = await self._pool.fetchrow(
+            """UPDATE crawl_jobs
+               SET status = 'leased', worker_id = $1, attempts = attempts + 1,
+                   lease_expires_at = now() + make_interval(secs => $2)
+               WHERE id = (
+                   SELECT id FROM crawl_jobs
+                   WHERE (status = 'pending' OR (status = 'leased' AND lease_expires_at < now()))
+                     AND attempts < $3
+                   ORDER BY id
+                   FOR UPDATE SKIP LOCKED
+                   LIMIT 1
+               )
+               RETURNING id, run_id, subreddit, posts_limit, comments_limit, attempts""",
+            worker_id,
+            float(self._lease_seconds),
+            MAX_JOB_ATTEMPTS,
+        )
+        if row is None:
+            return None
+        return CrawlJob(
+            id=row["id"],
+            run_id=row["run_id"],
+            unit=CrawlUnit(row["subreddit"], row["posts_limit"], row["comments_limit"]),
+            attempts=row["attempts"],
+        )
+
+    async def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        status = await self._pool.execute(
+            """UPDATE crawl_jobs SET lease_expires_at = now() + make_interval(secs => $3)
+               WHERE id = $1 AND worker_id = $2 AND status = 'leased'""",
+            job_id,
+            worker_id,
+            float(self._lease_seconds),
+        )
+        return rowcount(status) == 1
+
+    async def _finish(
+        self, job_id: int, worker_id: str, status: str, result: str | None, error: str | None
+    ) -> bool:
+        tag = await self._pool.execute(
+            """UPDATE crawl_jobs SET status = $3, result = $4, error = $5, finished_at = now()
+               WHERE id = $1 AND worker_id = $2 AND status = 'leased'""",
+            job_id,
+            worker_id,
+            status,
+            result,
+            error,
+        )
+        return rowcount(tag) == 1
+
+    async def complete(self, job_id: int, worker_id: str, result: dict[str, Any]) -> bool:
+        return await self._finish(job_id, worker_id, "done", json.dumps(result), None)
+
+    async def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        return await self._finish(job_id, worker_id, "failed", None, error)
+
+    async def collect(self, run_id: str) -> list[FinishedJob]:
+        async with self._pool.acquire() as conn, conn.transaction():
+            await conn.execute(
+                """UPDATE crawl_jobs SET status = 'failed', error = $2, finished_at = now()
+                   WHERE run_id = $1 AND status = 'leased' AND lease_expires_at < now()
+                     AND attempts >= $3""",
+                run_id,
+                _expired_error(),
+                MAX_JOB_ATTEMPTS,
+            )
+            rows = await conn.fetch(
+                """UPDATE crawl_jobs SET collected_at = now()
+                   WHERE run_id = $1 AND status IN ('done', 'failed') AND collected_at IS NULL
+                   RETURNING id, subreddit, result, error""",
+                run_id,
+            )
+        return [
+            FinishedJob(
+                id=row["id"],
+                subreddit=row["subreddit"],
+                result=json.loads(row["result"]) if row["result"] else None,
+                error=row["error"],
+            )
+            for row in rows
+        ]
+
+    async def cancel(self, run_id: str) -> int:
+        tag = await self._pool.execute(
+            """UPDATE crawl_jobs SET status = 'cancelled', finished_at = now()
+               WHERE run_id = $1 AND status IN ('pending', 'leased')""",
+            run_id,
+        )
+        return rowcount(tag)
+
+    async def purge(self, days: int = JOB_RETENTION_DAYS) -> int:
+        tag = await self._pool.execute(
+            """DELETE FROM crawl_jobs
+               WHERE created_at < now() - make_interval(days => $1)
+                 AND status NOT IN ('pending', 'leased')""",
+            days,
+        )
+        return rowcount(tag)
+
+
+async def open_job_queue(db_path: Path, dsn: str | None = None) -> JobQueue:
+    """Postgres, wenn ein DSN gesetzt ist (``WSB_JOBS_DSN``), sonst die SQLite-Datei."""
+    if dsn:
+        return await PostgresJobQueue(dsn).open()
+    return await SQLiteJobQueue(db_path).open()
@@ -3,11 +3,15 @@ Async Reddit-Crawling via asyncpraw.
 
 asyncpraw ist der offizielle async-Port von praw. Alle Netzwerk-Calls
 sind awaitable, was paralleles Crawlen mehrerer Subreddits ermöglicht.
+Jeder Subreddit ist eine eigene Crawl-Einheit (siehe crawler/units.py),
+deren Ergebnis sofort weitergereicht wird.
 """
 
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 
@@ -15,29 +19,63 @@ import asyncpraw
 import asyncprawcore
 from loguru import logger
 
-from wsb_crawler.analysis.signals import compute_signals
 from wsb_crawler.config import RedditSettings, get_settings
-from wsb_crawler.crawler.ticker import aggregate_mentions, extract_tickers
-from wsb_crawler.models import CrawlResult, RedditPost, TickerMention
-from wsb_crawler.runtime.progress import update_run, update_subreddit
+from wsb_crawler.crawler.checkpoints import (
+    CHECKPOINT_EVERY_POSTS,
+    UnitCheckpoint,
+    load_units,
+    save_unit,
+)
+from wsb_crawler.crawler.ticker import extract_tickers
+from wsb_crawler.crawler.units import CrawlUnit
+from wsb_crawler.models import CrawlResult, RateLimitState, RedditPost, TickerMention
+from wsb_crawler.runtime.metrics import API_CALLS, PHASE_SECONDS, RATE_LIMITED
+from wsb_crawler.runtime.progress import update_subreddit
 
 if TYPE_CHECKING:
-    from wsb_crawler.storage.database import Database
+    from wsb_crawler.storage.base import Storage
 
-_db: Database | None = None
+# Wird pro Einheit aufgerufen, sobald sie fertig ist (Ergebnis oder Fehler)
+UnitCallback = Callable[[CrawlUnit, CrawlResult | BaseException], Awaitable[None]]
+# Bekommt den Zwischenstand einer Einheit nach jedem Batch
+CheckpointCallback = Callable[[UnitCheckpoint], Awaitable[None]]
 
+# Posts pro Listing-Request (asyncpraw lädt das Hot-Listing seitenweise)
+LISTING_PAGE_SIZE = 100
 
-def set_database(db: Database) -> None:
+_db: Storage | None = None
+# Rate-Limit-Stand nach dem letzten Crawl (für die adaptive Zeitplanung)
+_last_rate_limit: RateLimitState | None = None
+
+
+def set_database(db: Storage) -> None:
     global _db
     _db = db
 
 
-def _get_db() -> Database:
+def _get_db() -> Storage:
     if _db is None:
         raise RuntimeError("Datenbank nicht gesetzt — set_database() zuerst aufrufen")
     return _db
 
 
+def last_rate_limit() -> RateLimitState | None:
+    return _last_rate_limit
+
+
+def _capture_rate_limit(reddit: asyncpraw.Reddit) -> None:
+    """Merkt sich den Rate-Limit-Stand aus dem asyncprawcore-Limiter."""
+    global _last_rate_limit
+    limiter = getattr(getattr(reddit, "_core", None), "_rate_limiter", None)
+    if limiter is None or limiter.remaining is None or limiter.reset_timestamp is None:
+        return
+    _last_rate_limit = RateLimitState(
+        remaining=float(limiter.remaining),
+        used=int(limiter.used or 0),
+        reset_at=datetime.fromtimestamp(limiter.reset_timestamp, tz=UTC),
+    )
+
+
 def _sanitize_credential(value: str, name: str) -> str:
     """Bereinigt einen Credential-String.
 
@@ -79,27 +117,25 @@ def _make_reddit_client(cfg: RedditSettings) -> asyncpraw.Reddit:
     return asyncpraw.Reddit(**kwargs)
 
 
-async def _fetch_posts(
+async def _iter_submissions(
     reddit: asyncpraw.Reddit,
     subreddit_name: str,
     limit: int,
     comments_limit: int,
-) -> tuple[list[RedditPost], list[RedditPost]]:
+    after: str | None = None,
+) -> AsyncIterator[tuple[RedditPost, list[RedditPost]]]:
     """
-    Holt Posts + Kommentare eines Subreddits.
-    Gibt (posts, comments) zurück.
+    Holt Posts + Top-Kommentare eines Subreddits, Post für Post.
+    ``after`` setzt das Hot-Listing hinter einem Post fort (Fullname ``t3_…``).
     """
-    posts: list[RedditPost] = []
-    comments: list[RedditPost] = []
-
-    update_subreddit(subreddit_name, posts=0, comments=0)
-    logger.info(
-        f"r/{subreddit_name}: lade bis zu {limit} Posts mit je {comments_limit} Top-Kommentaren"
-    )
-
     subreddit = await reddit.subreddit(subreddit_name)
+    params = {"after": after} if after else None
 
-    async for submission in subreddit.hot(limit=limit):
+    index = 0
+    async for submission in subreddit.hot(limit=limit, params=params):
+        if index % LISTING_PAGE_SIZE == 0:
+            API_CALLS.inc(api="reddit")
+        index += 1
         post = RedditPost(
             id=submission.id,
             subreddit=subreddit_name,
@@ -112,11 +148,12 @@ async def _fetch_posts(
             url=f"https://reddit.com{submission.permalink}",
             is_comment=False,
         )
-        posts.append(post)
+        comments: list[RedditPost] = []
 
         # Top-Kommentare holen (nicht alle – zu viele API-Calls)
         if comments_limit > 0:
             submission.comment_sort = "top"
+            API_CALLS.inc(api="reddit")
             await submission.load()
             # replace_more ist in asyncpraw eine Coroutine — ohne await bleiben
             # MoreComments-Objekte im Baum und belegen Plätze im Limit-Slice
@@ -140,115 +177,170 @@ async def _fetch_posts(
                         parent_id=submission.id,
                     )
                 )
+        yield post, comments
 
-        if len(posts) % 25 == 0:
-            update_subreddit(subreddit_name, posts=len(posts), comments=len(comments))
-            logger.info(
-                f"r/{subreddit_name}: Zwischenstand {len(posts)} Posts, "
-                f"{len(comments)} Kommentare"
-            )
 
-    update_subreddit(subreddit_name, posts=len(posts), comments=len(comments), done=True)
-    logger.info(f"r/{subreddit_name}: fertig — {len(posts)} Posts, {len(comments)} Kommentare")
-    return posts, comments
+async def crawl_subreddit(
+    reddit: asyncpraw.Reddit,
+    unit: CrawlUnit,
+    run_id: str,
+    known_symbols: frozenset[str] | None = None,
+    *,
+    checkpoint: UnitCheckpoint | None = None,
+    on_checkpoint: CheckpointCallback | None = None,
+) -> CrawlResult:
+    """Eine Crawl-Einheit: Posts + Kommentare eines Subreddits laden und Ticker extrahieren.
+
+    Extrahiert wird batchweise alle ``CHECKPOINT_EVERY_POSTS`` Posts; danach
+    bekommt ``on_checkpoint`` den Zwischenstand. Mit ``checkpoint`` geht es
+    ab dessen Listing-Cursor weiter, schon gelesene Posts zählen mit.
+
+    Die Wartezeit auf Reddit und die Extraktion landen getrennt in
+    ``wsb_phase_duration_seconds`` (Phasen ``reddit_fetch``/``extract``).
+    """
+    cp = checkpoint or UnitCheckpoint.start(run_id, unit.subreddit)
+    sub = unit.subreddit
+    remaining = unit.posts_limit - cp.result.posts_scanned
+
+    update_subreddit(sub, posts=cp.result.posts_scanned, comments=cp.result.comments_scanned)
+    if cp.after:
+        logger.info(
+            f"r/{sub}: setze nach {cp.result.posts_scanned} Posts fort — "
+            f"noch bis zu {remaining} Posts mit je {unit.comments_limit} Top-Kommentaren"
+        )
+    else:
+        logger.info(
+            f"r/{sub}: lade bis zu {unit.posts_limit} Posts "
+            f"mit je {unit.comments_limit} Top-Kommentaren"
+        )
+
+    batch_ids: list[str] = []
+    batch_comments = 0
+    batch_mentions: list[TickerMention] = []
+
+    async def _flush() -> None:
+        nonlocal batch_ids, batch_comments, batch_mentions
+        cp.advance(batch_ids, batch_comments, batch_mentions)
+        batch_ids, batch_comments, batch_mentions = [], 0, []
+        update_subreddit(sub, posts=cp.result.posts_scanned, comments=cp.result.comments_scanned)
+        logger.info(
+            f"r/{sub}: Zwischenstand {cp.result.posts_scanned} Posts, "
+            f"{cp.result.comments_scanned} Kommentare"
+        )
+        if on_checkpoint is not None:
+            await on_checkpoint(cp)
+
+    fetch_seconds = extract_seconds = 0.0
+    try:
+        if remaining > 0:
+            waiting_since = time.perf_counter()
+            async for post, comments in _iter_submissions(
+                reddit, sub, remaining, unit.comments_limit, cp.after
+            ):
+                fetched_at = time.perf_counter()
+                fetch_seconds += fetched_at - waiting_since
+                if post.id not in cp.seen_ids:  # sonst: Listing seit Checkpoint verschoben
+                    batch_ids.append(post.id)
+                    batch_comments += len(comments)
+                    for item in (post, *comments):
+                        batch_mentions.extend(extract_tickers(item, known_symbols))
+                    extract_seconds += time.perf_counter() - fetched_at
+                    if len(batch_ids) >= CHECKPOINT_EVERY_POSTS:
+                        await _flush()
+                waiting_since = time.perf_counter()
+            if batch_ids:
+                await _flush()
+    except asyncprawcore.exceptions.TooManyRequests:
+        RATE_LIMITED.inc(api="reddit")
+        raise
+    finally:
+        PHASE_SECONDS.observe(fetch_seconds, phase="reddit_fetch", subreddit=sub)
+        PHASE_SECONDS.observe(extract_seconds, phase="extract", subreddit=sub)
+
+    result = cp.result
+    result.finished_at = datetime.now(tz=UTC)
+    update_subreddit(sub, posts=result.posts_scanned, comments=result.comments_scanned, done=True)
+    logger.info(
+        f"r/{sub}: fertig — {result.posts_scanned} Posts, {result.comments_scanned} Kommentare, "
+        f"{len(result.mention_counts)} einzigartige Ticker"
+    )
+    return result
+
+
+async def crawl_standalone_unit(
+    reddit_cfg: RedditSettings,
+    unit: CrawlUnit,
+    run_id: str,
+    known_symbols: frozenset[str] | None = None,
+) -> CrawlResult:
+    """Eine Einheit mit eigenem Reddit-Client — für ``wsb-crawler worker``."""
+    async with _make_reddit_client(reddit_cfg) as reddit:
+        try:
+            return await crawl_subreddit(reddit, unit, run_id, known_symbols)
+        finally:
+            _capture_rate_limit(reddit)
+
+
+def _log_unit_error(subreddit: str, exc: BaseException) -> None:
+    if isinstance(exc, asyncprawcore.exceptions.Forbidden):
+        logger.error(
+            "Reddit 403 bei r/{}: {}. Bitte Reddit-API-Config prüfen "
+            "(client_id, client_secret, user_agent) und sicherstellen, "
+            "dass die App als 'script' erstellt wurde.",
+            subreddit,
+            exc,
+        )
+    else:
+        logger.error(f"Fehler beim Crawlen von r/{subreddit}: {exc}")
 
 
-async def crawl_all_subreddits(run_id: str) -> CrawlResult:
+async def crawl_units(run_id: str, units: list[CrawlUnit], on_done: UnitCallback) -> None:
     """
-    Crawlt alle konfigurierten Subreddits parallel.
+    Crawlt alle Einheiten parallel über einen gemeinsamen Reddit-Client.
 
-    Gibt ein vollständiges CrawlResult zurück mit aggregierten
-    Mention-Counts und allen Einzel-Mentions.
+    ``on_done`` wird pro Einheit aufgerufen, sobald sie fertig ist — mit dem
+    CrawlResult oder der Exception. Eine fehlgeschlagene (oder langsame,
+    gedrosselte) Einheit hält die anderen nicht auf. Zwischenstände landen
+    als Checkpoint in der DB (crawler/checkpoints.py).
     """
-    cfg = await get_settings(_get_db())
-    crawler_cfg = cfg.crawler
-    started_at = datetime.now(tz=UTC)
+    db = _get_db()
+    cfg = await get_settings(db)
+    # Mit importierten Listing-Dateien nur echte Symbole als implizite Ticker
+    known_symbols = await db.get_known_symbols() or None
+    # Angefangene Einheiten eines fortgesetzten Laufs
+    checkpoints = await load_units(db, run_id)
 
-    all_posts: list[RedditPost] = []
-    all_comments: list[RedditPost] = []
+    async def _save_checkpoint(checkpoint: UnitCheckpoint) -> None:
+        await save_unit(db, run_id, checkpoint)
 
     async with _make_reddit_client(cfg.reddit) as reddit:
-        # Alle Subreddits gleichzeitig crawlen (asyncio.gather)
-        tasks = [
-            _fetch_posts(
-                reddit,
-                sub,
-                limit=crawler_cfg.posts_limit,
-                comments_limit=crawler_cfg.comments_limit,
-            )
-            for sub in crawler_cfg.subreddits
-        ]
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    for i, result in enumerate(results):
-        sub = crawler_cfg.subreddits[i]
-        if isinstance(result, BaseException):
-            update_subreddit(sub, posts=0, comments=0, done=True, error=str(result))
-            if isinstance(result, asyncprawcore.exceptions.Forbidden):
-                logger.error(
-                    "Reddit 403 bei r/{}: {}. Bitte Reddit-API-Config prüfen "
-                    "(client_id, client_secret, user_agent) und sicherstellen, "
-                    "dass die App als 'script' erstellt wurde.",
-                    sub,
-                    result,
-                )
-            else:
-                logger.error(f"Fehler beim Crawlen von r/{sub}: {result}")
-            continue
-        posts, comments = result
-        all_posts.extend(posts)
-        all_comments.extend(comments)
 
-    logger.info(
-        f"Crawl abgeschlossen: {len(all_posts)} Posts, "
-        f"{len(all_comments)} Kommentare aus {len(crawler_cfg.subreddits)} Subreddits"
-    )
-
-    # Ticker aus allen Posts + Kommentaren extrahieren
-    all_items = all_posts + all_comments
-    update_run(
-        phase="extract",
-        phase_label="Ticker erkennen",
-        message=f"Extrahiere Ticker aus {len(all_items)} Reddit-Beiträgen und Kommentaren…",
-        progress=42,
-        posts_scanned=len(all_posts),
-        comments_scanned=len(all_comments),
-    )
-    all_mentions: list[TickerMention] = []
-    for idx, item in enumerate(all_items, start=1):
-        all_mentions.extend(extract_tickers(item))
-        if idx % 2500 == 0:
-            update_run(
-                message=f"Ticker-Erkennung: {idx}/{len(all_items)} Texte verarbeitet…",
-                progress=42 + int((idx / max(1, len(all_items))) * 6),
+        async def _run_unit(unit: CrawlUnit) -> None:
+            try:
+                result = await crawl_subreddit(
+                    reddit,
+                    unit,
+                    run_id,
+                    known_symbols,
+                    checkpoint=checkpoints.get(unit.subreddit),
+                    on_checkpoint=_save_checkpoint,
+                )
+            except Exception as exc:
+                update_subreddit(unit.subreddit, posts=0, comments=0, done=True, error=str(exc))
+                _log_unit_error(unit.subreddit, exc)
+                await on_done(unit, exc)
+                return
+            await on_done(unit, result)
+
+        try:
+            outcomes = await asyncio.gather(
+                *(_run_unit(unit) for unit in units), return_exceptions=True
             )
-
-    mention_counts = aggregate_mentions(all_mentions)
-    mention_signals = compute_signals(all_mentions)
-    top_tickers = list(mention_counts.items())[:10]
-
-    update_run(
-        phase="extract",
-        phase_label="Ticker erkennen",
-        message=f"{len(mention_counts)} einzigartige Ticker erkannt.",
-        progress=49,
-        tickers_found=len(mention_counts),
-        top_tickers=top_tickers,
-    )
-
-    logger.info(f"Ticker erkannt: {len(mention_counts)} einzigartige Ticker")
-    if mention_counts:
-        logger.info(f"Top-Ticker: {top_tickers[:5]}")
-
-    return CrawlResult(
-        run_id=run_id,
-        started_at=started_at,
-        finished_at=datetime.now(tz=UTC),
-        subreddits=cfg.crawler.subreddits,
-        posts_scanned=len(all_posts),
-        comments_scanned=len(all_comments),
-        mention_counts=mention_counts,
-        mention_signals=mention_signals,
-        mentions=all_mentions,
-    )
+        finally:
+            _capture_rate_limit(reddit)
+
+    for unit, outcome in zip(units, outcomes, strict=True):
+        if isinstance(outcome, asyncio.CancelledError):
+            raise outcome
+        if isinstance(outcome, BaseException):
+            logger.error(f"r/{unit.subreddit}: Verarbeitung fehlgeschlagen: {outcome}")
@@ -2,32 +2,75 @@
 Einzelner Crawl-Lauf — kann sowohl vom Scheduler als auch von der API ausgelöst werden.
 
 Ausgelagert aus main.py damit api/routers/dashboard.py es ohne Zirkular-Import nutzen kann.
+
+Ablauf: jede fällige Crawl-Einheit (ein Subreddit) läuft für sich und
+speichert ihre Mentions sofort. Eine gemeinsame Analyse-Stufe bekommt die
+fertigen Einheiten über eine Queue, wertet die bis dahin gesammelten
+Nennungen aus und stellt Alerts ein — ein langsamer oder gedrosselter
+Subreddit hält die Alerts der anderen nicht mehr auf.
+
+Mit ``crawl_backend=workers`` crawlen ``wsb-crawler worker``-Prozesse die
+Einheiten (siehe crawler/worker.py); dieser Prozess bleibt Koordinator und
+einziger Schreiber von Mentions und Alerts.
+
+Unterbrochene Läufe (Stopp, Fehler, Neustart) setzt der nächste Lauf anhand
+der Checkpoints fort, statt von vorn zu beginnen (siehe crawler/checkpoints.py).
+
+Mit ``profile=True`` läuft der Crawl unter dem Sampling-Profiler aus
+runtime/profiler.py; das Profil liegt danach pro run_id unter ``PROFILES_DIR``.
 """
 
 from __future__ import annotations
 
 import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 
 from loguru import logger
 
-from wsb_crawler.alerts.dispatch import send_alerts
+from wsb_crawler.alerts.outbox import enqueue_alerts
 from wsb_crawler.analysis.detector import analyze_mentions
-from wsb_crawler.config import get_settings
-from wsb_crawler.crawler.reddit import crawl_all_subreddits
+from wsb_crawler.analysis.signals import merge_signals
+from wsb_crawler.config import Settings, get_settings
+from wsb_crawler.crawler.checkpoints import (
+    PHASE_SAVED,
+    ResumePoint,
+    RunCheckpoint,
+    UnitCheckpoint,
+    find_resume_point,
+    save_run,
+    save_unit,
+)
+from wsb_crawler.crawler.jobs import JobQueue
+from wsb_crawler.crawler.reddit import crawl_units
+from wsb_crawler.crawler.units import CrawlUnit, build_units, due_units
+from wsb_crawler.crawler.worker import dispatch_units
+from wsb_crawler.models import Alert, CrawlResult, PendingEnrichment, TickerSignal
+from wsb_crawler.runtime.metrics import PHASE_SECONDS, QUEUE_DEPTH
+from wsb_crawler.runtime.profiler import CrawlProfiler, save_profile
 from wsb_crawler.runtime.progress import (
     add_diagnostic,
     finish_run,
     start_run,
     update_run,
 )
-from wsb_crawler.storage.database import Database
+from wsb_crawler.storage.base import Storage
 
 # Verhindert dass Scheduler und manueller API-Trigger gleichzeitig crawlen
 _crawl_lock = asyncio.Lock()
 _current_crawl_task: asyncio.Task[None] | None = None
 _stop_requested = False
+# Job-Queue für crawl_backend=workers (gesetzt in main.py)
+_job_queue: JobQueue | None = None
 
 MENTION_RETENTION_DAYS = 90
+OUTBOX_RETENTION_DAYS = 30
+
+
+def set_job_queue(queue: JobQueue | None) -> None:
+    global _job_queue
+    _job_queue = queue
 
 
 def is_crawl_running() -> bool:
@@ -43,7 +86,31 @@ def stop_current_crawl() -> bool:
     return True
 
 
-async def run_single_crawl(db: Database, *, dry_run: bool = False) -> None:
+async def _save_profile(profiler: CrawlProfiler) -> None:
+    profile = await profiler.stop()
+    try:
+        path = await asyncio.to_thread(save_profile, profile)
+    except OSError as e:
+        logger.warning(f"Profil konnte nicht gespeichert werden: {e}")
+        return
+    if path is None:
+        logger.info("Profil verworfen — es wurde kein Lauf gestartet")
+        return
+    lag = profile.summary()["loop_lag"]
+    logger.info(
+        f"Profil gespeichert: {path} ({profile.duration:.1f}s, "
+        f"Loop-Lag max {lag['max_ms']:.0f} ms, p99 {lag['p99_ms']:.0f} ms)"
+    )
+
+
+async def run_single_crawl(
+    db: Storage, *, dry_run: bool = False, force: bool = False, profile: bool = False
+) -> None:
+    """Ein Crawl-Lauf; ``force`` crawlt auch Einheiten, deren eigener Takt noch nicht fällig ist.
+
+    ``profile`` sampelt den Lauf inkl. Loop-Lag und speichert das Profil —
+    auch bei Stopp oder Fehler.
+    """
     global _current_crawl_task, _stop_requested
     if _crawl_lock.locked():
         logger.warning("Crawl übersprungen — es läuft bereits ein anderer Crawl")
@@ -51,7 +118,13 @@ async def run_single_crawl(db: Database, *, dry_run: bool = False) -> None:
 
     async with _crawl_lock:
         _stop_requested = False
-        _current_crawl_task = asyncio.create_task(_run_crawl(db, dry_run=dry_run))
+        profiler = CrawlProfiler() if profile else None
+        if profiler is not None:
+            profiler.start()
+        _current_crawl_task = asyncio.create_task(
+            _run_crawl(db, dry_run=dry_run, force=force, profiler=profiler),
+            context=profiler.context() if profiler is not None else None,
+        )
         try:
             await _current_crawl_task
         except asyncio.CancelledError:
@@ -62,20 +135,218 @@ async def run_single_crawl(db: Database, *, dry_run: bool = False) -> None:
         finally:
             _current_crawl_task = None
             _stop_requested = False
+            if profiler is not None:
+                await _save_profile(profiler)
+
 
+@dataclass
+class _RunState:
+    """Zwischenstand eines Laufs über alle bisher fertigen Einheiten."""
+
+    mention_counts: Counter[str] = field(default_factory=Counter)
+    signals: dict[str, TickerSignal] = field(default_factory=dict)
+    posts_scanned: int = 0
+    comments_scanned: int = 0
+    succeeded: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+    alerted: set[str] = field(default_factory=set)  # schon eingestellt bzw. in der Vorschau
+    enqueued_count: int = 0  # in die Outbox gestellt, nicht zwingend zugestellt
+    # Kurse/Namen/News noch nicht eingestellter Kandidaten (Objekt des Lauf-Checkpoints)
+    enrichment: PendingEnrichment = field(default_factory=PendingEnrichment)
+
+    def add(self, result: CrawlResult) -> None:
+        self.mention_counts.update(result.mention_counts)
+        merge_signals(self.signals, result.mention_signals)
+        self.posts_scanned += result.posts_scanned
+        self.comments_scanned += result.comments_scanned
+
+
+async def _save_run_state(
+    db: Storage, run_id: str, state: _RunState, checkpoint: RunCheckpoint
+) -> None:
+    checkpoint.alerted = set(state.alerted)
+    checkpoint.enqueued_count = state.enqueued_count
+    await save_run(db, run_id, checkpoint)
+
+
+async def _analyze(
+    db: Storage,
+    cfg: Settings,
+    run_id: str,
+    state: _RunState,
+    checkpoint: RunCheckpoint,
+    *,
+    dry_run: bool,
+) -> None:
+    """Analysiert die bisher gesammelten Nennungen und stellt neue Alerts ein.
+
+    Läuft nach jeder fertigen Einheit erneut. Bereits ausgelöste Ticker
+    fallen heraus, und alle Durchgänge zusammen bleiben unter max_per_run.
+    Jede neu geholte Enrichment landet sofort im Lauf-Checkpoint.
+    """
+    mention_counts = dict(state.mention_counts.most_common())
+    update_run(
+        phase="analysis",
+        phase_label="Spikes analysieren",
+        message=(
+            f"Analysiere {len(mention_counts)} Ticker aus "
+            f"{len(state.succeeded)} fertigen Subreddit(s)…"
+        ),
+        progress=60,
+        tickers_found=len(mention_counts),
+        top_tickers=list(mention_counts.items())[:10],
+    )
+    remaining = cfg.alerts.max_per_run - len(state.alerted)
+    if remaining <= 0:
+        return
+
+    async def _dispatch(alert: Alert) -> None:
+        # Jeder Kandidat geht in die Outbox, sobald seine Kurse und News da
+        # sind — nicht erst, wenn alle anderen angereichert sind
+        state.alerted.add(alert.ticker)
+        state.enrichment.drop(alert.ticker)
+        if dry_run:
+            return
+        # Zustellung übernimmt der Outbox-Worker — der Crawl wartet nicht auf
+        # Webhooks. Cooldown schon vor dem Einstellen, damit der nächste Lauf
+        # denselben Ticker nicht erneut einstellt; landet der Alert im
+        # Dead-Letter, gibt die Outbox den Cooldown wieder frei.
+        await db.set_cooldown(alert.ticker, cfg.alerts.cooldown_h)
+        state.enqueued_count += await enqueue_alerts(db, run_id, [alert])
+        update_run(
+            phase="alerts",
+            phase_label="Alerts senden",
+            message=f"{state.enqueued_count} Alert(s) zur Zustellung eingestellt…",
+            progress=86,
+            alerts_enqueued=state.enqueued_count,
+        )
+
+    # run_id wird in analyze_mentions aus der History ausgeschlossen: die
+    # gerade gespeicherten Mentions dürfen die Basis nicht beeinflussen
+    # (sonst nie NEW_TICKER-Alerts)
+    alerts = await analyze_mentions(
+        {t: n for t, n in mention_counts.items() if t not in state.alerted},
+        db,
+        run_id=run_id,
+        signals=state.signals,
+        limit=remaining,
+        on_alert=_dispatch,
+        enrichment=state.enrichment,
+        on_enriched=lambda: _save_run_state(db, run_id, state, checkpoint),
+    )
+    if alerts and dry_run:
+        update_run(
+            phase="alerts",
+            phase_label="Alerts senden",
+            message=f"Dry-Run: {len(alerts)} Alert(s) würden gesendet.",
+            progress=86,
+        )
+        logger.info(f"Dry-Run: {len(alerts)} Alert(s) nicht an Discord gesendet")
 
-async def _run_crawl(db: Database, *, dry_run: bool = False) -> None:
+
+async def _analysis_stage(
+    db: Storage,
+    cfg: Settings,
+    run_id: str,
+    queue: asyncio.Queue[CrawlResult | None],
+    state: _RunState,
+    checkpoint: RunCheckpoint,
+    *,
+    dry_run: bool,
+) -> None:
+    """Gemeinsame Analyse-Stufe: läuft, sobald eine Einheit fertig ist, bis ``None`` kommt.
+
+    Was während einer Analyse fertig wird, wird im nächsten Durchgang
+    gemeinsam ausgewertet. Eingestellte Alerts und die Enrichment offener
+    Kandidaten landen im Lauf-Checkpoint.
+    """
+    finished = False
+    while not finished:
+        batch = [await queue.get()]
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        finished = None in batch
+        results = [r for r in batch if r is not None]
+        if not results:
+            continue
+        for result in results:
+            state.add(result)
+        with PHASE_SECONDS.time(phase="analysis", subreddit=""):
+            await _analyze(db, cfg, run_id, state, checkpoint, dry_run=dry_run)
+        if state.alerted != checkpoint.alerted:
+            await _save_run_state(db, run_id, state, checkpoint)
+
+
+async def _start_or_resume(
+    db: Storage, cfg: Settings, *, dry_run: bool, force: bool
+) -> tuple[str, list[CrawlUnit], ResumePoint | None] | None:
+    """Setzt einen unterbrochenen Lauf fort oder startet einen neuen.
+
+    ``None``, wenn kein Subreddit fällig ist.
+    """
+    resume = await find_resume_point(db, dry_run=dry_run)
+    if resume is not None:
+        # Nur was noch fehlt; Einheiten, die inzwischen aus der Config
+        # entfernt wurden, fallen weg
+        units = [
+            u
+            for u in build_units(cfg.crawler)
+            if u.subreddit in resume.subreddits and u.subreddit not in resume.saved
+        ]
+        await db.reopen_run(resume.run_id)
+        resume.run.resumes += 1
+        await save_run(db, resume.run_id, resume.run)
+        logger.info(
+            f"Setze unterbrochenen Lauf [{resume.run_id[:8]}] fort "
+            f"({resume.run.resumes}. Fortsetzung): "
+            f"{len(resume.saved)} Subreddit(s) fertig, {len(units)} offen"
+        )
+        return resume.run_id, units, resume
+
+    # Zwischenstände älterer Läufe sind wertlos geworden
+    await db.clear_checkpoints()
+    units = build_units(cfg.crawler)
+    if not force:
+        units, waiting = due_units(units, await db.get_subreddit_crawls(), datetime.now(tz=UTC))
+        if waiting:
+            logger.info(
+                "Noch nicht fällig (eigener Takt): {}",
+                ", ".join(f"r/{u.subreddit}" for u in waiting),
+            )
+        if not units:
+            logger.info("Crawl übersprungen — kein Subreddit fällig")
+            return None
+    run_id = await db.start_run([u.subreddit for u in units])
+    await save_run(db, run_id, RunCheckpoint(dry_run=dry_run))
+    return run_id, units, None
+
+
+async def _run_crawl(
+    db: Storage,
+    *,
+    dry_run: bool = False,
+    force: bool = False,
+    profiler: CrawlProfiler | None = None,
+) -> None:
     cfg = await get_settings(db)
-    run_id = await db.start_run(cfg.crawler.subreddits)
-    start_run(run_id, cfg.crawler.subreddits, dry_run=dry_run)
+    started_run = await _start_or_resume(db, cfg, dry_run=dry_run, force=force)
+    if started_run is None:
+        return
+    run_id, units, resume = started_run
+    if profiler is not None:
+        profiler.run_id = run_id
+    subreddits = resume.subreddits if resume else [u.subreddit for u in units]
+    start_run(run_id, subreddits, dry_run=dry_run)
 
     mode = "Dry-Run" if dry_run else "Live"
     logger.info(f"═══ Crawl gestartet [{run_id[:8]}] | {mode} ═══")
     logger.info(
-        "Crawl-Plan: {} Subreddits | {} Posts/Subreddit | {} Kommentare/Post",
-        len(cfg.crawler.subreddits),
-        cfg.crawler.posts_limit,
-        cfg.crawler.comments_limit,
+        "Crawl-Plan: {}",
+        ", ".join(
+            f"r/{u.subreddit} ({u.posts_limit} Posts, {u.comments_limit} Kommentare/Post)"
+            for u in units
+        )
+        or "nur Analyse",
     )
     if dry_run:
         add_diagnostic(
@@ -84,6 +355,50 @@ async def _run_crawl(db: Database, *, dry_run: bool = False) -> None:
             source="crawl",
         )
 
+    started = datetime.now(tz=UTC)
+    state = _RunState()
+    queue: asyncio.Queue[CrawlResult | None] = asyncio.Queue()
+    QUEUE_DEPTH.track(queue.qsize, queue="analysis")
+    run_checkpoint = resume.run if resume else RunCheckpoint(dry_run=dry_run)
+    state.enrichment = run_checkpoint.enrichment
+    if resume is not None:
+        # Fertige Einheiten des unterbrochenen Laufs gehen direkt in die Analyse
+        state.alerted = set(resume.run.alerted)
+        state.enqueued_count = resume.run.enqueued_count
+        for sub, checkpoint in resume.saved.items():
+            state.succeeded.append(sub)
+            queue.put_nowait(checkpoint.result)
+
+    async def _unit_done(unit: CrawlUnit, outcome: CrawlResult | BaseException) -> None:
+        # Fehler einer Einheit bleiben bei ihr — gespeicherte Daten der
+        # anderen Einheiten und der Lauf selbst bleiben gültig
+        sub = unit.subreddit
+        try:
+            if isinstance(outcome, BaseException):
+                state.failed[sub] = str(outcome) or type(outcome).__name__
+                await db.record_subreddit_crawl(sub, run_id, error=state.failed[sub])
+                return
+            with PHASE_SECONDS.time(phase="save", subreddit=sub):
+                await db.save_run_mentions(run_id, outcome.mention_counts, subreddit=sub)
+                await save_unit(db, run_id, UnitCheckpoint(sub, outcome, phase=PHASE_SAVED))
+                await db.record_subreddit_crawl(
+                    sub,
+                    run_id,
+                    posts_scanned=outcome.posts_scanned,
+                    comments_scanned=outcome.comments_scanned,
+                    tickers_found=len(outcome.mention_counts),
+                )
+        except Exception as e:
+            logger.exception(f"r/{sub}: Speichern fehlgeschlagen: {e}")
+            state.failed[sub] = str(e)
+            add_diagnostic("error", f"Speichern fehlgeschlagen: {e}", source=f"r/{sub}")
+            return
+        state.succeeded.append(sub)
+        queue.put_nowait(outcome)
+
+    analysis = asyncio.create_task(
+        _analysis_stage(db, cfg, run_id, queue, state, run_checkpoint, dry_run=dry_run)
+    )
     try:
         update_run(
             phase="reddit",
@@ -91,65 +406,25 @@ async def _run_crawl(db: Database, *, dry_run: bool = False) -> None:
             message="Posts und Top-Kommentare werden von Reddit geladen…",
             progress=8,
         )
-        result = await crawl_all_subreddits(run_id=run_id)
-
-        update_run(
-            phase="save",
-            phase_label="Daten speichern",
-            message=f"Speichere Mentions für {len(result.mention_counts)} erkannte Ticker…",
-            progress=50,
-            posts_scanned=result.posts_scanned,
-            comments_scanned=result.comments_scanned,
-            tickers_found=len(result.mention_counts),
-            top_tickers=result.top_tickers[:10],
-        )
-        await db.save_run_mentions(run_id, result.mention_counts)
-
-        # run_id ausschließen: die gerade gespeicherten Mentions dürfen die
-        # History-Queries nicht beeinflussen (sonst nie NEW_TICKER-Alerts)
-        update_run(
-            phase="analysis",
-            phase_label="Spikes analysieren",
-            message="Vergleiche aktuelle Nennungen mit der historischen 30-Tage-Basis…",
-            progress=60,
-        )
-        alerts = await analyze_mentions(
-            result.mention_counts, db, run_id=run_id, signals=result.mention_signals
-        )
+        try:
+            # Ohne offene Einheiten (Fortsetzung nach dem Crawlen) nur noch analysieren
+            if units and cfg.crawler.crawl_backend == "workers":
+                if _job_queue is None:
+                    raise RuntimeError("crawl_backend=workers, aber keine Job-Queue gesetzt")
+                await dispatch_units(_job_queue, run_id, units, _unit_done)
+            elif units:
+                await crawl_units(run_id, units, _unit_done)
+        finally:
+            queue.put_nowait(None)
+        await analysis
 
-        sent_count = 0
-        if alerts:
-            update_run(
-                phase="alerts",
-                phase_label="Alerts senden",
-                message=(
-                    f"Dry-Run: {len(alerts)} Alert(s) würden gesendet."
-                    if dry_run
-                    else f"Sende {len(alerts)} Alert(s) an Discord…"
-                ),
-                progress=86,
-            )
-            if dry_run:
-                logger.info(f"Dry-Run: {len(alerts)} Alert(s) nicht an Discord gesendet")
-                update_run(alerts_sent=0, progress=92)
-            else:
-                sent_count = await send_alerts(alerts, cfg)
-                update_run(
-                    alerts_sent=sent_count,
-                    message=f"{sent_count} Alert(s) gesendet…",
-                    progress=92,
-                )
-                for alert in alerts:
-                    if alert.sent:
-                        await db.set_cooldown(alert.ticker, cfg.alerts.cooldown_h)
-                        await db.save_alert(alert)
-        else:
+        if not state.alerted:
             update_run(
                 phase="alerts",
                 phase_label="Alerts senden",
                 message="Keine Alerts ausgelöst.",
                 progress=88,
-                alerts_sent=0,
+                alerts_enqueued=0,
             )
 
         update_run(
@@ -157,41 +432,57 @@ async def _run_crawl(db: Database, *, dry_run: bool = False) -> None:
             phase_label="Aufräumen",
             message="Lauf abschließen und alte Mentions bereinigen…",
             progress=95,
+            posts_scanned=state.posts_scanned,
+            comments_scanned=state.comments_scanned,
         )
+        # Gesund, solange mindestens eine Einheit durchgelaufen ist
+        healthy = bool(state.succeeded) or not state.failed
         await db.finish_run(
             run_id,
-            posts_scanned=result.posts_scanned,
-            comments_scanned=result.comments_scanned,
+            posts_scanned=state.posts_scanned,
+            comments_scanned=state.comments_scanned,
+            is_healthy=healthy,
         )
+        # Regulär abgeschlossen: nichts mehr fortzusetzen
+        await db.clear_checkpoints(run_id)
 
         purged = await db.purge_old_mentions(days=MENTION_RETENTION_DAYS)
         if purged:
             logger.debug(f"{purged} Mentions älter als {MENTION_RETENTION_DAYS} Tage gelöscht")
+        await db.purge_old_outbox(days=OUTBOX_RETENTION_DAYS)
+        if _job_queue is not None:
+            await _job_queue.purge()
 
-        duration = result.duration_seconds or 0
+        tickers_found = len(state.mention_counts)
+        duration = (datetime.now(tz=UTC) - started).total_seconds()
         message = (
-            f"Crawl abgeschlossen: {result.posts_scanned} Posts, "
-            f"{result.comments_scanned} Kommentare, {len(result.mention_counts)} Ticker, "
-            f"{sent_count} Alerts"
+            f"Crawl abgeschlossen: {state.posts_scanned} Posts, "
+            f"{state.comments_scanned} Kommentare, {tickers_found} Ticker, "
+            f"{state.enqueued_count} Alerts eingestellt"
         )
         if dry_run:
-            message += f" (Dry-Run, {len(alerts)} Alert-Vorschau)"
-        finish_run(success=True, message=message, alerts_sent=sent_count)
+            message += f" (Dry-Run, {len(state.alerted)} Alert-Vorschau)"
+        if state.failed:
+            message += f" — fehlgeschlagen: {', '.join(f'r/{s}' for s in state.failed)}"
+        finish_run(success=healthy, message=message, alerts_enqueued=state.enqueued_count)
         logger.info(
             f"═══ Crawl abgeschlossen [{run_id[:8]}] | "
-            f"{result.posts_scanned} Posts | "
-            f"{len(result.mention_counts)} Ticker | "
-            f"{sent_count} Alerts | "
+            f"{len(state.succeeded)}/{len(units)} Subreddits | "
+            f"{state.posts_scanned} Posts | "
+            f"{tickers_found} Ticker | "
+            f"{state.enqueued_count} Alerts eingestellt | "
             f"{duration:.1f}s ═══"
         )
 
     except asyncio.CancelledError:
+        analysis.cancel()
         logger.warning("Crawl-Lauf wurde gestoppt")
-        finish_run(success=False, message="Crawl gestoppt.", alerts_sent=0)
-        await db.finish_run(run_id, 0, 0, is_healthy=True)
+        finish_run(success=False, message="Crawl gestoppt.", alerts_enqueued=state.enqueued_count)
+        await db.finish_run(run_id, state.posts_scanned, state.comments_scanned, is_healthy=True)
         raise
     except Exception as e:
+        analysis.cancel()
         logger.exception(f"Fehler im Crawl-Lauf: {e}")
         finish_run(success=False, message=f"Crawl fehlgeschlagen: {e}")
-        await db.finish_run(run_id, 0, 0, is_healthy=False)
+        await db.finish_run(run_id, state.posts_scanned, state.comments_scanned, is_healthy=False)
         raise
@@ -295,13 +295,18 @@ BLACKLIST: frozenset[str] = frozenset(
 CONTEXT_WINDOW = 100
 
 
-def extract_tickers(post: RedditPost) -> list[TickerMention]:
+def extract_tickers(
+    post: RedditPost, known_symbols: frozenset[str] | None = None
+) -> list[TickerMention]:
     """
     Extrahiert alle Ticker-Erwähnungen aus einem Post/Kommentar.
 
     Priorisiert $TICKER-Format (explizit gemeint) gegenüber reinen
     Großbuchstaben-Sequenzen (könnten Abkürzungen sein).
 
+    known_symbols: Symbole aus der lokalen Stammdaten-Tabelle. Wenn gesetzt,
+    werden implizite Treffer (ohne $) verworfen, die dort nicht gelistet sind.
+
     Gibt pro Post jede Ticker+Post-ID-Kombination nur einmal zurück
     (Dedup innerhalb eines Posts), zählt aber mehrfache Nennungen
     über separate Posts hinweg.
@@ -335,6 +340,9 @@ def extract_tickers(post: RedditPost) -> list[TickerMention]:
         if not is_explicit and ticker.isdigit():
             continue
 
+        if known_symbols and not is_explicit and ticker not in known_symbols:
+            continue
+
         found.add(ticker)
 
         # Kontext extrahieren
@@ -0,0 +1,73 @@
+"""
+Crawl-Einheiten: ein Subreddit = eine unabhängige Einheit.
+
+Jede Einheit hat eigene Limits und optional einen eigenen Takt
+(``subreddit_overrides``). Der globale Scheduler löst weiterhin die Läufe
+aus; eine Einheit mit ``interval_minutes`` wird darin nur gecrawlt, wenn
+ihr letzter erfolgreicher Crawl lange genug zurückliegt — ein großer,
+langsamer Subreddit kann so z.B. stündlich laufen, während die kleinen
+bei jedem Lauf dran sind.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from wsb_crawler.config import CrawlerSettings
+
+
+@dataclass(frozen=True, slots=True)
+class CrawlUnit:
+    subreddit: str
+    posts_limit: int
+    comments_limit: int
+    interval_minutes: int | None = None  # None = bei jedem Lauf
+
+
+def build_units(cfg: CrawlerSettings) -> list[CrawlUnit]:
+    """Eine Einheit pro konfiguriertem Subreddit, Overrides schlagen globale Limits."""
+    units = []
+    for sub in cfg.subreddits:
+        override = cfg.subreddit_overrides.get(sub)
+        units.append(
+            CrawlUnit(
+                subreddit=sub,
+                posts_limit=(
+                    override.posts_limit
+                    if override and override.posts_limit is not None
+                    else cfg.posts_limit
+                ),
+                comments_limit=(
+                    override.comments_limit
+                    if override and override.comments_limit is not None
+                    else cfg.comments_limit
+                ),
+                interval_minutes=override.interval_minutes if override else None,
+            )
+        )
+    return units
+
+
+def due_units(
+    units: list[CrawlUnit], last_crawls: dict[str, dict[str, Any]], now: datetime
+) -> tuple[list[CrawlUnit], list[CrawlUnit]]:
+    """Teilt in (fällig, wartend) anhand des letzten erfolgreichen Crawls.
+
+    Fehlgeschlagene Einheiten bleiben fällig, bis ein Crawl gelingt.
+    """
+    due: list[CrawlUnit] = []
+    waiting: list[CrawlUnit] = []
+    for unit in units:
+        succeeded_at = (last_crawls.get(unit.subreddit) or {}).get("succeeded_at")
+        if (
+            unit.interval_minutes is None
+            or not succeeded_at
+            or now - datetime.fromisoformat(succeeded_at)
+            >= timedelta(minutes=unit.interval_minutes)
+        ):
+            due.append(unit)
+        else:
+            waiting.append(unit)
+    return due, waiting
@@ -0,0 +1,161 @@
+"""
+Verteilte Crawls: Worker-Schleife und Koordinator-Seite.
+
+``wsb-crawler worker`` startet ``run_worker``: Job leasen, Subreddit
+crawlen (eigener Reddit-Client), Ergebnis zurückmelden — Heartbeats halten
+den Lease, solange der Crawl läuft. Der Koordinator ruft bei
+``crawl_backend=workers`` statt ``crawl_units`` die Funktion
+``dispatch_units`` auf: Jobs anlegen und fertige Ergebnisse über denselben
+``on_done``-Callback an den Runner geben — Speichern und Analyse laufen
+also genau wie beim lokalen Crawl.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import socket
+
+from loguru import logger
+
+from wsb_crawler.config import get_reddit_settings
+from wsb_crawler.crawler.jobs import (
+    JOB_HEARTBEAT_SECONDS,
+    CrawlJob,
+    JobQueue,
+    result_from_payload,
+    result_to_payload,
+)
+from wsb_crawler.crawler.reddit import UnitCallback, crawl_standalone_unit
+from wsb_crawler.crawler.units import CrawlUnit
+from wsb_crawler.models import CrawlResult
+from wsb_crawler.runtime.progress import update_subreddit
+from wsb_crawler.storage.base import Storage
+
+WORKER_IDLE_SECONDS = 5.0
+DISPATCH_POLL_SECONDS = 2.0
+DISPATCH_TIMEOUT_SECONDS = 30 * 60
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def crawl_job(db: Storage, job: CrawlJob) -> CrawlResult:
+    """Crawlt die Einheit eines Jobs (Zugangsdaten aus DB bzw. ENV des Workers)."""
+    reddit_cfg = await get_reddit_settings(db)
+    known_symbols = await db.get_known_symbols() or None
+    return await crawl_standalone_unit(reddit_cfg, job.unit, job.run_id, known_symbols)
+
+
+async def _keep_lease(queue: JobQueue, job: CrawlJob, worker_id: str) -> None:
+    while True:
+        await asyncio.sleep(JOB_HEARTBEAT_SECONDS)
+        if not await queue.heartbeat(job.id, worker_id):
+            logger.warning(f"Job {job.id} (r/{job.unit.subreddit}): Lease verloren")
+            return
+
+
+async def process_job(db: Storage, queue: JobQueue, job: CrawlJob, worker_id: str) -> None:
+    logger.info(f"Job {job.id}: r/{job.unit.subreddit} (Versuch {job.attempts})")
+    heartbeat = asyncio.create_task(_keep_lease(queue, job, worker_id))
+    try:
+        result = await crawl_job(db, job)
+    except Exception as e:
+        logger.error(f"Job {job.id}: r/{job.unit.subreddit} fehlgeschlagen: {e}")
+        await queue.fail(job.id, worker_id, str(e) or type(e).__name__)
+        return
+    finally:
+        heartbeat.cancel()
+    if await queue.complete(job.id, worker_id, result_to_payload(result)):
+        logger.info(
+            f"Job {job.id}: r/{job.unit.subreddit} fertig — "
+            f"{result.posts_scanned} Posts, {len(result.mention_counts)} Ticker"
+        )
+    else:
+        # Lease abgelaufen und neu vergeben bzw. Lauf abgebrochen
+        logger.warning(f"Job {job.id}: Ergebnis verworfen, Lease nicht mehr gültig")
+
+
+async def run_worker(
+    db: Storage,
+    queue: JobQueue,
+    *,
+    worker_id: str | None = None,
+    once: bool = False,
+    idle_seconds: float = WORKER_IDLE_SECONDS,
+) -> int:
+    """Arbeitet Jobs ab, bis der Task abgebrochen wird.
+
+    ``once``: aufhören, sobald kein Job mehr frei ist. Gibt die Zahl der
+    bearbeiteten Jobs zurück.
+    """
+    worker_id = worker_id or default_worker_id()
+    logger.info(f"Worker {worker_id} gestartet")
+    processed = 0
+    while True:
+        job = await queue.lease(worker_id)
+        if job is None:
+            if once:
+                return processed
+            await asyncio.sleep(idle_seconds)
+            continue
+        await process_job(db, queue, job, worker_id)
+        processed += 1
+
+
+async def dispatch_units(
+    queue: JobQueue,
+    run_id: str,
+    units: list[CrawlUnit],
+    on_done: UnitCallback,
+    *,
+    timeout: float = DISPATCH_TIMEOUT_SECONDS,
+    poll_seconds: float = DISPATCH_POLL_SECONDS,
+) -> None:
+    """Koordinator: Jobs anlegen, Ergebnisse einsammeln, sobald Worker sie liefern.
+
+    Einheiten ohne Ergebnis nach ``timeout`` gelten als fehlgeschlagen.
+    """
+    by_name = {unit.subreddit: unit for unit in units}
+    waiting = set(by_name)
+    await queue.enqueue(run_id, units)
+    logger.info(f"{len(units)} Crawl-Job(s) für Worker eingestellt")
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    try:
+        while waiting:
+            for job in await queue.collect(run_id):
+                unit = by_name.get(job.subreddit)
+                if unit is None or job.subreddit not in waiting:
+                    continue
+                waiting.discard(job.subreddit)
+                if job.result is None:
+                    error = job.error or "unbekannter Fehler"
+                    update_subreddit(unit.subreddit, posts=0, comments=0, done=True, error=error)
+                    await on_done(unit, RuntimeError(error))
+                    continue
+                result = result_from_payload(run_id, unit.subreddit, job.result)
+                update_subreddit(
+                    unit.subreddit,
+                    posts=result.posts_scanned,
+                    comments=result.comments_scanned,
+                    done=True,
+                )
+                await on_done(unit, result)
+            if not waiting:
+                break
+            if loop.time() >= deadline:
+                await queue.cancel(run_id)
+                for sub in sorted(waiting):
+                    error = f"kein Worker-Ergebnis nach {timeout:.0f}s"
+                    update_subreddit(sub, posts=0, comments=0, done=True, error=error)
+                    await on_done(by_name[sub], TimeoutError(error))
+                break
+            await asyncio.sleep(poll_seconds)
+    except asyncio.CancelledError:
+        # Gestoppter Lauf: offene Jobs nicht mehr vergeben
+        with contextlib.suppress(Exception):
+            await queue.cancel(run_id)
+        raise
@@ -7,14 +7,19 @@ Wochentag: 0 = Sonntag … 6 = Samstag (7 wird ebenfalls als Sonntag akzeptiert)
 
 Bewusst simpel und ohne externe Library (z. B. croniter), um das Projekt schlank
 zu halten. Kein Sekunden-Feld — der Scheduler arbeitet minutengenau.
+Zeitzonen über ``zoneinfo`` (IANA, DST-bewusst), siehe `CronSchedule.next_after`.
 """
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from bisect import bisect_left
+from datetime import UTC, date, datetime, timedelta, tzinfo
 
 # (low, high) je Feld: Minute, Stunde, Tag, Monat, Wochentag
 _FIELD_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+# 29. Februar kann bis zu 8 Jahre entfernt sein (z.B. 2096 → 2104)
+_MAX_SEARCH_YEARS = 8
+_ONE_MINUTE = timedelta(minutes=1)
 
 
 def _parse_field(field: str, lo: int, hi: int) -> set[int]:
@@ -44,7 +49,12 @@ def _parse_field(field: str, lo: int, hi: int) -> set[int]:
 
 
 class CronSchedule:
-    """Vorgeparste Cron-Regel mit `next_after()`-Berechnung."""
+    """Vorgeparste Cron-Regel mit `next_after()`-Berechnung.
+
+    `next_after()` springt feldweise (Monat → Tag → Stunde → Minute) über
+    sortierte Wertelisten statt Minute für Minute zu prüfen — auch seltene
+    Regeln wie `0 9 29 2 *` kosten nur eine Handvoll Schritte.
+    """
 
     def __init__(self, expression: str) -> None:
         fields = expression.split()
@@ -63,18 +73,15 @@ class CronSchedule:
         # sind beide eingeschränkt, matcht ein Tag wenn EINES zutrifft.
         self._dom_restricted = fields[2] != "*"
         self._dow_restricted = fields[4] != "*"
+        # Sortierte Wertelisten für die Sprünge (bisect)
+        self._minutes = sorted(self.minute)
+        self._hours = sorted(self.hour)
+        self._months = sorted(self.month)
 
-    def _matches(self, moment: datetime) -> bool:
-        if moment.minute not in self.minute:
-            return False
-        if moment.hour not in self.hour:
-            return False
-        if moment.month not in self.month:
-            return False
+    def _day_matches(self, day: date) -> bool:
         # cron-Wochentag: So=0..Sa=6  (Python weekday(): Mo=0..So=6)
-        cron_dow = (moment.weekday() + 1) % 7
-        dom_ok = moment.day in self.dom
-        dow_ok = cron_dow in self.dow
+        dom_ok = day.day in self.dom
+        dow_ok = (day.weekday() + 1) % 7 in self.dow
         if self._dom_restricted and self._dow_restricted:
             return dom_ok or dow_ok
         if self._dom_restricted:
@@ -83,15 +90,94 @@ class CronSchedule:
             return dow_ok
         return True
 
-    def next_after(self, after: datetime) -> datetime:
-        """Nächster passender Zeitpunkt *strikt nach* `after` (minutengenau)."""
-        candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
-        # Ein Jahr an Minuten ist die Obergrenze — jede gültige Regel matcht früher.
-        for _ in range(366 * 24 * 60):
-            if self._matches(candidate):
-                return candidate
-            candidate += timedelta(minutes=1)
-        raise ValueError(f"Cron-Ausdruck '{self.expression}' matcht innerhalb eines Jahres nicht")
+    def next_wall_time(self, start: datetime) -> datetime:
+        """Erster passender Zeitpunkt *ab* `start` (inklusive), rein auf der Wanduhr.
+
+        Ignoriert `tzinfo` — DST-Übergänge behandelt `next_after()`.
+        """
+        t = start.replace(second=0, microsecond=0)
+        if t < start:
+            t += timedelta(minutes=1)
+        last_year = t.year + _MAX_SEARCH_YEARS
+        while t.year <= last_year:
+            if t.month not in self.month:
+                i = bisect_left(self._months, t.month)
+                if i == len(self._months):
+                    t = t.replace(year=t.year + 1, month=self._months[0], day=1, hour=0, minute=0)
+                else:
+                    t = t.replace(month=self._months[i], day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if t.hour not in self.hour:
+                i = bisect_left(self._hours, t.hour)
+                if i == len(self._hours):
+                    t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+                else:
+                    t = t.replace(hour=self._hours[i], minute=0)
+                continue
+            if t.minute not in self.minute:
+                i = bisect_left(self._minutes, t.minute)
+                if i == len(self._minutes):
+                    t = (t + timedelta(hours=1)).replace(minute=0)
+                else:
+                    t = t.replace(minute=self._minutes[i])
+                continue
+            return t
+        raise ValueError(
+            f"Cron-Ausdruck '{self.expression}' matcht innerhalb von "
+            f"{_MAX_SEARCH_YEARS} Jahren nicht"
+        )
+
+    def _instants(self, wall: datetime, zone: tzinfo) -> list[datetime]:
+        """Echte Zeitpunkte zu einer Wanduhrzeit in `zone` (DST-Regeln siehe next_after)."""
+        first = wall.replace(tzinfo=zone, fold=0)
+        second = wall.replace(tzinfo=zone, fold=1)
+        if first.utcoffset() == second.utcoffset():
+            return [first]
+        normalized = first.astimezone(UTC).astimezone(zone)
+        if normalized.replace(tzinfo=None) != wall:
+            # Lücke (Uhr springt vor): Lauf wird um die Lückenlänge nach hinten verschoben
+            return [normalized]
+        # Doppelte Stunde (Uhr springt zurück): feste Uhrzeiten laufen einmal,
+        # stündliche Regeln in beiden Durchgängen
+        return [first, second] if len(self.hour) == 24 else [first]
+
+    def next_after(self, after: datetime, tz: tzinfo | None = None) -> datetime:
+        """Nächster passender Zeitpunkt *strikt nach* `after` (minutengenau).
+
+        Die Regel wird auf der Wanduhr von `tz` ausgewertet (Default: die
+        Zeitzone von `after`); das Ergebnis liegt in dieser Zeitzone.
+        DST-Übergänge in IANA-Zonen (``zoneinfo``):
+
+        - Uhrzeit fällt in die Lücke beim Vorstellen (z.B. 02:30 in
+          Europe/Berlin Ende März) → Lauf zur entsprechenden Zeit danach (03:30).
+        - Uhrzeit existiert beim Zurückstellen doppelt → feste Uhrzeiten laufen
+          einmal (erster Durchgang), Regeln mit Stunde ``*`` in beiden.
+        """
+        zone = tz or after.tzinfo
+        if zone is None or after.tzinfo is None:
+            return self.next_wall_time(after.replace(second=0, microsecond=0) + _ONE_MINUTE)
+        reference = after.astimezone(UTC)
+        local = after.astimezone(zone)
+        wall = local.replace(tzinfo=None, second=0, microsecond=0)
+        found = self._first_instant(wall + _ONE_MINUTE, zone, reference)
+        repeat = local.utcoffset() - local.replace(fold=1).utcoffset()  # type: ignore[operator]
+        if local.fold == 0 and repeat > timedelta(0) and len(self.hour) == 24:
+            # Erster Durchgang einer doppelten Stunde: der zweite Durchgang
+            # beginnt wieder bei früheren Wanduhrzeiten
+            second = self._first_instant(wall - repeat + _ONE_MINUTE, zone, reference)
+            found = min(found, second, key=lambda instant: instant.astimezone(UTC))
+        return found
+
+    def _first_instant(self, wall: datetime, zone: tzinfo, reference: datetime) -> datetime:
+        while True:
+            wall = self.next_wall_time(wall)
+            for instant in self._instants(wall, zone):
+                if instant.astimezone(UTC) > reference:
+                    return instant
+            wall += _ONE_MINUTE
 
 
 def validate_cron(expression: str) -> None:
@@ -99,6 +185,6 @@ def validate_cron(expression: str) -> None:
     CronSchedule(expression)
 
 
-def next_run(expression: str, after: datetime) -> datetime:
-    """Bequemer Einzelaufruf: nächster Lauf nach `after`."""
-    return CronSchedule(expression).next_after(after)
+def next_run(expression: str, after: datetime, tz: tzinfo | None = None) -> datetime:
+    """Bequemer Einzelaufruf: nächster Lauf nach `after` (Wanduhr von `tz`)."""
+    return CronSchedule(expression).next_after(after, tz)
@@ -0,0 +1,201 @@
+"""
+Lokale News-Quelle: RSS-/Atom-Feeds → SQLite-FTS5-Index.
+
+Alternative zu NewsAPI ohne Quota, Latenz und Rate-Limits: ein Hintergrund-Task
+zieht periodisch die konfigurierten Feeds (``news_feeds``) und schreibt die
+Einträge in ``news_articles``/``news_fts``. ``news.get_news()`` beantwortet
+Anfragen dann per lokaler Volltextsuche in Millisekunden; NewsAPI bleibt
+optionaler Fallback für Ticker ohne lokalen Treffer.
+
+Parsing bewusst mit der Standardbibliothek (xml.etree) — RSS 2.0 und Atom 1.0
+decken praktisch alle Finanz-Feeds ab (Yahoo, Nasdaq, Reuters-Mirror, …).
+Da die Feed-URLs frei konfigurierbar sind, wird die Antwort auf
+``FEED_MAX_BYTES`` begrenzt und jedes Dokument mit DOCTYPE abgelehnt, bevor
+xml.etree es sieht — ohne DTD keine Entity-Deklarationen, also keine
+Entity-Expansion („Billion Laughs“) und keine externen Entities.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import html
+import re
+import xml.etree.ElementTree as ET
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+from wsb_crawler.config import get_settings
+from wsb_crawler.models import FeedEntry
+from wsb_crawler.storage.base import Storage
+
+_ATOM_NS = "{http://www.w3.org/2005/Atom}"
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+_DOCTYPE_RE = re.compile(r"<!DOCTYPE", re.IGNORECASE)
+# Zusammenfassungen kürzen — für die Suche reichen die ersten Sätze
+SUMMARY_MAX_CHARS = 1000
+FEED_TIMEOUT_SECONDS = 15.0
+# Obergrenze für eine Feed-Antwort — echte Feeds liegen bei wenigen hundert KB
+FEED_MAX_BYTES = 5 * 1024 * 1024
+
+
+def _clean_text(value: str | None) -> str:
+    """HTML-Tags und Entities entfernen, Whitespace normalisieren."""
+    if not value:
+        return ""
+    text = html.unescape(_TAG_RE.sub(" ", value))
+    return _WS_RE.sub(" ", text).strip()
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    """RFC-822 (RSS) oder ISO-8601 (Atom) → aware UTC-datetime."""
+    if not value:
+        return None
+    value = value.strip()
+    dt: datetime | None
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(UTC)
+
+
+def _child_text(node: ET.Element, *tags: str) -> str | None:
+    for tag in tags:
+        child = node.find(tag)
+        if child is not None and (child.text or "").strip():
+            return child.text
+    return None
+
+
+def _atom_link(entry: ET.Element) -> str | None:
+    """Atom-Link: bevorzugt rel="alternate" (bzw. ohne rel)."""
+    fallback = None
+    for link in entry.findall(f"{_ATOM_NS}link"):
+        href = link.get("href")
+        if not href:
+            continue
+        if link.get("rel", "alternate") == "alternate":
+            return href
+        fallback = fallback or href
+    return fallback
+
+
+def parse_feed(xml_text: str, feed_url: str) -> list[FeedEntry]:
+    """Parst einen RSS-2.0- oder Atom-Feed. Einträge ohne Titel/Link werden verworfen.
+
+    Dokumente mit DOCTYPE werden mit ValueError abgelehnt (siehe Modul-Docstring).
+    """
+    if _DOCTYPE_RE.search(xml_text):
+        raise ValueError("Feed mit DOCTYPE abgelehnt (Entity-Deklarationen nicht erlaubt)")
+    root = ET.fromstring(xml_text)
+    now = datetime.now(tz=UTC)
+    fallback_source = urlparse(feed_url).hostname or feed_url
+    entries: list[FeedEntry] = []
+
+    if root.tag == f"{_ATOM_NS}feed":
+        source = _clean_text(_child_text(root, f"{_ATOM_NS}title")) or fallback_source
+        for node in root.findall(f"{_ATOM_NS}entry"):
+            title = _clean_text(_child_text(node, f"{_ATOM_NS}title"))
+            url = _atom_link(node)
+            if not title or not url:
+                continue
+            summary = _child_text(node, f"{_ATOM_NS}summary", f"{_ATOM_NS}content")
+            published = _child_text(node, f"{_ATOM_NS}published", f"{_ATOM_NS}updated")
+            entries.append(
+                FeedEntry(
+                    url=url.strip(),
+                    title=title,
+                    summary=_clean_text(summary)[:SUMMARY_MAX_CHARS],
+                    source=source,
+                    published_at=_parse_date(published) or now,
+                )
+            )
+        return entries
+
+    channel = root.find("channel")
+    if channel is None:
+        raise ValueError(f"Weder RSS noch Atom: <{root.tag}>")
+    source = _clean_text(_child_text(channel, "title")) or fallback_source
+    for node in channel.findall("item"):
+        title = _clean_text(_child_text(node, "title"))
+        url = _child_text(node, "link") or _child_text(node, "guid")
+        if not title or not url:
+            continue
+        entries.append(
+            FeedEntry(
+                url=url.strip(),
+                title=title,
+                summary=_clean_text(_child_text(node, "description"))[:SUMMARY_MAX_CHARS],
+                source=source,
+                published_at=_parse_date(_child_text(node, "pubDate")) or now,
+            )
+        )
+    return entries
+
+
+async def _fetch_feed(client: httpx.AsyncClient, url: str) -> list[FeedEntry]:
+    """Lädt einen Feed gestreamt und bricht ab, sobald er ``FEED_MAX_BYTES`` überschreitet."""
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > FEED_MAX_BYTES:
+                raise ValueError(f"Feed größer als {FEED_MAX_BYTES} Bytes")
+        text = bytes(body).decode(response.encoding or "utf-8", errors="replace")
+    return parse_feed(text, url)
+
+
+async def ingest_feeds(db: Storage, urls: list[str]) -> int:
+    """Holt alle Feeds parallel und speichert neue Einträge. Gibt deren Anzahl zurück.
+
+    Ein kaputter Feed bricht die anderen nicht ab — er wird nur geloggt.
+    """
+    if not urls:
+        return 0
+    async with httpx.AsyncClient(timeout=FEED_TIMEOUT_SECONDS, follow_redirects=True) as client:
+        results = await asyncio.gather(
+            *[_fetch_feed(client, url) for url in urls], return_exceptions=True
+        )
+
+    entries: list[FeedEntry] = []
+    for url, result in zip(urls, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.warning(f"News-Feed konnte nicht gelesen werden: {url} ({result})")
+            continue
+        entries.extend(result)
+
+    added = await db.save_news_articles(entries)
+    logger.debug(f"News-Feeds: {len(entries)} Einträge gelesen, {added} neu")
+    return added
+
+
+async def feed_ingest_loop(db: Storage) -> None:
+    """Dauerläufer (asyncio-Task aus main.py): Feeds periodisch einlesen + aufräumen.
+
+    Ohne konfigurierte Feeds schläft der Task nur und prüft die Config erneut —
+    Feeds können jederzeit über das Dashboard ergänzt werden.
+    """
+    while True:
+        refresh_minutes = 15
+        try:
+            cfg = await get_settings(db)
+            refresh_minutes = cfg.feeds.refresh_minutes
+            if cfg.feeds.enabled:
+                await ingest_feeds(db, cfg.feeds.urls)
+                await db.purge_old_news(days=cfg.feeds.retention_days)
+        except RuntimeError:
+            pass  # noch nicht konfiguriert (Setup-Wizard)
+        except Exception as e:
+            logger.warning(f"News-Feed-Import fehlgeschlagen: {e}")
+        await asyncio.sleep(refresh_minutes * 60)
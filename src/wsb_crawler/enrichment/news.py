@@ -1,13 +1,21 @@
 """
-News-Enrichment via NewsAPI.
+News-Enrichment via lokalem Feed-Index und NewsAPI.
+
+Sind RSS-/Atom-Feeds konfiguriert (siehe feeds.py), wird zuerst der lokale
+FTS5-Index durchsucht; NewsAPI nur noch für Ticker ohne lokalen Treffer.
 
 httpx für async HTTP, tenacity für Retry-Logik,
 TTL-Cache damit derselbe Ticker in einem Run nicht doppelt angefragt wird.
+Mehrere Ticker werden per OR in eine Query gepackt (Free-Tier-Quota).
+``NewsBatcher`` bündelt dafür Einzelanfragen, die kurz nacheinander kommen.
 """
 
 from __future__ import annotations
 
 import asyncio
+import re
+from collections.abc import Awaitable, Callable
+from dataclasses import replace
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
@@ -17,20 +25,21 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 
 from wsb_crawler.config import get_settings
 from wsb_crawler.models import NewsArticle
+from wsb_crawler.runtime.metrics import API_CALLS, ENRICHMENT_SECONDS, RATE_LIMITED
 from wsb_crawler.storage.cache import news_cache
 
 if TYPE_CHECKING:
-    from wsb_crawler.storage.database import Database
+    from wsb_crawler.storage.base import Storage
 
-_db: Database | None = None
+_db: Storage | None = None
 
 
-def set_database(db: Database) -> None:
+def set_database(db: Storage) -> None:
     global _db
     _db = db
 
 
-def _get_db() -> Database:
+def _get_db() -> Storage:
     if _db is None:
         raise RuntimeError("Datenbank nicht gesetzt — set_database() zuerst aufrufen")
     return _db
@@ -38,6 +47,19 @@ def _get_db() -> Database:
 
 NEWSAPI_BASE = "https://newsapi.org/v2/everything"
 
+# NewsAPI akzeptiert für `q` maximal 500 Zeichen — mehr passt nicht in eine
+# Batch-Query. pageSize ist im Free-Tier auf 100 begrenzt.
+NEWSAPI_MAX_QUERY_CHARS = 500
+NEWSAPI_MAX_PAGE_SIZE = 100
+ARTICLES_PER_TICKER = 5  # genug für Discord-Embed
+# Pro Ticker im Batch so viele Artikel anfordern — die Treffer verteilen sich
+# ungleich (ein Hype-Ticker verdrängt sonst die anderen).
+_PAGE_SIZE_PER_TICKER = 20
+# So lange sammelt NewsBatcher Anfragen, bevor er sie gemeinsam abschickt
+NEWS_COALESCE_SECONDS = 0.05
+
+NewsFetcher = Callable[[list[str], dict[str, str | None]], Awaitable[dict[str, list[NewsArticle]]]]
+
 
 @retry(
     stop=stop_after_attempt(3),
@@ -50,12 +72,152 @@ async def _fetch_articles(params: dict[str, Any], api_key: str) -> list[dict[str
     async with httpx.AsyncClient(timeout=10.0) as client:
         # Key als Header statt Query-Parameter — landet so nicht in
         # Proxy-/Server-Logs und URL-Historien
-        response = await client.get(NEWSAPI_BASE, params=params, headers={"X-Api-Key": api_key})
+        API_CALLS.inc(api="newsapi")
+        with ENRICHMENT_SECONDS.time(source="news"):
+            response = await client.get(NEWSAPI_BASE, params=params, headers={"X-Api-Key": api_key})
+        if response.status_code == 429:
+            RATE_LIMITED.inc(api="newsapi")
         response.raise_for_status()
         data = response.json()
     return list(data.get("articles", []))
 
 
+def _short_name(company_name: str | None) -> str | None:
+    """Erster Teil des Firmennamens (ohne "Inc.", "Corp." etc.) als Suchterm."""
+    if not company_name:
+        return None
+    short_name = company_name.split()[0].strip(",.")
+    # "A" oder "AI" als Suchterm wäre zu breit
+    return short_name if len(short_name) > 3 else None
+
+
+def _ticker_clause(ticker: str, company_name: str | None) -> str:
+    """Suchquery-Teil für einen Ticker: "$GME OR GameStop" für bessere Trefferquote."""
+    parts = [f"${ticker}"]
+    short_name = _short_name(company_name)
+    if short_name:
+        parts.append(short_name)
+    return f"({' OR '.join(parts)})" if len(parts) > 1 else parts[0]
+
+
+def _pack_batches(
+    tickers: list[str], names: dict[str, str | None], max_chars: int = NEWSAPI_MAX_QUERY_CHARS
+) -> list[list[str]]:
+    """Packt Ticker greedy in möglichst wenige OR-Queries unterhalb von max_chars."""
+    batches: list[list[str]] = []
+    current: list[str] = []
+    length = 0
+    for ticker in tickers:
+        clause_len = len(_ticker_clause(ticker, names.get(ticker)))
+        added = clause_len if not current else clause_len + len(" OR ")
+        if current and length + added > max_chars:
+            batches.append(current)
+            current, length = [], 0
+            added = clause_len
+        current.append(ticker)
+        length += added
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _matcher(ticker: str, company_name: str | None) -> re.Pattern[str]:
+    """Regex, die einen Artikel einem Ticker zuordnet (Symbol case-sensitiv, Name nicht)."""
+    patterns = [rf"(?<![A-Za-z0-9])\$?{re.escape(ticker)}\b"]
+    short_name = _short_name(company_name)
+    if short_name:
+        patterns.append(rf"(?i:\b{re.escape(short_name)}\b)")
+    return re.compile("|".join(patterns))
+
+
+def _to_article(raw: dict[str, Any]) -> NewsArticle | None:
+    """Rohartikel → NewsArticle (noch ohne Ticker); ``None`` bei kaputten Feldern."""
+    try:
+        return NewsArticle(
+            ticker="",
+            title=raw["title"],
+            source=raw["source"]["name"],
+            url=raw["url"],
+            published_at=datetime.fromisoformat(raw["publishedAt"].replace("Z", "+00:00")),
+        )
+    except (KeyError, TypeError, AttributeError, ValueError) as e:
+        logger.warning(f"NewsAPI-Artikel übersprungen ({raw.get('url')}): {e!r}")
+        return None
+
+
+def _assign_articles(
+    batch: list[str], names: dict[str, str | None], raw_articles: list[dict[str, Any]]
+) -> dict[str, list[NewsArticle]]:
+    """Verteilt die Artikel einer Batch-Query per Titel/Beschreibung auf die Ticker.
+
+    Ein Artikel kann mehreren Tickern zugeordnet werden. Bei nur einem Ticker
+    im Batch gehört alles ihm (NewsAPI matcht auch im Volltext, den wir nicht sehen).
+    Artikel mit fehlerhaften Feldern werden einzeln übersprungen.
+    """
+    usable = [
+        (raw, article)
+        for raw in raw_articles
+        if raw.get("title") and raw.get("url") and (article := _to_article(raw)) is not None
+    ]
+    result: dict[str, list[NewsArticle]] = {t: [] for t in batch}
+    if len(batch) == 1:
+        ticker = batch[0]
+        result[ticker] = [
+            replace(article, ticker=ticker) for _, article in usable[:ARTICLES_PER_TICKER]
+        ]
+        return result
+
+    matchers = {t: _matcher(t, names.get(t)) for t in batch}
+    for raw, article in usable:
+        text = f"{raw.get('title') or ''} {raw.get('description') or ''}"
+        for ticker, pattern in matchers.items():
+            if len(result[ticker]) < ARTICLES_PER_TICKER and pattern.search(text):
+                result[ticker].append(replace(article, ticker=ticker))
+    return result
+
+
+def _fts_query(ticker: str, company_name: str | None) -> str:
+    """FTS5-Query für einen Ticker: '"GME" OR "GameStop"' (Terme als Phrase quotiert)."""
+    terms = [ticker]
+    short_name = _short_name(company_name)
+    if short_name:
+        terms.append(short_name)
+    return " OR ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+async def _search_local(
+    db: Storage, tickers: list[str], names: dict[str, str | None], since: datetime
+) -> dict[str, list[NewsArticle]]:
+    """Lokaler Feed-Index: FTS5-Vorauswahl, danach dieselbe Zuordnung wie bei NewsAPI.
+
+    FTS5 ignoriert Groß-/Kleinschreibung — "AMC" fände sonst jedes "amc"-Wort.
+    Der Nachfilter per _matcher hält das Symbol case-sensitiv.
+    """
+    results: dict[str, list[NewsArticle]] = {}
+    for ticker in tickers:
+        pattern = _matcher(ticker, names.get(ticker))
+        rows = await db.search_news(
+            _fts_query(ticker, names.get(ticker)), since, limit=_PAGE_SIZE_PER_TICKER
+        )
+        articles: list[NewsArticle] = []
+        for row in rows:
+            if not pattern.search(f"{row['title']} {row['summary'] or ''}"):
+                continue
+            articles.append(
+                NewsArticle(
+                    ticker=ticker,
+                    title=row["title"],
+                    source=row["source"],
+                    url=row["url"],
+                    published_at=datetime.fromisoformat(row["published_at"]),
+                )
+            )
+            if len(articles) >= ARTICLES_PER_TICKER:
+                break
+        results[ticker] = articles
+    return results
+
+
 async def get_news(ticker: str, company_name: str | None = None) -> list[NewsArticle]:
     """
     Holt aktuelle News für einen Ticker.
@@ -65,71 +227,155 @@ async def get_news(ticker: str, company_name: str | None = None) -> list[NewsArt
 
     Gibt max. 5 Artikel zurück (genug für Discord-Embed).
     """
-    cache_key = ticker
-    cached = news_cache.get(cache_key)
-    if cached is not None:
-        logger.debug(f"Cache-Hit für News: {ticker}")
-        return cached
-
-    cfg = (await get_settings(_get_db())).newsapi
-    if not cfg.key:
-        # Ohne Key wäre jeder Request ein garantierter 401
-        return []
-
-    since = (datetime.now(tz=UTC) - timedelta(hours=cfg.window_hours)).strftime(
-        "%Y-%m-%dT%H:%M:%SZ"
-    )
-
-    # Suchquery: "$GME OR GameStop" für bessere Trefferquote
-    query_parts = [f"${ticker}"]
-    if company_name:
-        # Nur der erste Teil des Firmennamens (ohne "Inc.", "Corp." etc.)
-        short_name = company_name.split()[0]
-        if len(short_name) > 3:  # "A" oder "AI" als Suchterm wäre zu breit
-            query_parts.append(short_name)
-    query = " OR ".join(query_parts)
+    result = await get_news_bulk([ticker], company_names={ticker: company_name})
+    return result[ticker]
+
+
+async def get_news_bulk(
+    tickers: list[str],
+    company_names: dict[str, str | None] | None = None,
+) -> dict[str, list[NewsArticle]]:
+    """
+    Holt News für mehrere Ticker mit möglichst wenigen NewsAPI-Requests.
+    Gibt {ticker: [NewsArticle, ...]} zurück.
+
+    Nicht gecachte Ticker werden per OR zu Batch-Queries (max. 500 Zeichen)
+    zusammengefasst; die Artikel werden danach über Titel/Beschreibung den
+    Tickern zugeordnet und pro Ticker gecacht. Spart im Free-Tier ein
+    Vielfaches an Tages-Quota gegenüber einem Request pro Ticker.
+
+    Mit konfigurierten News-Feeds wird vorher der lokale Index gefragt —
+    nur Ticker ohne lokalen Treffer gehen noch an NewsAPI.
+    """
+    names = company_names or {}
+    unique = list(dict.fromkeys(tickers))
+    results: dict[str, list[NewsArticle]] = {}
+    missing: list[str] = []
+    for ticker in unique:
+        cached = news_cache.get(ticker)
+        if cached is not None:
+            logger.debug(f"Cache-Hit für News: {ticker}")
+            results[ticker] = cached
+        else:
+            missing.append(ticker)
+
+    if not missing:
+        return {t: results.get(t, []) for t in tickers}
 
+    db = _get_db()
+    settings = await get_settings(db)
+    cfg = settings.newsapi
+    since_dt = datetime.now(tz=UTC) - timedelta(hours=cfg.window_hours)
+
+    if settings.feeds.enabled:
+        # Lokale Suche kostet keine Quota → nicht cachen, neue Feed-Einträge
+        # sollen beim nächsten Aufruf sofort sichtbar sein
+        local = await _search_local(db, missing, names, since_dt)
+        results.update({t: a for t, a in local.items() if a})
+        missing = [t for t in missing if not local[t]]
+        logger.debug(f"News: {len(local) - len(missing)} Ticker aus lokalem Feed-Index")
+
+    if missing:
+        if not cfg.key:
+            # Ohne Key wäre jeder Request ein garantierter 401
+            return {t: results.get(t, []) for t in tickers}
+
+        since = since_dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+        batches = _pack_batches(missing, names)
+        batch_results = await asyncio.gather(
+            *[_fetch_batch(batch, names, since, cfg.lang, cfg.key) for batch in batches]
+        )
+        for batch_result in batch_results:
+            results.update(batch_result)
+        logger.debug(f"News: {len(missing)} Ticker in {len(batches)} NewsAPI-Request(s) geholt")
+
+    return {t: results.get(t, []) for t in tickers}
+
+
+async def _fetch_batch(
+    batch: list[str], names: dict[str, str | None], since: str, lang: str, api_key: str
+) -> dict[str, list[NewsArticle]]:
+    """Eine Batch-Query ausführen, Artikel zuordnen und pro Ticker cachen."""
     params = {
-        "q": query,
-        "language": cfg.lang,
+        "q": " OR ".join(_ticker_clause(t, names.get(t)) for t in batch),
+        "language": lang,
         "sortBy": "publishedAt",
-        "pageSize": 5,
+        "pageSize": ARTICLES_PER_TICKER
+        if len(batch) == 1
+        else min(NEWSAPI_MAX_PAGE_SIZE, _PAGE_SIZE_PER_TICKER * len(batch)),
         "from": since,
     }
-
+    label = ", ".join(batch)
     try:
-        raw_articles = await _fetch_articles(params, cfg.key)
-
-        articles = [
-            NewsArticle(
-                ticker=ticker,
-                title=a["title"],
-                source=a["source"]["name"],
-                url=a["url"],
-                published_at=datetime.fromisoformat(a["publishedAt"].replace("Z", "+00:00")),
-            )
-            for a in raw_articles
-            if a.get("title") and a.get("url")
-        ]
+        raw_articles = await _fetch_articles(params, api_key)
+    except Exception as e:
+        logger.warning(f"Konnte News für {label} nicht holen: {e}")
+        # Leere Listen cachen um erneute Fehler zu vermeiden
+        for ticker in batch:
+            news_cache.set(ticker, [])
+        return {t: [] for t in batch}
 
-        news_cache.set(cache_key, articles)
+    assigned = _assign_articles(batch, names, raw_articles)
+    for ticker, articles in assigned.items():
+        news_cache.set(ticker, articles)
         logger.debug(f"News geholt: {ticker} → {len(articles)} Artikel")
-        return articles
-
-    except Exception as e:
-        logger.warning(f"Konnte News für {ticker} nicht holen: {e}")
-        news_cache.set(cache_key, [])  # Leere Liste cachen um erneute Fehler zu vermeiden
-        return []
+    return assigned
 
 
-async def get_news_bulk(
-    tickers: list[str],
-    company_names: dict[str, str | None] | None = None,
-) -> dict[str, list[NewsArticle]]:
+class NewsBatcher:
     """
-    Holt News für mehrere Ticker parallel.
-    Gibt {ticker: [NewsArticle, ...]} zurück.
+    Bündelt News-Anfragen einzelner Ticker zu einem ``get_news_bulk``-Aufruf.
+
+    Jeder Alert-Kandidat fragt seine News selbst an, sobald sein Firmenname
+    feststeht. Anfragen innerhalb von ``NEWS_COALESCE_SECONDS`` gehen
+    gemeinsam raus — so bleibt es bei einer NewsAPI-Batch-Query, obwohl die
+    Kandidaten unabhängig voneinander weiterlaufen. Ein abgebrochener
+    Aufrufer wird beim Verteilen übersprungen.
     """
-    names = company_names or {}
-    results = await asyncio.gather(*[get_news(t, names.get(t)) for t in tickers])
-    return dict(zip(tickers, results, strict=False))
+
+    def __init__(
+        self, fetch: NewsFetcher | None = None, *, window: float = NEWS_COALESCE_SECONDS
+    ) -> None:
+        self._fetch = fetch or get_news_bulk
+        self._window = window
+        self._pending: dict[str, asyncio.Future[list[NewsArticle]]] = {}
+        self._names: dict[str, str | None] = {}
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def get(self, ticker: str, company_name: str | None = None) -> list[NewsArticle]:
+        future = self._pending.get(ticker)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[ticker] = future
+            self._names[ticker] = company_name
+            if self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush())
+        return await future
+
+    async def _flush(self) -> None:
+        await asyncio.sleep(self._window)
+        pending, names = self._pending, self._names
+        self._pending, self._names, self._flush_task = {}, {}, None
+        open_tickers = [t for t, future in pending.items() if not future.done()]
+        try:
+            results = await self._fetch(open_tickers, names) if open_tickers else {}
+        except asyncio.CancelledError:
+            for future in pending.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            # Der Fehler gehört den wartenden Kandidaten, nicht diesem Task
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for ticker, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(ticker, []))
+
+    def cancel(self) -> None:
+        """Bricht eine noch ausstehende Sammel-Anfrage ab."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        for future in self._pending.values():
+            future.cancel()
@@ -17,6 +17,7 @@ from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from wsb_crawler.models import MarketStatus, PriceData
+from wsb_crawler.runtime.metrics import API_CALLS, ENRICHMENT_SECONDS, RATE_LIMITED
 from wsb_crawler.runtime.progress import add_diagnostic, update_run
 from wsb_crawler.storage.cache import price_cache
 
@@ -61,6 +62,14 @@ def _negative_cache_hit(ticker: str) -> bool:
     return True
 
 
+def _is_rate_limited(error: Exception) -> bool:
+    """yfinance reicht Yahoos 429 je nach Version als eigene Exception oder Text durch."""
+    text = str(error)
+    return (
+        type(error).__name__ == "YFRateLimitError" or "429" in text or "Too Many Requests" in text
+    )
+
+
 def _fetch_price_sync(ticker: str) -> PriceData:
     """Synchroner yfinance-Call (wird in Thread ausgeführt)."""
     stock = yf.Ticker(ticker)
@@ -127,17 +136,27 @@ async def _fetch_price_with_retry(ticker: str) -> PriceData:
     """
     async with _price_lock:
         await asyncio.sleep(YFINANCE_REQUEST_DELAY_SECONDS)
-        return await asyncio.to_thread(_fetch_price_sync, ticker)
+        API_CALLS.inc(api="yahoo")
+        try:
+            with ENRICHMENT_SECONDS.time(source="price"):
+                return await asyncio.to_thread(_fetch_price_sync, ticker)
+        except Exception as e:
+            if _is_rate_limited(e):
+                RATE_LIMITED.inc(api="yahoo")
+            raise
 
 
-async def get_price(ticker: str) -> PriceData | None:
+async def get_price(ticker: str, *, force: bool = False) -> PriceData | None:
     """
     Holt den aktuellen Kurs für einen Ticker.
     Nutzt den Cache (5 Min TTL) um API-Calls zu minimieren.
 
+    force: Cache überspringen (Refresher lädt kurz vor Ablauf nach). Der
+    negative Cache gilt trotzdem — fehlgeschlagene Ticker werden nicht gehämmert.
+
     Bei Fehler: gibt None zurück (kein Crash des ganzen Runs).
     """
-    cached = price_cache.get(ticker)
+    cached = None if force else price_cache.get(ticker)
     if cached is not None:
         logger.debug(f"Cache-Hit für Kurs: {ticker}")
         return cached
@@ -0,0 +1,110 @@
+"""
+Hintergrund-Refresher für Kurse und Firmennamen der aktuellen Top-Ticker.
+
+``/api/tickers`` liest bewusst nur aus ``price_cache``/``name_cache`` (kein
+yfinance-Burst pro Dashboard-Poll). Damit dort trotzdem echte Werte stehen,
+hält dieser Task die Caches für die Top-N-Ticker warm — Stale-While-Revalidate:
+
+- Das Dashboard bekommt sofort den letzten bekannten Wert (auch wenn abgelaufen).
+- Nachgeladen wird gedrosselt in kleinen Batches mit Pause dazwischen.
+- Reihenfolge: fehlende Werte zuerst, dann nach Restlaufzeit und Rang.
+
+Die eigentlichen Yahoo-Zugriffe laufen über ``get_price``/``resolve_name`` und
+teilen sich damit Lock, Delay und negativen Cache mit dem Crawl-Enrichment.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Literal
+
+from loguru import logger
+
+from wsb_crawler.enrichment.prices import get_price
+from wsb_crawler.enrichment.resolver import resolve_name
+from wsb_crawler.storage.base import Storage
+from wsb_crawler.storage.cache import name_cache, price_cache
+
+REFRESH_TOP_N = 20  # wie /api/tickers
+REFRESH_DAYS = 7  # Default-Zeitraum des Dashboards
+REFRESH_INTERVAL_SECONDS = 60
+REFRESH_BATCH_SIZE = 4
+REFRESH_BATCH_PAUSE_SECONDS = 10.0
+REFRESH_MAX_PER_CYCLE = 12  # Rest folgt im nächsten Zyklus
+# Werte kurz vor Ablauf schon nachladen, damit das Dashboard selten Stale sieht
+REFRESH_AHEAD_SECONDS = 60.0
+# Ein Rangplatz "kostet" so viele Sekunden Restlaufzeit — Platz 1 mit 2 Min.
+# Rest wird vor Platz 15 mit 1 Min. Rest aufgefrischt
+RANK_WEIGHT_SECONDS = 15.0
+# Fehlende Werte gelten als seit einer Stunde abgelaufen (→ immer zuerst)
+MISSING_TTL_SECONDS = -3600.0
+
+RefreshKind = Literal["price", "name"]
+
+
+@dataclass(frozen=True, slots=True)
+class RefreshItem:
+    """Ein fälliger Cache-Eintrag im Refresh-Plan."""
+
+    ticker: str
+    kind: RefreshKind
+    rank: int  # 0 = meistgenannter Ticker
+    ttl_remaining: float | None  # None = noch nie geladen
+
+    @property
+    def priority(self) -> float:
+        """Kleiner = dringender."""
+        ttl = MISSING_TTL_SECONDS if self.ttl_remaining is None else self.ttl_remaining
+        return ttl + self.rank * RANK_WEIGHT_SECONDS
+
+
+def plan_refresh(
+    tickers: list[str], *, ahead_seconds: float = REFRESH_AHEAD_SECONDS
+) -> list[RefreshItem]:
+    """Fällige Kurs-/Namens-Einträge für die (nach Rang sortierten) Ticker."""
+    items: list[RefreshItem] = []
+    for rank, ticker in enumerate(tickers):
+        checks: tuple[tuple[RefreshKind, float | None], ...] = (
+            ("price", price_cache.ttl_remaining(ticker)),
+            ("name", name_cache.ttl_remaining(ticker)),
+        )
+        for kind, ttl in checks:
+            if ttl is not None and ttl > ahead_seconds:
+                continue
+            items.append(RefreshItem(ticker=ticker, kind=kind, rank=rank, ttl_remaining=ttl))
+    items.sort(key=lambda item: item.priority)
+    return items
+
+
+async def _refresh_item(item: RefreshItem) -> None:
+    if item.kind == "price":
+        await get_price(item.ticker, force=True)
+    else:
+        await resolve_name(item.ticker, force=True)
+
+
+async def refresh_once(db: Storage) -> int:
+    """Ein Refresh-Zyklus. Gibt die Anzahl aufgefrischter Einträge zurück."""
+    entries = await db.get_top_tickers(days=REFRESH_DAYS, limit=REFRESH_TOP_N)
+    plan = plan_refresh([e.ticker for e in entries])[:REFRESH_MAX_PER_CYCLE]
+    if not plan:
+        return 0
+
+    logger.debug(f"Refresher: {len(plan)} fällige Einträge ({plan[0].ticker} zuerst)")
+    for start in range(0, len(plan), REFRESH_BATCH_SIZE):
+        if start:
+            await asyncio.sleep(REFRESH_BATCH_PAUSE_SECONDS)
+        for item in plan[start : start + REFRESH_BATCH_SIZE]:
+            await _refresh_item(item)
+    return len(plan)
+
+
+async def refresher_loop(db: Storage) -> None:
+    """Dauerläufer (asyncio-Task aus main.py): hält die Top-Ticker warm."""
+    while True:
+        try:
+            await refresh_once(db)
+        except Exception as e:
+            logger.warning(f"Kurs-Refresher fehlgeschlagen: {e}")
+        await asyncio.sleep(REFRESH_INTERVAL_SECONDS)
@@ -1,19 +1,44 @@
 """
 Ticker-Name-Resolver: $GME → "GameStop Corp."
 
-Nutzt yfinance als primäre Quelle, AlphaVantage als Fallback.
+Primäre Quelle ist die lokale ``symbols``-Tabelle (Listing-Dateien, siehe
+symbols.py) — ohne Netzwerk. yfinance nur noch für Symbole ohne Eintrag.
 Ergebnis wird 24h gecacht (Firmennamen ändern sich selten).
 """
 
 from __future__ import annotations
 
 import asyncio
+from typing import TYPE_CHECKING
 
 import yfinance as yf
 from loguru import logger
 
+from wsb_crawler.runtime.metrics import API_CALLS, ENRICHMENT_SECONDS
 from wsb_crawler.storage.cache import name_cache
 
+if TYPE_CHECKING:
+    from wsb_crawler.storage.base import Storage
+
+_db: Storage | None = None
+
+
+def set_database(db: Storage) -> None:
+    global _db
+    _db = db
+
+
+async def _lookup_local(tickers: list[str]) -> dict[str, str]:
+    """Namen aus der Symboltabelle. Ohne DB (z.B. in Tests) → leer."""
+    if _db is None or not tickers:
+        return {}
+    try:
+        found = await _db.get_symbols(tickers)
+    except RuntimeError:
+        # DB geschlossen (Shutdown) → auf Yahoo zurückfallen
+        return {}
+    return {symbol: info.name for symbol, info in found.items() if info.name}
+
 
 def _resolve_sync(ticker: str) -> str | None:
     """Synchroner yfinance-Call für Firmennamen."""
@@ -24,16 +49,23 @@ def _resolve_sync(ticker: str) -> str | None:
         return None
 
 
-async def resolve_name(ticker: str) -> str | None:
+async def resolve_name(ticker: str, *, force: bool = False) -> str | None:
     """
     Löst einen Ticker in einen Firmennamen auf.
     24h gecacht, gibt None zurück wenn unbekannt.
+
+    force: Cache überspringen (für den Hintergrund-Refresher).
     """
-    cached = name_cache.get(ticker)
-    if cached is not None or name_cache.get(ticker) == "":
+    cached = None if force else name_cache.get(ticker)
+    if cached is not None:
         return cached or None
 
-    name = await asyncio.to_thread(_resolve_sync, ticker)
+    local = await _lookup_local([ticker])
+    name = local.get(ticker)
+    if name is None:
+        API_CALLS.inc(api="yahoo")
+        with ENRICHMENT_SECONDS.time(source="name"):
+            name = await asyncio.to_thread(_resolve_sync, ticker)
     name_cache.set(ticker, name or "")
     if name:
         logger.debug(f"Ticker aufgelöst: {ticker} → {name}")
@@ -41,6 +73,9 @@ async def resolve_name(ticker: str) -> str | None:
 
 
 async def resolve_names_bulk(tickers: list[str]) -> dict[str, str | None]:
-    """Löst mehrere Ticker parallel auf."""
+    """Löst mehrere Ticker parallel auf (lokale Treffer per Sammel-Query)."""
+    uncached = [t for t in dict.fromkeys(tickers) if t not in name_cache]
+    for ticker, name in (await _lookup_local(uncached)).items():
+        name_cache.set(ticker, name)
     results = await asyncio.gather(*[resolve_name(t) for t in tickers])
     return dict(zip(tickers, results, strict=False))
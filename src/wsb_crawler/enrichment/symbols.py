@@ -0,0 +1,182 @@
+"""
+Lokale Symbol-Stammdaten aus Listing-Dateien.
+
+Ersetzt für bekannte Symbole den langsamen, stark rate-limitierten
+``yf.Ticker(...).info``-Call: Namen kommen aus der ``symbols``-Tabelle,
+Yahoo wird nur noch für Symbole ohne Eintrag gefragt (siehe resolver.py).
+
+Unterstützte Dateien im Verzeichnis ``data/symbols/`` (bzw. WSB_SYMBOLS_DIR):
+
+- ``nasdaqlisted.txt`` / ``otherlisted.txt`` von NASDAQ Trader
+  (Pipe-getrennt, https://www.nasdaqtrader.com/dynamic/SymDir/)
+- eigene ``*.csv`` mit Kopfzeile ``symbol,name[,exchange,type,currency]``
+
+Ein Hintergrund-Task prüft die Dateien periodisch und importiert sie neu,
+sobald sich eine ändert — Aktualisieren heißt also: Datei austauschen.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import os
+import re
+from pathlib import Path
+
+from loguru import logger
+
+from wsb_crawler.config import DB_PATH
+from wsb_crawler.models import SymbolInfo
+from wsb_crawler.storage.base import Storage
+
+
+def _resolve_symbols_dir() -> Path:
+    override = os.getenv("WSB_SYMBOLS_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    return DB_PATH.parent / "symbols"
+
+
+SYMBOLS_DIR = _resolve_symbols_dir()
+SYMBOL_SYNC_INTERVAL_SECONDS = 3600
+LISTING_SUFFIXES = (".txt", ".csv")
+
+# Börsen-Codes aus otherlisted.txt
+_EXCHANGE_CODES = {
+    "A": "NYSE American",
+    "N": "NYSE",
+    "P": "NYSE Arca",
+    "V": "IEX",
+    "Z": "Cboe BZX",
+}
+# "Apple Inc. - Common Stock" / "GameStop Corporation Class A Common Stock"
+# → Wertpapier-Zusatz abschneiden, damit der Name wie bei Yahoo aussieht
+_SECURITY_SUFFIX = re.compile(
+    r"\s+(?:Class [A-Z]\s+)?(?:Common Stock|Common Shares|Ordinary Shares)$", re.IGNORECASE
+)
+
+# Signatur der zuletzt importierten Dateien (Name, mtime, Größe)
+_last_signature: tuple[tuple[str, int, int], ...] | None = None
+
+
+def _clean_name(name: str) -> str:
+    name = name.split(" - ")[0].strip()
+    return _SECURITY_SUFFIX.sub("", name).strip()
+
+
+def _parse_pipe_listing(text: str) -> list[SymbolInfo]:
+    """NASDAQ-Trader-Format (nasdaqlisted.txt / otherlisted.txt)."""
+    rows = csv.DictReader(io.StringIO(text), delimiter="|")
+    symbols: list[SymbolInfo] = []
+    for row in rows:
+        symbol = (row.get("Symbol") or row.get("ACT Symbol") or "").strip().upper()
+        name = (row.get("Security Name") or "").strip()
+        # Letzte Zeile ist "File Creation Time: …" ohne weitere Spalten
+        if not symbol or not name or row.get("Test Issue") == "Y":
+            continue
+        if "Market Category" in row:
+            exchange = "NASDAQ"
+        else:
+            code = (row.get("Exchange") or "").strip()
+            exchange = _EXCHANGE_CODES.get(code, code)
+        symbols.append(
+            SymbolInfo(
+                symbol=symbol,
+                name=_clean_name(name),
+                exchange=exchange,
+                type="etf" if row.get("ETF") == "Y" else "stock",
+            )
+        )
+    return symbols
+
+
+def _parse_csv_listing(text: str) -> list[SymbolInfo]:
+    """Eigene CSV mit Kopfzeile symbol,name[,exchange,type,currency]."""
+    rows = csv.DictReader(io.StringIO(text))
+    symbols: list[SymbolInfo] = []
+    for raw in rows:
+        row = {(k or "").strip().lower(): (v or "").strip() for k, v in raw.items()}
+        if not row.get("symbol") or not row.get("name"):
+            continue
+        symbols.append(
+            SymbolInfo(
+                symbol=row["symbol"].upper(),
+                name=row["name"],
+                exchange=row.get("exchange", ""),
+                type=row.get("type") or "stock",
+                currency=row.get("currency") or "USD",
+            )
+        )
+    return symbols
+
+
+def parse_listing(text: str) -> list[SymbolInfo]:
+    """Erkennt das Format an der Kopfzeile (Pipe → NASDAQ Trader, sonst CSV)."""
+    text = text.lstrip("\ufeff")  # BOM aus Excel-Exports
+    header = text.split("\n", 1)[0]
+    if "|" in header:
+        return _parse_pipe_listing(text)
+    return _parse_csv_listing(text)
+
+
+def _listing_files(directory: Path) -> list[Path]:
+    if not directory.is_dir():
+        return []
+    return sorted(
+        p for p in directory.iterdir() if p.is_file() and p.suffix.lower() in LISTING_SUFFIXES
+    )
+
+
+def _signature(files: list[Path]) -> tuple[tuple[str, int, int], ...]:
+    result = []
+    for path in files:
+        stat = path.stat()
+        result.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(result)
+
+
+def load_listing_dir(directory: Path) -> list[SymbolInfo]:
+    """Liest alle Listing-Dateien; bei Duplikaten gewinnt die alphabetisch spätere Datei."""
+    merged: dict[str, SymbolInfo] = {}
+    for path in _listing_files(directory):
+        try:
+            entries = parse_listing(path.read_text(encoding="utf-8", errors="replace"))
+        except (OSError, csv.Error) as e:
+            logger.warning(f"Listing-Datei konnte nicht gelesen werden: {path} ({e})")
+            continue
+        merged.update((s.symbol, s) for s in entries)
+    return list(merged.values())
+
+
+async def sync_symbols(db: Storage, directory: Path | None = None, *, force: bool = False) -> int:
+    """Importiert die Listing-Dateien neu, falls sie sich geändert haben.
+
+    Gibt die Anzahl importierter Symbole zurück (0 = unverändert oder keine Dateien).
+    """
+    global _last_signature
+    directory = directory or SYMBOLS_DIR
+    files = await asyncio.to_thread(_listing_files, directory)
+    if not files:
+        return 0
+    signature = await asyncio.to_thread(_signature, files)
+    if not force and signature == _last_signature:
+        return 0
+
+    symbols = await asyncio.to_thread(load_listing_dir, directory)
+    if not symbols:
+        return 0
+    count = await db.replace_symbols(symbols)
+    _last_signature = signature
+    logger.info(f"Symbol-Stammdaten importiert: {count} Symbole aus {len(files)} Datei(en)")
+    return count
+
+
+async def symbol_sync_loop(db: Storage) -> None:
+    """Dauerläufer (asyncio-Task aus main.py): Listing-Dateien aktuell halten."""
+    while True:
+        try:
+            await sync_symbols(db)
+        except Exception as e:
+            logger.warning(f"Symbol-Import fehlgeschlagen: {e}")
+        await asyncio.sleep(SYMBOL_SYNC_INTERVAL_SECONDS)
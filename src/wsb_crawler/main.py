@@ -3,10 +3,16 @@ WSB-Crawler v2 — Haupt-Entry-Point.
 
 Startet den API-Server (Dashboard) und den Scheduler-Loop parallel.
 Beim ersten Start ohne Konfiguration → Browser öffnet Setup-Wizard.
+
+Unterbefehle:
+    wsb-crawler export mentions --format csv --since 2026-01-01 -o mentions.csv
+    wsb-crawler worker --db /shared/wsb_crawler.db   # Crawl-Jobs abarbeiten
+    wsb-crawler crawl --profile                      # ein Lauf, mit Profil
 """
 
 from __future__ import annotations
 
+import argparse
 import asyncio
 import contextlib
 import datetime as dt
@@ -15,6 +21,7 @@ import signal
 import sys
 import webbrowser
 from datetime import datetime
+from pathlib import Path
 
 from loguru import logger
 
@@ -22,19 +29,30 @@ from wsb_crawler.__version__ import __version__
 from wsb_crawler.alerts import bot as discord_bot
 from wsb_crawler.alerts.discord import send_heartbeat
 from wsb_crawler.alerts.discord import set_database as discord_set_db
+from wsb_crawler.alerts.outbox import deliver_due, outbox_worker
 from wsb_crawler.api.routers.status import setup_ws_log_sink
 from wsb_crawler.api.server import run_server
-from wsb_crawler.config import DB_PATH, Settings, get_settings, is_configured
+from wsb_crawler.config import DATABASE_DSN, DB_PATH, get_settings, is_configured
+from wsb_crawler.crawler.jobs import open_job_queue
 from wsb_crawler.crawler.reddit import set_database as reddit_set_db
-from wsb_crawler.crawler.runner import run_single_crawl
-from wsb_crawler.cron import next_run as cron_next_run
+from wsb_crawler.crawler.runner import run_single_crawl, set_job_queue
+from wsb_crawler.crawler.worker import run_worker
+from wsb_crawler.enrichment.feeds import feed_ingest_loop
 from wsb_crawler.enrichment.news import set_database as news_set_db
-from wsb_crawler.storage.database import Database
+from wsb_crawler.enrichment.refresher import refresher_loop
+from wsb_crawler.enrichment.resolver import set_database as resolver_set_db
+from wsb_crawler.enrichment.symbols import symbol_sync_loop
+from wsb_crawler.schedule import describe_schedule, plan_next_run, record_decision
+from wsb_crawler.storage.base import Storage, create_storage
+from wsb_crawler.storage.export import DATASETS, export_stream, parquet_available
 
 PORT = int(os.getenv("WSB_PORT", "80"))
 # Default: nur localhost — das Dashboard hat keine Authentifizierung.
 # Für LAN-Zugriff (z.B. Docker/NAS) explizit WSB_HOST=0.0.0.0 setzen.
 HOST = os.getenv("WSB_HOST", "127.0.0.1")
+# Optional: Crawl-Jobs in Postgres statt in der SQLite-Datei (crawl_backend=workers).
+# Liegt die History in Postgres, landen die Jobs per Default in derselben DB.
+JOBS_DSN = os.getenv("WSB_JOBS_DSN", "").strip() or DATABASE_DSN
 DASHBOARD_URL = f"http://localhost:{PORT}"
 
 BOT_RETRY_SECONDS = 60
@@ -58,22 +76,7 @@ def _setup_logging(log_level: str = "INFO") -> None:
     )
 
 
-def _next_run_at(cfg: Settings, now: datetime) -> datetime:
-    """Berechnet den nächsten Laufzeitpunkt je nach Zeitsteuerungs-Modus.
-
-    Cron-Modus mit ungültigem Ausdruck fällt sicher aufs Intervall zurück.
-    """
-    crawler = cfg.crawler
-    interval_at = now + dt.timedelta(minutes=crawler.crawl_interval_minutes)
-    if crawler.schedule_mode == "cron" and crawler.cron_expression.strip():
-        try:
-            return cron_next_run(crawler.cron_expression.strip(), now)
-        except ValueError as exc:
-            logger.error(f"Ungültiger Cron-Ausdruck '{crawler.cron_expression}': {exc} — Intervall")
-    return interval_at
-
-
-async def scheduler_loop(db: Database) -> None:
+async def scheduler_loop(db: Storage) -> None:
     """Wartet auf vollständige Konfiguration, dann geplante Crawls (Intervall/Cron)."""
     # Warten bis Setup abgeschlossen
     while not await is_configured(db):
@@ -81,12 +84,7 @@ async def scheduler_loop(db: Database) -> None:
         await asyncio.sleep(5)
 
     cfg = await get_settings(db)
-    if cfg.crawler.schedule_mode == "cron" and cfg.crawler.cron_expression.strip():
-        logger.info(f"Scheduler gestartet — Cron: {cfg.crawler.cron_expression}")
-    else:
-        logger.info(
-            f"Scheduler gestartet — Intervall: {cfg.crawler.crawl_interval_minutes} Minuten"
-        )
+    logger.info(f"Scheduler gestartet — {describe_schedule(cfg)}")
 
     while True:
         try:
@@ -99,7 +97,11 @@ async def scheduler_loop(db: Database) -> None:
             cfg = await get_settings(db)
 
         now = datetime.now(tz=dt.UTC)
-        next_at = _next_run_at(cfg, now)
+        decision = await plan_next_run(db, cfg, now)
+        record_decision(decision)
+        next_at = decision.next_run_at
+        if cfg.crawler.schedule_mode == "adaptive":
+            logger.info(f"Adaptive Planung: {'; '.join(decision.reasons)}")
 
         try:
             status = await db.get_run_status()
@@ -113,7 +115,7 @@ async def scheduler_loop(db: Database) -> None:
         await asyncio.sleep(sleep_seconds)
 
 
-async def bot_supervisor(db: Database) -> None:
+async def bot_supervisor(db: Storage) -> None:
     """Startet den Discord-Bot sobald ein Token konfiguriert ist.
 
     Läuft dauerhaft: greift auch, wenn der Token erst nach dem Start über
@@ -145,7 +147,7 @@ def _install_sigterm_handler(tasks: list[asyncio.Task[None]]) -> None:
 
 
 async def main_async() -> None:
-    async with Database(DB_PATH) as db:
+    async with create_storage(DB_PATH, DATABASE_DSN) as db:
         # Log-Level: ENV hat Vorrang, dann DB-Setting, dann INFO
         log_level = (
             os.getenv("LOG_LEVEL", "").strip() or (await db.get_setting("log_level") or "INFO")
@@ -162,6 +164,10 @@ async def main_async() -> None:
         reddit_set_db(db)
         discord_set_db(db)
         news_set_db(db)
+        resolver_set_db(db)
+        # Koordinator für wsb-crawler worker (nur genutzt bei crawl_backend=workers)
+        job_queue = await open_job_queue(DB_PATH, JOBS_DSN)
+        set_job_queue(job_queue)
 
         # Browser öffnen (nicht in Docker/Headless — WSB_NO_BROWSER=1)
         url = DASHBOARD_URL if configured else f"{DASHBOARD_URL}/setup"
@@ -173,6 +179,10 @@ async def main_async() -> None:
             asyncio.create_task(run_server(db, host=HOST, port=PORT)),
             asyncio.create_task(scheduler_loop(db)),
             asyncio.create_task(bot_supervisor(db)),
+            asyncio.create_task(refresher_loop(db)),
+            asyncio.create_task(feed_ingest_loop(db)),
+            asyncio.create_task(symbol_sync_loop(db)),
+            asyncio.create_task(outbox_worker(db)),
         ]
         _install_sigterm_handler(tasks)
 
@@ -183,10 +193,131 @@ async def main_async() -> None:
         finally:
             for task in tasks:
                 task.cancel()
+            set_job_queue(None)
+            await job_queue.close()
+
+
+async def export_async(args: argparse.Namespace) -> None:
+    """Schreibt einen Export-Datensatz in eine Datei oder nach stdout.
+
+    Öffnet die DB nur lesend (SQLite ``mode=ro``, Postgres read-only
+    Transaktionen) und ohne Schema-Init oder Migrationen — funktioniert auch,
+    während der Dienst läuft (z.B. als nächtlicher Cron-Job).
+    """
+    async with create_storage(args.db, DATABASE_DSN, read_only=True) as db:
+        stream = export_stream(db, args.dataset, args.format, since=args.since, until=args.until)
+        if args.output == "-":
+            async for chunk in stream:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            return
+        with open(args.output, "wb") as fh:
+            async for chunk in stream:
+                fh.write(chunk)
+
+
+async def worker_async(args: argparse.Namespace) -> None:
+    """Worker-Modus: Crawl-Jobs des Koordinators leasen und abarbeiten.
+
+    Zugangsdaten und Symbol-Liste kommen aus ``--db`` (bzw. ENV). Mehrere
+    Worker dürfen dieselbe DB-Datei nutzen; mit ``--dsn`` laufen die Jobs
+    über Postgres.
+    """
+    _setup_logging(os.getenv("LOG_LEVEL", "INFO").strip().upper() or "INFO")
+    async with create_storage(args.db, DATABASE_DSN) as db:
+        queue = await open_job_queue(args.db, args.dsn)
+        try:
+            processed = await run_worker(db, queue, worker_id=args.worker_id, once=args.once)
+            logger.info(f"Worker beendet — {processed} Job(s) bearbeitet")
+        finally:
+            await queue.close()
+
+
+async def crawl_async(args: argparse.Namespace) -> None:
+    """Ein einzelner Lauf im Vordergrund — alle Subreddits, wie der Dashboard-Button.
+
+    Eingestellte Alerts werden danach direkt zugestellt (ohne Outbox-Worker).
+    """
+    _setup_logging(os.getenv("LOG_LEVEL", "INFO").strip().upper() or "INFO")
+    async with create_storage(args.db, DATABASE_DSN) as db:
+        if not await is_configured(db):
+            sys.exit("Konfiguration unvollständig — bitte zuerst im Dashboard einrichten")
+        reddit_set_db(db)
+        discord_set_db(db)
+        news_set_db(db)
+        resolver_set_db(db)
+        job_queue = await open_job_queue(args.db, JOBS_DSN)
+        set_job_queue(job_queue)
+        try:
+            await run_single_crawl(db, dry_run=args.dry_run, force=True, profile=args.profile)
+            if not args.dry_run:
+                cfg = await get_settings(db)
+                while await deliver_due(db, cfg):
+                    pass
+        finally:
+            set_job_queue(None)
+            await job_queue.close()
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="wsb-crawler", description=f"WSB-Crawler v{__version__}")
+    commands = parser.add_subparsers(dest="command")
+    export = commands.add_parser("export", help="History als CSV/NDJSON/Parquet exportieren")
+    export.add_argument("dataset", choices=sorted(DATASETS))
+    export.add_argument("--format", choices=("csv", "ndjson", "parquet"), default="csv")
+    export.add_argument("--since", type=datetime.fromisoformat, help="ISO-Zeitpunkt (inklusive)")
+    export.add_argument("--until", type=datetime.fromisoformat, help="ISO-Zeitpunkt (exklusive)")
+    export.add_argument("-o", "--output", default="-", help="Zieldatei (Default: stdout)")
+    export.add_argument(
+        "--db",
+        default=DB_PATH,
+        type=Path,
+        help=f"SQLite-Datei (Default: {DB_PATH}, ohne Wirkung mit WSB_DATABASE_DSN)",
+    )
+    worker = commands.add_parser("worker", help="Crawl-Jobs vom Koordinator abarbeiten")
+    worker.add_argument(
+        "--db",
+        default=DB_PATH,
+        type=Path,
+        help=f"SQLite-Datei (Default: {DB_PATH}, ohne Wirkung mit WSB_DATABASE_DSN)",
+    )
+    worker.add_argument(
+        "--dsn", default=JOBS_DSN, help="Postgres-DSN für die Jobs (Default: WSB_JOBS_DSN)"
+    )
+    worker.add_argument("--worker-id", default=None, help="Default: <hostname>:<pid>")
+    worker.add_argument("--once", action="store_true", help="Beenden, sobald keine Jobs frei sind")
+    crawl = commands.add_parser("crawl", help="Einen Crawl-Lauf ausführen und beenden")
+    crawl.add_argument(
+        "--db",
+        default=DB_PATH,
+        type=Path,
+        help=f"SQLite-Datei (Default: {DB_PATH}, ohne Wirkung mit WSB_DATABASE_DSN)",
+    )
+    crawl.add_argument("--dry-run", action="store_true", help="Keine Alerts, keine Cooldowns")
+    crawl.add_argument(
+        "--profile",
+        action="store_true",
+        help="Lauf profilieren (Flamegraph-Stacks + Loop-Lag unter WSB_PROFILES_DIR)",
+    )
+    return parser
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
     """Synchroner Entry-Point für pyproject.toml scripts."""
+    args = _build_parser().parse_args(argv)
+    if args.command == "export":
+        if args.format == "parquet" and not parquet_available():
+            sys.exit("Parquet-Export braucht pyarrow: pip install 'wsb-crawler[parquet]'")
+        asyncio.run(export_async(args))
+        return
+    if args.command == "worker":
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(worker_async(args))
+        return
+    if args.command == "crawl":
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(crawl_async(args))
+        return
     try:
         asyncio.run(main_async())
     except KeyboardInterrupt:
@@ -0,0 +1,160 @@
+"""
+Börsenkalender (NYSE, Xetra) für die marktgesteuerte Crawl-Planung.
+
+Handelszeiten sind je Börse fest hinterlegt, Feiertage und verkürzte
+Handelstage kommen aus lokalen Textdateien: mitgeliefert in
+``wsb_crawler/calendars/`` und ergänzbar über ``data/calendars/``
+(bzw. WSB_CALENDARS_DIR) — z.B. für Folgejahre, ohne Update des Pakets
+und ohne Neustart.
+
+Dateiformat, eine Zeile pro Tag::
+
+    2026-11-26        Thanksgiving Day         ← geschlossen
+    2026-11-27 13:00  Day after Thanksgiving   ← Handelsschluss 13:00 Ortszeit
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from loguru import logger
+
+from wsb_crawler.config import DB_PATH
+
+
+def _resolve_calendars_dir() -> Path:
+    override = os.getenv("WSB_CALENDARS_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    return DB_PATH.parent / "calendars"
+
+
+CALENDARS_DIR = _resolve_calendars_dir()
+# Sucht höchstens so weit voraus nach dem nächsten Handelstag (Feiertagsketten)
+_MAX_LOOKAHEAD_DAYS = 14
+
+_LINE = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\s+(\d{1,2}:\d{2})(?!\S))?")
+
+
+@dataclass(frozen=True, slots=True)
+class Exchange:
+    timezone: str
+    pre_market: time  # Beginn der dichten Crawl-Phase
+    regular_open: time
+    regular_close: time
+
+
+EXCHANGES: dict[str, Exchange] = {
+    "NYSE": Exchange("America/New_York", time(4, 0), time(9, 30), time(16, 0)),
+    "XETRA": Exchange("Europe/Berlin", time(8, 0), time(9, 0), time(17, 30)),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Session:
+    """Dichte Phase eines Handelstags: Pre-Market-Beginn bis Handelsschluss."""
+
+    day: date
+    opens_at: datetime
+    closes_at: datetime
+
+    def contains(self, moment: datetime) -> bool:
+        return self.opens_at <= moment < self.closes_at
+
+
+@dataclass(frozen=True, slots=True)
+class ExchangeCalendar:
+    name: str
+    exchange: Exchange
+    holidays: frozenset[date] = frozenset()
+    early_closes: dict[date, time] = field(default_factory=dict)
+
+    @property
+    def zone(self) -> ZoneInfo:
+        return ZoneInfo(self.exchange.timezone)
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, day: date) -> Session | None:
+        if not self.is_trading_day(day):
+            return None
+        close = self.early_closes.get(day, self.exchange.regular_close)
+        return Session(
+            day=day,
+            opens_at=datetime.combine(day, self.exchange.pre_market, tzinfo=self.zone),
+            closes_at=datetime.combine(day, close, tzinfo=self.zone),
+        )
+
+    def next_session(self, after: datetime) -> Session | None:
+        """Laufende oder nächste Session (die erste, die nach `after` endet)."""
+        day = after.astimezone(self.zone).date()
+        for offset in range(_MAX_LOOKAHEAD_DAYS):
+            session = self.session(day + timedelta(days=offset))
+            if session is not None and session.closes_at > after:
+                return session
+        return None
+
+
+def _parse_calendar(text: str, source: str) -> tuple[set[date], dict[date, time]]:
+    holidays: set[date] = set()
+    early_closes: dict[date, time] = {}
+    for number, raw in enumerate(text.splitlines(), start=1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = _LINE.match(line)
+        if match is None:
+            logger.warning(f"Kalender {source}:{number}: Zeile ignoriert: {line!r}")
+            continue
+        day = date.fromisoformat(match.group(1))
+        if match.group(2):
+            early_closes[day] = time.fromisoformat(match.group(2).zfill(5))
+        else:
+            holidays.add(day)
+    return holidays, early_closes
+
+
+def load_calendar(name: str, directory: Path | None = None) -> ExchangeCalendar:
+    """Kalender einer Börse: mitgelieferte Daten + lokale Ergänzungen.
+
+    Gecacht pro Signatur (mtime, Größe) der lokalen Datei — Änderungen an
+    ``calendars/*.txt`` greifen beim nächsten Aufruf, ohne Neustart.
+    ValueError bei unbekannter Börse.
+    """
+    key = name.strip().upper()
+    if key not in EXCHANGES:
+        raise ValueError(f"Unbekannter Börsenkalender '{name}' (bekannt: {', '.join(EXCHANGES)})")
+    local = (directory or CALENDARS_DIR) / f"{key.lower()}.txt"
+    try:
+        stat = local.stat()
+    except OSError:
+        return _load_calendar(key, local, None)
+    return _load_calendar(key, local, (stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=8)
+def _load_calendar(key: str, local: Path, signature: tuple[int, int] | None) -> ExchangeCalendar:
+    """``signature`` ist nur Cache-Schlüssel; None = keine lokale Datei."""
+    filename = local.name
+    holidays, early_closes = _parse_calendar(
+        resources.files("wsb_crawler").joinpath("calendars", filename).read_text("utf-8"),
+        filename,
+    )
+    if signature is not None and local.is_file():
+        extra_holidays, extra_closes = _parse_calendar(local.read_text("utf-8"), str(local))
+        holidays |= extra_holidays
+        early_closes.update(extra_closes)
+    return ExchangeCalendar(
+        name=key,
+        exchange=EXCHANGES[key],
+        holidays=frozenset(holidays),
+        early_closes=early_closes,
+    )
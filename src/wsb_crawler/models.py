@@ -232,6 +232,47 @@ class NewsArticle:
     sentiment: float | None = None  # -1.0 bis 1.0, optional
 
 
+@dataclass
+class PendingEnrichment:
+    """Schon geholte Kurse, Namen und News von Alert-Kandidaten, die noch
+    nicht eingestellt sind.
+
+    Steht im Lauf-Checkpoint: ein fortgesetzter Lauf holt sie nicht erneut.
+    """
+
+    names: dict[str, str | None] = field(default_factory=dict)
+    prices: dict[str, PriceData] = field(default_factory=dict)
+    news: dict[str, list[NewsArticle]] = field(default_factory=dict)
+
+    def drop(self, ticker: str) -> None:
+        """Kandidat ist eingestellt — seine Daten werden nicht mehr gebraucht."""
+        self.names.pop(ticker, None)
+        self.prices.pop(ticker, None)
+        self.news.pop(ticker, None)
+
+
+@dataclass
+class FeedEntry:
+    """Ein Eintrag aus einem RSS-/Atom-Feed (noch keinem Ticker zugeordnet)."""
+
+    url: str
+    title: str
+    summary: str
+    source: str
+    published_at: datetime
+
+
+@dataclass(frozen=True)
+class SymbolInfo:
+    """Stammdaten eines börsennotierten Symbols aus lokalen Listing-Dateien."""
+
+    symbol: str
+    name: str
+    exchange: str = ""
+    type: str = "stock"  # stock | etf
+    currency: str = "USD"
+
+
 # ── Analyse ────────────────────────────────────────────────────────────────
 
 
@@ -296,6 +337,13 @@ class Alert:
     triggered_at: datetime = field(default_factory=_utcnow)
     sent: bool = False
     cooldown_until: datetime | None = None
+    # Zustell-Latenz pro erfolgreichem Kanal in ms (ab Dispatch-Start)
+    delivery_ms: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def latency_ms(self) -> float | None:
+        """Zeit bis zur ersten erfolgreichen Zustellung (None = nirgends zugestellt)."""
+        return min(self.delivery_ms.values()) if self.delivery_ms else None
 
 
 # ── Trend-Analyse (für /top und /chart) ────────────────────────────────────
@@ -327,3 +375,28 @@ class RunStatus:
     tracked_tickers: int
     next_run_at: datetime | None
     is_healthy: bool
+
+
+@dataclass(frozen=True)
+class RateLimitState:
+    """Reddit-Rate-Limit nach dem letzten Crawl (aus den ``X-Ratelimit-*``-Headern)."""
+
+    remaining: float
+    used: int
+    reset_at: datetime
+
+    @property
+    def headroom(self) -> float:
+        """Anteil des Fensters, der noch frei ist (0.0–1.0)."""
+        total = self.remaining + self.used
+        return self.remaining / total if total > 0 else 1.0
+
+
+@dataclass(frozen=True)
+class RunActivity:
+    """Aktivität eines abgeschlossenen Laufs (Eingabe für die adaptive Zeitplanung)."""
+
+    run_id: str
+    started_at: datetime
+    mentions: int  # Summe aller Ticker-Nennungen
+    candidates: int  # Ticker mit mindestens alert_min_abs Nennungen
@@ -0,0 +1,119 @@
+"""Log-Verteiler für den Live-Log-WebSocket (``/api/ws/logs``).
+
+Der Loguru-Sink übergibt Zeilen nur noch an den Hub — kein Task pro Zeile,
+kein ``await`` pro Client:
+
+- jeder Client hat eine eigene, begrenzte Queue; ist sie voll, fliegen die
+  ältesten Zeilen raus und ein Drop-Zähler steigt (langsame Clients bremsen
+  niemanden sonst),
+- der Sender pro Client sammelt Zeilen ``BATCH_INTERVAL_SECONDS`` lang und
+  schickt sie als ein Frame,
+- Logs aus ``asyncio.to_thread``-Workern werden per ``call_soon_threadsafe``
+  an den Event-Loop übergeben statt verworfen.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any
+
+from wsb_crawler.runtime.metrics import QUEUE_DEPTH
+
+# Verlauf für neu verbundene Clients
+HISTORY_SIZE = 200
+# Max. ausstehende Zeilen pro Client, danach werden die ältesten verworfen
+CLIENT_QUEUE_LINES = 1000
+BATCH_INTERVAL_SECONDS = 0.1
+MAX_BATCH_LINES = 500
+
+
+class LogSubscriber:
+    """Ausstehende Zeilen eines WebSocket-Clients."""
+
+    __slots__ = ("history", "lines", "dropped", "wake")
+
+    def __init__(self, history: list[str] | None = None) -> None:
+        # Verlauf beim Verbinden — enthält keine Zeile, die auch in ``lines`` landet
+        self.history = history or []
+        self.lines: deque[str] = deque()
+        self.dropped = 0
+        self.wake = asyncio.Event()
+
+    def push(self, line: str) -> None:
+        if len(self.lines) >= CLIENT_QUEUE_LINES:
+            self.lines.popleft()
+            self.dropped += 1
+        self.lines.append(line)
+        self.wake.set()
+
+
+class LogHub:
+    """Ring-Buffer + Fan-out an alle verbundenen Log-Clients."""
+
+    def __init__(self) -> None:
+        self.history: deque[str] = deque(maxlen=HISTORY_SIZE)
+        self._subscribers: set[LogSubscriber] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def pending_lines(self) -> int:
+        """Noch nicht an Clients geschickte Zeilen (für ``wsb_queue_depth``)."""
+        return sum(len(sub.lines) for sub in self._subscribers)
+
+    def emit(self, message: object) -> None:
+        """Loguru-Sink. Darf aus beliebigen Threads aufgerufen werden."""
+        line = str(message).rstrip("\n")
+        if not line:
+            return
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self.history.append(line)
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._dispatch(line)
+        else:
+            loop.call_soon_threadsafe(self._dispatch, line)
+
+    def _dispatch(self, line: str) -> None:
+        self.history.append(line)
+        for sub in self._subscribers:
+            sub.push(line)
+
+    def subscribe(self) -> LogSubscriber:
+        """Neuer Client mit Verlaufs-Snapshot in ``sub.history``.
+
+        Snapshot und Anmeldung passieren im selben synchronen Schritt — jede
+        Zeile steht danach entweder im Verlauf oder in der Queue, nie in beiden.
+        """
+        self._loop = asyncio.get_running_loop()
+        sub = LogSubscriber(list(self.history))
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: LogSubscriber) -> None:
+        self._subscribers.discard(sub)
+
+    async def next_batch(self, sub: LogSubscriber) -> dict[str, Any]:
+        """Wartet auf neue Zeilen und gibt sie gebündelt als Frame zurück."""
+        await sub.wake.wait()
+        # Kurz sammeln, damit ein Burst (z.B. DEBUG-Crawl) ein Frame wird
+        await asyncio.sleep(BATCH_INTERVAL_SECONDS)
+        count = min(len(sub.lines), MAX_BATCH_LINES)
+        lines = [sub.lines.popleft() for _ in range(count)]
+        if not sub.lines:
+            sub.wake.clear()
+        dropped, sub.dropped = sub.dropped, 0
+        return {"type": "lines", "lines": lines, "dropped": dropped}
+
+
+log_hub = LogHub()
+QUEUE_DEPTH.track(lambda: log_hub.pending_lines, queue="log_clients")
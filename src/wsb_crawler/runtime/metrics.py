@@ -0,0 +1,272 @@
+"""
+Prometheus-Metriken ohne externe Abhängigkeit.
+
+Drei Typen wie bei prometheus_client — ``Counter``, ``Gauge``, ``Histogram`` —
+mit festen Label-Namen. Werte liegen in Dicts (Label-Werte-Tupel → Zahl):
+ein Zählen kostet einen Dict-Zugriff, eine Histogramm-Beobachtung zusätzlich
+eine Binärsuche über die Buckets. Erst ``render()`` baut das Text-Format
+(Version 0.0.4), ausgeliefert unter ``/metrics``.
+
+Gauges können statt gesetzter Werte eine Funktion bekommen
+(``Gauge.track``), die erst beim Abruf ausgewertet wird — für Queue-Tiefen,
+die sonst bei jedem put/get gepflegt werden müssten.
+
+Wie TTLCache nur für den Event-Loop-Thread gedacht (kein Locking); Code in
+``asyncio.to_thread`` wird vom Aufrufer aus gemessen.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from types import TracebackType
+from typing import TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Sekunden: von Cache-nahen Aufrufen bis zu langsamen Subreddits
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PHASE_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        try:
+            key = tuple(str(labels[n]) for n in self.label_names)
+        except KeyError as e:
+            raise ValueError(f"{self.name}: Label {e} fehlt") from None
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name}: erwartet Labels {self.label_names}")
+        return key
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]:
+        """Sample-Zeilen im Text-Format (ohne HELP/TYPE)."""
+
+    def render(self) -> str:
+        header = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        return "\n".join([*header, *self._samples()])
+
+
+class Counter(_Metric):
+    """Monoton steigender Zähler (API-Calls, 429er, Cache-Zugriffe)."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """Momentanwert (Queue-Tiefen) — gesetzt oder beim Abruf ausgewertet."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+        self._callbacks: dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def track(self, callback: Callable[[], float], **labels: str) -> None:
+        """Wert kommt beim Abruf aus ``callback`` (ersetzt einen gesetzten Wert)."""
+        key = self._key(labels)
+        self._values.pop(key, None)
+        self._callbacks[key] = callback
+
+    def value(self, **labels: str) -> float:
+        key = self._key(labels)
+        callback = self._callbacks.get(key)
+        return float(callback()) if callback is not None else self._values.get(key, 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        values = dict(self._values)
+        for key, callback in self._callbacks.items():
+            try:
+                values[key] = float(callback())
+            except Exception:
+                continue  # Ein kaputter Callback soll den Abruf nicht sprengen
+        for key, value in sorted(values.items()):
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}{labels} {_format_value(value)}"
+
+
+class _HistogramSeries:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size  # pro Bucket, nicht kumuliert; letzter = +Inf
+        self.sum = 0.0
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_started")
+
+    def __init__(self, histogram: Histogram, labels: dict[str, str]) -> None:
+        self._histogram = histogram
+        self._labels = labels
+        self._started = 0.0
+
+    def __enter__(self) -> _Timer:
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self._histogram.observe(time.perf_counter() - self._started, **self._labels)
+
+
+class Histogram(_Metric):
+    """Verteilung von Dauern in Sekunden, feste Bucket-Grenzen."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _HistogramSeries(len(self.buckets) + 1)
+        series.counts[bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+    def time(self, **labels: str) -> _Timer:
+        """Kontextmanager: misst die Dauer des Blocks (auch bei Exceptions)."""
+        return _Timer(self, labels)
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series.counts) if series else 0
+
+    def _samples(self) -> Iterator[str]:
+        bounds = [*(_format_value(b) for b in self.buckets), "+Inf"]
+        names = (*self.label_names, "le")
+        for key, series in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, series.counts, strict=True):
+                cumulative += count
+                yield f"{self.name}_bucket{_format_labels(names, (*key, bound))} {cumulative}"
+            labels = _format_labels(self.label_names, key)
+            yield f"{self.name}_sum{labels} {_format_value(series.sum)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+_M = TypeVar("_M", bound=_Metric)
+
+
+class Registry:
+    """Alle Metriken eines Prozesses, in Registrierungs-Reihenfolge."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _M) -> _M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metrik {metric.name} ist schon registriert")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+# ── Metriken des Crawlers ──────────────────────────────────────────────────
+# Werden in den jeweiligen Modulen importiert.
+
+# Phasen eines Laufs: reddit_fetch/extract pro Subreddit, save pro Einheit,
+# analysis pro Durchgang (subreddit="")
+PHASE_SECONDS = REGISTRY.register(
+    Histogram(
+        "wsb_phase_duration_seconds",
+        "Dauer der Crawl-Phasen",
+        ("phase", "subreddit"),
+        buckets=PHASE_BUCKETS,
+    )
+)
+# Ein externer Aufruf pro Beobachtung: source = price, name, news
+ENRICHMENT_SECONDS = REGISTRY.register(
+    Histogram("wsb_enrichment_duration_seconds", "Dauer der Enrichment-Aufrufe", ("source",))
+)
+ALERT_SECONDS = REGISTRY.register(
+    Histogram("wsb_alert_delivery_duration_seconds", "Dauer der Alert-Zustellung", ("channel",))
+)
+API_CALLS = REGISTRY.register(
+    Counter("wsb_api_requests_total", "Requests an externe APIs", ("api",))
+)
+RATE_LIMITED = REGISTRY.register(
+    Counter("wsb_api_rate_limited_total", "Rate-Limit-Antworten (HTTP 429)", ("api",))
+)
+CACHE_LOOKUPS = REGISTRY.register(
+    Counter("wsb_cache_lookups_total", "Zugriffe auf die TTL-Caches", ("cache", "result"))
+)
+QUEUE_DEPTH = REGISTRY.register(Gauge("wsb_queue_depth", "Wartende Einträge pro Queue", ("queue",)))
@@ -0,0 +1,424 @@
+"""
+Profiling-Modus für einzelne Crawl-Läufe (``POST /api/crawl?profile=true``,
+``wsb-crawler crawl --profile``).
+
+Ein Sampler-Thread liest alle ``PROFILE_SAMPLE_INTERVAL_SECONDS`` die Stacks
+des Prozesses — ohne Abhängigkeit, ohne Neustart, nur für diesen Lauf:
+
+- ``loop;<phase>;…``: was der Event-Loop-Thread gerade rechnet (CPU) bzw.
+  ``loop;idle``, wenn er im Selector auf I/O wartet
+- ``await;<phase>;<kategorie>;…``: worauf jeder Task des Laufs gerade wartet —
+  der async Stack wird über ``cr_await`` bis zum wartenden Objekt verfolgt und
+  nach Modulen eingeordnet (``reddit``, ``sqlite``, ``postgres``, ``http``,
+  ``thread``, ``sleep``, ``wait``, ``ready`` = bereit, wartet auf den Loop)
+- ``thread;<name>;…``: arbeitende Threads (SQLite-Thread von aiosqlite,
+  ``asyncio.to_thread``-Executor für yfinance)
+
+Die Phase ist die innerste bekannte Funktion im Stack (``_PHASES``). Zum Lauf
+gehören alle Tasks, die aus dem Crawl-Task heraus entstehen — erkannt über
+eine Task-Factory und eine ContextVar, die Tasks bei ``create_task`` erben.
+
+Parallel misst ein Task die Event-Loop-Verzögerung (Loop-Lag). Ergebnis pro
+Lauf unter ``PROFILES_DIR``: ``<run_id>.folded`` (Collapsed-Stacks für
+flamegraph.pl, inferno oder speedscope) und ``<run_id>.json`` (Zusammenfassung,
+verlinkt in ``/api/runs/{id}``). Aufbewahrt werden die letzten ``PROFILE_KEEP``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import gc
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from types import FrameType
+from typing import Any
+
+from wsb_crawler.config import DB_PATH
+
+
+def _resolve_profiles_dir() -> Path:
+    override = os.getenv("WSB_PROFILES_DIR", "").strip()
+    if override:
+        return Path(override).expanduser()
+    return DB_PATH.parent / "profiles"
+
+
+PROFILES_DIR = _resolve_profiles_dir()
+PROFILE_KEEP = 20
+PROFILE_SAMPLE_INTERVAL_SECONDS = 0.01
+LOOP_LAG_INTERVAL_SECONDS = 0.05
+LOOP_LAG_WARN_MS = 100.0
+MAX_STACK_DEPTH = 64
+
+# Innerste bekannte Funktion → Phase des Laufs
+_PHASES = {
+    "wsb_crawler.crawler.runner._start_or_resume": "starting",
+    "wsb_crawler.crawler.reddit.crawl_subreddit": "reddit",
+    "wsb_crawler.crawler.reddit._iter_submissions": "reddit",
+    "wsb_crawler.crawler.ticker.extract_tickers": "extract",
+    "wsb_crawler.crawler.checkpoints.save_unit": "save",
+    "wsb_crawler.crawler.runner._unit_done": "save",
+    "wsb_crawler.crawler.runner._analyze": "analysis",
+    "wsb_crawler.analysis.detector._enrich_candidate": "enrich",
+    "wsb_crawler.alerts.outbox.enqueue_alerts": "alerts",
+}
+# Top-Level-Paket → worauf ein Task wartet (innerster Treffer zählt)
+_AWAIT_CATEGORIES = {
+    "aiosqlite": "sqlite",
+    "asyncpg": "postgres",
+    "asyncpraw": "reddit",
+    "asyncprawcore": "reddit",
+    "aiohttp": "reddit",
+    "httpx": "http",
+    "httpcore": "http",
+}
+_RUN_ID = re.compile(r"[0-9a-f-]{8,64}")
+
+# Gesetzt im Kontext des Crawl-Tasks — davon erzeugte Tasks erben ihn
+_profiled: contextvars.ContextVar[bool] = contextvars.ContextVar("wsb_profiled", default=False)
+
+
+def _label(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{frame.f_code.co_qualname}"
+
+
+def _phase(labels: list[str]) -> str:
+    for label in reversed(labels):
+        phase = _PHASES.get(label)
+        if phase is not None:
+            return phase
+    return "other"
+
+
+def _thread_stack(frame: FrameType | None) -> list[FrameType]:
+    """Sync-Stack eines Threads, von außen nach innen."""
+    frames: list[FrameType] = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+
+def _awaited(obj: Any) -> Any:
+    """Das Objekt, auf das eine Coroutine bzw. ein Async-Generator wartet."""
+    for attr in ("cr_await", "ag_await", "gi_yieldfrom"):
+        if hasattr(obj, attr):
+            return getattr(obj, attr)
+    # async_generator_asend (``async for``) und FutureIter (``await future``)
+    # geben Generator bzw. Future nur über den GC preis
+    for ref in gc.get_referents(obj):
+        if hasattr(ref, "ag_frame") or isinstance(ref, asyncio.Future):
+            return ref
+    return None
+
+
+def _async_stack(task: asyncio.Task[Any]) -> tuple[list[FrameType], Any, bool]:
+    """Async Stack eines Tasks: (Frames außen → innen, wartendes Objekt, läuft gerade)."""
+    frames: list[FrameType] = []
+    obj: Any = task.get_coro()
+    running = bool(getattr(obj, "cr_running", False))
+    for _ in range(MAX_STACK_DEPTH):
+        if obj is None or isinstance(obj, asyncio.Future):
+            break
+        frame = getattr(obj, "cr_frame", None) or getattr(obj, "ag_frame", None)
+        if frame is None:
+            frame = getattr(obj, "gi_frame", None)
+        if frame is not None:
+            frames.append(frame)
+        obj = _awaited(obj)
+    return frames, obj, running
+
+
+def _await_category(labels: list[str], leaf: Any) -> str | None:
+    """Wartegrund eines Tasks — ``None``, wenn er nur auf andere Tasks wartet."""
+    if isinstance(leaf, asyncio.Task) or type(leaf).__name__ == "_GatheringFuture":
+        return None  # die Kinder-Tasks werden selbst gesampelt
+    for label in reversed(labels):
+        category = _AWAIT_CATEGORIES.get(label.split(".", 1)[0])
+        if category is not None:
+            return category
+        if label.startswith("asyncio.threads."):
+            return "thread"
+        if label == "asyncio.tasks.sleep":
+            return "sleep"
+        if label.startswith(("asyncio.queues.", "asyncio.locks.")):
+            return "wait"
+    return "await" if leaf is not None else "ready"
+
+
+def _is_idle(frames: list[FrameType]) -> bool:
+    """Thread blockiert in einem Warte-Aufruf (Queue, Lock, Selector)?"""
+    if not frames:
+        return True
+    top = frames[-1]
+    module = top.f_globals.get("__name__", "")
+    return module in ("threading", "queue", "selectors") or (
+        module == "concurrent.futures.thread" and top.f_code.co_name == "_worker"
+    )
+
+
+def _folded(frames: list[FrameType]) -> list[str]:
+    return [_label(f).replace(";", ":") for f in frames[-MAX_STACK_DEPTH:]]
+
+
+@dataclass
+class Profile:
+    """Gesammelte Samples eines Laufs."""
+
+    started_at: datetime
+    interval: float
+    run_id: str | None = None
+    duration: float = 0.0
+    stacks: Counter[str] = field(default_factory=Counter)
+    loop: Counter[str] = field(default_factory=Counter)  # Phase bzw. "idle"
+    awaits: Counter[tuple[str, str]] = field(default_factory=Counter)  # (Phase, Kategorie)
+    threads: Counter[str] = field(default_factory=Counter)
+    lags: list[float] = field(default_factory=list)  # Sekunden
+
+    def folded(self) -> str:
+        """Collapsed-Stack-Format: ``frame;frame;… anzahl`` pro Zeile."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _seconds(self, samples: int) -> float:
+        return round(samples * self.interval, 3)
+
+    def summary(self) -> dict[str, Any]:
+        lags_ms = sorted(lag * 1000 for lag in self.lags)
+        awaits: dict[str, dict[str, float]] = {}
+        for (phase, category), count in sorted(self.awaits.items()):
+            awaits.setdefault(phase, {})[category] = self._seconds(count)
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(),
+            "duration_seconds": round(self.duration, 3),
+            "sample_interval_ms": self.interval * 1000,
+            "samples": sum(self.loop.values()),
+            # Event-Loop-Thread: Rechenzeit pro Phase, "idle" = wartet auf I/O
+            "loop_seconds": {k: self._seconds(v) for k, v in self.loop.most_common()},
+            # Wartezeit der Tasks (summiert über parallele Tasks)
+            "await_seconds": awaits,
+            "thread_seconds": {k: self._seconds(v) for k, v in self.threads.most_common()},
+            "loop_lag": {
+                "checks": len(lags_ms),
+                "mean_ms": round(statistics.fmean(lags_ms), 2) if lags_ms else 0.0,
+                "p99_ms": round(lags_ms[int(len(lags_ms) * 0.99)], 2) if lags_ms else 0.0,
+                "max_ms": round(lags_ms[-1], 2) if lags_ms else 0.0,
+                "over_threshold": sum(1 for lag in lags_ms if lag >= LOOP_LAG_WARN_MS),
+                "threshold_ms": LOOP_LAG_WARN_MS,
+            },
+        }
+
+
+class CrawlProfiler:
+    """Sampling-Profiler für einen Crawl-Lauf.
+
+    ``start()`` im Event-Loop aufrufen, den Crawl-Task mit ``context()``
+    erzeugen, am Ende ``await stop()``.
+    """
+
+    def __init__(
+        self,
+        interval: float = PROFILE_SAMPLE_INTERVAL_SECONDS,
+        lag_interval: float = LOOP_LAG_INTERVAL_SECONDS,
+    ) -> None:
+        self.profile = Profile(started_at=datetime.now(tz=UTC), interval=interval)
+        self._lag_interval = lag_interval
+        self._tasks: set[asyncio.Task[Any]] = set()
+        self._lock = threading.Lock()  # _tasks wird vom Sampler-Thread gelesen
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lag_task: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._previous_factory: Any = None
+        self._factory: Any = None
+        self._started = 0.0
+
+    @property
+    def run_id(self) -> str | None:
+        return self.profile.run_id
+
+    @run_id.setter
+    def run_id(self, value: str) -> None:
+        self.profile.run_id = value
+
+    def context(self) -> contextvars.Context:
+        """Kontext für den Crawl-Task: er und alle seine Kinder werden gesampelt."""
+        context = contextvars.copy_context()
+        context.run(_profiled.set, True)
+        return context
+
+    def _track(self, task: asyncio.Task[Any]) -> None:
+        with self._lock:
+            self._tasks.add(task)
+        task.add_done_callback(self._untrack)
+
+    def _untrack(self, task: asyncio.Task[Any]) -> None:
+        with self._lock:
+            self._tasks.discard(task)
+
+    def _install_factory(self, loop: asyncio.AbstractEventLoop) -> None:
+        previous = loop.get_task_factory()
+
+        def _factory(
+            loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any
+        ) -> asyncio.Future[Any]:
+            if previous is not None:
+                task = previous(loop, coro, **kwargs)
+            else:
+                task = asyncio.Task(coro, loop=loop, **kwargs)
+            context = kwargs.get("context")
+            profiled = context.get(_profiled) if context is not None else _profiled.get()
+            if profiled and isinstance(task, asyncio.Task):
+                self._track(task)
+            return task
+
+        self._previous_factory = previous
+        self._factory = _factory
+        loop.set_task_factory(_factory)
+
+    def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._install_factory(loop)
+        self._started = time.perf_counter()
+        self._lag_task = loop.create_task(self._watch_loop_lag())
+        loop_thread = threading.get_ident()
+        self._thread = threading.Thread(
+            target=self._run, args=(loop_thread,), name="wsb-profiler", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> Profile:
+        self._stopped.set()
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+        loop = self._loop
+        if loop is not None and loop.get_task_factory() is self._factory:
+            loop.set_task_factory(self._previous_factory)
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+        self.profile.duration = time.perf_counter() - self._started
+        return self.profile
+
+    async def _watch_loop_lag(self) -> None:
+        """Misst, wie viel später als geplant der Loop einen Sleep aufweckt."""
+        while True:
+            expected = time.perf_counter() + self._lag_interval
+            await asyncio.sleep(self._lag_interval)
+            self.profile.lags.append(max(0.0, time.perf_counter() - expected))
+
+    def _run(self, loop_thread: int) -> None:
+        own = threading.get_ident()
+        while not self._stopped.wait(self.profile.interval):
+            try:
+                self._sample(loop_thread, own)
+            except Exception:
+                continue  # Ein Sample darf den Lauf nie stören
+
+    def _sample(self, loop_thread: int, own: int) -> None:
+        profile = self.profile
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, top in sys._current_frames().items():
+            if ident == own:
+                continue
+            frames = _thread_stack(top)
+            if ident == loop_thread:
+                self._sample_loop(frames)
+                continue
+            if _is_idle(frames):
+                continue
+            labels = _folded(frames)
+            if any(label.startswith("aiosqlite.") for label in labels):
+                name = "sqlite"
+            else:
+                name = names.get(ident, "thread")
+                name = "executor" if name.startswith("asyncio_") else name
+            profile.threads[name] += 1
+            profile.stacks[";".join(["thread", name, *labels])] += 1
+
+        with self._lock:
+            tasks = list(self._tasks)
+        for task in tasks:
+            frames, leaf, running = _async_stack(task)
+            if running or task.done():
+                continue  # läuft gerade → steckt im Loop-Stack
+            labels = _folded(frames)
+            category = _await_category(labels, leaf)
+            if category is None:
+                continue
+            phase = _phase(labels)
+            profile.awaits[(phase, category)] += 1
+            profile.stacks[";".join(["await", phase, category, *labels])] += 1
+
+    def _sample_loop(self, frames: list[FrameType]) -> None:
+        profile = self.profile
+        if _is_idle(frames):
+            profile.loop["idle"] += 1
+            profile.stacks["loop;idle"] += 1
+            return
+        labels = _folded(frames)
+        # Loop-Maschinerie (run_forever → Handle._run) abschneiden
+        for i, label in enumerate(labels):
+            if label == "asyncio.events.Handle._run":
+                labels = labels[i + 1 :]
+                break
+        phase = _phase(labels)
+        profile.loop[phase] += 1
+        profile.stacks[";".join(["loop", phase, *labels])] += 1
+
+
+# ── Ablage ─────────────────────────────────────────────────────────────────
+
+
+def _valid_run_id(run_id: str) -> bool:
+    return _RUN_ID.fullmatch(run_id) is not None
+
+
+def save_profile(profile: Profile, directory: Path | None = None) -> Path | None:
+    """Schreibt ``<run_id>.folded`` und ``<run_id>.json``; ältere Profile über
+    ``PROFILE_KEEP`` werden gelöscht. Synchron — aus dem Loop per to_thread."""
+    if profile.run_id is None or not _valid_run_id(profile.run_id):
+        return None
+    directory = directory or PROFILES_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    folded = directory / f"{profile.run_id}.folded"
+    folded.write_text(profile.folded(), encoding="utf-8")
+    (directory / f"{profile.run_id}.json").write_text(
+        json.dumps(profile.summary(), indent=2), encoding="utf-8"
+    )
+    summaries = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+    for old in summaries[PROFILE_KEEP:]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".folded").unlink(missing_ok=True)
+    return folded
+
+
+def profile_path(run_id: str, directory: Path | None = None) -> Path | None:
+    """Collapsed-Stacks eines Laufs, falls er profiliert wurde."""
+    if not _valid_run_id(run_id):
+        return None
+    path = (directory or PROFILES_DIR) / f"{run_id}.folded"
+    return path if path.is_file() else None
+
+
+def load_profile_summary(run_id: str, directory: Path | None = None) -> dict[str, Any] | None:
+    if not _valid_run_id(run_id):
+        return None
+    path = (directory or PROFILES_DIR) / f"{run_id}.json"
+    try:
+        summary: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return summary
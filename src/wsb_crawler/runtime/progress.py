@@ -2,76 +2,207 @@
 
 Der Fortschritt ist bewusst runtime-only: nach Container-Neustart ist er weg,
 aber während eines langen Laufs kann /api/status dadurch Details liefern.
+
+Das Modell ist unveränderlich (frozen Dataclasses, Copy-on-Write): jede
+Änderung erzeugt einen neuen ``RunProgress`` mit höherer ``version``, nicht
+geänderte Teile (Steps, Diagnosen, Subreddits) werden geteilt. ``current()``
+liefert damit eine O(1)-Referenz, ``changes_since(n)`` nur die seit Version n
+geänderten Felder. Summen über die Subreddits werden inkrementell gepflegt.
+
+Jede Änderung benachrichtigt registrierte Listener (z.B. den Status-Hub für
+den Dashboard-WebSocket), statt dass Clients pollen müssen.
 """
 
 from __future__ import annotations
 
-from copy import deepcopy
+from collections import deque
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
 from typing import Any
 
-_current_run: dict[str, Any] | None = None
-_last_run: dict[str, Any] | None = None
+# Wie viele Änderungs-Einträge für changes_since() vorgehalten werden
+CHANGE_LOG_SIZE = 256
+MAX_DIAGNOSTICS = 20
+
+_STEPS: tuple[tuple[str, str], ...] = (
+    ("starting", "Start"),
+    ("reddit", "Reddit lesen"),
+    ("extract", "Ticker erkennen"),
+    ("save", "Daten speichern"),
+    ("analysis", "Spikes analysieren"),
+    ("enrich", "Kurse & News"),
+    ("alerts", "Alerts senden"),
+    ("cleanup", "Aufräumen"),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Step:
+    key: str
+    label: str
+    done: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    at: str
+    level: str
+    source: str | None
+    message: str
+
+
+@dataclass(frozen=True, slots=True)
+class SubredditProgress:
+    posts: int = 0
+    comments: int = 0
+    done: bool = False
+    error: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class RunProgress:
+    """Unveränderlicher Zustand eines Laufs in einer bestimmten Version."""
+
+    run_id: str
+    version: int
+    started_at: str
+    updated_at: str
+    subreddits: tuple[str, ...]
+    dry_run: bool = False
+    active: bool = True
+    success: bool | None = None
+    phase: str = "starting"
+    phase_label: str = "Start"
+    message: str = "Crawl wird vorbereitet…"
+    progress: int = 2
+    finished_at: str | None = None
+    duration_s: float = 0.0
+    # Wird nur per Copy-on-Write ersetzt, nie verändert
+    subreddit_progress: Mapping[str, SubredditProgress] = field(default_factory=dict)
+    subreddits_done: int = 0
+    posts_scanned: int = 0
+    comments_scanned: int = 0
+    tickers_found: int = 0
+    candidate_count: int = 0
+    active_candidate_count: int = 0
+    alerts_enqueued: int = 0  # in die Outbox gestellt; zugestellt wird danach
+    alert_preview: tuple[Any, ...] = ()
+    diagnostics: tuple[Diagnostic, ...] = ()
+    top_tickers: tuple[Any, ...] = ()
+    steps: tuple[Step, ...] = ()
+
+    @property
+    def short_id(self) -> str:
+        return self.run_id[:8]
+
+    def field_value(self, name: str) -> Any:
+        """JSON-taugliche Darstellung eines Feldes (wie in ``to_dict``)."""
+        value = getattr(self, name)
+        if name == "subreddit_progress":
+            return {
+                sub: {"posts": p.posts, "comments": p.comments, "done": p.done, "error": p.error}
+                for sub, p in value.items()
+            }
+        if name == "steps":
+            return [{"key": s.key, "label": s.label, "done": s.done} for s in value]
+        if name == "diagnostics":
+            return [
+                {"at": d.at, "level": d.level, "source": d.source, "message": d.message}
+                for d in value
+            ]
+        if isinstance(value, tuple):
+            return list(value)
+        return value
+
+    def to_dict(self) -> dict[str, Any]:
+        data = {name: self.field_value(name) for name in _FIELDS}
+        data["short_id"] = self.short_id
+        return data
+
+
+_FIELDS = tuple(RunProgress.__dataclass_fields__)
+
+_current_run: RunProgress | None = None
+_last_run: RunProgress | None = None
+_version = 0
+# (version, geänderte Felder) — "*" = kompletter Neuaufbau (neuer Lauf)
+_changes: deque[tuple[int, frozenset[str]]] = deque(maxlen=CHANGE_LOG_SIZE)
+# to_dict() wird pro Version nur einmal gebaut
+_dict_cache: tuple[int, dict[str, Any]] | None = None
+_listeners: list[Callable[[], None]] = []
+
+
+def add_listener(callback: Callable[[], None]) -> None:
+    """Registriert einen Callback, der bei jeder Fortschritts-Änderung aufgerufen wird."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def remove_listener(callback: Callable[[], None]) -> None:
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def _publish() -> None:
+    for callback in list(_listeners):
+        callback()
 
 
 def _now_iso() -> str:
     return datetime.now(tz=UTC).isoformat()
 
 
+def _next_version(changed: frozenset[str]) -> int:
+    global _version
+    _version += 1
+    _changes.append((_version, changed))
+    return _version
+
+
+def _apply(changes: dict[str, Any]) -> None:
+    """Neue Version des aktuellen Laufs mit den geänderten Feldern.
+
+    ``progress`` steigt nur: Einheiten und Analyse-Durchgänge laufen
+    überlappend, ein später Durchgang darf den Balken nicht zurücksetzen.
+    """
+    global _current_run
+    if _current_run is None:
+        return
+    if "progress" in changes:
+        changes["progress"] = max(_current_run.progress, changes["progress"])
+    changes.setdefault("updated_at", _now_iso())
+    version = _next_version(frozenset(changes))
+    _current_run = replace(_current_run, version=version, **changes)
+    _publish()
+
+
 def start_run(run_id: str, subreddits: list[str], *, dry_run: bool = False) -> None:
     """Startet einen neuen Progress-Snapshot."""
     global _current_run
     now = _now_iso()
-    _current_run = {
-        "run_id": run_id,
-        "short_id": run_id[:8],
-        "active": True,
-        "success": None,
-        "dry_run": dry_run,
-        "phase": "starting",
-        "phase_label": "Start",
-        "message": "Crawl wird vorbereitet…",
-        "progress": 2,
-        "started_at": now,
-        "updated_at": now,
-        "finished_at": None,
-        "duration_s": 0.0,
-        "subreddits": subreddits,
-        "subreddit_progress": {
-            sub: {"posts": 0, "comments": 0, "done": False, "error": None} for sub in subreddits
-        },
-        "posts_scanned": 0,
-        "comments_scanned": 0,
-        "tickers_found": 0,
-        "candidate_count": 0,
-        "active_candidate_count": 0,
-        "alerts_sent": 0,
-        "alert_preview": [],
-        "diagnostics": [],
-        "top_tickers": [],
-        "steps": [
-            {"key": "starting", "label": "Start", "done": False},
-            {"key": "reddit", "label": "Reddit lesen", "done": False},
-            {"key": "extract", "label": "Ticker erkennen", "done": False},
-            {"key": "save", "label": "Daten speichern", "done": False},
-            {"key": "analysis", "label": "Spikes analysieren", "done": False},
-            {"key": "enrich", "label": "Kurse & News", "done": False},
-            {"key": "alerts", "label": "Alerts senden", "done": False},
-            {"key": "cleanup", "label": "Aufräumen", "done": False},
-        ],
-    }
+    _current_run = RunProgress(
+        run_id=run_id,
+        version=_next_version(frozenset({"*"})),
+        started_at=now,
+        updated_at=now,
+        subreddits=tuple(subreddits),
+        dry_run=dry_run,
+        subreddit_progress={sub: SubredditProgress() for sub in subreddits},
+        steps=tuple(Step(key, label) for key, label in _STEPS),
+    )
+    _publish()
 
 
-def _mark_done_until(phase: str) -> None:
-    if _current_run is None:
-        return
-    seen = False
-    for step in _current_run["steps"]:
-        if step["key"] == phase:
-            seen = True
-            step["done"] = False
-        elif not seen:
-            step["done"] = True
+def _steps_until(steps: tuple[Step, ...], phase: str) -> tuple[Step, ...]:
+    """Alle Steps vor ``phase`` erledigt, ``phase`` und folgende offen."""
+    keys = [s.key for s in steps]
+    if phase not in keys:
+        return tuple(s if s.done else replace(s, done=True) for s in steps)
+    index = keys.index(phase)
+    return tuple(
+        s if s.done == (i < index) else replace(s, done=i < index) for i, s in enumerate(steps)
+    )
 
 
 def update_run(
@@ -85,36 +216,32 @@ def update_run(
     """Aktualisiert den aktuellen Lauf."""
     if _current_run is None:
         return
+    changes: dict[str, Any] = {}
     if phase is not None:
-        _current_run["phase"] = phase
-        _mark_done_until(phase)
+        changes["phase"] = phase
+        changes["steps"] = _steps_until(_current_run.steps, phase)
     if phase_label is not None:
-        _current_run["phase_label"] = phase_label
+        changes["phase_label"] = phase_label
     if message is not None:
-        _current_run["message"] = message
+        changes["message"] = message
     if progress is not None:
-        _current_run["progress"] = max(0, min(100, progress))
+        changes["progress"] = max(0, min(100, progress))
     for key, value in metrics.items():
-        _current_run[key] = value
-    _current_run["updated_at"] = _now_iso()
-    _current_run["duration_s"] = _duration_seconds(_current_run.get("started_at"))
+        changes[key] = tuple(value) if isinstance(value, list) else value
+    _apply(changes)
+
+
+def _with_diagnostic(level: str, message: str, source: str | None) -> tuple[Diagnostic, ...]:
+    assert _current_run is not None
+    entry = Diagnostic(at=_now_iso(), level=level.upper(), source=source, message=message)
+    return (*_current_run.diagnostics, entry)[-MAX_DIAGNOSTICS:]
 
 
 def add_diagnostic(level: str, message: str, *, source: str | None = None) -> None:
     """Hängt eine Warnung/Fehlermeldung an den aktuellen Lauf an."""
     if _current_run is None:
         return
-    diagnostics = _current_run.setdefault("diagnostics", [])
-    diagnostics.append(
-        {
-            "at": _now_iso(),
-            "level": level.upper(),
-            "source": source,
-            "message": message,
-        }
-    )
-    del diagnostics[:-20]
-    update_run()
+    _apply({"diagnostics": _with_diagnostic(level, message, source)})
 
 
 def update_subreddit(
@@ -126,59 +253,117 @@ def update_subreddit(
     error: str | None = None,
 ) -> None:
     """Aktualisiert den Fortschritt eines einzelnen Subreddits."""
-    if _current_run is None:
+    run = _current_run
+    if run is None:
         return
-    progress = _current_run.setdefault("subreddit_progress", {})
-    progress[subreddit] = {
-        "posts": posts,
-        "comments": comments,
-        "done": done,
-        "error": error,
+    previous = run.subreddit_progress.get(subreddit, SubredditProgress())
+    entry = SubredditProgress(posts=posts, comments=comments, done=done, error=error)
+    subreddit_progress = {**run.subreddit_progress, subreddit: entry}
+    # Summen per Delta statt über alle Subreddits neu zu zählen
+    done_count = run.subreddits_done + int(done) - int(previous.done)
+    changes: dict[str, Any] = {
+        "subreddit_progress": subreddit_progress,
+        "subreddits_done": done_count,
+        "posts_scanned": run.posts_scanned + posts - previous.posts,
+        "comments_scanned": run.comments_scanned + comments - previous.comments,
+        "phase": "reddit",
+        "phase_label": "Reddit lesen",
+        "steps": _steps_until(run.steps, "reddit"),
+        "message": f"r/{subreddit}: {posts} Posts, {comments} Kommentare gelesen",
+        "progress": 10 + int((done_count / max(1, len(subreddit_progress))) * 30),
     }
     if error:
-        add_diagnostic("error", error, source=f"r/{subreddit}")
-    _current_run["posts_scanned"] = sum(int(v.get("posts", 0)) for v in progress.values())
-    _current_run["comments_scanned"] = sum(int(v.get("comments", 0)) for v in progress.values())
-    done_count = sum(1 for v in progress.values() if v.get("done"))
-    total = max(1, len(progress))
-    update_run(
-        phase="reddit",
-        phase_label="Reddit lesen",
-        message=f"r/{subreddit}: {posts} Posts, {comments} Kommentare gelesen",
-        progress=10 + int((done_count / total) * 30),
-    )
+        changes["diagnostics"] = _with_diagnostic("error", error, f"r/{subreddit}")
+    _apply(changes)
 
 
-def finish_run(*, success: bool, message: str, alerts_sent: int | None = None) -> None:
+def finish_run(*, success: bool, message: str, alerts_enqueued: int | None = None) -> None:
     """Schließt den aktuellen Progress-Snapshot ab."""
     global _current_run, _last_run
-    if _current_run is None:
+    run = _current_run
+    if run is None:
         return
-    if alerts_sent is not None:
-        _current_run["alerts_sent"] = alerts_sent
+    now = _now_iso()
+    changes: dict[str, Any] = {
+        "active": False,
+        "success": success,
+        "finished_at": now,
+        "updated_at": now,
+        "duration_s": _duration_seconds(run.started_at),
+        "progress": 100 if success else run.progress,
+        "phase": "done" if success else "failed",
+        "phase_label": "Abgeschlossen" if success else "Fehler",
+        "message": message,
+        "steps": tuple(s if s.done == success else replace(s, done=success) for s in run.steps),
+    }
+    if alerts_enqueued is not None:
+        changes["alerts_enqueued"] = alerts_enqueued
     if not success:
-        add_diagnostic("error", message, source="crawl")
-    _current_run["active"] = False
-    _current_run["success"] = success
-    _current_run["finished_at"] = _now_iso()
-    _current_run["updated_at"] = _current_run["finished_at"]
-    _current_run["duration_s"] = _duration_seconds(_current_run.get("started_at"))
-    _current_run["progress"] = 100 if success else _current_run.get("progress", 0)
-    _current_run["phase"] = "done" if success else "failed"
-    _current_run["phase_label"] = "Abgeschlossen" if success else "Fehler"
-    _current_run["message"] = message
-    for step in _current_run.get("steps", []):
-        step["done"] = success
-    _last_run = deepcopy(_current_run)
+        changes["diagnostics"] = _with_diagnostic("error", message, "crawl")
+    _apply(changes)
+    _last_run = _current_run
     _current_run = None
 
 
+def current() -> RunProgress | None:
+    """Aktueller oder zuletzt abgeschlossener Lauf als unveränderliche Referenz."""
+    return _current_run if _current_run is not None else _last_run
+
+
+def version() -> int:
+    return _version
+
+
+def _cached_dict(run: RunProgress) -> dict[str, Any]:
+    global _dict_cache
+    if _dict_cache is None or _dict_cache[0] != run.version:
+        _dict_cache = (run.version, run.to_dict())
+    return _dict_cache[1]
+
+
 def snapshot() -> dict[str, Any] | None:
-    """Gibt den aktuellen oder zuletzt abgeschlossenen Lauf zurück."""
-    if _current_run is not None:
-        update_run()
-        return deepcopy(_current_run)
-    return deepcopy(_last_run) if _last_run is not None else None
+    """Gibt den aktuellen oder zuletzt abgeschlossenen Lauf zurück.
+
+    Die Dict-Darstellung wird pro Version einmal gebaut und danach geteilt —
+    Aufrufer dürfen sie nicht verändern. Nur ``duration_s`` wird für laufende
+    Crawls frisch berechnet (ohne neue Version, sonst würde jeder
+    Status-Abruf selbst wieder eine Änderung melden).
+    """
+    run = current()
+    if run is None:
+        return None
+    data = _cached_dict(run)
+    if run.active:
+        data = {**data, "duration_s": _duration_seconds(run.started_at)}
+    return data
+
+
+def changes_since(since: int) -> dict[str, Any]:
+    """Nur die seit Version ``since`` geänderten Felder.
+
+    ``full=True`` (mit komplettem ``run``), wenn dazwischen ein neuer Lauf
+    begann oder die Änderungshistorie nicht weit genug zurückreicht.
+    """
+    run = current()
+    if run is None:
+        return {"version": _version, "full": True, "run": None}
+    if since >= run.version:
+        return {"version": run.version, "full": False, "changes": {}}
+
+    changed: set[str] = set()
+    oldest = _changes[0][0] if _changes else run.version
+    for entry_version, fields in reversed(_changes):
+        if entry_version <= since:
+            break
+        changed |= fields
+    if "*" in changed or since < oldest - 1:
+        return {"version": run.version, "full": True, "run": snapshot()}
+
+    data = snapshot() or {}
+    keys = changed & data.keys()
+    if run.active:
+        keys.add("duration_s")
+    return {"version": run.version, "full": False, "changes": {k: data[k] for k in keys}}
 
 
 def _duration_seconds(started_at: str | None) -> float:
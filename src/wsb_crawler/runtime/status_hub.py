@@ -0,0 +1,165 @@
+"""Publish/Subscribe-Hub für den Live-Status des Dashboards.
+
+Statt pro WebSocket-Client jede Sekunde den kompletten Status aus der DB zu
+bauen, berechnet genau ein Producer-Task den Payload — und nur, wenn sich
+etwas geändert haben kann:
+
+- ``progress.py`` (Crawl-Fortschritt) und schreibende DB-Methoden rufen
+  ``notify()`` auf,
+- während ein Crawl läuft zusätzlich einmal pro Sekunde (Laufzeit tickt),
+- sonst alle 30 s als Heartbeat (z.B. für ``next_run_at``).
+
+Clients bekommen beim Verbinden einen ``snapshot`` und danach nur noch
+``patch``-Nachrichten mit JSON-Patch-Operationen (RFC 6902: add/replace/remove).
+Die Last ist damit unabhängig von der Anzahl verbundener Clients.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+PayloadBuilder = Callable[[], Awaitable[dict[str, Any]]]
+
+# Mindestabstand zwischen zwei Berechnungen (bündelt Event-Bursts)
+MIN_INTERVAL_SECONDS = 0.25
+ACTIVE_TICK_SECONDS = 1.0
+IDLE_TICK_SECONDS = 30.0
+# Langsame Clients verlieren Patches → bekommen danach einen frischen Snapshot
+CLIENT_QUEUE_SIZE = 32
+
+
+def _escape(key: str) -> str:
+    return key.replace("~", "~0").replace("/", "~1")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> list[dict[str, Any]]:
+    """Minimaler JSON-Patch von old nach new. Listen werden als Ganzes ersetzt."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: list[dict[str, Any]] = []
+        for key in old.keys() - new.keys():
+            ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+    if old == new and type(old) is type(new):
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+class _Subscriber:
+    __slots__ = ("queue", "needs_snapshot")
+
+    def __init__(self) -> None:
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.needs_snapshot = True
+
+
+class StatusHub:
+    """Ein Producer, beliebig viele Abonnenten."""
+
+    def __init__(self, builder: PayloadBuilder) -> None:
+        self._builder = builder
+        self._subscribers: set[_Subscriber] = set()
+        self._payload: dict[str, Any] | None = None
+        self._dirty: asyncio.Event | None = None
+        self._producer: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def pending_messages(self) -> int:
+        """Noch nicht an Clients geschickte Nachrichten (für ``wsb_queue_depth``)."""
+        return sum(sub.queue.qsize() for sub in self._subscribers)
+
+    def notify(self) -> None:
+        """Signalisiert eine mögliche Status-Änderung (auch aus anderen Threads)."""
+        loop, dirty = self._loop, self._dirty
+        if loop is None or dirty is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            dirty.set()
+        else:
+            loop.call_soon_threadsafe(dirty.set)
+
+    def _ensure_producer(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._producer is not None and not self._producer.done() and self._loop is loop:
+            return
+        self._loop = loop
+        self._dirty = asyncio.Event()
+        self._payload = None
+        self._producer = loop.create_task(self._run())
+
+    async def subscribe(self) -> _Subscriber:
+        self._ensure_producer()
+        sub = _Subscriber()
+        self._subscribers.add(sub)
+        if self._payload is not None:
+            self._deliver(sub, self._payload, [])
+        else:
+            self.notify()
+        return sub
+
+    def unsubscribe(self, sub: _Subscriber) -> None:
+        self._subscribers.discard(sub)
+        if not self._subscribers and self._producer is not None:
+            self._producer.cancel()
+            self._producer = None
+
+    def _deliver(
+        self, sub: _Subscriber, payload: dict[str, Any], ops: list[dict[str, Any]]
+    ) -> None:
+        if sub.needs_snapshot:
+            message: dict[str, Any] = {"type": "snapshot", "data": payload}
+        elif ops:
+            message = {"type": "patch", "ops": ops}
+        else:
+            return
+        try:
+            sub.queue.put_nowait(message)
+            sub.needs_snapshot = False
+        except asyncio.QueueFull:
+            # Client hängt hinterher — verworfene Patches per Snapshot ersetzen
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+            sub.queue.put_nowait({"type": "snapshot", "data": payload})
+            sub.needs_snapshot = False
+
+    async def publish_once(self) -> None:
+        """Payload einmal berechnen und als Diff an alle Abonnenten verteilen."""
+        payload = await self._builder()
+        ops = json_diff(self._payload, payload) if self._payload is not None else []
+        self._payload = payload
+        for sub in list(self._subscribers):
+            self._deliver(sub, payload, ops)
+
+    async def _run(self) -> None:
+        assert self._dirty is not None
+        dirty = self._dirty
+        while True:
+            try:
+                await self.publish_once()
+            except Exception as e:
+                logger.debug(f"Status-Hub: Payload konnte nicht berechnet werden: {e}")
+            active = bool(self._payload and self._payload.get("crawl_running"))
+            timeout = ACTIVE_TICK_SECONDS if active else IDLE_TICK_SECONDS
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(dirty.wait(), timeout=timeout)
+            dirty.clear()
+            await asyncio.sleep(MIN_INTERVAL_SECONDS)
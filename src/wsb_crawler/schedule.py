@@ -0,0 +1,253 @@
+"""
+Zeitplanung der Crawls: nächster Laufzeitpunkt je Zeitsteuerungs-Modus.
+
+- ``interval``: alle ``crawl_interval_minutes`` ab Laufende.
+- ``cron``: feste Zeiten laut Cron-Ausdruck, ausgewertet auf der Wanduhr von
+  ``schedule_timezone`` (IANA, DST-bewusst).
+- ``market``: richtet sich nach dem Börsenkalender (``market_calendar``):
+  an Handelstagen von Pre-Market-Beginn bis Handelsschluss alle
+  ``market_dense_minutes``, sonst (Nacht, Wochenende, Feiertag) alle
+  ``market_sparse_minutes`` — aber nie über den nächsten Pre-Market-Beginn
+  hinaus, damit die dichte Phase pünktlich startet.
+- ``adaptive``: Abstand aus der Aktivität der letzten Läufe (Nennungen pro
+  Minute im Vergleich zum Median, Alert-Kandidaten) und dem Reddit-Rate-Limit,
+  begrenzt auf ``adaptive_min_minutes`` … ``adaptive_max_minutes``.
+  Ausgangswert bei normaler Aktivität ist ``crawl_interval_minutes``.
+
+Der Scheduler hält jede Entscheidung samt Begründung fest
+(``record_decision``); ``/api/status`` liefert sie unter ``schedule`` aus.
+
+Ungültige Einstellungen fallen sicher aufs Intervall zurück.
+"""
+
+from __future__ import annotations
+
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from loguru import logger
+
+from wsb_crawler.config import Settings
+from wsb_crawler.crawler.reddit import last_rate_limit
+from wsb_crawler.cron import next_run as cron_next_run
+from wsb_crawler.market_calendar import ExchangeCalendar, load_calendar
+from wsb_crawler.models import RateLimitState, RunActivity
+
+if TYPE_CHECKING:
+    from wsb_crawler.storage.base import Storage
+
+SCHEDULE_MODES = ("interval", "cron", "market", "adaptive")
+
+# Adaptive Zeitplanung
+ADAPTIVE_HISTORY_RUNS = 24  # Basis für den Median der Nennungen pro Minute
+ADAPTIVE_MIN_HISTORY = 3  # Läufe mit bekanntem Zeitfenster; darunter: Basisintervall
+ADAPTIVE_MIN_WINDOW_MINUTES = 1.0  # Untergrenze fürs Zeitfenster (direkt nacheinander)
+ACTIVITY_FACTOR_BOUNDS = (0.25, 8.0)
+CANDIDATE_WEIGHT = 0.5  # jeder Kandidat verkürzt um 50 % des Basisintervalls …
+CANDIDATE_FACTOR_MAX = 4.0  # … höchstens auf ein Viertel
+RATE_LIMIT_MIN_HEADROOM = 0.2  # darunter: nicht vor dem Reset des Fensters
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleDecision:
+    """Nächster Lauf samt Begründung (für Logs und die Status-API)."""
+
+    mode: str
+    decided_at: datetime
+    next_run_at: datetime
+    reasons: tuple[str, ...] = ()
+    signals: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "decided_at": self.decided_at.isoformat(),
+            "next_run_at": self.next_run_at.isoformat(),
+            "interval_minutes": round((self.next_run_at - self.decided_at).total_seconds() / 60, 1),
+            "reasons": list(self.reasons),
+            "signals": self.signals,
+        }
+
+
+_last_decision: ScheduleDecision | None = None
+
+
+def record_decision(decision: ScheduleDecision) -> None:
+    global _last_decision
+    _last_decision = decision
+
+
+def last_decision() -> ScheduleDecision | None:
+    """Letzte Entscheidung des Schedulers (None, solange er noch nicht geplant hat)."""
+    return _last_decision
+
+
+def market_next_run(
+    calendar: ExchangeCalendar,
+    now: datetime,
+    dense_minutes: int,
+    sparse_minutes: int,
+) -> datetime:
+    """Nächster Lauf im Markt-Modus (dicht in der Session, sonst dünn)."""
+    session = calendar.next_session(now)
+    if session is not None and session.contains(now):
+        # Letzter dichter Lauf genau zum Handelsschluss
+        return min(now + timedelta(minutes=dense_minutes), session.closes_at)
+    sparse_at = now + timedelta(minutes=sparse_minutes)
+    if session is not None and session.opens_at < sparse_at:
+        return session.opens_at
+    return sparse_at
+
+
+def describe_schedule(cfg: Settings) -> str:
+    """Kurzbeschreibung für Logs, z.B. 'Cron: 0 */2 * * * (Europe/Berlin)'."""
+    crawler = cfg.crawler
+    if crawler.schedule_mode == "cron" and crawler.cron_expression.strip():
+        return f"Cron: {crawler.cron_expression} ({crawler.schedule_timezone})"
+    if crawler.schedule_mode == "adaptive":
+        return (
+            f"Adaptiv: {crawler.adaptive_min_minutes}–{crawler.adaptive_max_minutes} Min. "
+            f"(Basis {crawler.crawl_interval_minutes} Min.)"
+        )
+    if crawler.schedule_mode == "market":
+        return (
+            f"Börsenzeiten {crawler.market_calendar}: alle {crawler.market_dense_minutes} Min. "
+            f"in der Session, sonst alle {crawler.market_sparse_minutes} Min."
+        )
+    return f"Intervall: {crawler.crawl_interval_minutes} Minuten"
+
+
+def next_run_at(cfg: Settings, now: datetime) -> datetime:
+    """Berechnet den nächsten Laufzeitpunkt je nach Zeitsteuerungs-Modus.
+
+    Cron-/Markt-Modus mit ungültigen Einstellungen fällt sicher aufs Intervall zurück.
+    Der adaptive Modus braucht die History (``plan_next_run``); hier gilt
+    ersatzweise das Basisintervall.
+    """
+    crawler = cfg.crawler
+    interval_at = now + timedelta(minutes=crawler.crawl_interval_minutes)
+    if crawler.schedule_mode == "cron" and crawler.cron_expression.strip():
+        try:
+            zone = ZoneInfo(crawler.schedule_timezone or "UTC")
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.error(f"Unbekannte Zeitzone '{crawler.schedule_timezone}' — nutze UTC")
+            zone = ZoneInfo("UTC")
+        try:
+            return cron_next_run(crawler.cron_expression.strip(), now, zone)
+        except ValueError as exc:
+            logger.error(f"Ungültiger Cron-Ausdruck '{crawler.cron_expression}': {exc} — Intervall")
+    if crawler.schedule_mode == "market":
+        try:
+            calendar = load_calendar(crawler.market_calendar)
+        except ValueError as exc:
+            logger.error(f"{exc} — Intervall")
+            return interval_at
+        return market_next_run(
+            calendar, now, crawler.market_dense_minutes, crawler.market_sparse_minutes
+        )
+    return interval_at
+
+
+def _mention_rates(history: list[RunActivity]) -> list[float]:
+    """Nennungen pro Minute je Lauf (neueste zuerst), ohne den ältesten Lauf."""
+    return [
+        run.mentions
+        / max(
+            (run.started_at - previous.started_at).total_seconds() / 60,
+            ADAPTIVE_MIN_WINDOW_MINUTES,
+        )
+        for run, previous in zip(history, history[1:], strict=False)
+    ]
+
+
+def decide_adaptive(
+    base_minutes: float,
+    min_minutes: float,
+    max_minutes: float,
+    history: list[RunActivity],
+    rate_limit: RateLimitState | None,
+    now: datetime,
+) -> tuple[float, list[str], dict[str, Any]]:
+    """Abstand bis zum nächsten Lauf → (Minuten, Begründungen, Eingangswerte).
+
+    ``history``: letzte Läufe, neueste zuerst. Verglichen werden Nennungen
+    pro Minute seit dem vorigen Lauf — die Abstände sind im adaptiven Modus
+    ungleich, ein Lauf nach 10 Minuten sammelt weniger als einer nach 60.
+    Der älteste Lauf dient nur als Beginn des ersten Zeitfensters.
+    """
+    reasons: list[str] = []
+    signals: dict[str, Any] = {"base_minutes": base_minutes, "history_runs": len(history)}
+    minutes = base_minutes
+    rates = _mention_rates(history)
+
+    if len(rates) < ADAPTIVE_MIN_HISTORY:
+        reasons.append(f"Nur {len(history)} Läufe in der History — Basisintervall")
+    else:
+        latest = history[0]
+        baseline = statistics.median(rates[1:])
+        ratio = rates[0] / baseline if baseline > 0 else 1.0
+        lo, hi = ACTIVITY_FACTOR_BOUNDS
+        activity = min(max(ratio, lo), hi)
+        minutes /= activity
+        signals.update(
+            mentions=latest.mentions,
+            mentions_per_minute=round(rates[0], 3),
+            baseline_per_minute=round(baseline, 3),
+            velocity=ratio,
+        )
+        reasons.append(
+            f"Nennungen {rates[0]:.1f}/Min. vs. Median {baseline:.1f}/Min. (×{ratio:.2f}) "
+            f"→ {base_minutes / activity:.0f} Min."
+        )
+        signals["candidates"] = latest.candidates
+        if latest.candidates:
+            factor = min(1 + CANDIDATE_WEIGHT * latest.candidates, CANDIDATE_FACTOR_MAX)
+            minutes /= factor
+            reasons.append(f"{latest.candidates} Alert-Kandidat(en) → ÷{factor:.1f}")
+
+    if minutes < min_minutes:
+        reasons.append(f"Untergrenze {min_minutes:.0f} Min.")
+        minutes = min_minutes
+    elif minutes > max_minutes:
+        reasons.append(f"Obergrenze {max_minutes:.0f} Min.")
+        minutes = max_minutes
+
+    if rate_limit is not None:
+        signals["ratelimit_remaining"] = rate_limit.remaining
+        signals["ratelimit_headroom"] = round(rate_limit.headroom, 3)
+        until_reset = (rate_limit.reset_at - now).total_seconds() / 60
+        if rate_limit.headroom < RATE_LIMIT_MIN_HEADROOM and until_reset > minutes:
+            minutes = min(until_reset, max_minutes)
+            reasons.append(
+                f"Reddit-Rate-Limit fast aufgebraucht ({rate_limit.remaining:.0f} frei) "
+                f"→ warte auf Reset ({until_reset:.0f} Min.)"
+            )
+    return minutes, reasons, signals
+
+
+async def plan_next_run(db: Storage, cfg: Settings, now: datetime) -> ScheduleDecision:
+    """Nächster Lauf mit Begründung; nur der adaptive Modus liest dafür die DB."""
+    crawler = cfg.crawler
+    if crawler.schedule_mode != "adaptive":
+        return ScheduleDecision(
+            mode=crawler.schedule_mode,
+            decided_at=now,
+            next_run_at=next_run_at(cfg, now),
+            reasons=(describe_schedule(cfg),),
+        )
+    lo = min(crawler.adaptive_min_minutes, crawler.adaptive_max_minutes)
+    hi = max(crawler.adaptive_min_minutes, crawler.adaptive_max_minutes)
+    base = min(max(crawler.crawl_interval_minutes, lo), hi)
+    # + letzter Lauf + Beginn des ältesten Zeitfensters
+    history = await db.get_recent_activity(cfg.alerts.min_abs, limit=ADAPTIVE_HISTORY_RUNS + 2)
+    minutes, reasons, signals = decide_adaptive(base, lo, hi, history, last_rate_limit(), now)
+    return ScheduleDecision(
+        mode="adaptive",
+        decided_at=now,
+        next_run_at=now + timedelta(minutes=minutes),
+        reasons=tuple(reasons),
+        signals=signals,
+    )
@@ -0,0 +1,176 @@
+"""
+Storage-Schnittstelle: was der Rest der App von der Datenbank erwartet.
+
+Zwei Implementierungen:
+- ``Database`` (storage/database.py): eine SQLite-Datei, Default
+- ``PostgresDatabase`` (storage/postgres.py): Postgres/TimescaleDB mit
+  Connection-Pool — mehrere Crawler-Knoten schreiben gleichzeitig
+
+Beide liefern dieselben Formen zurück (Zeitstempel als ISO-Strings in
+Dicts, Dataclasses aus models.py), Aufrufer merken vom Backend nichts.
+``create_storage`` wählt anhand von ``WSB_DATABASE_DSN``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+from wsb_crawler.models import (
+    Alert,
+    FeedEntry,
+    RunActivity,
+    RunStatus,
+    SymbolInfo,
+    TickerHistory,
+    TrendEntry,
+)
+from wsb_crawler.storage.database import Database
+from wsb_crawler.storage.postgres import PostgresDatabase
+
+
+class Storage(Protocol):
+    async def init(self) -> None: ...
+    async def close(self) -> None: ...
+    async def __aenter__(self) -> Storage: ...
+    async def __aexit__(self, *_: object) -> None: ...
+    def add_change_listener(self, callback: Callable[[], None]) -> None: ...
+
+    # Zähler
+    async def rebuild_stats(self) -> dict[str, int]: ...
+    async def get_stats(self) -> dict[str, int]: ...
+
+    # Crawl-Runs und Mentions
+    async def start_run(self, subreddits: list[str]) -> str: ...
+    async def finish_run(
+        self,
+        run_id: str,
+        posts_scanned: int,
+        comments_scanned: int,
+        is_healthy: bool = True,
+    ) -> None: ...
+    async def save_run_mentions(
+        self, run_id: str, counts: dict[str, int], subreddit: str = ""
+    ) -> None: ...
+    async def record_subreddit_crawl(
+        self,
+        subreddit: str,
+        run_id: str,
+        *,
+        posts_scanned: int = 0,
+        comments_scanned: int = 0,
+        tickers_found: int = 0,
+        error: str | None = None,
+    ) -> None: ...
+    async def get_subreddit_crawls(self) -> dict[str, dict[str, Any]]: ...
+    async def get_ticker_history(self, ticker: str, days: int = 30) -> TickerHistory: ...
+    async def get_daily_mention_totals(self, days: int = 14) -> list[tuple[datetime, int]]: ...
+    async def get_avg_mentions(
+        self, ticker: str, days: int = 30, exclude_run_id: str | None = None
+    ) -> float: ...
+    async def is_known_ticker(self, ticker: str, exclude_run_id: str | None = None) -> bool: ...
+    async def get_top_tickers(self, days: int = 7, limit: int = 10) -> list[TrendEntry]: ...
+    async def get_run_status(self) -> RunStatus: ...
+    async def get_recent_activity(
+        self, min_mentions: int, limit: int = 48
+    ) -> list[RunActivity]: ...
+
+    # Checkpoints unterbrochener Läufe
+    async def save_checkpoint(self, run_id: str, unit: str, phase: str, state: str) -> None: ...
+    async def get_checkpoints(self, run_id: str) -> dict[str, dict[str, Any]]: ...
+    async def get_resumable_run(self, max_age_minutes: int) -> dict[str, Any] | None: ...
+    async def reopen_run(self, run_id: str) -> None: ...
+    async def clear_checkpoints(self, run_id: str | None = None) -> int: ...
+
+    # Cooldowns und Alert-History
+    async def is_on_cooldown(self, ticker: str) -> bool: ...
+    async def set_cooldown(self, ticker: str, hours: int) -> None: ...
+    async def save_alert(self, alert: Alert) -> None: ...
+
+    # Settings
+    async def get_setting(self, key: str) -> str | None: ...
+    async def set_setting(self, key: str, value: str) -> None: ...
+    async def get_all_settings(self) -> dict[str, str]: ...
+    async def is_configured(self) -> bool: ...
+
+    # History-APIs
+    def iter_alert_history(
+        self,
+        *,
+        limit: int = 50,
+        after: tuple[str, int] | None = None,
+        ticker: str | None = None,
+        reason: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        min_confidence: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]: ...
+    async def get_alert_history(
+        self, limit: int = 50, ticker: str | None = None, **filters: Any
+    ) -> list[dict[str, Any]]: ...
+    def iter_runs(
+        self,
+        *,
+        limit: int = 20,
+        after: tuple[str, str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> AsyncIterator[dict[str, Any]]: ...
+    async def get_recent_runs(self, limit: int = 20, **filters: Any) -> list[dict[str, Any]]: ...
+    async def get_run_mentions(
+        self, run_id: str, *, limit: int = 100, after: tuple[int, str] | None = None
+    ) -> list[dict[str, Any]]: ...
+    async def get_run_detail(
+        self, run_id: str, mentions_limit: int | None = None
+    ) -> dict[str, Any] | None: ...
+
+    # Lokaler News-Index
+    async def save_news_articles(self, entries: list[FeedEntry]) -> int: ...
+    async def search_news(
+        self, match: str, since: datetime, limit: int = 20
+    ) -> list[dict[str, Any]]: ...
+    async def purge_old_news(self, days: int = 14) -> int: ...
+
+    # Alert-Outbox
+    async def enqueue_alert(self, key: str, run_id: str, ticker: str, payload: str) -> bool: ...
+    async def claim_due_alerts(self, limit: int, lease_seconds: float) -> list[dict[str, Any]]: ...
+    async def mark_alert_sent(self, outbox_id: int) -> None: ...
+    async def mark_alert_failed(
+        self, outbox_id: int, error: str, retry_in_seconds: float | None
+    ) -> None: ...
+    async def purge_old_outbox(self, days: int = 30) -> int: ...
+    async def get_outbox(
+        self, status: str | None = None, limit: int = 50
+    ) -> list[dict[str, Any]]: ...
+
+    # Symbol-Stammdaten
+    async def replace_symbols(self, symbols: list[SymbolInfo]) -> int: ...
+    async def count_symbols(self) -> int: ...
+    async def get_symbols(self, symbols: list[str]) -> dict[str, SymbolInfo]: ...
+    async def get_known_symbols(self) -> frozenset[str]: ...
+
+    # Export und Aufräumen
+    def iter_export_chunks(
+        self,
+        table: str,
+        columns: list[str],
+        time_column: str,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[tuple[Any, ...]]]: ...
+    async def purge_old_mentions(self, days: int = 90) -> int: ...
+
+
+def create_storage(path: Path, dsn: str | None = None, *, read_only: bool = False) -> Storage:
+    """Postgres, wenn ein DSN gesetzt ist (``WSB_DATABASE_DSN``), sonst die SQLite-Datei.
+
+    Noch nicht geöffnet — ``await storage.init()`` bzw. ``async with``.
+    ``read_only`` öffnet nur lesend und ohne Schema-Init/Migrationen.
+    """
+    if dsn:
+        return PostgresDatabase(dsn, read_only=read_only)
+    return Database(path, read_only=read_only)
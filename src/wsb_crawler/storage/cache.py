@@ -6,6 +6,14 @@ Verhindert doppelte API-Calls wenn ein Ticker mehrfach pro Run auftaucht
 
 Bewusst simpel gehalten: kein Redis, kein externes Cache-System.
 Der Cache lebt nur für die Laufzeit des Prozesses.
+
+Optional hält ein Cache abgelaufene Einträge noch eine Gnadenfrist lang
+vor (``stale_ttl_seconds``). ``get()`` liefert weiterhin nur frische Werte,
+``get_stale()`` auch veraltete — Grundlage für Stale-While-Revalidate im
+Dashboard (siehe enrichment/refresher.py).
+
+Benannte Caches zählen Treffer und Fehlschläge von ``get()`` als
+Prometheus-Metrik (runtime/metrics.py); ``in`` prüft ohne mitzuzählen.
 """
 
 from __future__ import annotations
@@ -14,6 +22,8 @@ import time
 from dataclasses import dataclass
 from typing import Generic, TypeVar
 
+from wsb_crawler.runtime.metrics import CACHE_LOOKUPS
+
 T = TypeVar("T")
 
 
@@ -21,6 +31,7 @@ T = TypeVar("T")
 class _CacheEntry(Generic[T]):
     value: T
     expires_at: float  # monotonic timestamp
+    stale_until: float  # monotonic timestamp, >= expires_at
 
 
 class TTLCache(Generic[T]):
@@ -34,47 +45,95 @@ class TTLCache(Generic[T]):
         cache: TTLCache[PriceData] = TTLCache(ttl_seconds=300)
         cache.set("GME", price_data)
         data = cache.get("GME")   # None wenn abgelaufen
+
+    stale_ttl_seconds: wie lange ein abgelaufener Eintrag zusätzlich für
+    ``get_stale()`` aufbewahrt wird (Default 0 = sofort verwerfen).
+    name: Label für die Cache-Metriken (leer = nicht gezählt).
     """
 
-    def __init__(self, ttl_seconds: int = 300) -> None:
+    def __init__(self, ttl_seconds: int = 300, stale_ttl_seconds: int = 0, name: str = "") -> None:
         self._ttl = ttl_seconds
+        self.name = name
+        self._stale_ttl = stale_ttl_seconds
         self._store: dict[str, _CacheEntry[T]] = {}
+        # Zählt Schreibzugriffe — z.B. für die Invalidierung des API-Response-Caches
+        self.version = 0
 
-    def get(self, key: str) -> T | None:
+    def _entry(self, key: str, now: float) -> _CacheEntry[T] | None:
+        """Eintrag inkl. Stale-Phase; komplett abgelaufene werden entfernt."""
         entry = self._store.get(key)
         if entry is None:
             return None
-        if time.monotonic() > entry.expires_at:
+        if now > entry.stale_until:
             del self._store[key]
             return None
-        return entry.value
+        return entry
+
+    def get(self, key: str) -> T | None:
+        now = time.monotonic()
+        entry = self._entry(key, now)
+        hit = entry is not None and now <= entry.expires_at
+        if self.name:
+            CACHE_LOOKUPS.inc(cache=self.name, result="hit" if hit else "miss")
+        return entry.value if hit and entry is not None else None
+
+    def __contains__(self, key: str) -> bool:
+        """Frischer Eintrag vorhanden? Zählt nicht als Cache-Zugriff."""
+        now = time.monotonic()
+        entry = self._entry(key, now)
+        return entry is not None and now <= entry.expires_at
+
+    def get_stale(self, key: str) -> T | None:
+        """Wie ``get()``, liefert aber auch abgelaufene Werte innerhalb der Gnadenfrist."""
+        entry = self._entry(key, time.monotonic())
+        return entry.value if entry is not None else None
+
+    def ttl_remaining(self, key: str) -> float | None:
+        """Sekunden bis der Eintrag veraltet (negativ = bereits stale, None = fehlt)."""
+        now = time.monotonic()
+        entry = self._entry(key, now)
+        if entry is None:
+            return None
+        return entry.expires_at - now
 
     def set(self, key: str, value: T) -> None:
+        now = time.monotonic()
         self._store[key] = _CacheEntry(
             value=value,
-            expires_at=time.monotonic() + self._ttl,
+            expires_at=now + self._ttl,
+            stale_until=now + self._ttl + self._stale_ttl,
         )
+        self.version += 1
 
     def invalidate(self, key: str) -> None:
-        self._store.pop(key, None)
+        if self._store.pop(key, None) is not None:
+            self.version += 1
 
     def clear(self) -> None:
         self._store.clear()
+        self.version += 1
 
     def __len__(self) -> int:
+        """Anzahl frischer Einträge (stale Einträge zählen nicht mit)."""
         self._evict_expired()
-        return len(self._store)
+        now = time.monotonic()
+        return sum(1 for v in self._store.values() if now <= v.expires_at)
 
     def _evict_expired(self) -> None:
         now = time.monotonic()
-        expired = [k for k, v in self._store.items() if now > v.expires_at]
+        expired = [k for k, v in self._store.items() if now > v.stale_until]
         for k in expired:
             del self._store[k]
 
     @property
     def stats(self) -> dict[str, int]:
         self._evict_expired()
-        return {"size": len(self._store), "ttl_seconds": self._ttl}
+        return {
+            "size": len(self),
+            "stale": len(self._store) - len(self),
+            "ttl_seconds": self._ttl,
+            "stale_ttl_seconds": self._stale_ttl,
+        }
 
 
 # ── Globale Cache-Instanzen ────────────────────────────────────────────────
@@ -82,11 +141,16 @@ class TTLCache(Generic[T]):
 
 from wsb_crawler.models import NewsArticle, PriceData  # noqa: E402
 
-# Kursdaten: 5 Minuten TTL (Börse ändert sich, aber nicht jede Sekunde)
-price_cache: TTLCache[PriceData] = TTLCache(ttl_seconds=300)
+# Kursdaten: 5 Minuten TTL (Börse ändert sich, aber nicht jede Sekunde).
+# Veraltete Kurse bleiben 6h für das Dashboard lesbar, bis der Refresher nachlädt.
+price_cache: TTLCache[PriceData] = TTLCache(
+    ttl_seconds=300, stale_ttl_seconds=6 * 3600, name="price"
+)
 
 # News: 30 Minuten TTL (Headlines ändern sich selten)
-news_cache: TTLCache[list[NewsArticle]] = TTLCache(ttl_seconds=1800)
+news_cache: TTLCache[list[NewsArticle]] = TTLCache(ttl_seconds=1800, name="news")
 
-# Ticker-Namen (Firmenname zu $GME): 24h TTL (sehr stabil)
-name_cache: TTLCache[str | None] = TTLCache(ttl_seconds=86_400)
+# Ticker-Namen (Firmenname zu $GME): 24h TTL (sehr stabil), 7 Tage stale lesbar
+name_cache: TTLCache[str | None] = TTLCache(
+    ttl_seconds=86_400, stale_ttl_seconds=7 * 86_400, name="name"
+)
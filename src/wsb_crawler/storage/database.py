@@ -13,6 +13,8 @@ from __future__ import annotations
 import json
 import sqlite3
 import uuid
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
@@ -22,7 +24,10 @@ from loguru import logger
 
 from wsb_crawler.models import (
     Alert,
+    FeedEntry,
+    RunActivity,
     RunStatus,
+    SymbolInfo,
     TickerHistory,
     TrendDirection,
     TrendEntry,
@@ -46,8 +51,17 @@ def _parse_dt(value: str) -> datetime:
     return dt
 
 
+def _as_utc(dt: datetime) -> datetime:
+    """Filter-Grenze → aware UTC; naive Werte gelten als UTC.
+
+    Gespeichert wird als ``+00:00``-String — verglichen wird als Text, also
+    muss die Grenze im selben Offset vorliegen.
+    """
+    return dt.replace(tzinfo=UTC) if dt.tzinfo is None else dt.astimezone(UTC)
+
+
 # Schema-Version für Migrationen
-SCHEMA_VERSION = 2
+SCHEMA_VERSION = 10
 
 # Nachträglich ergänzte Spalten pro Tabelle (Name → SQL-Typ). Werden per
 # ALTER TABLE nachgezogen, falls sie in einer bestehenden DB noch fehlen.
@@ -58,6 +72,9 @@ _COLUMN_MIGRATIONS: dict[str, list[tuple[str, str]]] = {
         ("sentiment_label", "TEXT"),
         ("avg_score", "REAL"),
     ],
+    "ticker_mentions": [
+        ("subreddit", "TEXT NOT NULL DEFAULT ''"),
+    ],
 }
 
 CREATE_TABLES = """
@@ -86,17 +103,62 @@ CREATE TABLE IF NOT EXISTS crawl_runs (
     subreddits          TEXT NOT NULL,   -- JSON-Array
     is_healthy          INTEGER DEFAULT 1
 );
+CREATE INDEX IF NOT EXISTS idx_runs_started ON crawl_runs(started_at);
 
--- Ticker-Nennungen pro Lauf (aggregiert)
+-- Ticker-Nennungen pro Lauf und Subreddit (aggregiert; '' = Altbestand ohne Subreddit)
 CREATE TABLE IF NOT EXISTS ticker_mentions (
     id          INTEGER PRIMARY KEY AUTOINCREMENT,
     run_id      TEXT NOT NULL REFERENCES crawl_runs(id),
     ticker      TEXT NOT NULL,
     mentions    INTEGER NOT NULL,
-    recorded_at TEXT NOT NULL
+    recorded_at TEXT NOT NULL,
+    subreddit   TEXT NOT NULL DEFAULT ''
 );
 CREATE INDEX IF NOT EXISTS idx_mentions_ticker ON ticker_mentions(ticker);
 CREATE INDEX IF NOT EXISTS idx_mentions_recorded ON ticker_mentions(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_mentions_run ON ticker_mentions(run_id, mentions);
+
+-- Verteilte Crawl-Jobs (crawl_backend=workers, siehe crawler/jobs.py)
+CREATE TABLE IF NOT EXISTS crawl_jobs (
+    id                  INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id              TEXT NOT NULL,
+    subreddit           TEXT NOT NULL,
+    posts_limit         INTEGER NOT NULL,
+    comments_limit      INTEGER NOT NULL,
+    status              TEXT NOT NULL DEFAULT 'pending',  -- pending|leased|done|failed|cancelled
+    worker_id           TEXT,
+    lease_expires_at    TEXT,
+    attempts            INTEGER NOT NULL DEFAULT 0,
+    result              TEXT,            -- JSON, siehe crawler/jobs.py::result_to_payload
+    error               TEXT,
+    created_at          TEXT NOT NULL,
+    finished_at         TEXT,
+    collected_at        TEXT,            -- vom Koordinator abgeholt
+    UNIQUE (run_id, subreddit)
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON crawl_jobs(status, id);
+
+-- Letzter Crawl pro Subreddit (eigener Zeitplan je Crawl-Einheit)
+CREATE TABLE IF NOT EXISTS subreddit_crawls (
+    subreddit           TEXT PRIMARY KEY,
+    run_id              TEXT NOT NULL,
+    crawled_at          TEXT NOT NULL,
+    succeeded_at        TEXT,            -- letzter erfolgreicher Crawl
+    posts_scanned       INTEGER DEFAULT 0,
+    comments_scanned    INTEGER DEFAULT 0,
+    tickers_found       INTEGER DEFAULT 0,
+    error               TEXT
+);
+
+-- Zwischenstände unterbrochener Läufe (siehe crawler/checkpoints.py)
+CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+    run_id      TEXT NOT NULL,
+    unit        TEXT NOT NULL,   -- Subreddit; '' = Lauf-Checkpoint
+    phase       TEXT NOT NULL,
+    state       TEXT NOT NULL,   -- JSON
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (run_id, unit)
+);
 
 -- Cooldown-Tracking: wann wurde zuletzt ein Alert für einen Ticker gesendet?
 CREATE TABLE IF NOT EXISTS alert_cooldowns (
@@ -124,8 +186,102 @@ CREATE TABLE IF NOT EXISTS alert_history (
 );
 CREATE INDEX IF NOT EXISTS idx_alerts_ticker ON alert_history(ticker);
 CREATE INDEX IF NOT EXISTS idx_alerts_sent ON alert_history(sent_at);
+-- Keyset-Pagination gefiltert nach Ticker: (ticker, sent_at, id) am Index entlang
+CREATE INDEX IF NOT EXISTS idx_alerts_ticker_sent ON alert_history(ticker, sent_at);
+
+-- Lokaler News-Index aus RSS-/Atom-Feeds (Alternative zu NewsAPI)
+CREATE TABLE IF NOT EXISTS news_articles (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    url             TEXT NOT NULL UNIQUE,
+    title           TEXT NOT NULL,
+    summary         TEXT NOT NULL DEFAULT '',
+    source          TEXT NOT NULL,
+    published_at    TEXT NOT NULL,
+    fetched_at      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_news_published ON news_articles(published_at);
+
+-- FTS5-Volltextindex über Titel + Zusammenfassung (External Content,
+-- per Trigger synchron gehalten — die Texte liegen nur einmal in der DB)
+CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+    title, summary, content='news_articles', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS news_articles_ai AFTER INSERT ON news_articles BEGIN
+    INSERT INTO news_fts(rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS news_articles_ad AFTER DELETE ON news_articles BEGIN
+    INSERT INTO news_fts(news_fts, rowid, title, summary)
+    VALUES ('delete', old.id, old.title, old.summary);
+END;
+
+-- Symbol-Stammdaten aus lokalen Listing-Dateien (Namensauflösung ohne Netzwerk)
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol      TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    exchange    TEXT NOT NULL DEFAULT '',
+    type        TEXT NOT NULL DEFAULT 'stock',
+    currency    TEXT NOT NULL DEFAULT 'USD',
+    updated_at  TEXT NOT NULL
+);
+
+-- Persistente Alert-Outbox: der Crawl stellt Alerts nur ein, ein eigener
+-- Worker liefert aus (Retry mit Backoff, Dead-Letter nach max. Versuchen)
+CREATE TABLE IF NOT EXISTS alert_outbox (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,   -- run_id:ticker
+    run_id          TEXT NOT NULL,
+    ticker          TEXT NOT NULL,
+    payload         TEXT NOT NULL,          -- Alert als JSON
+    status          TEXT NOT NULL DEFAULT 'pending',  -- pending | sent | dead
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT NOT NULL,
+    last_error      TEXT,
+    created_at      TEXT NOT NULL,
+    sent_at         TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON alert_outbox(status, next_attempt_at);
+
+-- Laufende Zähler für get_run_status (statt COUNT(*) über die ganze History).
+-- Per Trigger in derselben Transaktion wie Insert/Purge gepflegt; ticker_stats
+-- zählt die Mention-Zeilen pro Ticker, damit "tracked_tickers" beim Löschen der
+-- letzten Zeile eines Tickers sinkt.
+CREATE TABLE IF NOT EXISTS stats (
+    key     TEXT PRIMARY KEY,
+    value   INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS ticker_stats (
+    ticker          TEXT PRIMARY KEY,
+    mention_rows    INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS crawl_runs_stats_ai AFTER INSERT ON crawl_runs BEGIN
+    UPDATE stats SET value = value + 1 WHERE key = 'total_runs';
+END;
+CREATE TRIGGER IF NOT EXISTS crawl_runs_stats_ad AFTER DELETE ON crawl_runs BEGIN
+    UPDATE stats SET value = value - 1 WHERE key = 'total_runs';
+END;
+CREATE TRIGGER IF NOT EXISTS alert_history_stats_ai AFTER INSERT ON alert_history BEGIN
+    UPDATE stats SET value = value + 1 WHERE key = 'total_alerts';
+END;
+CREATE TRIGGER IF NOT EXISTS alert_history_stats_ad AFTER DELETE ON alert_history BEGIN
+    UPDATE stats SET value = value - 1 WHERE key = 'total_alerts';
+END;
+CREATE TRIGGER IF NOT EXISTS ticker_mentions_stats_ai AFTER INSERT ON ticker_mentions BEGIN
+    INSERT INTO ticker_stats (ticker, mention_rows) VALUES (new.ticker, 1)
+    ON CONFLICT(ticker) DO UPDATE SET mention_rows = mention_rows + 1;
+    UPDATE stats SET value = value + 1 WHERE key = 'tracked_tickers'
+    AND (SELECT mention_rows FROM ticker_stats WHERE ticker = new.ticker) = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS ticker_mentions_stats_ad AFTER DELETE ON ticker_mentions BEGIN
+    UPDATE ticker_stats SET mention_rows = mention_rows - 1 WHERE ticker = old.ticker;
+    UPDATE stats SET value = value - 1 WHERE key = 'tracked_tickers'
+    AND (SELECT mention_rows FROM ticker_stats WHERE ticker = old.ticker) = 0;
+    DELETE FROM ticker_stats WHERE ticker = old.ticker AND mention_rows = 0;
+END;
 """
 
+# Zähler in der stats-Tabelle (Reihenfolge = Seed-Reihenfolge)
+STAT_KEYS = ("total_runs", "total_alerts", "tracked_tickers")
+
 
 class Database:
     """
@@ -138,14 +294,28 @@ class Database:
         # oder als Context Manager:
         async with Database(path) as db:
             await db.save_run_mentions(run_id, counts)
+
+    read_only: Datei nur lesend öffnen (``mode=ro``), ohne Schema-Init und
+    Migrationen — z.B. für ``wsb-crawler export`` neben dem laufenden Dienst.
     """
 
-    def __init__(self, path: Path) -> None:
+    def __init__(self, path: Path, *, read_only: bool = False) -> None:
         self._path = path
+        self._read_only = read_only
         self._conn: aiosqlite.Connection | None = None
+        self._change_listeners: list[Callable[[], None]] = []
 
     async def init(self) -> None:
-        """Verbindung öffnen + Schema anlegen."""
+        """Verbindung öffnen + Schema anlegen (read-only: nur öffnen)."""
+        if self._read_only:
+            try:
+                self._conn = await aiosqlite.connect(self._ro_uri(), uri=True)
+            except sqlite3.OperationalError as e:
+                raise RuntimeError(
+                    f"Datenbank konnte nicht gelesen werden: {self._path.resolve()} ({e})"
+                ) from e
+            self._conn.row_factory = aiosqlite.Row
+            return
         try:
             self._path.parent.mkdir(parents=True, exist_ok=True)
             self._conn = await aiosqlite.connect(self._path)
@@ -159,6 +329,7 @@ class Database:
         self._conn.row_factory = aiosqlite.Row
         await self._conn.executescript(CREATE_TABLES)
         await self._run_column_migrations()
+        await self._seed_stats()
         await self._apply_schema_version()
         logger.info(f"Datenbank initialisiert: {self._path}")
 
@@ -174,12 +345,25 @@ class Database:
     async def __aexit__(self, *_: object) -> None:
         await self.close()
 
+    def _ro_uri(self) -> str:
+        return self._path.resolve().as_uri() + "?mode=ro"
+
     @property
     def conn(self) -> aiosqlite.Connection:
         if self._conn is None:
             raise RuntimeError("Datenbank nicht initialisiert. Bitte zuerst init() aufrufen.")
         return self._conn
 
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Callback nach Schreibzugriffen, die den Dashboard-Status betreffen
+        (Runs, Mentions, Alerts, Settings) — z.B. für den Status-Hub."""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def _notify_change(self) -> None:
+        for callback in list(self._change_listeners):
+            callback()
+
     # ── Schema ──────────────────────────────────────────────────────────────
 
     async def _run_column_migrations(self) -> None:
@@ -196,6 +380,45 @@ class Database:
             await self.conn.commit()
             logger.info(f"Schema-Migration: {added} Spalte(n) ergänzt")
 
+    async def _seed_stats(self) -> None:
+        """Befüllt die Zähler einmalig (neue DB oder Upgrade von Schema < 6)."""
+        async with self.conn.execute("SELECT COUNT(*) as c FROM stats") as cur:
+            row = await cur.fetchone()
+        if row and row["c"] >= len(STAT_KEYS):
+            return
+        await self.rebuild_stats()
+
+    async def rebuild_stats(self) -> dict[str, int]:
+        """Zählt stats/ticker_stats einmal komplett neu (Seed bzw. Reparatur)."""
+        await self.conn.execute("DELETE FROM ticker_stats")
+        await self.conn.execute(
+            """INSERT INTO ticker_stats (ticker, mention_rows)
+               SELECT ticker, COUNT(*) FROM ticker_mentions GROUP BY ticker"""
+        )
+        counts: dict[str, int] = {}
+        for key, sql in (
+            ("total_runs", "SELECT COUNT(*) FROM crawl_runs"),
+            ("total_alerts", "SELECT COUNT(*) FROM alert_history"),
+            ("tracked_tickers", "SELECT COUNT(*) FROM ticker_stats"),
+        ):
+            async with self.conn.execute(sql) as cur:
+                row = await cur.fetchone()
+                counts[key] = row[0] if row else 0
+        await self.conn.executemany(
+            "INSERT OR REPLACE INTO stats (key, value) VALUES (?, ?)",
+            [(key, counts[key]) for key in STAT_KEYS],
+        )
+        await self.conn.commit()
+        return counts
+
+    async def get_stats(self) -> dict[str, int]:
+        """Aktuelle Zählerstände (O(1), unabhängig von der History-Größe)."""
+        async with self.conn.execute("SELECT key, value FROM stats") as cur:
+            rows = await cur.fetchall()
+        stats = dict.fromkeys(STAT_KEYS, 0)
+        stats.update({row["key"]: row["value"] for row in rows})
+        return stats
+
     async def _apply_schema_version(self) -> None:
         async with self.conn.execute("SELECT MAX(version) as v FROM schema_version") as cur:
             row = await cur.fetchone()
@@ -220,6 +443,7 @@ class Database:
             (run_id, _utcnow().isoformat(), json.dumps(subreddits)),
         )
         await self.conn.commit()
+        self._notify_change()
         return run_id
 
     async def finish_run(
@@ -242,15 +466,124 @@ class Database:
             ),
         )
         await self.conn.commit()
+        self._notify_change()
 
-    async def save_run_mentions(self, run_id: str, counts: dict[str, int]) -> None:
-        """Speichert Ticker-Mention-Counts eines Laufs."""
+    async def save_run_mentions(
+        self, run_id: str, counts: dict[str, int], subreddit: str = ""
+    ) -> None:
+        """Speichert Ticker-Mention-Counts eines Laufs (pro Subreddit eigene Zeilen)."""
         now = _utcnow().isoformat()
         await self.conn.executemany(
-            "INSERT INTO ticker_mentions (run_id, ticker, mentions, recorded_at) VALUES (?, ?, ?, ?)",
-            [(run_id, ticker, count, now) for ticker, count in counts.items()],
+            """INSERT INTO ticker_mentions (run_id, ticker, mentions, recorded_at, subreddit)
+               VALUES (?, ?, ?, ?, ?)""",
+            [(run_id, ticker, count, now, subreddit) for ticker, count in counts.items()],
         )
         await self.conn.commit()
+        self._notify_change()
+
+    async def record_subreddit_crawl(
+        self,
+        subreddit: str,
+        run_id: str,
+        *,
+        posts_scanned: int = 0,
+        comments_scanned: int = 0,
+        tickers_found: int = 0,
+        error: str | None = None,
+    ) -> None:
+        """Merkt sich das Ergebnis einer Crawl-Einheit; ``succeeded_at`` nur bei Erfolg."""
+        now = _utcnow().isoformat()
+        await self.conn.execute(
+            """INSERT INTO subreddit_crawls
+                   (subreddit, run_id, crawled_at, succeeded_at,
+                    posts_scanned, comments_scanned, tickers_found, error)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(subreddit) DO UPDATE SET
+                   run_id = excluded.run_id,
+                   crawled_at = excluded.crawled_at,
+                   succeeded_at = COALESCE(excluded.succeeded_at, succeeded_at),
+                   posts_scanned = excluded.posts_scanned,
+                   comments_scanned = excluded.comments_scanned,
+                   tickers_found = excluded.tickers_found,
+                   error = excluded.error""",
+            (
+                subreddit,
+                run_id,
+                now,
+                None if error else now,
+                posts_scanned,
+                comments_scanned,
+                tickers_found,
+                error,
+            ),
+        )
+        await self.conn.commit()
+
+    async def get_subreddit_crawls(self) -> dict[str, dict[str, Any]]:
+        """Letzter Crawl pro Subreddit (für Zeitplan und Anzeige)."""
+        async with self.conn.execute("SELECT * FROM subreddit_crawls ORDER BY subreddit") as cur:
+            rows = await cur.fetchall()
+        return {row["subreddit"]: dict(row) for row in rows}
+
+    # ── Crawl-Checkpoints ────────────────────────────────────────────────────
+
+    async def save_checkpoint(self, run_id: str, unit: str, phase: str, state: str) -> None:
+        """Überschreibt den Checkpoint einer Einheit (``unit=''``: Lauf-Checkpoint)."""
+        await self.conn.execute(
+            """INSERT INTO crawl_checkpoints (run_id, unit, phase, state, updated_at)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(run_id, unit) DO UPDATE SET
+                   phase = excluded.phase,
+                   state = excluded.state,
+                   updated_at = excluded.updated_at""",
+            (run_id, unit, phase, state, _utcnow().isoformat()),
+        )
+        await self.conn.commit()
+
+    async def get_checkpoints(self, run_id: str) -> dict[str, dict[str, Any]]:
+        """Alle Checkpoints eines Laufs, nach Einheit."""
+        async with self.conn.execute(
+            "SELECT unit, phase, state, updated_at FROM crawl_checkpoints WHERE run_id = ?",
+            (run_id,),
+        ) as cur:
+            rows = await cur.fetchall()
+        return {row["unit"]: dict(row) for row in rows}
+
+    async def get_resumable_run(self, max_age_minutes: int) -> dict[str, Any] | None:
+        """Jüngster Lauf mit Checkpoints, die nicht älter als N Minuten sind."""
+        cutoff = (_utcnow() - timedelta(minutes=max_age_minutes)).isoformat()
+        async with self.conn.execute(
+            """SELECT r.id, r.subreddits
+               FROM crawl_runs r JOIN crawl_checkpoints c ON c.run_id = r.id
+               GROUP BY r.id
+               HAVING MAX(c.updated_at) >= ?
+               ORDER BY MAX(c.updated_at) DESC
+               LIMIT 1""",
+            (cutoff,),
+        ) as cur:
+            row = await cur.fetchone()
+        if not row:
+            return None
+        return {"id": row["id"], "subreddits": json.loads(row["subreddits"])}
+
+    async def reopen_run(self, run_id: str) -> None:
+        """Markiert einen unterbrochenen Lauf wieder als laufend (Fortsetzung)."""
+        await self.conn.execute(
+            "UPDATE crawl_runs SET finished_at = NULL, is_healthy = 1 WHERE id = ?", (run_id,)
+        )
+        await self.conn.commit()
+        self._notify_change()
+
+    async def clear_checkpoints(self, run_id: str | None = None) -> int:
+        """Löscht die Checkpoints eines Laufs (``None``: alle)."""
+        if run_id is None:
+            cur = await self.conn.execute("DELETE FROM crawl_checkpoints")
+        else:
+            cur = await self.conn.execute(
+                "DELETE FROM crawl_checkpoints WHERE run_id = ?", (run_id,)
+            )
+        await self.conn.commit()
+        return cur.rowcount or 0
 
     # ── Ticker History ───────────────────────────────────────────────────────
 
@@ -376,6 +709,7 @@ class Database:
             ),
         )
         await self.conn.commit()
+        self._notify_change()
 
     # ── Trend-Analyse ────────────────────────────────────────────────────────
 
@@ -431,19 +765,7 @@ class Database:
         ) as cur:
             last_run = await cur.fetchone()
 
-        async with self.conn.execute("SELECT COUNT(*) as c FROM crawl_runs") as cur:
-            row = await cur.fetchone()
-            total_runs = row["c"] if row else 0
-
-        async with self.conn.execute("SELECT COUNT(*) as c FROM alert_history") as cur:
-            row = await cur.fetchone()
-            total_alerts = row["c"] if row else 0
-
-        async with self.conn.execute(
-            "SELECT COUNT(DISTINCT ticker) as c FROM ticker_mentions"
-        ) as cur:
-            row = await cur.fetchone()
-            tracked = row["c"] if row else 0
+        stats = await self.get_stats()
 
         last_at = None
         duration = None
@@ -456,13 +778,46 @@ class Database:
         return RunStatus(
             last_run_at=last_at,
             last_run_duration_seconds=duration,
-            total_runs=total_runs,
-            total_alerts_sent=total_alerts,
-            tracked_tickers=tracked,
+            total_runs=stats["total_runs"],
+            total_alerts_sent=stats["total_alerts"],
+            tracked_tickers=stats["tracked_tickers"],
             next_run_at=None,  # wird vom Scheduler gesetzt
             is_healthy=True,
         )
 
+    async def get_recent_activity(self, min_mentions: int, limit: int = 48) -> list[RunActivity]:
+        """Letzte erfolgreich abgeschlossene Läufe mit Nennungs- und Kandidatenzahl, neueste zuerst."""
+        async with self.conn.execute(
+            """
+            SELECT r.id, r.started_at,
+                   COALESCE(SUM(m.mentions), 0) AS mentions,
+                   COALESCE(SUM(m.mentions >= ?), 0) AS candidates
+            FROM (
+                SELECT id, started_at FROM crawl_runs
+                WHERE finished_at IS NOT NULL AND is_healthy = 1
+                ORDER BY started_at DESC LIMIT ?
+            ) r
+            LEFT JOIN (
+                -- Kandidaten pro Ticker, nicht pro Subreddit-Zeile
+                SELECT run_id, ticker, SUM(mentions) AS mentions
+                FROM ticker_mentions GROUP BY run_id, ticker
+            ) m ON m.run_id = r.id
+            GROUP BY r.id
+            ORDER BY r.started_at DESC
+            """,
+            (min_mentions, limit),
+        ) as cur:
+            rows = await cur.fetchall()
+        return [
+            RunActivity(
+                run_id=row["id"],
+                started_at=_parse_dt(row["started_at"]),
+                mentions=int(row["mentions"]),
+                candidates=int(row["candidates"]),
+            )
+            for row in rows
+        ]
+
     # ── Settings ─────────────────────────────────────────────────────────────
 
     async def get_setting(self, key: str) -> str | None:
@@ -480,6 +835,7 @@ class Database:
             (key, value, _utcnow().isoformat()),
         )
         await self.conn.commit()
+        self._notify_change()
 
     async def get_all_settings(self) -> dict[str, str]:
         """Gibt alle gespeicherten Settings als dict zurück."""
@@ -498,35 +854,125 @@ class Database:
 
     # ── Alert History (API) ───────────────────────────────────────────────────
 
+    async def iter_alert_history(
+        self,
+        *,
+        limit: int = 50,
+        after: tuple[str, int] | None = None,
+        ticker: str | None = None,
+        reason: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        min_confidence: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Alert-History neueste zuerst, zeilenweise (konstanter Speicher).
+
+        after: Sortierschlüssel ``(sent_at, id)`` der letzten Zeile der
+        Vorseite (Keyset-Pagination, siehe storage/pagination.py).
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if after is not None:
+            clauses.append("(sent_at, id) < (?, ?)")
+            params.extend(after)
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker.upper())
+        if reason:
+            clauses.append("reason = ?")
+            params.append(reason)
+        if since is not None:
+            clauses.append("sent_at >= ?")
+            params.append(_as_utc(since).isoformat())
+        if until is not None:
+            clauses.append("sent_at < ?")
+            params.append(_as_utc(until).isoformat())
+        if min_confidence is not None:
+            clauses.append("confidence >= ?")
+            params.append(min_confidence)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        async with self.conn.execute(
+            f"SELECT * FROM alert_history {where} ORDER BY sent_at DESC, id DESC LIMIT ?",
+            params,
+        ) as cur:
+            async for row in cur:
+                yield dict(row)
+
     async def get_alert_history(
-        self, limit: int = 50, ticker: str | None = None
+        self, limit: int = 50, ticker: str | None = None, **filters: Any
     ) -> list[dict[str, Any]]:
         """Gibt Alert-History als Liste von dicts zurück (für API)."""
-        query: str
-        params: tuple[Any, ...]
-        if ticker:
-            query = """SELECT * FROM alert_history WHERE ticker = ?
-                       ORDER BY sent_at DESC LIMIT ?"""
-            params = (ticker.upper(), limit)
-        else:
-            query = "SELECT * FROM alert_history ORDER BY sent_at DESC LIMIT ?"
-            params = (limit,)
+        return [row async for row in self.iter_alert_history(limit=limit, ticker=ticker, **filters)]
 
-        async with self.conn.execute(query, params) as cur:
-            rows = await cur.fetchall()
-
-        return [dict(r) for r in rows]
+    async def iter_runs(
+        self,
+        *,
+        limit: int = 20,
+        after: tuple[str, str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Crawl-Runs neueste zuerst; after = ``(started_at, id)`` der Vorseite."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        if after is not None:
+            clauses.append("(started_at, id) < (?, ?)")
+            params.extend(after)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(_as_utc(since).isoformat())
+        if until is not None:
+            clauses.append("started_at < ?")
+            params.append(_as_utc(until).isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        async with self.conn.execute(
+            f"SELECT * FROM crawl_runs {where} ORDER BY started_at DESC, id DESC LIMIT ?",
+            params,
+        ) as cur:
+            async for row in cur:
+                yield dict(row)
 
-    async def get_recent_runs(self, limit: int = 20) -> list[dict[str, Any]]:
+    async def get_recent_runs(self, limit: int = 20, **filters: Any) -> list[dict[str, Any]]:
         """Gibt die letzten Crawl-Runs als Liste von dicts zurück (für API)."""
+        return [row async for row in self.iter_runs(limit=limit, **filters)]
+
+    async def get_run_mentions(
+        self, run_id: str, *, limit: int = 100, after: tuple[int, str] | None = None
+    ) -> list[dict[str, Any]]:
+        """Mentions eines Runs über alle Subreddits summiert, meistgenannte zuerst.
+
+        after = ``(mentions, ticker)`` der letzten gelieferten Zeile.
+        """
+        keyset = ""
+        params: list[Any] = [run_id]
+        if after is not None:
+            # Sortierung mentions DESC, ticker ASC → kein einfacher Row-Value-Vergleich
+            # HAVING sieht unter "mentions" die Roh-Spalte, nicht den Alias
+            keyset = "HAVING (SUM(mentions) < ? OR (SUM(mentions) = ? AND ticker > ?))"
+            params.extend([after[0], after[0], after[1]])
+        params.append(limit)
         async with self.conn.execute(
-            "SELECT * FROM crawl_runs ORDER BY started_at DESC LIMIT ?", (limit,)
+            f"""SELECT ticker, SUM(mentions) AS mentions, MAX(recorded_at) AS recorded_at
+                FROM ticker_mentions
+                WHERE run_id = ?
+                GROUP BY ticker {keyset}
+                ORDER BY mentions DESC, ticker ASC
+                LIMIT ?""",
+            params,
         ) as cur:
             rows = await cur.fetchall()
         return [dict(r) for r in rows]
 
-    async def get_run_detail(self, run_id: str) -> dict[str, Any] | None:
-        """Gibt einen einzelnen Crawl-Run inklusive Top-Mentions zurück."""
+    async def get_run_detail(
+        self, run_id: str, mentions_limit: int | None = None
+    ) -> dict[str, Any] | None:
+        """Gibt einen einzelnen Crawl-Run inklusive Top-Mentions zurück.
+
+        mentions_limit: nur die ersten N Mentions (Rest per get_run_mentions),
+        ``mentions_total`` enthält immer die Gesamtzahl.
+        """
         async with self.conn.execute("SELECT * FROM crawl_runs WHERE id = ?", (run_id,)) as cur:
             row = await cur.fetchone()
         if row is None:
@@ -534,16 +980,262 @@ class Database:
 
         detail = dict(row)
         async with self.conn.execute(
-            """SELECT ticker, mentions, recorded_at
-               FROM ticker_mentions
-               WHERE run_id = ?
-               ORDER BY mentions DESC, ticker ASC""",
+            "SELECT COUNT(DISTINCT ticker) AS n FROM ticker_mentions WHERE run_id = ?", (run_id,)
+        ) as cur:
+            count = await cur.fetchone()
+        detail["mentions_total"] = int(count["n"]) if count else 0
+        async with self.conn.execute(
+            """SELECT subreddit, COUNT(*) AS tickers, SUM(mentions) AS mentions
+               FROM ticker_mentions WHERE run_id = ?
+               GROUP BY subreddit ORDER BY mentions DESC""",
             (run_id,),
         ) as cur:
-            rows = await cur.fetchall()
-        detail["mentions"] = [dict(r) for r in rows]
+            detail["subreddit_totals"] = [dict(r) for r in await cur.fetchall()]
+        detail["mentions"] = await self.get_run_mentions(
+            run_id, limit=mentions_limit if mentions_limit is not None else -1
+        )
         return detail
 
+    # ── Lokaler News-Index (RSS/Atom) ─────────────────────────────────────────
+
+    async def save_news_articles(self, entries: list[FeedEntry]) -> int:
+        """Speichert Feed-Einträge (Dedup über die URL). Gibt die Anzahl neuer zurück."""
+        if not entries:
+            return 0
+        now = _utcnow().isoformat()
+        cur = await self.conn.executemany(
+            """INSERT OR IGNORE INTO news_articles
+               (url, title, summary, source, published_at, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [
+                (e.url, e.title, e.summary, e.source, e.published_at.isoformat(), now)
+                for e in entries
+            ],
+        )
+        await self.conn.commit()
+        # rowcount zählt nur die eigentlichen Inserts (ohne FTS-Trigger, ohne IGNOREs)
+        return max(0, cur.rowcount)
+
+    async def search_news(
+        self, match: str, since: datetime, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """FTS5-Suche im lokalen News-Index, neueste zuerst.
+
+        match: FTS5-Query-Syntax (z.B. '"GME" OR "GameStop"').
+        """
+        async with self.conn.execute(
+            """SELECT a.url, a.title, a.summary, a.source, a.published_at
+               FROM news_fts
+               JOIN news_articles a ON a.id = news_fts.rowid
+               WHERE news_fts MATCH ? AND a.published_at >= ?
+               ORDER BY a.published_at DESC
+               LIMIT ?""",
+            (match, since.isoformat(), limit),
+        ) as cur:
+            rows = await cur.fetchall()
+        return [dict(r) for r in rows]
+
+    async def purge_old_news(self, days: int = 14) -> int:
+        """Löscht lokale News-Artikel, die älter als N Tage sind."""
+        cutoff = (_utcnow() - timedelta(days=days)).isoformat()
+        cur = await self.conn.execute("DELETE FROM news_articles WHERE published_at < ?", (cutoff,))
+        await self.conn.commit()
+        return cur.rowcount or 0
+
+    # ── Alert-Outbox ─────────────────────────────────────────────────────────
+
+    async def enqueue_alert(self, key: str, run_id: str, ticker: str, payload: str) -> bool:
+        """Stellt einen Alert in die Outbox. False, wenn der Key schon existiert."""
+        now = _utcnow().isoformat()
+        cur = await self.conn.execute(
+            """INSERT OR IGNORE INTO alert_outbox
+               (idempotency_key, run_id, ticker, payload, next_attempt_at, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (key, run_id, ticker, payload, now, now),
+        )
+        await self.conn.commit()
+        return cur.rowcount > 0
+
+    async def claim_due_alerts(self, limit: int, lease_seconds: float) -> list[dict[str, Any]]:
+        """Fällige Outbox-Einträge holen und für lease_seconds reservieren.
+
+        Stirbt der Prozess während der Zustellung, werden sie nach Ablauf der
+        Reservierung erneut fällig (at-least-once).
+        """
+        now = _utcnow()
+        async with self.conn.execute(
+            """SELECT id, idempotency_key, run_id, ticker, payload, attempts
+               FROM alert_outbox
+               WHERE status = 'pending' AND next_attempt_at <= ?
+               ORDER BY next_attempt_at, id
+               LIMIT ?""",
+            (now.isoformat(), limit),
+        ) as cur:
+            rows = [dict(r) for r in await cur.fetchall()]
+        if rows:
+            lease_until = (now + timedelta(seconds=lease_seconds)).isoformat()
+            await self.conn.executemany(
+                "UPDATE alert_outbox SET next_attempt_at = ? WHERE id = ?",
+                [(lease_until, r["id"]) for r in rows],
+            )
+            await self.conn.commit()
+        return rows
+
+    async def mark_alert_sent(self, outbox_id: int) -> None:
+        await self.conn.execute(
+            """UPDATE alert_outbox
+               SET status = 'sent', attempts = attempts + 1, sent_at = ?, last_error = NULL
+               WHERE id = ?""",
+            (_utcnow().isoformat(), outbox_id),
+        )
+        await self.conn.commit()
+
+    async def mark_alert_failed(
+        self, outbox_id: int, error: str, retry_in_seconds: float | None
+    ) -> None:
+        """Fehlversuch verbuchen: neu einplanen oder (retry_in_seconds=None) dead-lettern.
+
+        Ein Dead-Letter gibt den beim Einstellen gesetzten Cooldown seines
+        Tickers wieder frei — es wurde ja nichts gesendet. Ein späterer Cooldown
+        (``last_alert_at`` nach dem Einstellen) bleibt unberührt.
+        """
+        if retry_in_seconds is None:
+            await self.conn.execute(
+                """UPDATE alert_outbox
+                   SET status = 'dead', attempts = attempts + 1, last_error = ?
+                   WHERE id = ?""",
+                (error, outbox_id),
+            )
+            await self.conn.execute(
+                """UPDATE alert_cooldowns SET cooldown_until = ?
+                   WHERE EXISTS (
+                       SELECT 1 FROM alert_outbox o
+                       WHERE o.id = ? AND o.ticker = alert_cooldowns.ticker
+                         AND alert_cooldowns.last_alert_at <= o.created_at
+                   )""",
+                (_utcnow().isoformat(), outbox_id),
+            )
+        else:
+            next_at = (_utcnow() + timedelta(seconds=retry_in_seconds)).isoformat()
+            await self.conn.execute(
+                """UPDATE alert_outbox
+                   SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?
+                   WHERE id = ?""",
+                (error, next_at, outbox_id),
+            )
+        await self.conn.commit()
+
+    async def purge_old_outbox(self, days: int = 30) -> int:
+        """Löscht zugestellte Outbox-Einträge älter als N Tage (Dead-Letters bleiben)."""
+        cutoff = (_utcnow() - timedelta(days=days)).isoformat()
+        cur = await self.conn.execute(
+            "DELETE FROM alert_outbox WHERE status = 'sent' AND created_at < ?", (cutoff,)
+        )
+        await self.conn.commit()
+        return cur.rowcount or 0
+
+    async def get_outbox(self, status: str | None = None, limit: int = 50) -> list[dict[str, Any]]:
+        """Outbox-Einträge (ohne Payload) für Diagnose/API, neueste zuerst."""
+        query = (
+            "SELECT id, idempotency_key, run_id, ticker, status, attempts, next_attempt_at, "
+            "last_error, created_at, sent_at FROM alert_outbox"
+        )
+        params: list[Any] = []
+        if status:
+            query += " WHERE status = ?"
+            params.append(status)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        async with self.conn.execute(query, params) as cur:
+            rows = await cur.fetchall()
+        return [dict(r) for r in rows]
+
+    # ── Symbol-Stammdaten ────────────────────────────────────────────────────
+
+    async def replace_symbols(self, symbols: list[SymbolInfo]) -> int:
+        """Ersetzt die komplette Symboltabelle in einer Transaktion.
+
+        Delistete Symbole verschwinden so beim nächsten Import automatisch.
+        """
+        now = _utcnow().isoformat()
+        await self.conn.execute("DELETE FROM symbols")
+        await self.conn.executemany(
+            """INSERT OR REPLACE INTO symbols
+               (symbol, name, exchange, type, currency, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(s.symbol, s.name, s.exchange, s.type, s.currency, now) for s in symbols],
+        )
+        await self.conn.commit()
+        return await self.count_symbols()
+
+    async def count_symbols(self) -> int:
+        async with self.conn.execute("SELECT COUNT(*) AS n FROM symbols") as cur:
+            row = await cur.fetchone()
+        return int(row["n"]) if row else 0
+
+    async def get_symbols(self, symbols: list[str]) -> dict[str, SymbolInfo]:
+        """Stammdaten für mehrere Symbole (unbekannte fehlen im Ergebnis)."""
+        if not symbols:
+            return {}
+        placeholders = ",".join("?" * len(symbols))
+        async with self.conn.execute(
+            f"SELECT symbol, name, exchange, type, currency FROM symbols "
+            f"WHERE symbol IN ({placeholders})",
+            symbols,
+        ) as cur:
+            rows = await cur.fetchall()
+        return {r["symbol"]: SymbolInfo(**dict(r)) for r in rows}
+
+    async def get_known_symbols(self) -> frozenset[str]:
+        """Alle bekannten Symbole (leer, wenn keine Listing-Dateien importiert wurden)."""
+        async with self.conn.execute("SELECT symbol FROM symbols") as cur:
+            rows = await cur.fetchall()
+        return frozenset(r["symbol"] for r in rows)
+
+    # ── Export ───────────────────────────────────────────────────────────────
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Eigene read-only Verbindung (WAL-Snapshot), z.B. für lange Exporte.
+
+        Blockiert die Haupt-Verbindung nicht und sieht einen konsistenten
+        Stand, auch wenn währenddessen ein Crawl schreibt.
+        """
+        conn = await aiosqlite.connect(self._ro_uri(), uri=True)
+        try:
+            yield conn
+        finally:
+            await conn.close()
+
+    async def iter_export_chunks(
+        self,
+        table: str,
+        columns: list[str],
+        time_column: str,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[tuple[Any, ...]]]:
+        """Zeilen einer Tabelle in Chunks, chronologisch (konstanter Speicher).
+
+        table/columns kommen aus der festen Export-Spezifikation (storage/export.py),
+        nie aus Benutzereingaben.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if since is not None:
+            clauses.append(f"{time_column} >= ?")
+            params.append(_as_utc(since).isoformat())
+        if until is not None:
+            clauses.append(f"{time_column} < ?")
+            params.append(_as_utc(until).isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = f"SELECT {', '.join(columns)} FROM {table} {where} ORDER BY {time_column}, rowid"
+        async with self.reader() as conn, conn.execute(query, params) as cur:
+            while rows := await cur.fetchmany(chunk_size):
+                yield [tuple(r) for r in rows]
+
     # ── Aufräumen ────────────────────────────────────────────────────────────
 
     async def purge_old_mentions(self, days: int = 90) -> int:
@@ -558,4 +1250,5 @@ class Database:
             "DELETE FROM ticker_mentions WHERE recorded_at < ?", (cutoff,)
         )
         await self.conn.commit()
+        self._notify_change()
         return cur.rowcount or 0
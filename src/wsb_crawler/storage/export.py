@@ -0,0 +1,212 @@
+"""
+Bulk-Export der History (Mentions, Alerts, Runs) als CSV, NDJSON oder Parquet.
+
+Die Zeilen kommen chunkweise aus einem read-only Snapshot der DB
+(``Storage.iter_export_chunks``) und werden direkt kodiert weitergereicht —
+der Speicherbedarf hängt nur von der Chunk-Größe ab, nicht von der Menge der
+History. Genutzt von ``/api/export/{dataset}`` (Streaming-Response) und dem
+CLI-Befehl ``wsb-crawler export`` (z.B. per Cron).
+
+Parquet braucht das optionale Paket ``pyarrow`` (``wsb-crawler[parquet]``);
+jeder Chunk wird eine Row-Group.
+"""
+
+from __future__ import annotations
+
+import csv
+import importlib
+import io
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime
+from types import ModuleType
+from typing import Any, Literal
+
+from wsb_crawler.storage.base import Storage
+
+ExportFormat = Literal["csv", "ndjson", "parquet"]
+ColumnType = Literal["str", "int", "float"]
+
+EXPORT_CHUNK_ROWS = 1000
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ExportDataset:
+    table: str
+    time_column: str  # für since/until und die Sortierung
+    columns: tuple[tuple[str, ColumnType], ...]
+
+    @property
+    def column_names(self) -> list[str]:
+        return [name for name, _ in self.columns]
+
+
+DATASETS: dict[str, ExportDataset] = {
+    "mentions": ExportDataset(
+        table="ticker_mentions",
+        time_column="recorded_at",
+        columns=(
+            ("id", "int"),
+            ("run_id", "str"),
+            ("ticker", "str"),
+            ("mentions", "int"),
+            ("recorded_at", "str"),
+            ("subreddit", "str"),
+        ),
+    ),
+    "alerts": ExportDataset(
+        table="alert_history",
+        time_column="sent_at",
+        columns=(
+            ("id", "int"),
+            ("ticker", "str"),
+            ("reason", "str"),
+            ("mentions", "int"),
+            ("avg_mentions", "float"),
+            ("ratio", "float"),
+            ("price", "float"),
+            ("price_change", "float"),
+            ("confidence", "int"),
+            ("sentiment", "float"),
+            ("sentiment_label", "str"),
+            ("avg_score", "float"),
+            ("sent_at", "str"),
+        ),
+    ),
+    "runs": ExportDataset(
+        table="crawl_runs",
+        time_column="started_at",
+        columns=(
+            ("id", "str"),
+            ("started_at", "str"),
+            ("finished_at", "str"),
+            ("posts_scanned", "int"),
+            ("comments_scanned", "int"),
+            ("subreddits", "str"),
+            ("is_healthy", "int"),
+        ),
+    ),
+}
+
+
+def _load_pyarrow() -> tuple[ModuleType, ModuleType] | None:
+    try:
+        return importlib.import_module("pyarrow"), importlib.import_module("pyarrow.parquet")
+    except ImportError:
+        return None
+
+
+def parquet_available() -> bool:
+    return _load_pyarrow() is not None
+
+
+def export_filename(dataset: str, fmt: ExportFormat) -> str:
+    return f"wsb-{dataset}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{fmt}"
+
+
+async def _encode_csv(
+    spec: ExportDataset, chunks: AsyncIterator[list[tuple[Any, ...]]]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(spec.column_names)
+    async for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():  # nur Kopfzeile (keine Zeilen)
+        yield buffer.getvalue().encode()
+
+
+async def _encode_ndjson(
+    spec: ExportDataset, chunks: AsyncIterator[list[tuple[Any, ...]]]
+) -> AsyncIterator[bytes]:
+    names = spec.column_names
+    async for chunk in chunks:
+        yield b"".join(
+            json.dumps(dict(zip(names, row, strict=True)), separators=(",", ":")).encode() + b"\n"
+            for row in chunk
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only Datei, die geschriebene Bytes sammelt, bis sie abgeholt werden.
+
+    ``tell()`` zählt über alle Abholungen hinweg — der Parquet-Footer
+    referenziert absolute Offsets.
+    """
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._parts.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    def tell(self) -> int:
+        return self._position
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+async def _encode_parquet(
+    spec: ExportDataset, chunks: AsyncIterator[list[tuple[Any, ...]]]
+) -> AsyncIterator[bytes]:
+    modules = _load_pyarrow()
+    if modules is None:
+        raise RuntimeError("Parquet-Export braucht pyarrow (pip install 'wsb-crawler[parquet]')")
+    pa, pq = modules
+    types = {"str": pa.string(), "int": pa.int64(), "float": pa.float64()}
+    schema = pa.schema([(name, types[kind]) for name, kind in spec.columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        async for chunk in chunks:
+            columns = list(zip(*chunk, strict=True))
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+async def export_stream(
+    db: Storage,
+    dataset: str,
+    fmt: ExportFormat,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    chunk_size: int = EXPORT_CHUNK_ROWS,
+) -> AsyncIterator[bytes]:
+    """Kodierter Export als Byte-Chunks. KeyError bei unbekanntem Datensatz."""
+    spec = DATASETS[dataset]
+    chunks = db.iter_export_chunks(
+        spec.table,
+        spec.column_names,
+        spec.time_column,
+        since=since,
+        until=until,
+        chunk_size=chunk_size,
+    )
+    encoders = {"csv": _encode_csv, "ndjson": _encode_ndjson, "parquet": _encode_parquet}
+    async for data in encoders[fmt](spec, chunks):
+        if data:
+            yield data
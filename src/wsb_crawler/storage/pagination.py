@@ -0,0 +1,35 @@
+"""
+Keyset-Pagination für die History-Abfragen.
+
+Statt ``OFFSET`` (SQLite liest und verwirft alle übersprungenen Zeilen)
+merkt sich ein Cursor die Sortierschlüssel der letzten gelieferten Zeile,
+z.B. ``(sent_at, id)``. Die nächste Seite beginnt per Row-Value-Vergleich
+``WHERE (sent_at, id) < (?, ?)`` direkt am Index — jede Seite kostet gleich
+viel, egal wie weit hinten sie liegt.
+
+Cursor sind für Clients opak (URL-sicheres Base64 über ein JSON-Array).
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, arity: int) -> tuple[Any, ...]:
+    """Cursor → Sortierschlüssel. ValueError bei kaputten/fremden Cursorn."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Ungültiger Cursor: {cursor!r}") from e
+    if not isinstance(values, list) or len(values) != arity:
+        raise ValueError(f"Ungültiger Cursor: {cursor!r}")
+    return tuple(values)
@@ -0,0 +1,1128 @@
+"""
+Postgres-/TimescaleDB-Backend für die Storage-Schnittstelle (storage/base.py).
+
+Für mehrere Crawler-Knoten, die gleichzeitig schreiben — SQLite erlaubt nur
+einen Writer. Unterschiede zur SQLite-Variante:
+- asyncpg-Connection-Pool statt einer Verbindung
+- Mentions per ``COPY`` statt zeilenweisem INSERT
+- Tages-Rollups (History, Chart, Top-Ticker) aus ``ticker_mentions_daily``:
+  mit TimescaleDB ein Continuous Aggregate über der Hypertable
+  ``ticker_mentions`` (Echtzeit-Anteil für noch nicht materialisierte Tage),
+  ohne TimescaleDB eine gewöhnliche View mit derselben Form
+- Outbox-Claims mit ``FOR UPDATE SKIP LOCKED``, damit zwei Knoten nie
+  denselben Alert reservieren
+- News-Suche über eine ``tsvector``-Spalte statt FTS5
+
+Nach außen identisch: Zeitstempel kommen als ISO-Strings zurück, Zähler
+pflegen Trigger in derselben Transaktion wie die Schreibzugriffe.
+
+Braucht das optionale Paket ``asyncpg`` (``wsb-crawler[postgres]``).
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import uuid
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from loguru import logger
+
+from wsb_crawler.models import (
+    Alert,
+    FeedEntry,
+    RunActivity,
+    RunStatus,
+    SymbolInfo,
+    TickerHistory,
+    TrendDirection,
+    TrendEntry,
+)
+from wsb_crawler.storage.database import SCHEMA_VERSION, STAT_KEYS, _as_utc, _parse_dt, _utcnow
+
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+CURSOR_PREFETCH = 500
+
+# Serialisiert das Anlegen des Schemas, wenn mehrere Knoten gleichzeitig starten
+_SCHEMA_LOCK_KEY = 0x575342  # "WSB"
+
+CREATE_TABLES = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version     INTEGER PRIMARY KEY,
+    applied_at  TIMESTAMPTZ NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS settings (
+    key         TEXT PRIMARY KEY,
+    value       TEXT NOT NULL,
+    updated_at  TIMESTAMPTZ NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS crawl_runs (
+    id                  TEXT PRIMARY KEY,
+    started_at          TIMESTAMPTZ NOT NULL,
+    finished_at         TIMESTAMPTZ,
+    posts_scanned       INTEGER DEFAULT 0,
+    comments_scanned    INTEGER DEFAULT 0,
+    subreddits          TEXT NOT NULL,   -- JSON-Array
+    is_healthy          INTEGER DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON crawl_runs(started_at);
+
+-- Ohne Primärschlüssel: eine Hypertable verlangt die Zeitspalte in jedem
+-- eindeutigen Index, und nichts adressiert einzelne Mention-Zeilen
+CREATE TABLE IF NOT EXISTS ticker_mentions (
+    id          BIGINT GENERATED BY DEFAULT AS IDENTITY,
+    run_id      TEXT NOT NULL REFERENCES crawl_runs(id),
+    ticker      TEXT NOT NULL,
+    mentions    INTEGER NOT NULL,
+    recorded_at TIMESTAMPTZ NOT NULL,
+    subreddit   TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_mentions_ticker ON ticker_mentions(ticker, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_mentions_recorded ON ticker_mentions(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_mentions_run ON ticker_mentions(run_id, mentions);
+
+CREATE TABLE IF NOT EXISTS subreddit_crawls (
+    subreddit           TEXT PRIMARY KEY,
+    run_id              TEXT NOT NULL,
+    crawled_at          TIMESTAMPTZ NOT NULL,
+    succeeded_at        TIMESTAMPTZ,
+    posts_scanned       INTEGER DEFAULT 0,
+    comments_scanned    INTEGER DEFAULT 0,
+    tickers_found       INTEGER DEFAULT 0,
+    error               TEXT
+);
+
+CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+    run_id      TEXT NOT NULL,
+    unit        TEXT NOT NULL,   -- Subreddit; '' = Lauf-Checkpoint
+    phase       TEXT NOT NULL,
+    state       TEXT NOT NULL,   -- JSON
+    updated_at  TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (run_id, unit)
+);
+
+CREATE TABLE IF NOT EXISTS alert_cooldowns (
+    ticker          TEXT PRIMARY KEY,
+    last_alert_at   TIMESTAMPTZ NOT NULL,
+    cooldown_until  TIMESTAMPTZ NOT NULL,
+    alert_count     INTEGER DEFAULT 1
+);
+
+CREATE TABLE IF NOT EXISTS alert_history (
+    id              BIGSERIAL PRIMARY KEY,
+    ticker          TEXT NOT NULL,
+    reason          TEXT NOT NULL,
+    mentions        INTEGER NOT NULL,
+    avg_mentions    DOUBLE PRECISION NOT NULL,
+    ratio           DOUBLE PRECISION NOT NULL,
+    price           DOUBLE PRECISION,
+    price_change    DOUBLE PRECISION,
+    confidence      INTEGER,
+    sentiment       DOUBLE PRECISION,
+    sentiment_label TEXT,
+    avg_score       DOUBLE PRECISION,
+    sent_at         TIMESTAMPTZ NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_alerts_sent ON alert_history(sent_at, id);
+CREATE INDEX IF NOT EXISTS idx_alerts_ticker_sent ON alert_history(ticker, sent_at);
+
+CREATE TABLE IF NOT EXISTS news_articles (
+    id              BIGSERIAL PRIMARY KEY,
+    url             TEXT NOT NULL UNIQUE,
+    title           TEXT NOT NULL,
+    summary         TEXT NOT NULL DEFAULT '',
+    source          TEXT NOT NULL,
+    published_at    TIMESTAMPTZ NOT NULL,
+    fetched_at      TIMESTAMPTZ NOT NULL,
+    search          TSVECTOR GENERATED ALWAYS AS
+                        (to_tsvector('simple', title || ' ' || summary)) STORED
+);
+CREATE INDEX IF NOT EXISTS idx_news_published ON news_articles(published_at);
+CREATE INDEX IF NOT EXISTS idx_news_search ON news_articles USING GIN (search);
+
+CREATE TABLE IF NOT EXISTS symbols (
+    symbol      TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    exchange    TEXT NOT NULL DEFAULT '',
+    type        TEXT NOT NULL DEFAULT 'stock',
+    currency    TEXT NOT NULL DEFAULT 'USD',
+    updated_at  TIMESTAMPTZ NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS alert_outbox (
+    id              BIGSERIAL PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    run_id          TEXT NOT NULL,
+    ticker          TEXT NOT NULL,
+    payload         TEXT NOT NULL,
+    status          TEXT NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TIMESTAMPTZ NOT NULL,
+    last_error      TEXT,
+    created_at      TIMESTAMPTZ NOT NULL,
+    sent_at         TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON alert_outbox(status, next_attempt_at);
+
+CREATE TABLE IF NOT EXISTS stats (
+    key     TEXT PRIMARY KEY,
+    value   BIGINT NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS ticker_stats (
+    ticker          TEXT PRIMARY KEY,
+    mention_rows    BIGINT NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION wsb_count_rows() RETURNS trigger AS $$
+BEGIN
+    UPDATE stats SET value = value + (CASE WHEN TG_OP = 'INSERT' THEN 1 ELSE -1 END)
+    WHERE key = TG_ARGV[0];
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION wsb_count_mentions() RETURNS trigger AS $$
+DECLARE
+    n BIGINT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO ticker_stats AS t (ticker, mention_rows) VALUES (NEW.ticker, 1)
+        ON CONFLICT (ticker) DO UPDATE SET mention_rows = t.mention_rows + 1
+        RETURNING mention_rows INTO n;
+        IF n = 1 THEN
+            UPDATE stats SET value = value + 1 WHERE key = 'tracked_tickers';
+        END IF;
+    ELSE
+        UPDATE ticker_stats SET mention_rows = mention_rows - 1 WHERE ticker = OLD.ticker
+        RETURNING mention_rows INTO n;
+        IF n = 0 THEN
+            DELETE FROM ticker_stats WHERE ticker = OLD.ticker;
+            UPDATE stats SET value = value - 1 WHERE key = 'tracked_tickers';
+        END IF;
+    END IF;
+    RETURN NULL;
+END $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER crawl_runs_stats AFTER INSERT OR DELETE ON crawl_runs
+    FOR EACH ROW EXECUTE FUNCTION wsb_count_rows('total_runs');
+CREATE OR REPLACE TRIGGER alert_history_stats AFTER INSERT OR DELETE ON alert_history
+    FOR EACH ROW EXECUTE FUNCTION wsb_count_rows('total_alerts');
+CREATE OR REPLACE TRIGGER ticker_mentions_stats AFTER INSERT OR DELETE ON ticker_mentions
+    FOR EACH ROW EXECUTE FUNCTION wsb_count_mentions();
+"""
+
+# Tages-Rollup mit TimescaleDB: Continuous Aggregate, stündlich materialisiert.
+# materialized_only=false ergänzt die noch nicht materialisierten Tage live.
+# Jede Anweisung einzeln — Continuous Aggregates dürfen nicht in einer
+# Transaktion angelegt werden.
+_TIMESCALE_ROLLUP = (
+    "SELECT create_hypertable('ticker_mentions', 'recorded_at', "
+    "if_not_exists => TRUE, migrate_data => TRUE)",
+    """CREATE MATERIALIZED VIEW IF NOT EXISTS ticker_mentions_daily
+       WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS
+       SELECT time_bucket(INTERVAL '1 day', recorded_at) AS day, ticker,
+              SUM(mentions) AS total
+       FROM ticker_mentions
+       GROUP BY day, ticker
+       WITH NO DATA""",
+    """SELECT add_continuous_aggregate_policy('ticker_mentions_daily',
+           start_offset => INTERVAL '3 days', end_offset => INTERVAL '1 hour',
+           schedule_interval => INTERVAL '1 hour', if_not_exists => TRUE)""",
+)
+
+# Gleiche Form ohne TimescaleDB (wird bei jeder Abfrage aggregiert)
+_PLAIN_ROLLUP = """
+CREATE OR REPLACE VIEW ticker_mentions_daily AS
+SELECT date_trunc('day', recorded_at, 'UTC') AS day, ticker, SUM(mentions) AS total
+FROM ticker_mentions
+GROUP BY 1, 2
+"""
+
+
+def load_asyncpg() -> Any | None:
+    try:
+        return importlib.import_module("asyncpg")
+    except ImportError:
+        return None
+
+
+def rowcount(status: str) -> int:
+    """asyncpg liefert den Command-Tag, z.B. ``UPDATE 1`` oder ``INSERT 0 3``."""
+    return int(status.rsplit(" ", 1)[-1])
+
+
+def _value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _row(record: Any) -> dict[str, Any]:
+    """Record → dict in derselben Form wie bei SQLite (Zeitstempel als ISO-String)."""
+    return {key: _value(value) for key, value in record.items()}
+
+
+class PostgresDatabase:
+    """
+    Storage auf Postgres (optional TimescaleDB).
+
+    Verwendung:
+        async with PostgresDatabase("postgresql://wsb@db/wsb") as db:
+            await db.save_run_mentions(run_id, counts)
+
+    schema: eigenes Postgres-Schema (z.B. für Tests), sonst ``public``.
+    read_only: nur lesende Transaktionen, ohne Schema-Init (wie bei SQLite).
+    """
+
+    def __init__(self, dsn: str, *, schema: str | None = None, read_only: bool = False) -> None:
+        self._dsn = dsn
+        self._schema = schema
+        self._read_only = read_only
+        self._pool: Any = None
+        self._asyncpg: Any = None
+        self._timescale = False
+        self._change_listeners: list[Callable[[], None]] = []
+
+    async def init(self) -> None:
+        """Pool öffnen + Schema anlegen."""
+        asyncpg = load_asyncpg()
+        if asyncpg is None:
+            raise RuntimeError(
+                "WSB_DATABASE_DSN braucht asyncpg (pip install 'wsb-crawler[postgres]')"
+            )
+        self._asyncpg = asyncpg
+        server_settings = {"timezone": "UTC"}
+        if self._read_only:
+            server_settings["default_transaction_read_only"] = "on"
+        try:
+            if self._schema:
+                if not self._read_only:
+                    conn = await asyncpg.connect(self._dsn)
+                    try:
+                        await conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{self._schema}"')
+                    finally:
+                        await conn.close()
+                server_settings["search_path"] = f'"{self._schema}", public'
+            self._pool = await asyncpg.create_pool(
+                self._dsn,
+                min_size=POOL_MIN_SIZE,
+                max_size=POOL_MAX_SIZE,
+                server_settings=server_settings,
+            )
+        except (OSError, asyncpg.PostgresError) as e:
+            raise RuntimeError(
+                f"Postgres-Datenbank nicht erreichbar ({e}). Prüfe WSB_DATABASE_DSN."
+            ) from e
+        if self._read_only:
+            return
+        async with self.pool.acquire() as conn:
+            await conn.execute("SELECT pg_advisory_lock($1)", _SCHEMA_LOCK_KEY)
+            try:
+                await conn.execute(CREATE_TABLES)
+                self._timescale = await self._create_rollup(conn)
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", _SCHEMA_LOCK_KEY)
+        await self._seed_stats()
+        await self._apply_schema_version()
+        logger.info(
+            "Datenbank initialisiert: Postgres"
+            + (" mit TimescaleDB" if self._timescale else "")
+            + (f" (Schema {self._schema})" if self._schema else "")
+        )
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def __aenter__(self) -> PostgresDatabase:
+        await self.init()
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await self.close()
+
+    @property
+    def pool(self) -> Any:
+        if self._pool is None:
+            raise RuntimeError("Datenbank nicht initialisiert. Bitte zuerst init() aufrufen.")
+        return self._pool
+
+    @property
+    def timescale(self) -> bool:
+        """True, wenn die Tages-Rollups ein TimescaleDB Continuous Aggregate sind."""
+        return self._timescale
+
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Callback nach Schreibzugriffen dieses Knotens (siehe Database)."""
+        if callback not in self._change_listeners:
+            self._change_listeners.append(callback)
+
+    def _notify_change(self) -> None:
+        for callback in list(self._change_listeners):
+            callback()
+
+    # ── Schema ──────────────────────────────────────────────────────────────
+
+    async def _create_rollup(self, conn: Any) -> bool:
+        """Continuous Aggregate, falls TimescaleDB verfügbar ist, sonst eine View."""
+        available = await conn.fetchval(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'timescaledb'"
+        )
+        if available:
+            try:
+                await conn.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+                for statement in _TIMESCALE_ROLLUP:
+                    await conn.execute(statement)
+                return True
+            except self._asyncpg.PostgresError as e:
+                # z.B. nicht in shared_preload_libraries oder fehlende Rechte
+                logger.warning(f"TimescaleDB nicht nutzbar, Tages-Rollups als View: {e}")
+        await conn.execute(_PLAIN_ROLLUP)
+        return False
+
+    async def _seed_stats(self) -> None:
+        count = await self.pool.fetchval("SELECT COUNT(*) FROM stats")
+        if count >= len(STAT_KEYS):
+            return
+        await self.rebuild_stats()
+
+    async def rebuild_stats(self) -> dict[str, int]:
+        """Zählt stats/ticker_stats einmal komplett neu (Seed bzw. Reparatur)."""
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.execute("LOCK TABLE stats, ticker_stats IN EXCLUSIVE MODE")
+            await conn.execute("DELETE FROM ticker_stats")
+            await conn.execute(
+                """INSERT INTO ticker_stats (ticker, mention_rows)
+                   SELECT ticker, COUNT(*) FROM ticker_mentions GROUP BY ticker"""
+            )
+            counts = {
+                "total_runs": await conn.fetchval("SELECT COUNT(*) FROM crawl_runs"),
+                "total_alerts": await conn.fetchval("SELECT COUNT(*) FROM alert_history"),
+                "tracked_tickers": await conn.fetchval("SELECT COUNT(*) FROM ticker_stats"),
+            }
+            await conn.executemany(
+                """INSERT INTO stats (key, value) VALUES ($1, $2)
+                   ON CONFLICT (key) DO UPDATE SET value = excluded.value""",
+                [(key, counts[key]) for key in STAT_KEYS],
+            )
+        return {key: int(value) for key, value in counts.items()}
+
+    async def get_stats(self) -> dict[str, int]:
+        rows = await self.pool.fetch("SELECT key, value FROM stats")
+        stats = dict.fromkeys(STAT_KEYS, 0)
+        stats.update({row["key"]: int(row["value"]) for row in rows})
+        return stats
+
+    async def _apply_schema_version(self) -> None:
+        await self.pool.execute(
+            "INSERT INTO schema_version VALUES ($1, $2) ON CONFLICT (version) DO NOTHING",
+            SCHEMA_VERSION,
+            _utcnow(),
+        )
+
+    # ── Crawl Runs ──────────────────────────────────────────────────────────
+
+    async def start_run(self, subreddits: list[str]) -> str:
+        run_id = str(uuid.uuid4())
+        await self.pool.execute(
+            "INSERT INTO crawl_runs (id, started_at, subreddits) VALUES ($1, $2, $3)",
+            run_id,
+            _utcnow(),
+            json.dumps(subreddits),
+        )
+        self._notify_change()
+        return run_id
+
+    async def finish_run(
+        self,
+        run_id: str,
+        posts_scanned: int,
+        comments_scanned: int,
+        is_healthy: bool = True,
+    ) -> None:
+        await self.pool.execute(
+            """UPDATE crawl_runs
+               SET finished_at = $1, posts_scanned = $2, comments_scanned = $3, is_healthy = $4
+               WHERE id = $5""",
+            _utcnow(),
+            posts_scanned,
+            comments_scanned,
+            1 if is_healthy else 0,
+            run_id,
+        )
+        self._notify_change()
+
+    async def save_run_mentions(
+        self, run_id: str, counts: dict[str, int], subreddit: str = ""
+    ) -> None:
+        """Mention-Counts eines Laufs per COPY (ein Roundtrip für alle Zeilen)."""
+        if not counts:
+            return
+        now = _utcnow()
+        async with self.pool.acquire() as conn:
+            await conn.copy_records_to_table(
+                "ticker_mentions",
+                records=[
+                    (run_id, ticker, count, now, subreddit) for ticker, count in counts.items()
+                ],
+                columns=["run_id", "ticker", "mentions", "recorded_at", "subreddit"],
+            )
+        self._notify_change()
+
+    async def record_subreddit_crawl(
+        self,
+        subreddit: str,
+        run_id: str,
+        *,
+        posts_scanned: int = 0,
+        comments_scanned: int = 0,
+        tickers_found: int = 0,
+        error: str | None = None,
+    ) -> None:
+        now = _utcnow()
+        await self.pool.execute(
+            """INSERT INTO subreddit_crawls AS s
+                   (subreddit, run_id, crawled_at, succeeded_at,
+                    posts_scanned, comments_scanned, tickers_found, error)
+               VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+               ON CONFLICT (subreddit) DO UPDATE SET
+                   run_id = excluded.run_id,
+                   crawled_at = excluded.crawled_at,
+                   succeeded_at = COALESCE(excluded.succeeded_at, s.succeeded_at),
+                   posts_scanned = excluded.posts_scanned,
+                   comments_scanned = excluded.comments_scanned,
+                   tickers_found = excluded.tickers_found,
+                   error = excluded.error""",
+            subreddit,
+            run_id,
+            now,
+            None if error else now,
+            posts_scanned,
+            comments_scanned,
+            tickers_found,
+            error,
+        )
+
+    async def get_subreddit_crawls(self) -> dict[str, dict[str, Any]]:
+        rows = await self.pool.fetch("SELECT * FROM subreddit_crawls ORDER BY subreddit")
+        return {row["subreddit"]: _row(row) for row in rows}
+
+    # ── Crawl-Checkpoints ────────────────────────────────────────────────────
+
+    async def save_checkpoint(self, run_id: str, unit: str, phase: str, state: str) -> None:
+        await self.pool.execute(
+            """INSERT INTO crawl_checkpoints (run_id, unit, phase, state, updated_at)
+               VALUES ($1, $2, $3, $4, $5)
+               ON CONFLICT (run_id, unit) DO UPDATE SET
+                   phase = excluded.phase,
+                   state = excluded.state,
+                   updated_at = excluded.updated_at""",
+            run_id,
+            unit,
+            phase,
+            state,
+            _utcnow(),
+        )
+
+    async def get_checkpoints(self, run_id: str) -> dict[str, dict[str, Any]]:
+        rows = await self.pool.fetch(
+            "SELECT unit, phase, state, updated_at FROM crawl_checkpoints WHERE run_id = $1",
+            run_id,
+        )
+        return {row["unit"]: _row(row) for row in rows}
+
+    async def get_resumable_run(self, max_age_minutes: int) -> dict[str, Any] | None:
+        row = await self.pool.fetchrow(
+            """SELECT r.id, r.subreddits
+               FROM crawl_runs r JOIN crawl_checkpoints c ON c.run_id = r.id
+               GROUP BY r.id
+               HAVING MAX(c.updated_at) >= $1
+               ORDER BY MAX(c.updated_at) DESC
+               LIMIT 1""",
+            _utcnow() - timedelta(minutes=max_age_minutes),
+        )
+        if not row:
+            return None
+        return {"id": row["id"], "subreddits": json.loads(row["subreddits"])}
+
+    async def reopen_run(self, run_id: str) -> None:
+        await self.pool.execute(
+            "UPDATE crawl_runs SET finished_at = NULL, is_healthy = 1 WHERE id = $1", run_id
+        )
+        self._notify_change()
+
+    async def clear_checkpoints(self, run_id: str | None = None) -> int:
+        if run_id is None:
+            return rowcount(await self.pool.execute("DELETE FROM crawl_checkpoints"))
+        return rowcount(
+            await self.pool.execute("DELETE FROM crawl_checkpoints WHERE run_id = $1", run_id)
+        )
+
+    # ── Ticker History (Tages-Rollups) ───────────────────────────────────────
+
+    async def get_ticker_history(self, ticker: str, days: int = 30) -> TickerHistory:
+        rows = await self.pool.fetch(
+            """SELECT day, total FROM ticker_mentions_daily
+               WHERE ticker = $1 AND day >= date_trunc('day', $2::timestamptz, 'UTC')
+               ORDER BY day ASC""",
+            ticker,
+            _utcnow() - timedelta(days=days),
+        )
+        return TickerHistory(
+            ticker=ticker, mention_counts=[(r["day"], int(r["total"])) for r in rows]
+        )
+
+    async def get_daily_mention_totals(self, days: int = 14) -> list[tuple[datetime, int]]:
+        rows = await self.pool.fetch(
+            """SELECT day, SUM(total) AS total FROM ticker_mentions_daily
+               WHERE day >= date_trunc('day', $1::timestamptz, 'UTC')
+               GROUP BY day ORDER BY day ASC""",
+            _utcnow() - timedelta(days=days),
+        )
+        return [(r["day"], int(r["total"])) for r in rows]
+
+    async def get_avg_mentions(
+        self, ticker: str, days: int = 30, exclude_run_id: str | None = None
+    ) -> float:
+        """Wie bei SQLite aus den Rohdaten — der Rollup kennt keine einzelnen Läufe."""
+        value = await self.pool.fetchval(
+            """SELECT AVG(daily_total) FROM (
+                   SELECT SUM(mentions) AS daily_total
+                   FROM ticker_mentions
+                   WHERE ticker = $1 AND recorded_at >= $2
+                     AND run_id <> COALESCE($3::text, '')
+                   GROUP BY date_trunc('day', recorded_at, 'UTC')
+               ) d""",
+            ticker,
+            _utcnow() - timedelta(days=days),
+            exclude_run_id,
+        )
+        return float(value) if value else 0.0
+
+    async def is_known_ticker(self, ticker: str, exclude_run_id: str | None = None) -> bool:
+        value = await self.pool.fetchval(
+            """SELECT 1 FROM ticker_mentions
+               WHERE ticker = $1 AND run_id <> COALESCE($2::text, '') LIMIT 1""",
+            ticker,
+            exclude_run_id,
+        )
+        return value is not None
+
+    # ── Cooldowns ────────────────────────────────────────────────────────────
+
+    async def is_on_cooldown(self, ticker: str) -> bool:
+        until = await self.pool.fetchval(
+            "SELECT cooldown_until FROM alert_cooldowns WHERE ticker = $1", ticker
+        )
+        return until is not None and until > _utcnow()
+
+    async def set_cooldown(self, ticker: str, hours: int) -> None:
+        now = _utcnow()
+        await self.pool.execute(
+            """INSERT INTO alert_cooldowns AS c (ticker, last_alert_at, cooldown_until, alert_count)
+               VALUES ($1, $2, $3, 1)
+               ON CONFLICT (ticker) DO UPDATE SET
+                   last_alert_at = excluded.last_alert_at,
+                   cooldown_until = excluded.cooldown_until,
+                   alert_count = c.alert_count + 1""",
+            ticker,
+            now,
+            now + timedelta(hours=hours),
+        )
+
+    # ── Alert History ────────────────────────────────────────────────────────
+
+    async def save_alert(self, alert: Alert) -> None:
+        price = alert.spike.price_data
+        signal = alert.spike.signal
+        await self.pool.execute(
+            """INSERT INTO alert_history
+               (ticker, reason, mentions, avg_mentions, ratio, price, price_change,
+                confidence, sentiment, sentiment_label, avg_score, sent_at)
+               VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)""",
+            alert.ticker,
+            alert.reason.value,
+            alert.spike.current_mentions,
+            alert.spike.avg_mentions,
+            alert.spike.ratio,
+            price.primary_price if price else None,
+            price.primary_change if price else None,
+            alert.spike.confidence or None,
+            round(signal.sentiment, 4) if signal else None,
+            signal.sentiment_label if signal else None,
+            round(signal.avg_score, 2) if signal else None,
+            alert.triggered_at,
+        )
+        self._notify_change()
+
+    # ── Trend-Analyse ────────────────────────────────────────────────────────
+
+    async def get_top_tickers(self, days: int = 7, limit: int = 10) -> list[TrendEntry]:
+        """Top-Ticker aus dem Tages-Rollup (ganze Tage ab dem Starttag)."""
+        rows = await self.pool.fetch(
+            """SELECT ticker,
+                      SUM(total) AS total,
+                      AVG(total)::float8 AS avg_daily,
+                      MAX(total) AS peak,
+                      (ARRAY_AGG(day ORDER BY total DESC, day ASC))[1] AS peak_day
+               FROM ticker_mentions_daily
+               WHERE day >= date_trunc('day', $1::timestamptz, 'UTC')
+               GROUP BY ticker
+               ORDER BY total DESC
+               LIMIT $2""",
+            _utcnow() - timedelta(days=days),
+            limit,
+        )
+        return [
+            TrendEntry(
+                ticker=r["ticker"],
+                company_name=None,
+                total_mentions=int(r["total"]),
+                avg_daily_mentions=r["avg_daily"] or 0.0,
+                # SQLite liefert den Tag ohne Zeitzone — gleiche Form
+                peak_day=r["peak_day"].replace(tzinfo=None) if r["peak_day"] else None,
+                peak_mentions=int(r["peak"] or 0),
+                trend_direction=TrendDirection.FLAT,
+            )
+            for r in rows
+        ]
+
+    # ── Status ───────────────────────────────────────────────────────────────
+
+    async def get_run_status(self) -> RunStatus:
+        last_run = await self.pool.fetchrow(
+            "SELECT started_at, finished_at FROM crawl_runs ORDER BY started_at DESC LIMIT 1"
+        )
+        stats = await self.get_stats()
+        last_at = last_run["started_at"] if last_run else None
+        duration = None
+        if last_run and last_run["finished_at"]:
+            duration = (last_run["finished_at"] - last_at).total_seconds()
+        return RunStatus(
+            last_run_at=last_at,
+            last_run_duration_seconds=duration,
+            total_runs=stats["total_runs"],
+            total_alerts_sent=stats["total_alerts"],
+            tracked_tickers=stats["tracked_tickers"],
+            next_run_at=None,
+            is_healthy=True,
+        )
+
+    async def get_recent_activity(self, min_mentions: int, limit: int = 48) -> list[RunActivity]:
+        rows = await self.pool.fetch(
+            """
+            SELECT r.id, r.started_at,
+                   COALESCE(SUM(m.mentions), 0) AS mentions,
+                   COUNT(*) FILTER (WHERE m.mentions >= $1) AS candidates
+            FROM (
+                SELECT id, started_at FROM crawl_runs
+                WHERE finished_at IS NOT NULL AND is_healthy = 1
+                ORDER BY started_at DESC LIMIT $2
+            ) r
+            LEFT JOIN LATERAL (
+                SELECT SUM(mentions) AS mentions
+                FROM ticker_mentions WHERE run_id = r.id GROUP BY ticker
+            ) m ON TRUE
+            GROUP BY r.id, r.started_at
+            ORDER BY r.started_at DESC
+            """,
+            min_mentions,
+            limit,
+        )
+        return [
+            RunActivity(
+                run_id=row["id"],
+                started_at=row["started_at"],
+                mentions=int(row["mentions"]),
+                candidates=int(row["candidates"]),
+            )
+            for row in rows
+        ]
+
+    # ── Settings ─────────────────────────────────────────────────────────────
+
+    async def get_setting(self, key: str) -> str | None:
+        value: str | None = await self.pool.fetchval(
+            "SELECT value FROM settings WHERE key = $1", key
+        )
+        return value
+
+    async def set_setting(self, key: str, value: str) -> None:
+        await self.pool.execute(
+            """INSERT INTO settings (key, value, updated_at) VALUES ($1, $2, $3)
+               ON CONFLICT (key) DO UPDATE SET value = excluded.value,
+                                               updated_at = excluded.updated_at""",
+            key,
+            value,
+            _utcnow(),
+        )
+        self._notify_change()
+
+    async def get_all_settings(self) -> dict[str, str]:
+        rows = await self.pool.fetch("SELECT key, value FROM settings")
+        return {r["key"]: r["value"] for r in rows}
+
+    async def is_configured(self) -> bool:
+        required = ["reddit_client_id", "reddit_client_secret", "discord_webhook_url"]
+        settings = await self.get_all_settings()
+        return all(settings.get(key) for key in required)
+
+    # ── Alert History (API) ───────────────────────────────────────────────────
+
+    async def _iter_rows(self, query: str, params: list[Any]) -> AsyncIterator[dict[str, Any]]:
+        """Zeilenweise über einen Server-Cursor (konstanter Speicher)."""
+        async with self.pool.acquire() as conn, conn.transaction(readonly=True):
+            async for record in conn.cursor(query, *params, prefetch=CURSOR_PREFETCH):
+                yield _row(record)
+
+    async def iter_alert_history(
+        self,
+        *,
+        limit: int = 50,
+        after: tuple[str, int] | None = None,
+        ticker: str | None = None,
+        reason: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        min_confidence: int | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if after is not None:
+            params.extend([_parse_dt(after[0]), after[1]])
+            clauses.append(f"(sent_at, id) < (${len(params) - 1}, ${len(params)})")
+        if ticker:
+            params.append(ticker.upper())
+            clauses.append(f"ticker = ${len(params)}")
+        if reason:
+            params.append(reason)
+            clauses.append(f"reason = ${len(params)}")
+        if since is not None:
+            params.append(_as_utc(since))
+            clauses.append(f"sent_at >= ${len(params)}")
+        if until is not None:
+            params.append(_as_utc(until))
+            clauses.append(f"sent_at < ${len(params)}")
+        if min_confidence is not None:
+            params.append(min_confidence)
+            clauses.append(f"confidence >= ${len(params)}")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        query = (
+            f"SELECT * FROM alert_history {where} "
+            f"ORDER BY sent_at DESC, id DESC LIMIT ${len(params)}"
+        )
+        async for row in self._iter_rows(query, params):
+            yield row
+
+    async def get_alert_history(
+        self, limit: int = 50, ticker: str | None = None, **filters: Any
+    ) -> list[dict[str, Any]]:
+        return [row async for row in self.iter_alert_history(limit=limit, ticker=ticker, **filters)]
+
+    async def iter_runs(
+        self,
+        *,
+        limit: int = 20,
+        after: tuple[str, str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if after is not None:
+            params.extend([_parse_dt(after[0]), after[1]])
+            clauses.append(f"(started_at, id) < (${len(params) - 1}, ${len(params)})")
+        if since is not None:
+            params.append(_as_utc(since))
+            clauses.append(f"started_at >= ${len(params)}")
+        if until is not None:
+            params.append(_as_utc(until))
+            clauses.append(f"started_at < ${len(params)}")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        query = (
+            f"SELECT * FROM crawl_runs {where} "
+            f"ORDER BY started_at DESC, id DESC LIMIT ${len(params)}"
+        )
+        async for row in self._iter_rows(query, params):
+            yield row
+
+    async def get_recent_runs(self, limit: int = 20, **filters: Any) -> list[dict[str, Any]]:
+        return [row async for row in self.iter_runs(limit=limit, **filters)]
+
+    async def get_run_mentions(
+        self, run_id: str, *, limit: int = 100, after: tuple[int, str] | None = None
+    ) -> list[dict[str, Any]]:
+        keyset = ""
+        params: list[Any] = [run_id]
+        if after is not None:
+            keyset = "HAVING (SUM(mentions) < $2 OR (SUM(mentions) = $2 AND ticker > $3))"
+            params.extend(after)
+        params.append(limit if limit >= 0 else None)  # -1 = alle (wie bei SQLite)
+        rows = await self.pool.fetch(
+            f"""SELECT ticker, SUM(mentions) AS mentions, MAX(recorded_at) AS recorded_at
+                FROM ticker_mentions
+                WHERE run_id = $1
+                GROUP BY ticker {keyset}
+                ORDER BY mentions DESC, ticker ASC
+                LIMIT ${len(params)}""",
+            *params,
+        )
+        return [_row(r) for r in rows]
+
+    async def get_run_detail(
+        self, run_id: str, mentions_limit: int | None = None
+    ) -> dict[str, Any] | None:
+        row = await self.pool.fetchrow("SELECT * FROM crawl_runs WHERE id = $1", run_id)
+        if row is None:
+            return None
+        detail = _row(row)
+        detail["mentions_total"] = int(
+            await self.pool.fetchval(
+                "SELECT COUNT(DISTINCT ticker) FROM ticker_mentions WHERE run_id = $1", run_id
+            )
+        )
+        totals = await self.pool.fetch(
+            """SELECT subreddit, COUNT(*) AS tickers, SUM(mentions) AS mentions
+               FROM ticker_mentions WHERE run_id = $1
+               GROUP BY subreddit ORDER BY mentions DESC""",
+            run_id,
+        )
+        detail["subreddit_totals"] = [_row(r) for r in totals]
+        detail["mentions"] = await self.get_run_mentions(
+            run_id, limit=mentions_limit if mentions_limit is not None else -1
+        )
+        return detail
+
+    # ── Lokaler News-Index (RSS/Atom) ─────────────────────────────────────────
+
+    async def save_news_articles(self, entries: list[FeedEntry]) -> int:
+        if not entries:
+            return 0
+        status = await self.pool.execute(
+            """INSERT INTO news_articles (url, title, summary, source, published_at, fetched_at)
+               SELECT u, t, s, src, p, $6
+               FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::timestamptz[])
+                    AS e(u, t, s, src, p)
+               ON CONFLICT (url) DO NOTHING""",
+            [e.url for e in entries],
+            [e.title for e in entries],
+            [e.summary for e in entries],
+            [e.source for e in entries],
+            [e.published_at for e in entries],
+            _utcnow(),
+        )
+        return rowcount(status)
+
+    async def search_news(
+        self, match: str, since: datetime, limit: int = 20
+    ) -> list[dict[str, Any]]:
+        """Volltextsuche; ``websearch_to_tsquery`` versteht die FTS5-Form
+        '"GME" OR "GameStop"' (quotierte Phrasen, OR) unverändert."""
+        rows = await self.pool.fetch(
+            """SELECT url, title, summary, source, published_at
+               FROM news_articles
+               WHERE search @@ websearch_to_tsquery('simple', $1) AND published_at >= $2
+               ORDER BY published_at DESC
+               LIMIT $3""",
+            match,
+            since,
+            limit,
+        )
+        return [_row(r) for r in rows]
+
+    async def purge_old_news(self, days: int = 14) -> int:
+        status = await self.pool.execute(
+            "DELETE FROM news_articles WHERE published_at < $1",
+            _utcnow() - timedelta(days=days),
+        )
+        return rowcount(status)
+
+    # ── Alert-Outbox ─────────────────────────────────────────────────────────
+
+    async def enqueue_alert(self, key: str, run_id: str, ticker: str, payload: str) -> bool:
+        now = _utcnow()
+        status = await self.pool.execute(
+            """INSERT INTO alert_outbox
+               (idempotency_key, run_id, ticker, payload, next_attempt_at, created_at)
+               VALUES ($1, $2, $3, $4, $5, $5)
+               ON CONFLICT (idempotency_key) DO NOTHING""",
+            key,
+            run_id,
+            ticker,
+            payload,
+            now,
+        )
+        return rowcount(status) > 0
+
+    async def claim_due_alerts(self, limit: int, lease_seconds: float) -> list[dict[str, Any]]:
+        """Wie bei SQLite, aber atomar: gesperrte Zeilen anderer Knoten werden übersprungen."""
+        now = _utcnow()
+        rows = await self.pool.fetch(
+            """WITH due AS (
+                   SELECT id, next_attempt_at FROM alert_outbox
+                   WHERE status = 'pending' AND next_attempt_at <= $1
+                   ORDER BY next_attempt_at, id
+                   LIMIT $2
+                   FOR UPDATE SKIP LOCKED
+               )
+               UPDATE alert_outbox o SET next_attempt_at = $3
+               FROM due WHERE o.id = due.id
+               RETURNING o.id, o.idempotency_key, o.run_id, o.ticker, o.payload, o.attempts,
+                         due.next_attempt_at AS due_at""",
+            now,
+            limit,
+            now + timedelta(seconds=lease_seconds),
+        )
+        claimed = sorted(rows, key=lambda r: (r["due_at"], r["id"]))
+        return [{k: v for k, v in _row(r).items() if k != "due_at"} for r in claimed]
+
+    async def mark_alert_sent(self, outbox_id: int) -> None:
+        await self.pool.execute(
+            """UPDATE alert_outbox
+               SET status = 'sent', attempts = attempts + 1, sent_at = $1, last_error = NULL
+               WHERE id = $2""",
+            _utcnow(),
+            outbox_id,
+        )
+
+    async def mark_alert_failed(
+        self, outbox_id: int, error: str, retry_in_seconds: float | None
+    ) -> None:
+        if retry_in_seconds is None:
+            # Dead-Letter gibt den Cooldown frei (siehe Database.mark_alert_failed)
+            async with self.pool.acquire() as conn, conn.transaction():
+                await conn.execute(
+                    """UPDATE alert_outbox
+                       SET status = 'dead', attempts = attempts + 1, last_error = $1
+                       WHERE id = $2""",
+                    error,
+                    outbox_id,
+                )
+                await conn.execute(
+                    """UPDATE alert_cooldowns c SET cooldown_until = $1
+                       FROM alert_outbox o
+                       WHERE o.id = $2 AND o.ticker = c.ticker
+                         AND c.last_alert_at <= o.created_at""",
+                    _utcnow(),
+                    outbox_id,
+                )
+            return
+        await self.pool.execute(
+            """UPDATE alert_outbox
+               SET attempts = attempts + 1, last_error = $1, next_attempt_at = $2
+               WHERE id = $3""",
+            error,
+            _utcnow() + timedelta(seconds=retry_in_seconds),
+            outbox_id,
+        )
+
+    async def purge_old_outbox(self, days: int = 30) -> int:
+        status = await self.pool.execute(
+            "DELETE FROM alert_outbox WHERE status = 'sent' AND created_at < $1",
+            _utcnow() - timedelta(days=days),
+        )
+        return rowcount(status)
+
+    async def get_outbox(self, status: str | None = None, limit: int = 50) -> list[dict[str, Any]]:
+        query = (
+            "SELECT id, idempotency_key, run_id, ticker, status, attempts, next_attempt_at, "
+            "last_error, created_at, sent_at FROM alert_outbox"
+        )
+        params: list[Any] = []
+        if status:
+            params.append(status)
+            query += " WHERE status = $1"
+        params.append(limit)
+        query += f" ORDER BY id DESC LIMIT ${len(params)}"
+        return [_row(r) for r in await self.pool.fetch(query, *params)]
+
+    # ── Symbol-Stammdaten ────────────────────────────────────────────────────
+
+    async def replace_symbols(self, symbols: list[SymbolInfo]) -> int:
+        """Ersetzt die Symboltabelle in einer Transaktion (COPY statt Einzel-Inserts)."""
+        now = _utcnow()
+        unique = {s.symbol: s for s in symbols}  # letzter gewinnt wie INSERT OR REPLACE
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.execute("DELETE FROM symbols")
+            await conn.copy_records_to_table(
+                "symbols",
+                records=[
+                    (s.symbol, s.name, s.exchange, s.type, s.currency, now) for s in unique.values()
+                ],
+                columns=["symbol", "name", "exchange", "type", "currency", "updated_at"],
+            )
+        return await self.count_symbols()
+
+    async def count_symbols(self) -> int:
+        return int(await self.pool.fetchval("SELECT COUNT(*) FROM symbols"))
+
+    async def get_symbols(self, symbols: list[str]) -> dict[str, SymbolInfo]:
+        if not symbols:
+            return {}
+        rows = await self.pool.fetch(
+            """SELECT symbol, name, exchange, type, currency FROM symbols
+               WHERE symbol = ANY($1::text[])""",
+            symbols,
+        )
+        return {r["symbol"]: SymbolInfo(**dict(r)) for r in rows}
+
+    async def get_known_symbols(self) -> frozenset[str]:
+        rows = await self.pool.fetch("SELECT symbol FROM symbols")
+        return frozenset(r["symbol"] for r in rows)
+
+    # ── Export ───────────────────────────────────────────────────────────────
+
+    async def iter_export_chunks(
+        self,
+        table: str,
+        columns: list[str],
+        time_column: str,
+        *,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[list[tuple[Any, ...]]]:
+        """Chunks aus einem read-only Snapshot (REPEATABLE READ) über einen Server-Cursor.
+
+        Zweiter Sortierschlüssel ist die erste Spalte (``id``) statt SQLites rowid.
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if since is not None:
+            params.append(_as_utc(since))
+            clauses.append(f"{time_column} >= ${len(params)}")
+        if until is not None:
+            params.append(_as_utc(until))
+            clauses.append(f"{time_column} < ${len(params)}")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        query = (
+            f"SELECT {', '.join(columns)} FROM {table} {where} "
+            f"ORDER BY {time_column}, {columns[0]}"
+        )
+        async with (
+            self.pool.acquire() as conn,
+            conn.transaction(isolation="repeatable_read", readonly=True),
+        ):
+            cursor = await conn.cursor(query, *params)
+            while rows := await cursor.fetch(chunk_size):
+                yield [tuple(_value(v) for v in r.values()) for r in rows]
+
+    # ── Aufräumen ────────────────────────────────────────────────────────────
+
+    async def purge_old_mentions(self, days: int = 90) -> int:
+        """Löscht Roh-Mentions älter als N Tage.
+
+        Materialisierte Tage im Continuous Aggregate bleiben dabei erhalten —
+        der Rollup reicht also weiter zurück als die Rohdaten.
+        """
+        status = await self.pool.execute(
+            "DELETE FROM ticker_mentions WHERE recorded_at < $1",
+            _utcnow() - timedelta(days=days),
+        )
+        self._notify_change()
+        return rowcount(status)
@@ -15,6 +15,7 @@ from wsb_crawler.models import (
     SpikeResult,
     TickerSignal,
 )
+from wsb_crawler.storage.base import Storage
 from wsb_crawler.storage.database import Database
 
 # alte alert_history-Schema-Version (vor der Signal-Migration)
@@ -91,13 +92,10 @@ class TestMigration:
 
 class TestPersistence:
     @pytest.fixture
-    async def db(self, tmp_path: Path) -> Database:
-        database = Database(tmp_path / "t.db")
-        await database.init()
-        yield database
-        await database.close()
+    async def db(self, storage: Storage) -> Storage:
+        yield storage
 
-    async def test_save_and_read_signal_fields(self, db: Database) -> None:
+    async def test_save_and_read_signal_fields(self, db: Storage) -> None:
         await db.save_alert(_alert())
         rows = await db.get_alert_history(ticker="GME")
         assert len(rows) == 1
@@ -107,7 +105,7 @@ class TestPersistence:
         assert row["sentiment_label"] == "bullish"
         assert row["avg_score"] == pytest.approx(200.0)
 
-    async def test_alert_without_signal_stores_nulls(self, db: Database) -> None:
+    async def test_alert_without_signal_stores_nulls(self, db: Storage) -> None:
         await db.save_alert(_alert(with_signal=False))
         row = (await db.get_alert_history(ticker="GME"))[0]
         assert row["sentiment"] is None
@@ -53,3 +53,38 @@ class TestTTLCache:
         stats = cache.stats
         assert stats["size"] == 1
         assert stats["ttl_seconds"] == 123
+
+
+class TestStaleWhileRevalidate:
+    def test_get_stale_survives_expiry_within_grace(self):
+        cache: TTLCache[str] = TTLCache(ttl_seconds=300, stale_ttl_seconds=600)
+        cache.set("GME", "GameStop")
+        later = time.monotonic() + 400
+        with patch("wsb_crawler.storage.cache.time.monotonic", return_value=later):
+            assert cache.get("GME") is None  # frisch: abgelaufen
+            assert cache.get_stale("GME") == "GameStop"  # stale: noch lesbar
+            assert len(cache) == 0
+            assert cache.stats["stale"] == 1
+
+    def test_get_stale_drops_after_grace(self):
+        cache: TTLCache[str] = TTLCache(ttl_seconds=300, stale_ttl_seconds=600)
+        cache.set("GME", "GameStop")
+        with patch(
+            "wsb_crawler.storage.cache.time.monotonic", return_value=time.monotonic() + 1000
+        ):
+            assert cache.get_stale("GME") is None
+
+    def test_without_grace_stale_equals_fresh(self):
+        cache: TTLCache[str] = TTLCache(ttl_seconds=300)
+        cache.set("GME", "GameStop")
+        with patch("wsb_crawler.storage.cache.time.monotonic", return_value=time.monotonic() + 400):
+            assert cache.get_stale("GME") is None
+
+    def test_ttl_remaining(self):
+        cache: TTLCache[str] = TTLCache(ttl_seconds=300, stale_ttl_seconds=600)
+        assert cache.ttl_remaining("GME") is None
+        cache.set("GME", "GameStop")
+        assert 299 < (cache.ttl_remaining("GME") or 0) <= 300
+        with patch("wsb_crawler.storage.cache.time.monotonic", return_value=time.monotonic() + 400):
+            remaining = cache.ttl_remaining("GME")
+            assert remaining is not None and remaining < 0
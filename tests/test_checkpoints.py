@@ -0,0 +1,335 @@
+"""
+Tests für fortsetzbare Crawl-Läufe (crawler/checkpoints.py).
+
+Reddit wird durch ein Fake-Listing ersetzt; DB und Orchestrator sind echt.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from wsb_crawler.alerts.outbox import decode_alert
+from wsb_crawler.crawler.checkpoints import (
+    CHECKPOINT_EVERY_POSTS,
+    PHASE_SAVED,
+    RESUME_MAX_AGE_MINUTES,
+    RunCheckpoint,
+    UnitCheckpoint,
+    find_resume_point,
+    load_units,
+    save_run,
+    save_unit,
+)
+from wsb_crawler.crawler.units import CrawlUnit
+from wsb_crawler.models import (
+    CrawlResult,
+    MarketStatus,
+    NewsArticle,
+    PendingEnrichment,
+    PriceData,
+)
+from wsb_crawler.storage.base import Storage
+
+
+@pytest.fixture
+async def db(storage: Storage) -> Storage:
+    await storage.set_setting("reddit_client_id", "test_id")
+    await storage.set_setting("reddit_client_secret", "test_secret")
+    await storage.set_setting("discord_webhook_url", "https://discord.com/api/webhooks/0/test")
+    return storage
+
+
+def _submission(post_id: str, text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=post_id,
+        title="",
+        selftext=text,
+        author="someone",
+        score=10,
+        upvote_ratio=0.9,
+        created_utc=datetime.now(tz=UTC).timestamp(),
+        permalink=f"/r/wallstreetbets/comments/{post_id}/",
+    )
+
+
+class _FakeReddit:
+    """Hot-Listing aus einer festen Liste, ``after`` wie bei Reddit."""
+
+    def __init__(self, submissions: list[SimpleNamespace]) -> None:
+        self.submissions = submissions
+        self.calls: list[tuple[int, str | None]] = []
+
+    async def subreddit(self, _name: str) -> _FakeReddit:
+        return self
+
+    async def _listing(self, limit: int, after: str | None):
+        ids = [f"t3_{s.id}" for s in self.submissions]
+        start = ids.index(after) + 1 if after else 0
+        for submission in self.submissions[start : start + limit]:
+            yield submission
+
+    def hot(self, limit: int, params: dict[str, str] | None = None):
+        after = (params or {}).get("after")
+        self.calls.append((limit, after))
+        return self._listing(limit, after)
+
+
+def _posts(n: int, start: int = 0) -> list[SimpleNamespace]:
+    return [_submission(f"p{i}", f"$GME Post {i}") for i in range(start, start + n)]
+
+
+def _result(counts: dict[str, int], subreddit: str) -> CrawlResult:
+    now = datetime.now(tz=UTC)
+    return CrawlResult(
+        run_id="x",
+        started_at=now,
+        finished_at=now,
+        subreddits=[subreddit],
+        posts_scanned=100,
+        comments_scanned=50,
+        mention_counts=counts,
+    )
+
+
+class TestStorage:
+    async def test_roundtrip_and_clear(self, db: Storage):
+        run_id = await db.start_run(["wallstreetbets"])
+        checkpoint = UnitCheckpoint.start(run_id, "wallstreetbets")
+        checkpoint.advance(["a", "b"], 3, [])
+        await save_unit(db, run_id, checkpoint)
+        await save_run(db, run_id, RunCheckpoint(dry_run=False, alerted={"GME"}, enqueued_count=1))
+
+        (restored,) = (await load_units(db, run_id)).values()
+        assert restored.after == "t3_b"
+        assert restored.seen_ids == {"a", "b"}
+        assert restored.result.posts_scanned == 2
+        assert restored.result.comments_scanned == 3
+
+        resume = await find_resume_point(db, dry_run=False)
+        assert resume is not None
+        assert resume.run_id == run_id
+        assert resume.subreddits == ["wallstreetbets"]
+        assert resume.run.alerted == {"GME"}
+        # Anderer Modus wird nicht fortgesetzt
+        assert await find_resume_point(db, dry_run=True) is None
+
+        assert await db.clear_checkpoints(run_id) == 2
+        assert await find_resume_point(db, dry_run=False) is None
+
+    async def test_pending_enrichment_roundtrip(self, db: Storage):
+        run_id = await db.start_run(["wallstreetbets"])
+        fetched_at = datetime(2026, 7, 6, 14, 24, tzinfo=UTC)
+        enrichment = PendingEnrichment(
+            names={"GME": "GameStop Corp.", "XYZQ": None},
+            prices={
+                "GME": PriceData(
+                    ticker="GME",
+                    company_name="GameStop Corp.",
+                    price=42.0,
+                    change_24h=2.0,
+                    market_status=MarketStatus.OPEN,
+                    fetched_at=fetched_at,
+                )
+            },
+            news={"GME": [NewsArticle("GME", "Squeeze", "Reuters", "https://x", fetched_at)]},
+        )
+        await save_run(db, run_id, RunCheckpoint(dry_run=False, enrichment=enrichment))
+
+        resume = await find_resume_point(db, dry_run=False)
+        assert resume is not None
+        assert resume.run.enrichment == enrichment
+
+    async def test_stale_checkpoints_are_not_resumed(self, db: Storage, raw_sql):
+        run_id = await db.start_run(["wallstreetbets"])
+        await save_run(db, run_id, RunCheckpoint(dry_run=False))
+        old = datetime.now(tz=UTC) - timedelta(minutes=RESUME_MAX_AGE_MINUTES + 1)
+        await raw_sql.execute(
+            "UPDATE crawl_checkpoints SET updated_at = ? WHERE run_id = ?",
+            (old.isoformat(), run_id),
+        )
+        assert await find_resume_point(db, dry_run=False) is None
+
+
+class TestCrawlSubreddit:
+    async def test_checkpoints_every_batch(self):
+        from wsb_crawler.crawler.reddit import crawl_subreddit
+
+        reddit = _FakeReddit(_posts(60))
+        saved: list[int] = []
+
+        async def _on_checkpoint(checkpoint: UnitCheckpoint) -> None:
+            saved.append(checkpoint.result.posts_scanned)
+
+        result = await crawl_subreddit(
+            reddit,
+            CrawlUnit("wallstreetbets", posts_limit=60, comments_limit=0),
+            "run1",
+            on_checkpoint=_on_checkpoint,
+        )
+        assert saved == [CHECKPOINT_EVERY_POSTS, 2 * CHECKPOINT_EVERY_POSTS, 60]
+        assert result.posts_scanned == 60
+        assert result.mention_counts == {"GME": 60}
+        assert result.mention_signals["GME"].mention_count == 60
+
+    async def test_resumes_after_cursor_and_skips_seen_posts(self):
+        from wsb_crawler.crawler.reddit import crawl_subreddit
+
+        checkpoint = UnitCheckpoint.start("run1", "wallstreetbets")
+        await crawl_subreddit(
+            _FakeReddit(_posts(25)),
+            CrawlUnit("wallstreetbets", posts_limit=25, comments_limit=0),
+            "run1",
+            checkpoint=checkpoint,
+        )
+        # Seit dem Checkpoint ist p10 im Listing hinter den Cursor gerutscht
+        listing = [*_posts(25), _submission("p10", "$GME schon gezählt"), *_posts(10, start=25)]
+        reddit = _FakeReddit(listing)
+
+        result = await crawl_subreddit(
+            reddit,
+            CrawlUnit("wallstreetbets", posts_limit=40, comments_limit=0),
+            "run1",
+            checkpoint=checkpoint,
+        )
+        assert reddit.calls == [(15, "t3_p24")]
+        assert result.posts_scanned == 35
+        assert result.mention_counts == {"GME": 35}
+
+
+class TestResumableRun:
+    @staticmethod
+    def _no_enrichment():
+        from contextlib import ExitStack
+
+        stack = ExitStack()
+        for name in ("get_prices_bulk", "get_news_bulk", "resolve_names_bulk"):
+            stack.enter_context(
+                patch(f"wsb_crawler.analysis.detector.{name}", new=AsyncMock(return_value={}))
+            )
+        return stack
+
+    async def test_stopped_run_continues_where_it_stopped(self, db: Storage):
+        from wsb_crawler.crawler import runner
+
+        interrupted = asyncio.Event()
+
+        async def _first(run_id, units, on_done):
+            by_name = {unit.subreddit: unit for unit in units}
+            await on_done(by_name["wallstreetbets"], _result({"GME": 30}, "wallstreetbets"))
+            partial = UnitCheckpoint.start(run_id, "wallstreetbetsGER")
+            partial.advance(["a"], 0, [])
+            await save_unit(db, run_id, partial)
+            interrupted.set()
+            await asyncio.sleep(30)
+
+        with (
+            patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_first)),
+            self._no_enrichment(),
+        ):
+            task = asyncio.create_task(runner.run_single_crawl(db))
+            await asyncio.wait_for(interrupted.wait(), timeout=5)
+            for _ in range(100):
+                if await db.get_outbox(status="pending"):
+                    break
+                await asyncio.sleep(0.01)
+            assert runner.stop_current_crawl()
+            await asyncio.wait_for(task, timeout=5)
+
+        stopped_run = (await db.get_recent_runs())[0]["id"]
+        resumed: dict[str, object] = {}
+
+        async def _second(run_id, units, on_done):
+            resumed["run_id"] = run_id
+            resumed["units"] = [u.subreddit for u in units]
+            resumed["checkpoints"] = await load_units(db, run_id)
+            await on_done(units[0], _result({"GME": 5, "TSLA": 40}, "wallstreetbetsGER"))
+
+        with (
+            patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_second)),
+            self._no_enrichment(),
+        ):
+            await runner.run_single_crawl(db)
+
+        assert resumed["run_id"] == stopped_run
+        assert resumed["units"] == ["wallstreetbetsGER"]
+        checkpoints = resumed["checkpoints"]
+        assert checkpoints["wallstreetbets"].phase == PHASE_SAVED
+        assert checkpoints["wallstreetbetsGER"].after == "t3_a"
+
+        runs = await db.get_recent_runs()
+        assert len(runs) == 1
+        assert runs[0]["finished_at"] is not None
+        assert runs[0]["posts_scanned"] == 200
+        mentions = {m["ticker"]: m["mentions"] for m in await db.get_run_mentions(stopped_run)}
+        assert mentions == {"GME": 35, "TSLA": 40}
+        # GME wurde vor dem Stopp eingestellt — kein zweiter Alert
+        pending = await db.get_outbox(status="pending")
+        assert sorted(row["ticker"] for row in pending) == ["GME", "TSLA"]
+        assert await db.get_checkpoints(stopped_run) == {}
+
+    async def test_resumed_run_reuses_fetched_enrichment(self, db: Storage):
+        from wsb_crawler.crawler import runner
+        from wsb_crawler.crawler.checkpoints import RUN_UNIT
+
+        price = PriceData(ticker="TSLA", company_name="Tesla", price=250.0)
+
+        async def _first(run_id, units, on_done):
+            by_name = {unit.subreddit: unit for unit in units}
+            await on_done(by_name["wallstreetbets"], _result({"TSLA": 40}, "wallstreetbets"))
+            await asyncio.sleep(30)
+
+        async def _stuck_news(tickers, names):
+            await asyncio.sleep(30)
+
+        with (
+            patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_first)),
+            self._no_enrichment(),
+            patch(
+                "wsb_crawler.analysis.detector.get_prices_bulk",
+                new=AsyncMock(return_value={"TSLA": price}),
+            ),
+            patch("wsb_crawler.analysis.detector.get_news_bulk", new=_stuck_news),
+        ):
+            task = asyncio.create_task(runner.run_single_crawl(db))
+            for _ in range(500):
+                run_id = (await db.get_recent_runs() or [{"id": ""}])[0]["id"]
+                rows = await db.get_checkpoints(run_id) if run_id else {}
+                if RUN_UNIT in rows and RunCheckpoint.from_row(rows[RUN_UNIT]).enrichment.prices:
+                    break
+                await asyncio.sleep(0.01)
+            assert runner.stop_current_crawl()
+            await asyncio.wait_for(task, timeout=5)
+
+        prices = AsyncMock(return_value={})
+
+        async def _second(run_id, units, on_done):
+            await on_done(units[0], _result({}, "wallstreetbetsGER"))
+
+        with (
+            patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_second)),
+            self._no_enrichment(),
+            patch("wsb_crawler.analysis.detector.get_prices_bulk", new=prices),
+        ):
+            await runner.run_single_crawl(db)
+
+        # Der Kurs stammt aus dem Checkpoint, nicht aus einer neuen Anfrage
+        prices.assert_not_awaited()
+        (row,) = await db.claim_due_alerts(10, 60)
+        assert decode_alert(row["payload"]).spike.price_data == price
+
+    async def test_completed_run_is_not_resumed(self, db: Storage):
+        from wsb_crawler.crawler import runner
+
+        fake = AsyncMock(return_value=None)
+        with patch.object(runner, "crawl_units", new=fake):
+            await runner.run_single_crawl(db)
+            await runner.run_single_crawl(db)
+
+        first, second = (call.args[0] for call in fake.await_args_list)
+        assert first != second
+        assert len(await db.get_recent_runs()) == 2
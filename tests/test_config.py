@@ -1,14 +1,21 @@
 """
-Tests für die Konfigurationsauflösung (config.py) — hier speziell der DB-Pfad.
+Tests für die Konfigurationsauflösung (config.py) — DB-Pfad und Subreddit-Overrides.
 """
 
 from __future__ import annotations
 
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 import pytest
 
-from wsb_crawler.config import _resolve_db_path
+from wsb_crawler.config import (
+    CrawlerSettings,
+    SubredditOverride,
+    _resolve_db_path,
+    parse_subreddit_overrides,
+)
+from wsb_crawler.crawler.units import build_units, due_units
 
 
 class TestResolveDbPath:
@@ -29,3 +36,49 @@ class TestResolveDbPath:
     def test_blank_env_falls_back_to_default(self, monkeypatch: pytest.MonkeyPatch):
         monkeypatch.setenv("WSB_DB_PATH", "   ")
         assert _resolve_db_path() == Path("data/wsb_crawler.db")
+
+
+class TestSubredditOverrides:
+    def test_parses_lines_and_semicolons(self):
+        raw = "r/wallstreetbets posts=200 comments=20\nwallstreetbetsGER interval=60; pennystocks"
+        assert parse_subreddit_overrides(raw) == {
+            "wallstreetbets": SubredditOverride(posts_limit=200, comments_limit=20),
+            "wallstreetbetsGER": SubredditOverride(interval_minutes=60),
+            "pennystocks": SubredditOverride(),
+        }
+
+    @pytest.mark.parametrize(
+        "raw", ["wsb speed=3", "wsb posts=viele", "wsb posts=0", "wsb comments=501"]
+    )
+    def test_rejects_invalid_values(self, raw: str):
+        with pytest.raises(ValueError, match="r/wsb"):
+            parse_subreddit_overrides(raw)
+
+    def test_units_fall_back_to_global_limits(self):
+        cfg = CrawlerSettings(
+            subreddits=["wsb", "wsbger"],
+            posts_limit=500,
+            comments_limit=100,
+            subreddit_overrides={"wsbger": SubredditOverride(posts_limit=50, interval_minutes=30)},
+        )
+        wsb, wsbger = build_units(cfg)
+        assert (wsb.posts_limit, wsb.comments_limit, wsb.interval_minutes) == (500, 100, None)
+        assert (wsbger.posts_limit, wsbger.comments_limit, wsbger.interval_minutes) == (50, 100, 30)
+
+    def test_due_units_use_last_success(self):
+        now = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+        cfg = CrawlerSettings(
+            subreddits=["a", "b", "c"],
+            subreddit_overrides={
+                "b": SubredditOverride(interval_minutes=60),
+                "c": SubredditOverride(interval_minutes=60),
+            },
+        )
+        last = {
+            "a": {"succeeded_at": now.isoformat()},
+            "b": {"succeeded_at": (now - timedelta(minutes=20)).isoformat()},
+            "c": {"succeeded_at": (now - timedelta(minutes=61)).isoformat()},
+        }
+        due, waiting = due_units(build_units(cfg), last, now)
+        assert [u.subreddit for u in due] == ["a", "c"]
+        assert [u.subreddit for u in waiting] == ["b"]
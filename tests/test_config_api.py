@@ -92,6 +92,21 @@ class TestConfigValidation:
         with pytest.raises(ValidationError):
             ConfigPayload(crawl_interval_minutes=0)
 
+    def test_market_schedule_fields(self):
+        payload = ConfigPayload(
+            schedule_mode="market", market_calendar="xetra", schedule_timezone="Europe/Berlin"
+        )
+        assert payload.market_calendar == "XETRA"
+        with pytest.raises(ValidationError):
+            ConfigPayload(market_calendar="LSE")
+        with pytest.raises(ValidationError):
+            ConfigPayload(schedule_timezone="Europe/Nowhere")
+
+    def test_subreddit_overrides_validated(self):
+        assert ConfigPayload(subreddit_overrides="wsb posts=100 interval=60").subreddit_overrides
+        with pytest.raises(ValidationError):
+            ConfigPayload(subreddit_overrides="wsb posts=5000")
+
     def test_posts_limit_upper_bound(self):
         with pytest.raises(ValidationError):
             ConfigPayload(posts_limit=5000)
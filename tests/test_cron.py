@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from zoneinfo import ZoneInfo
 
 import pytest
 
 from wsb_crawler.cron import CronSchedule, next_run, validate_cron
 
+BERLIN = ZoneInfo("Europe/Berlin")
+NEW_YORK = ZoneInfo("America/New_York")
+
 
 def _dt(y: int, mo: int, d: int, h: int, mi: int) -> datetime:
     return datetime(y, mo, d, h, mi, tzinfo=UTC)
@@ -78,3 +82,81 @@ def test_schedule_reuses_parse() -> None:
     sched = CronSchedule("0 12 * * *")
     a = sched.next_after(_dt(2026, 7, 6, 13, 0))
     assert a == _dt(2026, 7, 7, 12, 0)
+
+
+def _brute_force(expr: str, after: datetime) -> datetime:
+    """Referenz: Minute für Minute (alter Algorithmus), nur für kurze Abstände."""
+    sched = CronSchedule(expr)
+    candidate = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    while True:
+        if (
+            candidate.minute in sched.minute
+            and candidate.hour in sched.hour
+            and candidate.month in sched.month
+            and sched._day_matches(candidate.date())
+        ):
+            return candidate
+        candidate += timedelta(minutes=1)
+
+
+class TestFieldJumping:
+    @pytest.mark.parametrize(
+        "expr",
+        [
+            "*/7 * * * *",
+            "5,35 */3 * * 1-5",
+            "0 0 1,15 * 3",
+            "59 23 31 * *",
+            "0 12 * 2,8 0",
+        ],
+    )
+    def test_matches_minute_scan(self, expr: str) -> None:
+        moment = _dt(2026, 1, 30, 22, 47)
+        for _ in range(5):
+            expected = _brute_force(expr, moment)
+            assert next_run(expr, moment) == expected
+            moment = expected
+
+    def test_leap_day_beyond_one_year(self) -> None:
+        # Früher: ValueError nach einem Jahr Minuten-Scan
+        assert next_run("0 9 29 2 *", _dt(2026, 7, 1, 0, 0)) == _dt(2028, 2, 29, 9, 0)
+
+    def test_impossible_date_raises(self) -> None:
+        with pytest.raises(ValueError):
+            next_run("0 0 31 2 *", _dt(2026, 1, 1, 0, 0))
+
+    def test_seconds_are_truncated(self) -> None:
+        after = datetime(2026, 7, 6, 14, 24, 59, tzinfo=UTC)
+        assert next_run("* * * * *", after) == _dt(2026, 7, 6, 14, 25)
+
+
+class TestTimezones:
+    def test_evaluates_on_local_wall_clock(self) -> None:
+        # 09:30 New York = 13:30 UTC im Sommer, 14:30 UTC im Winter
+        summer = next_run("30 9 * * *", _dt(2026, 7, 6, 0, 0), NEW_YORK)
+        winter = next_run("30 9 * * *", _dt(2026, 12, 7, 0, 0), NEW_YORK)
+        assert summer.astimezone(UTC) == _dt(2026, 7, 6, 13, 30)
+        assert winter.astimezone(UTC) == _dt(2026, 12, 7, 14, 30)
+
+    def test_spring_forward_gap_shifts_run(self) -> None:
+        # 2026-03-29: Berlin springt von 02:00 auf 03:00
+        got = next_run("30 2 * * *", datetime(2026, 3, 29, 0, 0, tzinfo=BERLIN))
+        assert got.astimezone(UTC) == _dt(2026, 3, 29, 1, 30)  # = 03:30 MESZ
+        again = next_run("30 2 * * *", got)
+        assert again == datetime(2026, 3, 30, 2, 30, tzinfo=BERLIN)
+
+    def test_fall_back_fixed_time_runs_once(self) -> None:
+        # 2026-10-25: 02:00-03:00 gibt es in Berlin zweimal
+        first = next_run("30 2 * * *", datetime(2026, 10, 25, 0, 0, tzinfo=BERLIN))
+        assert first.astimezone(UTC) == _dt(2026, 10, 25, 0, 30)
+        assert next_run("30 2 * * *", first).date() == datetime(2026, 10, 26).date()
+
+    def test_fall_back_hourly_runs_in_both_passes(self) -> None:
+        sched = CronSchedule("*/30 * * * *")
+        moment = datetime(2026, 10, 25, 1, 50, tzinfo=BERLIN)
+        runs = []
+        for _ in range(6):
+            moment = sched.next_after(moment)
+            runs.append(moment.astimezone(UTC))
+        expected = [_dt(2026, 10, 25, 0, 0) + timedelta(minutes=30 * i) for i in range(6)]
+        assert runs == expected
@@ -4,6 +4,7 @@ Tests für Dashboard- und Status-Router (direkte Endpoint-Aufrufe).
 
 from __future__ import annotations
 
+import json
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
@@ -85,7 +86,8 @@ class TestDashboardEndpoints:
     async def test_runs_endpoint(self, db: Database):
         run_id = await db.start_run(["wsb"])
         await db.finish_run(run_id, 100, 50)
-        runs = await dashboard_router.get_runs(limit=10)
+        response = await dashboard_router.get_runs(limit=10)
+        runs = json.loads(response.body)
         assert len(runs) == 1
         assert runs[0]["posts_scanned"] == 100
 
@@ -139,6 +141,7 @@ class TestStatusEndpoint:
             result = await status_router.get_status()
 
         assert result["next_run_at"] == (now + timedelta(minutes=30)).isoformat()
+        assert result["schedule"]["reasons"] == ["Intervall: 30 Minuten"]
 
     async def test_status_calculates_next_cron_run(self, db: Database):
         await db.set_setting("reddit_client_id", "x")
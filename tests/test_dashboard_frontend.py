@@ -122,6 +122,17 @@ def test_config_shows_cron_next_run_preview() -> None:
     assert "Promise.all([api('/config'), api('/status')])" in html
 
 
+def test_config_offers_market_schedule_and_timezone() -> None:
+    html = INDEX.read_text(encoding="utf-8")
+
+    assert "setSched('market')" in html
+    assert 'data-cfg="market_calendar"' in html
+    assert 'data-cfg="schedule_timezone"' in html
+    assert "&tz=${encodeURIComponent(tz)}" in html
+    assert "setSched('adaptive')" in html
+    assert "state.configSchedule = status.schedule" in html
+
+
 def test_config_validates_before_save_and_tests_discord() -> None:
     html = INDEX.read_text(encoding="utf-8")
 
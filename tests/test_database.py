@@ -8,15 +8,14 @@ from pathlib import Path
 
 import pytest
 
+from tests.conftest import RawSQL
+from wsb_crawler.storage.base import Storage
 from wsb_crawler.storage.database import Database
 
 
 @pytest.fixture
-async def db(tmp_path: Path) -> Database:
-    database = Database(tmp_path / "test.db")
-    await database.init()
-    yield database
-    await database.close()
+def db(storage: Storage) -> Storage:
+    return storage
 
 
 class TestDatabaseOpen:
@@ -38,15 +37,14 @@ class TestDatabaseOpen:
 
 
 class TestCrawlRuns:
-    async def test_start_and_finish_run(self, db: Database):
+    async def test_start_and_finish_run(self, db: Storage, raw_sql: RawSQL):
         """Lauf kann gestartet und abgeschlossen werden."""
         run_id = await db.start_run(["wallstreetbets"])
         assert run_id  # nicht leer
 
         await db.finish_run(run_id, posts_scanned=100, comments_scanned=500)
 
-        async with db.conn.execute("SELECT * FROM crawl_runs WHERE id = ?", (run_id,)) as cur:
-            row = await cur.fetchone()
+        row = await raw_sql.fetchone("SELECT * FROM crawl_runs WHERE id = ?", (run_id,))
 
         assert row is not None
         assert row["posts_scanned"] == 100
@@ -54,20 +52,17 @@ class TestCrawlRuns:
         assert row["finished_at"] is not None
         assert row["is_healthy"] == 1
 
-    async def test_unhealthy_run_marked(self, db: Database):
+    async def test_unhealthy_run_marked(self, db: Storage, raw_sql: RawSQL):
         """Fehlerhafter Lauf wird als unhealthy markiert."""
         run_id = await db.start_run(["wallstreetbets"])
         await db.finish_run(run_id, 0, 0, is_healthy=False)
 
-        async with db.conn.execute(
-            "SELECT is_healthy FROM crawl_runs WHERE id = ?", (run_id,)
-        ) as cur:
-            row = await cur.fetchone()
+        row = await raw_sql.fetchone("SELECT is_healthy FROM crawl_runs WHERE id = ?", (run_id,))
         assert row["is_healthy"] == 0
 
 
 class TestTickerHistory:
-    async def test_save_and_retrieve_mentions(self, db: Database):
+    async def test_save_and_retrieve_mentions(self, db: Storage):
         """Mentions werden gespeichert und korrekt abgerufen."""
         run_id = await db.start_run(["wallstreetbets"])
         await db.save_run_mentions(run_id, {"GME": 42, "AMC": 17})
@@ -79,12 +74,12 @@ class TestTickerHistory:
         history_amc = await db.get_ticker_history("AMC", days=30)
         assert history_amc.mention_counts[0][1] == 17
 
-    async def test_avg_mentions_empty(self, db: Database):
+    async def test_avg_mentions_empty(self, db: Storage):
         """Durchschnitt ist 0 wenn keine History vorhanden."""
         avg = await db.get_avg_mentions("UNKNOWN", days=30)
         assert avg == 0.0
 
-    async def test_avg_mentions_calculated(self, db: Database):
+    async def test_avg_mentions_calculated(self, db: Storage):
         """Durchschnitt wird korrekt berechnet."""
         for count in [10, 20, 30]:
             run_id = await db.start_run(["wsb"])
@@ -94,7 +89,7 @@ class TestTickerHistory:
         # 3 Läufe am gleichen Tag → sum(10+20+30) = 60 auf 1 Tag → avg = 60.0
         assert avg == 60.0
 
-    async def test_is_known_ticker(self, db: Database):
+    async def test_is_known_ticker(self, db: Storage):
         """Bekannte vs. unbekannte Ticker werden korrekt unterschieden."""
         assert not await db.is_known_ticker("GME")
 
@@ -104,18 +99,37 @@ class TestTickerHistory:
         assert await db.is_known_ticker("GME")
         assert not await db.is_known_ticker("AMC")
 
+    async def test_run_mentions_sum_over_subreddits(self, db: Storage):
+        """Pro Subreddit eigene Zeilen, Run-Ansicht summiert pro Ticker."""
+        run_id = await db.start_run(["wsb", "wsbger"])
+        await db.save_run_mentions(run_id, {"GME": 5, "AMC": 2}, subreddit="wsb")
+        await db.save_run_mentions(run_id, {"GME": 3}, subreddit="wsbger")
+
+        rows = await db.get_run_mentions(run_id)
+        assert [(r["ticker"], r["mentions"]) for r in rows] == [("GME", 8), ("AMC", 2)]
+        after = await db.get_run_mentions(run_id, after=(8, "GME"))
+        assert [r["ticker"] for r in after] == ["AMC"]
+
+        detail = await db.get_run_detail(run_id)
+        assert detail["mentions_total"] == 2
+        assert {r["subreddit"]: r["mentions"] for r in detail["subreddit_totals"]} == {
+            "wsb": 7,
+            "wsbger": 3,
+        }
+        # Basis für den nächsten Lauf: Tagessumme über alle Subreddits
+        assert await db.get_avg_mentions("GME") == 8.0
+
 
 class TestRetention:
-    async def test_purge_old_mentions(self, db: Database):
+    async def test_purge_old_mentions(self, db: Storage, raw_sql: RawSQL):
         """Mentions älter als N Tage werden gelöscht, neuere bleiben."""
         old_run = await db.start_run(["wsb"])
         await db.save_run_mentions(old_run, {"GME": 5})
         # Alten Eintrag künstlich zurückdatieren
-        await db.conn.execute(
-            "UPDATE ticker_mentions SET recorded_at = '2000-01-01T00:00:00+00:00' WHERE run_id = ?",
-            (old_run,),
+        await raw_sql.execute(
+            "UPDATE ticker_mentions SET recorded_at = ? WHERE run_id = ?",
+            ("2000-01-01T00:00:00+00:00", old_run),
         )
-        await db.conn.commit()
 
         new_run = await db.start_run(["wsb"])
         await db.save_run_mentions(new_run, {"AMC": 3})
@@ -126,7 +140,7 @@ class TestRetention:
         assert not await db.is_known_ticker("GME")
         assert await db.is_known_ticker("AMC")
 
-    async def test_get_avg_mentions_excludes_run(self, db: Database):
+    async def test_get_avg_mentions_excludes_run(self, db: Storage):
         """exclude_run_id blendet den aktuellen Lauf aus der Durchschnittsberechnung aus."""
         run_id = await db.start_run(["wsb"])
         await db.save_run_mentions(run_id, {"GME": 50})
@@ -138,7 +152,7 @@ class TestRetention:
 
 
 class TestStatus:
-    async def test_run_status_empty(self, db: Database):
+    async def test_run_status_empty(self, db: Storage):
         """Status bei leerer DB ist sinnvoll initialisiert."""
         status = await db.get_run_status()
         assert status.last_run_at is None
@@ -146,7 +160,7 @@ class TestStatus:
         assert status.tracked_tickers == 0
         assert status.total_alerts_sent == 0
 
-    async def test_run_status_after_runs(self, db: Database):
+    async def test_run_status_after_runs(self, db: Storage):
         """Status spiegelt gespeicherte Läufe korrekt wider."""
         for _ in range(3):
             run_id = await db.start_run(["wsb"])
@@ -157,3 +171,37 @@ class TestStatus:
         assert status.total_runs == 3
         assert status.tracked_tickers == 1
         assert status.last_run_at is not None
+
+    async def test_counters_follow_purge(self, db: Storage, raw_sql: RawSQL):
+        """tracked_tickers sinkt erst, wenn die letzte Zeile eines Tickers gelöscht ist."""
+        old_run = await db.start_run(["wsb"])
+        await db.save_run_mentions(old_run, {"GME": 5, "AMC": 2})
+        await raw_sql.execute(
+            "UPDATE ticker_mentions SET recorded_at = ? WHERE run_id = ?",
+            ("2000-01-01T00:00:00+00:00", old_run),
+        )
+        new_run = await db.start_run(["wsb"])
+        await db.save_run_mentions(new_run, {"AMC": 3})
+        assert (await db.get_stats())["tracked_tickers"] == 2
+
+        await db.purge_old_mentions(days=90)
+
+        stats = await db.get_stats()
+        assert stats == {"total_runs": 2, "total_alerts": 0, "tracked_tickers": 1}
+        assert stats == await db.rebuild_stats()
+
+    async def test_counters_seeded_for_existing_db(self, tmp_path: Path):
+        """Upgrade einer DB ohne Zähler: Seed aus den vorhandenen Zeilen."""
+        path = tmp_path / "upgrade.db"
+        async with Database(path) as database:
+            run_id = await database.start_run(["wsb"])
+            await database.save_run_mentions(run_id, {"GME": 5, "TSLA": 1})
+            # Zustand vor Schema 6 simulieren
+            await database.conn.execute("DELETE FROM stats")
+            await database.conn.execute("DELETE FROM ticker_stats")
+            await database.conn.commit()
+
+        async with Database(path) as database:
+            status = await database.get_run_status()
+            assert status.total_runs == 1
+            assert status.tracked_tickers == 2
@@ -7,28 +7,25 @@ Nutzt eine In-Memory SQLite DB — kein Mocking nötig.
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
-from pathlib import Path
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from wsb_crawler.models import AlertReason, MarketStatus, PriceData
-from wsb_crawler.storage.database import Database
+from tests.conftest import RawSQL
+from wsb_crawler.models import AlertReason, MarketStatus, PendingEnrichment, PriceData
+from wsb_crawler.storage.base import Storage
 
 
 @pytest.fixture
-async def db(tmp_path: Path) -> Database:
+async def db(storage: Storage) -> Storage:
     """Konfigurierte Test-DB (Pflicht-Settings geseedet, kein ENV nötig)."""
-    database = Database(tmp_path / "test.db")
-    await database.init()
     # get_settings() braucht diese Pflichtfelder — in den Tests direkt in
     # die DB schreiben statt via ENV, damit `pytest` ohne CI-Setup läuft.
-    await database.set_setting("reddit_client_id", "test_id")
-    await database.set_setting("reddit_client_secret", "test_secret")
-    await database.set_setting("discord_webhook_url", "https://discord.com/api/webhooks/0/test")
-    await database.set_setting("newsapi_key", "test_key")
-    yield database
-    await database.close()
+    await storage.set_setting("reddit_client_id", "test_id")
+    await storage.set_setting("reddit_client_secret", "test_secret")
+    await storage.set_setting("discord_webhook_url", "https://discord.com/api/webhooks/0/test")
+    await storage.set_setting("newsapi_key", "test_key")
+    yield storage
 
 
 @pytest.fixture
@@ -62,7 +59,7 @@ def mock_enrichment():
 
 
 class TestSpikeDetection:
-    async def test_new_ticker_triggers_alert(self, db: Database, mock_enrichment):
+    async def test_new_ticker_triggers_alert(self, db: Storage, mock_enrichment):
         """Neuer Ticker mit genug Nennungen löst NEW_TICKER Alert aus."""
         from wsb_crawler.analysis.detector import analyze_mentions
 
@@ -73,14 +70,14 @@ class TestSpikeDetection:
         assert alerts[0].ticker == "GME"
         assert alerts[0].reason == AlertReason.NEW_TICKER
 
-    async def test_new_ticker_below_threshold_no_alert(self, db: Database, mock_enrichment):
+    async def test_new_ticker_below_threshold_no_alert(self, db: Storage, mock_enrichment):
         """Neuer Ticker mit zu wenig Nennungen löst keinen Alert aus."""
         from wsb_crawler.analysis.detector import analyze_mentions
 
         alerts = await analyze_mentions({"GME": 5}, db)  # < min_abs=20
         assert len(alerts) == 0
 
-    async def test_known_ticker_spike_triggers_alert(self, db: Database, mock_enrichment):
+    async def test_known_ticker_spike_triggers_alert(self, db: Storage, mock_enrichment):
         """Bekannter Ticker mit 3x mehr Nennungen als normal löst Spike-Alert aus."""
         from wsb_crawler.analysis.detector import analyze_mentions
 
@@ -96,7 +93,7 @@ class TestSpikeDetection:
         assert alerts[0].reason == AlertReason.SPIKE
         assert alerts[0].spike.ratio >= 2.0
 
-    async def test_price_move_upgrades_spike(self, db: Database):
+    async def test_price_move_upgrades_spike(self, db: Storage):
         """Spike + Kursbewegung ≥ min_price_move wird zu PRICE_MOVE hochgestuft."""
         from wsb_crawler.analysis.detector import analyze_mentions
 
@@ -131,7 +128,7 @@ class TestSpikeDetection:
         assert len(alerts) == 1
         assert alerts[0].reason == AlertReason.PRICE_MOVE
 
-    async def test_new_ticker_not_masked_by_own_run(self, db: Database, mock_enrichment):
+    async def test_new_ticker_not_masked_by_own_run(self, db: Storage, mock_enrichment):
         """Regression: NEW_TICKER-Alert muss auslösen, auch wenn die Mentions des
         aktuellen Laufs bereits gespeichert wurden (run_id-Ausschluss)."""
         from wsb_crawler.analysis.detector import analyze_mentions
@@ -147,7 +144,7 @@ class TestSpikeDetection:
         assert len(alerts) == 1
         assert alerts[0].reason == AlertReason.NEW_TICKER
 
-    async def test_cooldown_prevents_duplicate_alert(self, db: Database, mock_enrichment):
+    async def test_cooldown_prevents_duplicate_alert(self, db: Storage, mock_enrichment):
         """Ticker im Cooldown löst keinen zweiten Alert aus."""
         from wsb_crawler.analysis.detector import analyze_mentions
 
@@ -157,7 +154,7 @@ class TestSpikeDetection:
         alerts = await analyze_mentions({"GME": 50}, db)
         assert len(alerts) == 0
 
-    async def test_max_alerts_per_run_respected(self, db: Database, mock_enrichment):
+    async def test_max_alerts_per_run_respected(self, db: Storage, mock_enrichment):
         """Maximal 3 Alerts pro Lauf (konfigurierbar)."""
         from wsb_crawler.analysis.detector import analyze_mentions
 
@@ -184,14 +181,14 @@ class TestSpikeDetection:
         # max_per_run ist 3 (Default in config)
         assert len(alerts) <= 3
 
-    async def test_empty_mentions_returns_no_alerts(self, db: Database, mock_enrichment):
+    async def test_empty_mentions_returns_no_alerts(self, db: Storage, mock_enrichment):
         """Keine Mentions → keine Alerts."""
         from wsb_crawler.analysis.detector import analyze_mentions
 
         alerts = await analyze_mentions({}, db)
         assert alerts == []
 
-    async def test_high_engagement_signal_wins_ranking(self, db: Database):
+    async def test_high_engagement_signal_wins_ranking(self, db: Storage):
         """Bei Gleichstand (gleiche Nennungen/ratio) gewinnt hohes Engagement."""
         from wsb_crawler.analysis.detector import analyze_mentions
         from wsb_crawler.models import TickerSignal
@@ -233,34 +230,179 @@ class TestSpikeDetection:
         assert "TICK9" in {a.ticker for a in alerts}
 
 
+class TestCandidatePipeline:
+    """Jeder Kandidat läuft für sich durch Enrichment und Versand."""
+
+    @staticmethod
+    def _patches(prices):
+        from contextlib import ExitStack
+
+        stack = ExitStack()
+        stack.enter_context(patch("wsb_crawler.analysis.detector.get_prices_bulk", new=prices))
+        stack.enter_context(
+            patch(
+                "wsb_crawler.analysis.detector.get_news_bulk",
+                new=AsyncMock(side_effect=lambda tickers, names: {t: [] for t in tickers}),
+            )
+        )
+        stack.enter_context(
+            patch(
+                "wsb_crawler.analysis.detector.resolve_names_bulk",
+                new=AsyncMock(side_effect=lambda tickers: dict.fromkeys(tickers)),
+            )
+        )
+        return stack
+
+    async def test_first_alert_does_not_wait_for_slow_candidate(self, db: Storage):
+        import asyncio
+
+        from wsb_crawler.analysis.detector import analyze_mentions
+
+        release = asyncio.Event()
+        dispatched: list[str] = []
+
+        async def _prices(tickers):
+            if tickers == ["SLOW"]:
+                await release.wait()
+            return dict.fromkeys(tickers)
+
+        async def _on_alert(alert):
+            dispatched.append(alert.ticker)
+            if alert.ticker == "FAST":
+                release.set()
+
+        with self._patches(AsyncMock(side_effect=_prices)):
+            alerts = await asyncio.wait_for(
+                analyze_mentions({"SLOW": 40, "FAST": 30}, db, on_alert=_on_alert), timeout=5
+            )
+
+        # Versand in Fertig-Reihenfolge, Rückgabe in Ranking-Reihenfolge
+        assert dispatched == ["FAST", "SLOW"]
+        assert [a.ticker for a in alerts] == ["SLOW", "FAST"]
+
+    async def test_news_requests_are_batched(self, db: Storage):
+        from wsb_crawler.analysis.detector import analyze_mentions
+
+        with self._patches(AsyncMock(side_effect=lambda tickers: dict.fromkeys(tickers))):
+            from wsb_crawler.analysis import detector
+
+            alerts = await analyze_mentions({"AAAA": 30, "BBBB": 30, "CCCC": 30}, db)
+            assert len(alerts) == 3
+            detector.get_news_bulk.assert_awaited_once()
+            assert sorted(detector.get_news_bulk.await_args.args[0]) == ["AAAA", "BBBB", "CCCC"]
+
+    async def test_staggered_names_still_share_one_news_query(self, db: Storage):
+        import asyncio
+
+        from wsb_crawler.analysis import detector
+        from wsb_crawler.analysis.detector import analyze_mentions
+
+        # Namen außerhalb der Symbol-Tabelle kommen unterschiedlich schnell (yfinance)
+        delays = {"AAAA": 0.0, "BBBB": 0.1, "CCCC": 0.2}
+
+        async def _resolve(ticker: str) -> str:
+            await asyncio.sleep(delays[ticker])
+            return f"{ticker} Inc."
+
+        async def _names(tickers):
+            return dict(zip(tickers, await asyncio.gather(*map(_resolve, tickers)), strict=True))
+
+        with self._patches(AsyncMock(side_effect=lambda tickers: dict.fromkeys(tickers))):
+            detector.resolve_names_bulk.side_effect = _names
+            alerts = await analyze_mentions({t: 30 for t in delays}, db)
+
+            assert len(alerts) == 3
+            detector.resolve_names_bulk.assert_awaited_once()
+            detector.get_news_bulk.assert_awaited_once()
+            tickers, names = detector.get_news_bulk.await_args.args
+            assert sorted(tickers) == sorted(delays)
+            assert names == {t: f"{t} Inc." for t in delays}
+
+    async def test_limit_caps_enrichment(self, db: Storage):
+        from wsb_crawler.analysis.detector import analyze_mentions
+
+        prices = AsyncMock(side_effect=lambda tickers: dict.fromkeys(tickers))
+        with self._patches(prices):
+            alerts = await analyze_mentions({"AAAA": 30, "BBBB": 40}, db, limit=1)
+        assert [a.ticker for a in alerts] == ["BBBB"]
+        assert prices.await_count == 1
+
+    async def test_pending_enrichment_is_not_fetched_again(self, db: Storage):
+        from wsb_crawler.analysis import detector
+        from wsb_crawler.analysis.detector import analyze_mentions
+
+        price = PriceData(
+            ticker="AAAA", company_name="Aaaa Inc.", price=10.0, market_status=MarketStatus.OPEN
+        )
+        pending = PendingEnrichment(
+            names={"AAAA": "Aaaa Inc."}, prices={"AAAA": price}, news={"AAAA": []}
+        )
+        saves = AsyncMock()
+        prices = AsyncMock(side_effect=lambda tickers: dict.fromkeys(tickers, price))
+        with self._patches(prices):
+            alerts = await analyze_mentions(
+                {"AAAA": 40, "BBBB": 30}, db, enrichment=pending, on_enriched=saves
+            )
+            # Nur der noch fehlende Kandidat wird angefragt
+            prices.assert_awaited_once_with(["BBBB"])
+            detector.resolve_names_bulk.assert_awaited_once_with(["BBBB"])
+            assert detector.get_news_bulk.await_args.args[0] == ["BBBB"]
+
+        assert [a.spike.price_data for a in alerts] == [price, price]
+        assert set(pending.prices) == set(pending.news) == {"AAAA", "BBBB"}
+        assert saves.await_count == 3  # Namen, Kurs, News von BBBB
+
+    async def test_cancel_stops_all_candidates(self, db: Storage):
+        import asyncio
+
+        from wsb_crawler.analysis.detector import analyze_mentions
+
+        started = asyncio.Event()
+        cancelled: list[str] = []
+
+        async def _prices(tickers):
+            started.set()
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.extend(tickers)
+                raise
+
+        with self._patches(AsyncMock(side_effect=_prices)):
+            task = asyncio.create_task(analyze_mentions({"AAAA": 30, "BBBB": 30}, db))
+            await asyncio.wait_for(started.wait(), timeout=5)
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert sorted(cancelled) == ["AAAA", "BBBB"]
+
+
 class TestCooldownLogic:
-    async def test_cooldown_set_and_active(self, db: Database):
+    async def test_cooldown_set_and_active(self, db: Storage):
         """Cooldown wird korrekt gesetzt."""
         assert not await db.is_on_cooldown("GME")
         await db.set_cooldown("GME", hours=4)
         assert await db.is_on_cooldown("GME")
 
-    async def test_cooldown_expires(self, db: Database):
+    async def test_cooldown_expires(self, db: Storage, raw_sql: RawSQL):
         """Abgelaufener Cooldown wird korrekt erkannt."""
         # Expired cooldown direkt in DB schreiben
         now = datetime.now(tz=UTC)
         expired = (now - timedelta(hours=1)).isoformat()
-        await db.conn.execute(
+        await raw_sql.execute(
             """INSERT INTO alert_cooldowns (ticker, last_alert_at, cooldown_until)
                VALUES ('GME', ?, ?)""",
             (expired, expired),
         )
-        await db.conn.commit()
 
         assert not await db.is_on_cooldown("GME")
 
-    async def test_cooldown_renewal(self, db: Database):
+    async def test_cooldown_renewal(self, db: Storage, raw_sql: RawSQL):
         """Cooldown-Erneuerung erhöht den Zähler."""
         await db.set_cooldown("GME", hours=4)
         await db.set_cooldown("GME", hours=4)  # Zweites Mal
 
-        async with db.conn.execute(
-            "SELECT alert_count FROM alert_cooldowns WHERE ticker = 'GME'"
-        ) as cur:
-            row = await cur.fetchone()
+        row = await raw_sql.fetchone("SELECT alert_count FROM alert_cooldowns WHERE ticker = 'GME'")
         assert row["alert_count"] == 2
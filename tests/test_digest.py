@@ -0,0 +1,125 @@
+"""
+Tests für den Digest-Modus (gebündelte Alerts pro Kanal).
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+from wsb_crawler.alerts import discord, dispatch, telegram
+from wsb_crawler.config import (
+    AlertSettings,
+    CrawlerSettings,
+    DiscordSettings,
+    NewsAPISettings,
+    RedditSettings,
+    Settings,
+    TelegramSettings,
+)
+from wsb_crawler.models import Alert, AlertReason, SpikeResult
+
+
+def _settings(*, digest: bool = True, telegram_on: bool = True) -> Settings:
+    return Settings(
+        reddit=RedditSettings("i", "s", "ua"),
+        newsapi=NewsAPISettings(key=""),
+        discord=DiscordSettings("https://discord.com/api/webhooks/1/x"),
+        alerts=AlertSettings(digest=digest),
+        crawler=CrawlerSettings(subreddits=["wallstreetbets"]),
+        telegram=TelegramSettings(
+            bot_token="t" if telegram_on else None, chat_id="c" if telegram_on else None
+        ),
+    )
+
+
+def _alert(ticker: str) -> Alert:
+    spike = SpikeResult(
+        ticker=ticker,
+        current_mentions=40,
+        avg_mentions=5.0,
+        ratio=8.0,
+        delta=35,
+        is_new=False,
+        reason=AlertReason.SPIKE,
+    )
+    return Alert(ticker=ticker, reason=AlertReason.SPIKE, spike=spike)
+
+
+def _embed(chars: int) -> dict:
+    return {"title": "x" * chars, "fields": []}
+
+
+class TestDiscordPacking:
+    def test_max_ten_embeds_per_message(self):
+        chunks = discord._pack_embeds([_embed(10) for _ in range(23)])
+        assert [len(c) for c in chunks] == [10, 10, 3]
+
+    def test_splits_on_total_char_limit(self):
+        chunks = discord._pack_embeds([_embed(2500) for _ in range(5)])
+        assert [len(c) for c in chunks] == [2, 2, 1]
+
+    def test_embed_chars_counts_fields_and_footer(self):
+        embed = {
+            "title": "abc",
+            "fields": [{"name": "n", "value": "vv"}],
+            "footer": {"text": "ffff"},
+        }
+        assert discord._embed_chars(embed) == 10
+
+    async def test_digest_marks_chunk_results(self):
+        alerts = [_alert(f"T{i}") for i in range(12)]
+        # Erste Nachricht (10 Embeds) klappt, zweite nicht
+        send = AsyncMock(side_effect=["msg-1", False])
+        with (
+            patch.object(discord, "get_settings", new=AsyncMock(return_value=_settings())),
+            patch.object(discord, "_get_db"),
+            patch.object(discord, "_send_webhook", new=send),
+        ):
+            delivered = await discord.send_alert_digest(alerts)
+        assert delivered == [True] * 10 + [False] * 2
+        assert send.await_count == 2
+        assert len(send.await_args_list[0].args[0]["embeds"]) == 10
+
+
+class TestTelegramPacking:
+    def test_packs_up_to_limit(self):
+        chunks = telegram._pack_messages(["a" * 2000, "b" * 2000, "c" * 2000])
+        assert chunks == [[0, 1], [2]]
+
+    async def test_digest_sends_one_message(self):
+        send = AsyncMock(return_value=True)
+        with patch.object(telegram, "_send_message", new=send):
+            delivered = await telegram.send_alert_digest(
+                [_alert("GME"), _alert("AMC")], _settings()
+            )
+        assert delivered == [True, True]
+        send.assert_awaited_once()
+        assert "GME" in send.await_args.args[0] and "AMC" in send.await_args.args[0]
+
+
+class TestDigestDispatch:
+    async def test_uses_digest_senders(self):
+        alerts = [_alert("GME"), _alert("AMC")]
+        with (
+            patch.object(
+                dispatch.discord, "send_alert_digest", new=AsyncMock(return_value=[False, True])
+            ),
+            patch.object(
+                dispatch.telegram, "send_alert_digest", new=AsyncMock(return_value=[False, False])
+            ),
+            patch.object(dispatch.discord, "send_alert", new=AsyncMock()) as single,
+        ):
+            sent = await dispatch.send_alerts(alerts, _settings())
+        assert sent == 1
+        assert alerts[0].sent is False
+        assert list(alerts[1].delivery_ms) == ["discord"]
+        single.assert_not_awaited()
+
+    async def test_single_alert_uses_normal_path(self):
+        with (
+            patch.object(dispatch.discord, "send_alert", new=AsyncMock(return_value=True)) as one,
+            patch.object(dispatch.discord, "send_alert_digest", new=AsyncMock()) as digest,
+        ):
+            await dispatch.send_alerts([_alert("GME")], _settings(telegram_on=False))
+        one.assert_awaited_once()
+        digest.assert_not_awaited()
@@ -8,7 +8,18 @@ from __future__ import annotations
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+
 from wsb_crawler.alerts import discord as discord_mod
+from wsb_crawler.alerts.ratelimit import reset_limiters
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters():
+    # Jeder Test startet mit vollem Webhook-Bucket
+    reset_limiters()
+    yield
+    reset_limiters()
 
 
 def _response(status_code: int, json_body: dict | None = None) -> MagicMock:
@@ -0,0 +1,172 @@
+"""
+Tests für den Bulk-Export (/api/export/{dataset} und ``wsb-crawler export``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from tests.conftest import RawSQL
+from wsb_crawler.api.server import app, set_database
+from wsb_crawler.main import main
+from wsb_crawler.storage import export as export_mod
+from wsb_crawler.storage.base import Storage
+from wsb_crawler.storage.database import Database
+from wsb_crawler.storage.export import DATASETS, export_stream
+
+
+@pytest.fixture
+async def db(storage: Storage) -> Storage:
+    set_database(storage)
+    yield storage
+
+
+@pytest.fixture
+async def client(db: Storage) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def _insert_mentions(db: Storage, raw_sql: RawSQL, count: int) -> None:
+    run_id = await db.start_run(["wallstreetbets"])
+    await raw_sql.executemany(
+        "INSERT INTO ticker_mentions (run_id, ticker, mentions, recorded_at) VALUES (?, ?, ?, ?)",
+        [(run_id, f"T{i}", i, f"2026-05-{1 + i % 28:02d}T12:00:00+00:00") for i in range(count)],
+    )
+
+
+class TestExportStream:
+    async def test_csv_is_chunked_and_chronological(self, db: Storage, raw_sql: RawSQL):
+        await _insert_mentions(db, raw_sql, 25)
+        chunks = [c async for c in export_stream(db, "mentions", "csv", chunk_size=10)]
+        # Kopfzeile + 3 Chunks (10/10/5 Zeilen) → 3 Teile, nie alles auf einmal
+        assert len(chunks) == 3
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        assert len(rows) == 25
+        assert list(rows[0]) == DATASETS["mentions"].column_names
+        stamps = [r["recorded_at"] for r in rows]
+        assert stamps == sorted(stamps)
+
+    async def test_empty_csv_has_header(self, db: Storage):
+        body = b"".join([c async for c in export_stream(db, "alerts", "csv")])
+        assert body.decode().strip() == ",".join(DATASETS["alerts"].column_names)
+
+    async def test_parquet_roundtrip(self, db: Storage, raw_sql: RawSQL):
+        pq = pytest.importorskip("pyarrow.parquet")
+        await _insert_mentions(db, raw_sql, 25)
+        body = b"".join([c async for c in export_stream(db, "mentions", "parquet", chunk_size=10)])
+        table = pq.read_table(io.BytesIO(body))
+        assert table.num_rows == 25
+        assert table.column_names == DATASETS["mentions"].column_names
+
+    async def test_parquet_without_pyarrow_raises(self, db: Storage):
+        with (
+            patch.object(export_mod, "_load_pyarrow", return_value=None),
+            pytest.raises(RuntimeError, match="pyarrow"),
+        ):
+            [c async for c in export_stream(db, "mentions", "parquet")]
+
+
+class TestExportEndpoint:
+    async def test_ndjson_with_date_range(
+        self, client: httpx.AsyncClient, db: Storage, raw_sql: RawSQL
+    ):
+        await _insert_mentions(db, raw_sql, 28)
+        response = await client.get(
+            "/api/export/mentions",
+            params={
+                "format": "ndjson",
+                "since": "2026-05-10T00:00:00+00:00",
+                "until": "2026-05-20T00:00:00+00:00",
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 10
+        assert rows[0]["recorded_at"].startswith("2026-05-10")
+        assert rows[-1]["recorded_at"].startswith("2026-05-19")
+
+    async def test_date_range_with_utc_offset(
+        self, client: httpx.AsyncClient, db: Storage, raw_sql: RawSQL
+    ):
+        await _insert_mentions(db, raw_sql, 28)
+        response = await client.get(
+            "/api/export/mentions",
+            params={"format": "ndjson", "since": "2026-05-10T13:00:00+02:00"},
+        )
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows[0]["recorded_at"].startswith("2026-05-10")  # 11:00 UTC < 12:00 UTC
+
+    async def test_runs_csv(self, client: httpx.AsyncClient, db: Storage):
+        await db.start_run(["wallstreetbets", "stocks"])
+        response = await client.get("/api/export/runs")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert "stocks" in rows[0]["subreddits"]
+
+    async def test_unknown_dataset_is_rejected(self, client: httpx.AsyncClient):
+        response = await client.get("/api/export/settings")
+        assert response.status_code == 422
+
+    async def test_parquet_without_pyarrow_is_501(self, client: httpx.AsyncClient):
+        with patch.object(export_mod, "_load_pyarrow", return_value=None):
+            response = await client.get("/api/export/mentions", params={"format": "parquet"})
+        assert response.status_code == 501
+        assert "pyarrow" in response.json()["detail"]
+
+
+class TestExportCli:
+    async def test_cli_writes_file(self, db: Storage, tmp_path: Path, raw_sql: RawSQL):
+        if not isinstance(db, Database):
+            pytest.skip("--db betrifft nur die SQLite-Datei")
+        await _insert_mentions(db, raw_sql, 5)
+        target = tmp_path / "out.ndjson"
+        # main() ruft asyncio.run → eigener Thread statt des Test-Loops
+        await asyncio.to_thread(
+            main,
+            ["export", "mentions", "--format", "ndjson", "-o", str(target), "--db", str(db._path)],
+        )
+        lines = target.read_text().splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[0])["ticker"] == "T0"
+
+    async def test_cli_opens_read_only_without_schema_init(
+        self, db: Storage, tmp_path: Path, raw_sql: RawSQL
+    ):
+        if not isinstance(db, Database):
+            pytest.skip("--db betrifft nur die SQLite-Datei")
+        await _insert_mentions(db, raw_sql, 3)
+        target = tmp_path / "out.csv"
+        with patch.object(Database, "_run_column_migrations") as migrations:
+            await asyncio.to_thread(
+                main, ["export", "mentions", "-o", str(target), "--db", str(db._path)]
+            )
+        migrations.assert_not_called()
+        assert len(target.read_text().splitlines()) == 4
+
+    def test_cli_parquet_without_pyarrow_exits(self, tmp_path: Path):
+        with (
+            patch.object(export_mod, "_load_pyarrow", return_value=None),
+            pytest.raises(SystemExit, match="pyarrow"),
+        ):
+            main(["export", "mentions", "--format", "parquet", "--db", str(tmp_path / "x.db")])
+        assert not (tmp_path / "x.db").exists()
+
+    async def test_read_only_does_not_create_missing_file(self, tmp_path: Path):
+        path = tmp_path / "missing.db"
+        with pytest.raises(RuntimeError, match="nicht gelesen"):
+            await Database(path, read_only=True).init()
+        assert not path.exists()
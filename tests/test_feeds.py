@@ -0,0 +1,192 @@
+"""
+Tests für die lokale News-Quelle (enrichment/feeds.py + FTS5-Suche in news.py).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from wsb_crawler.enrichment import feeds as feeds_mod
+from wsb_crawler.enrichment import news as news_mod
+from wsb_crawler.models import FeedEntry
+from wsb_crawler.storage.base import Storage
+from wsb_crawler.storage.cache import news_cache
+
+_NOW = datetime.now(tz=UTC)
+_RFC822 = _NOW.strftime("%a, %d %b %Y %H:%M:%S +0000")
+
+RSS_FEED = f"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+  <title>Market Wire</title>
+  <item>
+    <title>GameStop shares jump after earnings</title>
+    <link>https://example.com/gme-earnings</link>
+    <description>&lt;p&gt;$GME rallied &lt;b&gt;20%&lt;/b&gt;.&lt;/p&gt;</description>
+    <pubDate>{_RFC822}</pubDate>
+  </item>
+  <item>
+    <title>AMC screens new blockbuster</title>
+    <link>https://example.com/amc</link>
+    <pubDate>{_RFC822}</pubDate>
+  </item>
+  <item><title>Ohne Link</title></item>
+</channel></rss>"""
+
+ATOM_FEED = f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Tech Atom</title>
+  <entry>
+    <title>Palantir wins contract</title>
+    <link rel="alternate" href="https://example.com/pltr"/>
+    <summary>PLTR up in premarket</summary>
+    <updated>{_NOW.isoformat().replace("+00:00", "Z")}</updated>
+  </entry>
+</feed>"""
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    news_cache.clear()
+    yield
+    news_cache.clear()
+
+
+@pytest.fixture
+def feed_server() -> Iterator[str]:
+    """Lokaler HTTP-Server mit /rss, /atom und einem kaputten /broken-Feed."""
+    payloads = {"/rss": RSS_FEED, "/atom": ATOM_FEED, "/broken": "<html>nope"}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            body = payloads.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            data = body.encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/xml")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args: object) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+async def db(storage: Storage) -> Storage:
+    await storage.set_setting("reddit_client_id", "test_id")
+    await storage.set_setting("reddit_client_secret", "test_secret")
+    await storage.set_setting("discord_webhook_url", "https://discord.com/api/webhooks/0/test")
+    news_mod.set_database(storage)
+    yield storage
+
+
+class TestParseFeed:
+    def test_rss_strips_html_and_skips_incomplete(self):
+        entries = feeds_mod.parse_feed(RSS_FEED, "https://wire.example/rss")
+        assert [e.url for e in entries] == [
+            "https://example.com/gme-earnings",
+            "https://example.com/amc",
+        ]
+        assert entries[0].summary == "$GME rallied 20% ."
+        assert entries[0].source == "Market Wire"
+        assert entries[0].published_at.tzinfo is not None
+
+    def test_atom(self):
+        entries = feeds_mod.parse_feed(ATOM_FEED, "https://tech.example/atom")
+        assert len(entries) == 1
+        assert entries[0].url == "https://example.com/pltr"
+        assert entries[0].summary == "PLTR up in premarket"
+
+    def test_unknown_format_raises(self):
+        with pytest.raises(ValueError):
+            feeds_mod.parse_feed("<html></html>", "https://x.example")
+
+    def test_doctype_is_rejected_before_parsing(self):
+        bomb = (
+            '<?xml version="1.0"?>\n<!doctype rss [<!ENTITY a "aaaaaaaaaa">'
+            '<!ENTITY b "&a;&a;&a;&a;&a;&a;&a;&a;&a;&a;">]>\n'
+            "<rss><channel><title>&b;</title></channel></rss>"
+        )
+        with (
+            patch.object(feeds_mod.ET, "fromstring") as fromstring,
+            pytest.raises(ValueError, match="DOCTYPE"),
+        ):
+            feeds_mod.parse_feed(bomb, "https://x.example")
+        fromstring.assert_not_called()
+
+
+class TestIngest:
+    async def test_ingest_is_idempotent_and_tolerates_broken_feed(
+        self, db: Storage, feed_server: str
+    ):
+        urls = [f"{feed_server}/rss", f"{feed_server}/atom", f"{feed_server}/broken"]
+        assert await feeds_mod.ingest_feeds(db, urls) == 3
+        assert await feeds_mod.ingest_feeds(db, urls) == 0
+
+    async def test_oversized_feed_is_skipped(
+        self, db: Storage, feed_server: str, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(feeds_mod, "FEED_MAX_BYTES", len(ATOM_FEED.encode()))
+        urls = [f"{feed_server}/rss", f"{feed_server}/atom"]
+        assert await feeds_mod.ingest_feeds(db, urls) == 1  # nur der Atom-Feed passt
+
+    async def test_purge_removes_old_entries(self, db: Storage):
+        old = FeedEntry(
+            url="https://example.com/old",
+            title="GME old news",
+            summary="",
+            source="Wire",
+            published_at=_NOW - timedelta(days=30),
+        )
+        await db.save_news_articles([old])
+        assert await db.purge_old_news(days=14) == 1
+        assert await db.search_news('"GME"', _NOW - timedelta(days=60)) == []
+
+
+class TestLocalSearch:
+    async def test_local_hit_skips_newsapi(self, db: Storage, feed_server: str):
+        await db.set_setting("news_feeds", f"{feed_server}/rss {feed_server}/atom")
+        await db.set_setting("newsapi_key", "test_key")
+        await feeds_mod.ingest_feeds(db, [f"{feed_server}/rss", f"{feed_server}/atom"])
+
+        mock = AsyncMock(return_value=[])
+        with patch.object(news_mod, "_fetch_articles", new=mock):
+            result = await news_mod.get_news_bulk(
+                ["GME", "PLTR", "TSLA"], company_names={"GME": "GameStop Corp."}
+            )
+        assert [a.url for a in result["GME"]] == ["https://example.com/gme-earnings"]
+        assert [a.url for a in result["PLTR"]] == ["https://example.com/pltr"]
+        # Nur der Ticker ohne lokalen Treffer geht an NewsAPI
+        mock.assert_awaited_once()
+        assert mock.await_args.args[0]["q"] == "$TSLA"
+
+    async def test_symbol_match_is_case_sensitive(self, db: Storage):
+        await db.set_setting("news_feeds", "https://wire.example/rss")
+        await db.save_news_articles(
+            [
+                FeedEntry(
+                    url="https://example.com/lower",
+                    title="The amc of the story",
+                    summary="",
+                    source="Wire",
+                    published_at=_NOW,
+                )
+            ]
+        )
+        result = await news_mod.get_news_bulk(["AMC"])
+        assert result["AMC"] == []
@@ -0,0 +1,342 @@
+"""
+Tests für verteilte Crawls: Job-Leasing (crawler/jobs.py), Worker und Koordinator
+(crawler/worker.py). Mehrere Prozesse teilen sich dabei eine echte DB-Datei.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from wsb_crawler.crawler.jobs import (
+    MAX_JOB_ATTEMPTS,
+    PostgresJobQueue,
+    SQLiteJobQueue,
+    result_from_payload,
+    result_to_payload,
+)
+from wsb_crawler.crawler.units import CrawlUnit
+from wsb_crawler.models import CrawlResult, TickerSignal
+from wsb_crawler.storage.database import Database
+from wsb_crawler.storage.postgres import load_asyncpg
+
+
+def _units(*names: str) -> list[CrawlUnit]:
+    return [CrawlUnit(name, posts_limit=10, comments_limit=2) for name in names]
+
+
+def _result(counts: dict[str, int], subreddit: str = "wsb") -> CrawlResult:
+    now = datetime.now(tz=UTC)
+    return CrawlResult(
+        run_id="r",
+        started_at=now,
+        finished_at=now,
+        subreddits=[subreddit],
+        posts_scanned=10,
+        comments_scanned=20,
+        mention_counts=counts,
+        mention_signals={
+            t: TickerSignal(t, n, total_score=5 * n, max_score=9, bull_hits=1, bear_hits=0)
+            for t, n in counts.items()
+        },
+    )
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> Database:
+    database = Database(tmp_path / "test.db")
+    await database.init()
+    await database.set_setting("reddit_client_id", "test_id")
+    await database.set_setting("reddit_client_secret", "test_secret")
+    await database.set_setting("discord_webhook_url", "https://discord.com/api/webhooks/0/test")
+    yield database
+    await database.close()
+
+
+@pytest.fixture
+async def queue(db: Database, tmp_path: Path) -> SQLiteJobQueue:
+    q = await SQLiteJobQueue(tmp_path / "test.db").open()
+    yield q
+    await q.close()
+
+
+class TestSQLiteLeasing:
+    async def test_each_job_leased_once(self, queue: SQLiteJobQueue):
+        await queue.enqueue("run1", _units("a", "b"))
+        first = await queue.lease("w1")
+        second = await queue.lease("w2")
+        assert first and second
+        assert {first.unit.subreddit, second.unit.subreddit} == {"a", "b"}
+        assert await queue.lease("w3") is None
+
+    async def test_enqueue_is_idempotent_per_run(self, queue: SQLiteJobQueue):
+        await queue.enqueue("run1", _units("a"))
+        await queue.enqueue("run1", _units("a"))
+        assert await queue.lease("w1") is not None
+        assert await queue.lease("w1") is None
+
+    async def test_expired_lease_moves_to_other_worker(self, db: Database, tmp_path: Path):
+        queue = await SQLiteJobQueue(tmp_path / "test.db", lease_seconds=0).open()
+        try:
+            await queue.enqueue("run1", _units("a"))
+            stale = await queue.lease("w1")
+            fresh = await queue.lease("w2")
+            assert stale and fresh and stale.id == fresh.id
+            assert fresh.attempts == 2
+            # Der abgelöste Worker darf nichts mehr zurückmelden
+            assert not await queue.heartbeat(stale.id, "w1")
+            assert not await queue.complete(stale.id, "w1", result_to_payload(_result({})))
+            assert await queue.complete(fresh.id, "w2", result_to_payload(_result({"GME": 1})))
+        finally:
+            await queue.close()
+
+    async def test_exhausted_attempts_fail_on_collect(self, db: Database, tmp_path: Path):
+        queue = await SQLiteJobQueue(tmp_path / "test.db", lease_seconds=0).open()
+        try:
+            await queue.enqueue("run1", _units("a"))
+            for i in range(MAX_JOB_ATTEMPTS):
+                assert await queue.lease(f"w{i}") is not None
+            assert await queue.lease("late") is None
+            (job,) = await queue.collect("run1")
+            assert job.result is None
+            assert "abgelaufen" in (job.error or "")
+        finally:
+            await queue.close()
+
+    async def test_collect_returns_results_once(self, queue: SQLiteJobQueue):
+        await queue.enqueue("run1", _units("a", "b"))
+        job_a = await queue.lease("w1")
+        job_b = await queue.lease("w1")
+        assert job_a and job_b
+        await queue.complete(job_a.id, "w1", result_to_payload(_result({"GME": 3})))
+        await queue.fail(job_b.id, "w1", "429 Too Many Requests")
+
+        finished = {job.subreddit: job for job in await queue.collect("run1")}
+        assert await queue.collect("run1") == []
+        restored = result_from_payload("run1", "a", finished["a"].result or {})
+        assert restored.mention_counts == {"GME": 3}
+        assert restored.mention_signals["GME"].total_score == 15
+        assert finished["b"].error == "429 Too Many Requests"
+
+    async def test_cancel_stops_leasing(self, queue: SQLiteJobQueue):
+        await queue.enqueue("run1", _units("a", "b"))
+        assert await queue.cancel("run1") == 2
+        assert await queue.lease("w1") is None
+
+    async def test_reenqueue_restarts_cancelled_and_collected_jobs(self, queue: SQLiteJobQueue):
+        await queue.enqueue("run1", _units("a", "b", "c"))
+        job_a = await queue.lease("w1")
+        job_b = await queue.lease("w1")
+        assert job_a and job_b
+        await queue.complete(job_a.id, "w1", result_to_payload(_result({"GME": 1})))
+        assert len(await queue.collect("run1")) == 1  # a abgeholt, dann Absturz
+        await queue.cancel("run1")  # Stopp: b (geleast) und c (pending)
+
+        # Fortsetzung mit derselben run_id stellt alle drei wieder ein
+        await queue.enqueue("run1", _units("a", "b", "c"))
+        leased = [await queue.lease("w2") for _ in range(3)]
+        assert sorted(job.unit.subreddit for job in leased if job) == ["a", "b", "c"]
+        assert all(job and job.attempts == 1 for job in leased)
+
+    async def test_reenqueue_keeps_active_and_uncollected_jobs(self, queue: SQLiteJobQueue):
+        await queue.enqueue("run1", _units("a", "b"))
+        job_a = await queue.lease("w1")
+        job_b = await queue.lease("w1")
+        assert job_a and job_b
+        await queue.complete(job_b.id, "w1", result_to_payload(_result({"GME": 1})))
+
+        await queue.enqueue("run1", _units("a", "b"))
+        assert await queue.lease("w2") is None
+        assert await queue.heartbeat(job_a.id, "w1")
+        (finished,) = await queue.collect("run1")
+        assert finished.subreddit == "b" and finished.result is not None
+
+
+def _lease_all(path: str, worker_id: str, out: multiprocessing.Queue) -> None:
+    """Läuft in einem eigenen Prozess: least, bis nichts mehr frei ist."""
+
+    async def _run() -> list[int]:
+        queue = await SQLiteJobQueue(Path(path)).open()
+        leased: list[int] = []
+        try:
+            while (job := await queue.lease(worker_id)) is not None:
+                leased.append(job.id)
+                await queue.complete(job.id, worker_id, {"posts_scanned": 0})
+        finally:
+            await queue.close()
+        return leased
+
+    out.put(asyncio.run(_run()))
+
+
+async def test_processes_sharing_one_db_lease_disjoint_jobs(queue: SQLiteJobQueue, tmp_path: Path):
+    await queue.enqueue("run1", _units(*(f"sub{i}" for i in range(60))))
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    procs = [
+        ctx.Process(target=_lease_all, args=(str(tmp_path / "test.db"), f"w{i}", out))
+        for i in range(3)
+    ]
+    for proc in procs:
+        proc.start()
+    leased = [await asyncio.to_thread(out.get, True, 60) for _ in procs]
+    for proc in procs:
+        proc.join(timeout=10)
+
+    all_ids = [job_id for ids in leased for job_id in ids]
+    assert len(all_ids) == 60
+    assert len(set(all_ids)) == 60
+    assert len(await queue.collect("run1")) == 60
+
+
+async def test_coordinator_runs_crawl_through_worker(db: Database, queue: SQLiteJobQueue):
+    """crawl_backend=workers: Worker crawlt, Koordinator speichert und analysiert."""
+    from wsb_crawler.crawler import runner, worker
+
+    await db.set_setting("crawl_backend", "workers")
+    results = {
+        "wallstreetbets": _result({"GME": 30}, "wallstreetbets"),
+        "wallstreetbetsGER": _result({"SAP": 2}, "wallstreetbetsGER"),
+    }
+
+    async def _crawl_job(_db: Database, job):
+        return results[job.unit.subreddit]
+
+    runner.set_job_queue(queue)
+    worker_task = asyncio.create_task(
+        worker.run_worker(db, queue, worker_id="w1", idle_seconds=0.01)
+    )
+    try:
+        with (
+            patch.object(worker, "crawl_job", new=_crawl_job),
+            patch.object(
+                runner,
+                "dispatch_units",
+                new=functools.partial(worker.dispatch_units, poll_seconds=0.01),
+            ),
+            patch.object(runner, "crawl_units", new=AsyncMock(side_effect=AssertionError)),
+            patch("wsb_crawler.analysis.detector.get_prices_bulk", new=AsyncMock(return_value={})),
+            patch("wsb_crawler.analysis.detector.get_news_bulk", new=AsyncMock(return_value={})),
+            patch(
+                "wsb_crawler.analysis.detector.resolve_names_bulk",
+                new=AsyncMock(return_value={}),
+            ),
+        ):
+            await asyncio.wait_for(runner.run_single_crawl(db), timeout=10)
+    finally:
+        worker_task.cancel()
+        runner.set_job_queue(None)
+
+    run = (await db.get_recent_runs())[0]
+    assert run["is_healthy"] == 1
+    assert run["posts_scanned"] == 20
+    detail = await db.get_run_detail(run["id"])
+    assert {r["subreddit"] for r in detail["subreddit_totals"]} == set(results)
+    assert [row["ticker"] for row in await db.get_outbox(status="pending")] == ["GME"]
+
+
+async def test_stopped_run_resumes_through_workers(db: Database, queue: SQLiteJobQueue):
+    """Gestoppter Lauf: die abgebrochenen Jobs laufen bei der Fortsetzung wieder an."""
+    from wsb_crawler.crawler import runner, worker
+
+    await db.set_setting("crawl_backend", "workers")
+    await db.set_setting("subreddits", "wallstreetbets")
+
+    async def _crawl_job(_db: Database, job):
+        return _result({"GME": 30}, job.unit.subreddit)
+
+    async def _job_statuses() -> list[str]:
+        async with db.conn.execute("SELECT status FROM crawl_jobs") as cur:
+            return [row[0] for row in await cur.fetchall()]
+
+    runner.set_job_queue(queue)
+    try:
+        with (
+            patch.object(worker, "crawl_job", new=_crawl_job),
+            patch.object(
+                runner,
+                "dispatch_units",
+                new=functools.partial(worker.dispatch_units, poll_seconds=0.01),
+            ),
+            patch("wsb_crawler.analysis.detector.get_prices_bulk", new=AsyncMock(return_value={})),
+            patch("wsb_crawler.analysis.detector.get_news_bulk", new=AsyncMock(return_value={})),
+            patch(
+                "wsb_crawler.analysis.detector.resolve_names_bulk",
+                new=AsyncMock(return_value={}),
+            ),
+        ):
+            # Erster Lauf: noch kein Worker da, Stopp nach dem Einstellen
+            first = asyncio.create_task(runner.run_single_crawl(db))
+            for _ in range(500):
+                if await _job_statuses():
+                    break
+                await asyncio.sleep(0.01)
+            assert runner.stop_current_crawl()
+            await asyncio.wait_for(first, timeout=5)
+            assert await _job_statuses() == ["cancelled"]
+            stopped_run = (await db.get_recent_runs())[0]["id"]
+
+            worker_task = asyncio.create_task(
+                worker.run_worker(db, queue, worker_id="w1", idle_seconds=0.01)
+            )
+            try:
+                await asyncio.wait_for(runner.run_single_crawl(db), timeout=10)
+            finally:
+                worker_task.cancel()
+    finally:
+        runner.set_job_queue(None)
+
+    (run,) = await db.get_recent_runs()
+    assert run["id"] == stopped_run
+    assert run["is_healthy"] == 1
+    assert run["finished_at"] is not None
+    assert await _job_statuses() == ["done"]
+    mentions = await db.get_run_mentions(stopped_run)
+    assert [(m["ticker"], m["mentions"]) for m in mentions] == [("GME", 30)]
+
+
+async def test_dispatch_times_out_without_workers(queue: SQLiteJobQueue):
+    from wsb_crawler.crawler.worker import dispatch_units
+
+    outcomes: dict[str, object] = {}
+
+    async def _on_done(unit, outcome):
+        outcomes[unit.subreddit] = outcome
+
+    await dispatch_units(queue, "run1", _units("a"), _on_done, timeout=0.05, poll_seconds=0.01)
+    assert isinstance(outcomes["a"], TimeoutError)
+    assert await queue.lease("late") is None
+
+
+@pytest.mark.skipif(
+    not os.getenv("WSB_TEST_JOBS_DSN") or load_asyncpg() is None,
+    reason="Postgres-Test braucht WSB_TEST_JOBS_DSN und asyncpg",
+)
+async def test_postgres_queue_leases_and_collects():
+    queue = await PostgresJobQueue(os.environ["WSB_TEST_JOBS_DSN"]).open()
+    run_id = f"test-{os.getpid()}-{datetime.now(tz=UTC).timestamp()}"
+    try:
+        await queue.enqueue(run_id, _units("a", "b"))
+        first = await queue.lease("w1")
+        second = await queue.lease("w2")
+        assert first and second and first.id != second.id
+        assert await queue.heartbeat(first.id, "w1")
+        assert await queue.complete(first.id, "w1", result_to_payload(_result({"GME": 1})))
+        assert await queue.fail(second.id, "w2", "boom")
+        finished = {job.subreddit: job for job in await queue.collect(run_id)}
+        assert finished[first.unit.subreddit].result is not None
+        assert finished[second.unit.subreddit].error == "boom"
+        # Fortsetzung mit derselben run_id: abgeholte Jobs laufen wieder an
+        await queue.enqueue(run_id, _units("a", "b"))
+        again = await queue.lease("w3")
+        assert again is not None and again.attempts == 1
+    finally:
+        await queue.cancel(run_id)
+        await queue.close()
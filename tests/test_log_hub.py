@@ -0,0 +1,86 @@
+"""
+Tests für den Log-Hub (runtime/log_hub.py): Batching, Backpressure, Thread-Handoff.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from wsb_crawler.runtime import log_hub as log_hub_module
+from wsb_crawler.runtime.log_hub import LogHub
+
+
+@pytest.fixture(autouse=True)
+def _fast_batches(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(log_hub_module, "BATCH_INTERVAL_SECONDS", 0.01)
+
+
+async def test_lines_are_coalesced_into_one_frame() -> None:
+    hub = LogHub()
+    sub = hub.subscribe()
+    for i in range(5):
+        hub.emit(f"zeile {i}\n")
+
+    frame = await asyncio.wait_for(hub.next_batch(sub), 1)
+
+    assert frame == {
+        "type": "lines",
+        "lines": [f"zeile {i}" for i in range(5)],
+        "dropped": 0,
+    }
+    assert list(hub.history)[-1] == "zeile 4"
+
+
+async def test_slow_client_drops_oldest_and_reports_count(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(log_hub_module, "CLIENT_QUEUE_LINES", 3)
+    hub = LogHub()
+    slow = hub.subscribe()
+    fast = hub.subscribe()
+    for i in range(5):
+        hub.emit(f"zeile {i}")
+
+    frame = await asyncio.wait_for(hub.next_batch(slow), 1)
+
+    assert frame["lines"] == ["zeile 2", "zeile 3", "zeile 4"]
+    assert frame["dropped"] == 2
+    # Der andere Client hat eine eigene Queue und ist nicht betroffen
+    assert len(fast.lines) == 3
+    # Zähler wird pro Frame zurückgesetzt
+    hub.emit("weiter")
+    assert (await asyncio.wait_for(hub.next_batch(slow), 1))["dropped"] == 0
+
+
+async def test_logs_from_worker_threads_reach_clients() -> None:
+    hub = LogHub()
+    sub = hub.subscribe()
+
+    await asyncio.to_thread(hub.emit, "aus dem Thread")
+    frame = await asyncio.wait_for(hub.next_batch(sub), 1)
+
+    assert frame["lines"] == ["aus dem Thread"]
+
+
+async def test_unsubscribed_clients_get_nothing() -> None:
+    hub = LogHub()
+    sub = hub.subscribe()
+    hub.unsubscribe(sub)
+    hub.emit("niemand hört zu")
+
+    assert not sub.lines
+    assert hub.subscriber_count == 0
+    assert list(hub.history) == ["niemand hört zu"]
+
+
+async def test_history_snapshot_and_queue_do_not_overlap() -> None:
+    hub = LogHub()
+    hub.emit("vorher")
+    sub = hub.subscribe()
+    hub.emit("nachher")
+
+    assert sub.history == ["vorher"]
+    frame = await asyncio.wait_for(hub.next_batch(sub), 1)
+    assert frame["lines"] == ["nachher"]
@@ -0,0 +1,176 @@
+"""
+Tests für die Prometheus-Metriken (runtime/metrics.py) und ihre Messpunkte.
+
+Die Metriken sind prozessweit — Tests vergleichen deshalb Differenzen statt
+absoluter Werte.
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from wsb_crawler.crawler.units import CrawlUnit
+from wsb_crawler.runtime.metrics import (
+    API_CALLS,
+    CACHE_LOOKUPS,
+    CONTENT_TYPE,
+    PHASE_SECONDS,
+    RATE_LIMITED,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+from wsb_crawler.storage.cache import TTLCache
+
+
+class TestExposition:
+    def test_counter_and_gauge_text_format(self):
+        registry = Registry()
+        calls = registry.register(Counter("x_calls_total", "Calls", ("api",)))
+        depth = registry.register(Gauge("x_queue_depth", "Depth", ("queue",)))
+        calls.inc(api="reddit")
+        calls.inc(2, api='we"ird')
+        pending = [1, 2, 3]
+        depth.track(lambda: len(pending), queue="analysis")
+        depth.set(4, queue="alerts")
+
+        text = registry.render()
+        assert "# TYPE x_calls_total counter" in text
+        assert 'x_calls_total{api="reddit"} 1' in text
+        assert 'x_calls_total{api="we\\"ird"} 2' in text
+        # Callback-Gauges werden erst beim Abruf ausgewertet
+        pending.append(4)
+        assert 'x_queue_depth{queue="analysis"} 4' in registry.render()
+        assert 'x_queue_depth{queue="alerts"} 4' in text
+        assert text.endswith("\n")
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        latency = registry.register(
+            Histogram("x_seconds", "Latency", ("phase",), buckets=(0.1, 1.0))
+        )
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value, phase="save")
+
+        lines = registry.render().splitlines()
+        assert 'x_seconds_bucket{phase="save",le="0.1"} 2' in lines
+        assert 'x_seconds_bucket{phase="save",le="1"} 3' in lines
+        assert 'x_seconds_bucket{phase="save",le="+Inf"} 4' in lines
+        assert 'x_seconds_sum{phase="save"} 3.65' in lines
+        assert 'x_seconds_count{phase="save"} 4' in lines
+
+    def test_timer_records_on_exception(self):
+        latency = Histogram("x_seconds", "Latency", ("source",))
+        with pytest.raises(RuntimeError), latency.time(source="news"):
+            raise RuntimeError("boom")
+        assert latency.count(source="news") == 1
+
+    def test_labels_are_checked(self):
+        calls = Counter("x_total", "Calls", ("api",))
+        with pytest.raises(ValueError):
+            calls.inc()
+        with pytest.raises(ValueError):
+            calls.inc(api="reddit", extra="1")
+
+    def test_duplicate_names_are_rejected(self):
+        registry = Registry()
+        registry.register(Counter("x_total", "Calls"))
+        with pytest.raises(ValueError):
+            registry.register(Gauge("x_total", "Depth"))
+
+    def test_metrics_endpoint(self):
+        from wsb_crawler.api.server import app
+
+        response = TestClient(app).get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == CONTENT_TYPE
+        for name in (
+            "wsb_phase_duration_seconds",
+            "wsb_enrichment_duration_seconds",
+            "wsb_alert_delivery_duration_seconds",
+            "wsb_api_requests_total",
+            "wsb_api_rate_limited_total",
+            "wsb_cache_lookups_total",
+            "wsb_queue_depth",
+        ):
+            assert f"# TYPE {name} " in response.text
+        assert 'wsb_queue_depth{queue="log_clients"}' in response.text
+
+
+class TestInstrumentation:
+    def test_named_cache_counts_hits_and_misses(self):
+        cache: TTLCache[int] = TTLCache(ttl_seconds=60, name="test")
+        hits = CACHE_LOOKUPS.value(cache="test", result="hit")
+        misses = CACHE_LOOKUPS.value(cache="test", result="miss")
+
+        assert cache.get("GME") is None
+        cache.set("GME", 1)
+        assert cache.get("GME") == 1
+        assert "GME" in cache  # zählt nicht mit
+
+        assert CACHE_LOOKUPS.value(cache="test", result="hit") == hits + 1
+        assert CACHE_LOOKUPS.value(cache="test", result="miss") == misses + 1
+
+    async def test_crawl_subreddit_records_phases_and_api_calls(self):
+        from wsb_crawler.crawler.reddit import crawl_subreddit
+
+        class _Reddit:
+            async def subreddit(self, _name: str) -> _Reddit:
+                return self
+
+            async def _listing(self):
+                for i in range(3):
+                    yield SimpleNamespace(
+                        id=f"p{i}",
+                        title="",
+                        selftext="$GME",
+                        author="someone",
+                        score=1,
+                        upvote_ratio=1.0,
+                        created_utc=datetime.now(tz=UTC).timestamp(),
+                        permalink=f"/r/metricstest/comments/p{i}/",
+                    )
+
+            def hot(self, limit: int, params: dict[str, str] | None = None):
+                return self._listing()
+
+        calls = API_CALLS.value(api="reddit")
+        await crawl_subreddit(
+            _Reddit(), CrawlUnit("metricstest", posts_limit=3, comments_limit=0), "run1"
+        )
+        assert API_CALLS.value(api="reddit") == calls + 1  # eine Listing-Seite
+        assert PHASE_SECONDS.count(phase="reddit_fetch", subreddit="metricstest") == 1
+        assert PHASE_SECONDS.count(phase="extract", subreddit="metricstest") == 1
+
+    async def test_discord_rate_limit_is_counted(self):
+        from wsb_crawler.alerts import discord as discord_mod
+        from wsb_crawler.alerts.ratelimit import reset_limiters
+
+        def _response(status_code: int, body: dict) -> MagicMock:
+            response = MagicMock(status_code=status_code, headers={})
+            response.json.return_value = body
+            return response
+
+        client = MagicMock()
+        client.post = AsyncMock(
+            side_effect=[_response(429, {"retry_after": 0.01}), _response(204, {})]
+        )
+        ctx = MagicMock()
+        ctx.__aenter__ = AsyncMock(return_value=client)
+        ctx.__aexit__ = AsyncMock(return_value=False)
+
+        calls = API_CALLS.value(api="discord")
+        limited = RATE_LIMITED.value(api="discord")
+        reset_limiters()
+        with patch("wsb_crawler.alerts.discord.httpx.AsyncClient", return_value=ctx):
+            assert await discord_mod._send_webhook({"content": "hi"}, "https://wh") is True
+        reset_limiters()
+
+        assert API_CALLS.value(api="discord") == calls + 2
+        assert RATE_LIMITED.value(api="discord") == limited + 1
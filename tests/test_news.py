@@ -10,6 +10,7 @@ from unittest.mock import AsyncMock, patch
 import pytest
 
 from wsb_crawler.enrichment import news as news_mod
+from wsb_crawler.storage.base import Storage
 from wsb_crawler.storage.cache import news_cache
 from wsb_crawler.storage.database import Database
 
@@ -21,7 +22,7 @@ def _clear_cache():
     news_cache.clear()
 
 
-async def _seed_required(database: Database) -> None:
+async def _seed_required(database: Storage) -> None:
     """get_settings() verlangt die Reddit-/Discord-Pflichtfelder."""
     await database.set_setting("reddit_client_id", "test_id")
     await database.set_setting("reddit_client_secret", "test_secret")
@@ -29,14 +30,11 @@ async def _seed_required(database: Database) -> None:
 
 
 @pytest.fixture
-async def db(tmp_path: Path) -> Database:
-    database = Database(tmp_path / "test.db")
-    await database.init()
-    await _seed_required(database)
-    await database.set_setting("newsapi_key", "test_key")
-    news_mod.set_database(database)
-    yield database
-    await database.close()
+async def db(storage: Storage) -> Storage:
+    await _seed_required(storage)
+    await storage.set_setting("newsapi_key", "test_key")
+    news_mod.set_database(storage)
+    yield storage
 
 
 _ARTICLE = {
@@ -48,7 +46,7 @@ _ARTICLE = {
 
 
 class TestGetNews:
-    async def test_parses_articles(self, db: Database):
+    async def test_parses_articles(self, db: Storage):
         with patch.object(news_mod, "_fetch_articles", new=AsyncMock(return_value=[_ARTICLE])):
             articles = await news_mod.get_news("GME", company_name="GameStop Corp.")
         assert len(articles) == 1
@@ -65,7 +63,7 @@ class TestGetNews:
         finally:
             await database.close()
 
-    async def test_error_returns_empty_and_caches(self, db: Database):
+    async def test_error_returns_empty_and_caches(self, db: Storage):
         with patch.object(
             news_mod, "_fetch_articles", new=AsyncMock(side_effect=RuntimeError("boom"))
         ) as mock_fetch:
@@ -74,7 +72,109 @@ class TestGetNews:
             assert await news_mod.get_news("GME") == []
             assert mock_fetch.call_count == 1
 
-    async def test_bulk_passes_company_names(self, db: Database):
+    async def test_bulk_passes_company_names(self, db: Storage):
         with patch.object(news_mod, "_fetch_articles", new=AsyncMock(return_value=[])):
             result = await news_mod.get_news_bulk(["GME"], company_names={"GME": "GameStop"})
         assert result == {"GME": []}
+
+
+def _raw(title: str, description: str = "", url: str | None = None) -> dict:
+    return {
+        "title": title,
+        "description": description,
+        "source": {"name": "Reuters"},
+        "url": url or f"https://example.com/{abs(hash(title))}",
+        "publishedAt": "2026-01-01T12:00:00Z",
+    }
+
+
+class TestBatching:
+    def test_pack_batches_respects_query_limit(self):
+        tickers = [f"T{i:03d}" for i in range(60)]
+        batches = news_mod._pack_batches(tickers, {}, max_chars=50)
+        assert [t for b in batches for t in b] == tickers
+        for batch in batches:
+            query = " OR ".join(news_mod._ticker_clause(t, None) for t in batch)
+            assert len(query) <= 50
+
+    def test_clause_uses_short_company_name(self):
+        assert news_mod._ticker_clause("GME", "GameStop Corp.") == "($GME OR GameStop)"
+        assert news_mod._ticker_clause("AI", "AI Holdings Inc.") == "$AI"
+
+    async def test_bulk_uses_one_request_and_assigns_by_text(self, db: Storage):
+        raw = [
+            _raw("GameStop soars after earnings"),
+            _raw("Markets wrap", description="AMC and $GME lead meme rally"),
+            _raw("Unrelated headline"),
+        ]
+        with patch.object(news_mod, "_fetch_articles", new=AsyncMock(return_value=raw)) as fetch:
+            result = await news_mod.get_news_bulk(
+                ["GME", "AMC", "TSLA"], company_names={"GME": "GameStop Corp."}
+            )
+
+        assert fetch.await_count == 1
+        query = fetch.await_args.args[0]["q"]
+        assert query == "($GME OR GameStop) OR $AMC OR $TSLA"
+        assert [a.title for a in result["GME"]] == ["GameStop soars after earnings", "Markets wrap"]
+        assert [a.title for a in result["AMC"]] == ["Markets wrap"]
+        assert result["AMC"][0].ticker == "AMC"
+        assert result["TSLA"] == []
+
+    async def test_bulk_caches_per_ticker(self, db: Storage):
+        raw = [_raw("$GME and $AMC squeeze")]
+        with patch.object(news_mod, "_fetch_articles", new=AsyncMock(return_value=raw)) as fetch:
+            await news_mod.get_news_bulk(["GME", "AMC"])
+            # Beide Ticker jetzt gecacht → kein weiterer Request, auch nicht einzeln
+            await news_mod.get_news("AMC")
+            result = await news_mod.get_news_bulk(["GME", "AMC"])
+        assert fetch.await_count == 1
+        assert len(result["GME"]) == 1 and len(result["AMC"]) == 1
+
+    async def test_symbol_match_is_case_sensitive(self, db: Storage):
+        raw = [_raw("Why the gme crowd is back"), _raw("Yet another $AMC story")]
+        with patch.object(news_mod, "_fetch_articles", new=AsyncMock(return_value=raw)):
+            result = await news_mod.get_news_bulk(["GME", "AMC"])
+        assert result["GME"] == []
+        assert len(result["AMC"]) == 1
+
+    @pytest.mark.parametrize("tickers", [["GME"], ["GME", "AMC"]])
+    async def test_malformed_articles_are_skipped(self, db: Storage, tickers: list[str]):
+        bad_date = {**_raw("$GME bad date"), "publishedAt": "gestern"}
+        no_source = {**_raw("$GME no source"), "source": None}
+        raw = [bad_date, no_source, _raw("$GME fine")]
+        with patch.object(news_mod, "_fetch_articles", new=AsyncMock(return_value=raw)):
+            result = await news_mod.get_news_bulk(tickers)
+        assert [a.title for a in result["GME"]] == ["$GME fine"]
+        assert [a.title for a in news_cache.get("GME") or []] == ["$GME fine"]
+
+
+class TestNewsBatcher:
+    async def test_concurrent_requests_share_one_fetch(self):
+        import asyncio
+
+        fetch = AsyncMock(side_effect=lambda tickers, names: {t: [t] for t in tickers})
+        batcher = news_mod.NewsBatcher(fetch, window=0.01)
+
+        gme, amc = await asyncio.gather(batcher.get("GME", "GameStop"), batcher.get("AMC"))
+
+        assert (gme, amc) == (["GME"], ["AMC"])
+        fetch.assert_awaited_once_with(["GME", "AMC"], {"GME": "GameStop", "AMC": None})
+
+    async def test_fetch_error_reaches_waiting_callers(self):
+        import asyncio
+
+        batcher = news_mod.NewsBatcher(AsyncMock(side_effect=RuntimeError("boom")), window=0)
+        with pytest.raises(RuntimeError, match="boom"):
+            await asyncio.wait_for(batcher.get("GME"), timeout=1)
+
+    async def test_cancelled_caller_is_skipped(self):
+        import asyncio
+
+        fetch = AsyncMock(side_effect=lambda tickers, names: {t: [] for t in tickers})
+        batcher = news_mod.NewsBatcher(fetch, window=0.01)
+        gone = asyncio.create_task(batcher.get("GME"))
+        await asyncio.sleep(0)
+        gone.cancel()
+
+        assert await batcher.get("AMC") == []
+        fetch.assert_awaited_once_with(["AMC"], {"GME": None, "AMC": None})
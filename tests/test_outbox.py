@@ -0,0 +1,170 @@
+"""
+Tests für die persistente Alert-Outbox (alerts/outbox.py).
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from tests.conftest import RawSQL
+from wsb_crawler.alerts import outbox
+from wsb_crawler.config import (
+    AlertSettings,
+    CrawlerSettings,
+    DiscordSettings,
+    NewsAPISettings,
+    RedditSettings,
+    Settings,
+    TelegramSettings,
+)
+from wsb_crawler.models import (
+    Alert,
+    AlertReason,
+    MarketStatus,
+    NewsArticle,
+    PriceData,
+    SpikeResult,
+    TickerHistory,
+    TickerSignal,
+)
+from wsb_crawler.storage.base import Storage
+
+
+@pytest.fixture
+async def db(storage: Storage) -> Storage:
+    yield storage
+
+
+def _settings() -> Settings:
+    return Settings(
+        reddit=RedditSettings("i", "s", "ua"),
+        newsapi=NewsAPISettings(key=""),
+        discord=DiscordSettings("https://discord.com/api/webhooks/1/x"),
+        alerts=AlertSettings(),
+        crawler=CrawlerSettings(),
+        telegram=TelegramSettings(),
+    )
+
+
+def _alert(ticker: str = "GME") -> Alert:
+    now = datetime(2026, 10, 19, 14, 30, tzinfo=UTC)
+    return Alert(
+        ticker=ticker,
+        reason=AlertReason.SPIKE,
+        spike=SpikeResult(
+            ticker=ticker,
+            current_mentions=40,
+            avg_mentions=5.0,
+            ratio=8.0,
+            delta=35,
+            is_new=False,
+            reason=AlertReason.SPIKE,
+            price_data=PriceData(
+                ticker=ticker,
+                company_name="GameStop Corp.",
+                price=42.0,
+                change_24h=2.5,
+                market_status=MarketStatus.OPEN,
+                fetched_at=now,
+            ),
+            news=[
+                NewsArticle(
+                    ticker=ticker, title="GME up", source="Wire", url="https://x", published_at=now
+                )
+            ],
+            history=TickerHistory(ticker=ticker, mention_counts=[(now, 3), (now, 5)]),
+            signal=TickerSignal(ticker, 40, 800, 300, 6, 1),
+            confidence=72,
+        ),
+        triggered_at=now,
+    )
+
+
+async def _set_sent(alerts: list[Alert], cfg: Settings) -> int:
+    for alert in alerts:
+        alert.sent = True
+    return len(alerts)
+
+
+async def _set_failed(alerts: list[Alert], cfg: Settings) -> int:
+    return 0
+
+
+class TestSerialization:
+    def test_roundtrip(self):
+        alert = _alert()
+        decoded = outbox.decode_alert(outbox.encode_alert(alert))
+        assert decoded.spike == alert.spike
+        assert decoded.triggered_at == alert.triggered_at
+        assert decoded.spike.signal.sentiment_label == "bullish"
+
+
+class TestOutbox:
+    async def test_enqueue_is_idempotent(self, db: Storage):
+        assert await outbox.enqueue_alerts(db, "run1", [_alert()]) == 1
+        assert await outbox.enqueue_alerts(db, "run1", [_alert()]) == 0
+        assert len(await db.get_outbox()) == 1
+
+    async def test_delivery_saves_history(self, db: Storage):
+        await outbox.enqueue_alerts(db, "run1", [_alert("GME"), _alert("AMC")])
+        with patch.object(outbox, "send_alerts", new=AsyncMock(side_effect=_set_sent)):
+            assert await outbox.deliver_due(db, _settings()) == 2
+            # Zugestellte Einträge sind nicht mehr fällig
+            assert await outbox.deliver_due(db, _settings()) == 0
+        history = await db.get_alert_history()
+        assert {h["ticker"] for h in history} == {"GME", "AMC"}
+
+    async def test_failure_backs_off_then_dead_letters(self, db: Storage, raw_sql: RawSQL):
+        await outbox.enqueue_alerts(db, "run1", [_alert()])
+        with (
+            patch.object(outbox, "send_alerts", new=AsyncMock(side_effect=_set_failed)),
+            patch.object(outbox, "OUTBOX_MAX_ATTEMPTS", 2),
+        ):
+            assert await outbox.deliver_due(db, _settings()) == 0
+            (row,) = await db.get_outbox()
+            assert row["status"] == "pending"
+            assert row["attempts"] == 1
+            # Backoff: nicht sofort wieder fällig
+            assert await db.claim_due_alerts(10, 60) == []
+
+            await raw_sql.execute("UPDATE alert_outbox SET next_attempt_at = created_at")
+            await outbox.deliver_due(db, _settings())
+
+        (row,) = await db.get_outbox()
+        assert row["status"] == "dead"
+        assert row["attempts"] == 2
+        assert row["last_error"]
+        assert await db.get_alert_history() == []
+
+    async def test_send_error_counts_as_failed_attempt(self, db: Storage):
+        await outbox.enqueue_alerts(db, "run1", [_alert()])
+        with patch.object(outbox, "send_alerts", new=AsyncMock(side_effect=RuntimeError("boom"))):
+            assert await outbox.deliver_due(db, _settings()) == 0
+        (row,) = await db.get_outbox()
+        assert row["status"] == "pending"
+        assert row["attempts"] == 1
+        assert "boom" in row["last_error"]
+        assert await db.claim_due_alerts(10, 60) == []
+
+    async def test_dead_letter_releases_its_cooldown(self, db: Storage):
+        # Wie im Runner: Cooldown vor dem Einstellen
+        await db.set_cooldown("GME", 4)
+        await outbox.enqueue_alerts(db, "run1", [_alert("GME"), _alert("AMC")])
+        await db.set_cooldown("AMC", 4)  # später gesetzt → gehört nicht zu diesem Alert
+        with (
+            patch.object(outbox, "send_alerts", new=AsyncMock(side_effect=_set_failed)),
+            patch.object(outbox, "OUTBOX_MAX_ATTEMPTS", 1),
+        ):
+            await outbox.deliver_due(db, _settings())
+
+        assert {row["status"] for row in await db.get_outbox()} == {"dead"}
+        assert not await db.is_on_cooldown("GME")
+        assert await db.is_on_cooldown("AMC")
+
+    def test_backoff_grows_and_caps(self):
+        assert outbox._backoff_seconds(1) == 30
+        assert outbox._backoff_seconds(2) == 60
+        assert outbox._backoff_seconds(20) == outbox.OUTBOX_BACKOFF_MAX_SECONDS
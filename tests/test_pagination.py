@@ -0,0 +1,195 @@
+"""
+Tests für Keyset-Pagination, Filter und NDJSON-Streaming der History-Endpunkte.
+"""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+import pytest
+
+from tests.conftest import RawSQL
+from wsb_crawler.api.response_cache import response_cache
+from wsb_crawler.api.server import app, set_database
+from wsb_crawler.storage.base import Storage
+from wsb_crawler.storage.pagination import decode_cursor, encode_cursor
+
+
+@pytest.fixture
+async def db(storage: Storage) -> Storage:
+    set_database(storage)
+    response_cache.clear()
+    yield storage
+
+
+@pytest.fixture
+async def client(db: Storage) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def _insert_alerts(raw_sql: RawSQL, count: int) -> None:
+    """count Alerts, je zwei mit identischem sent_at (Tie-Break über id)."""
+    await raw_sql.executemany(
+        """INSERT INTO alert_history
+           (ticker, reason, mentions, avg_mentions, ratio, confidence, sent_at)
+           VALUES (?, ?, 10, 2.0, 5.0, ?, ?)""",
+        [
+            (
+                "GME" if i % 3 else "AMC",
+                "spike" if i % 2 else "new_ticker",
+                i * 10 % 100,
+                f"2026-05-{1 + i // 2:02d}T12:00:00+00:00",
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def test_cursor_roundtrip_and_rejects_garbage() -> None:
+    cursor = encode_cursor("2026-05-01T12:00:00+00:00", 17)
+    assert decode_cursor(cursor, 2) == ("2026-05-01T12:00:00+00:00", 17)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 3)
+    with pytest.raises(ValueError):
+        decode_cursor("%%%", 2)
+
+
+async def test_alert_pages_cover_history_without_gaps(
+    client: httpx.AsyncClient, db: Storage, raw_sql: RawSQL
+) -> None:
+    await _insert_alerts(raw_sql, 25)
+    seen: list[int] = []
+    cursor = None
+    pages = 0
+    while True:
+        params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/api/alerts", params=params)
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert len(seen) == len(set(seen)) == 25
+    all_rows = await db.get_alert_history(limit=100)
+    assert seen == [row["id"] for row in all_rows]
+
+
+async def test_alert_filters(client: httpx.AsyncClient, db: Storage, raw_sql: RawSQL) -> None:
+    await _insert_alerts(raw_sql, 20)
+    response = await client.get(
+        "/api/alerts",
+        params={
+            "ticker": "gme",
+            "reason": "spike",
+            "min_confidence": 50,
+            "since": "2026-05-03T00:00:00+00:00",
+        },
+    )
+    rows = response.json()
+
+    assert rows
+    for row in rows:
+        assert row["ticker"] == "GME"
+        assert row["reason"] == "spike"
+        assert row["confidence"] >= 50
+        assert row["sent_at"] >= "2026-05-03"
+
+
+async def test_time_filters_respect_utc_offset(client: httpx.AsyncClient, raw_sql: RawSQL) -> None:
+    await _insert_alerts(raw_sql, 20)  # je zwei Alerts pro Tag um 12:00 UTC
+    response = await client.get(
+        "/api/alerts",
+        params={"since": "2026-05-03T14:00:00+02:00", "until": "2026-05-05T14:00:00+02:00"},
+    )
+    days = sorted(row["sent_at"][:10] for row in response.json())
+    assert days == ["2026-05-03", "2026-05-03", "2026-05-04", "2026-05-04"]
+
+
+async def test_ndjson_streams_rows_and_trailing_cursor(
+    client: httpx.AsyncClient, db: Storage, raw_sql: RawSQL
+) -> None:
+    await _insert_alerts(raw_sql, 8)
+    response = await client.get("/api/alerts", params={"limit": 5, "format": "ndjson"})
+
+    assert response.headers["Content-Type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 6
+    assert "next_cursor" in lines[-1]
+
+    rest = await client.get(
+        "/api/alerts", params={"format": "ndjson", "cursor": lines[-1]["next_cursor"]}
+    )
+    assert len(rest.text.splitlines()) == 3  # letzte Seite ohne Cursor-Zeile
+
+
+async def test_ndjson_page_is_read_before_streaming() -> None:
+    from wsb_crawler.api.routers import dashboard
+
+    closed = False
+
+    async def _rows():
+        nonlocal closed
+        try:
+            for i in range(4):
+                yield {"id": i}
+        finally:
+            closed = True
+
+    response = await dashboard._paged_response(_rows(), 3, "ndjson", lambda r: str(r["id"]))
+    # Der DB-Cursor ist zu, bevor der Client die erste Zeile liest
+    assert closed
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert lines == [{"id": 0}, {"id": 1}, {"id": 2}, {"next_cursor": "2"}]
+
+
+async def test_invalid_cursor_and_page_size(client: httpx.AsyncClient) -> None:
+    assert (await client.get("/api/alerts", params={"cursor": "kaputt"})).status_code == 400
+    assert (await client.get("/api/runs", params={"limit": 1000})).status_code == 422
+    ndjson = await client.get("/api/runs", params={"limit": 1000, "format": "ndjson"})
+    assert ndjson.status_code == 200
+
+
+async def test_runs_pagination_and_cached_cursor_header(
+    client: httpx.AsyncClient, db: Storage
+) -> None:
+    for _ in range(3):
+        await db.start_run(["wsb"])
+    first = await client.get("/api/runs", params={"limit": 2})
+    cached = await client.get("/api/runs", params={"limit": 2})
+    second = await client.get(
+        "/api/runs", params={"limit": 2, "cursor": first.headers["X-Next-Cursor"]}
+    )
+
+    assert cached.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+    assert len(second.json()) == 1
+    assert "X-Next-Cursor" not in second.headers
+    ids = [r["id"] for r in first.json() + second.json()]
+    assert len(set(ids)) == 3
+
+
+async def test_run_mentions_are_paged(client: httpx.AsyncClient, db: Storage) -> None:
+    run_id = await db.start_run(["wsb"])
+    await db.save_run_mentions(run_id, {f"T{i:02d}": 100 - i % 5 for i in range(12)})
+
+    detail = (await client.get(f"/api/runs/{run_id}", params={"mentions_limit": 5})).json()
+    assert detail["mentions_total"] == 12
+    assert len(detail["mentions"]) == 5
+
+    tickers = [m["ticker"] for m in detail["mentions"]]
+    cursor = detail["mentions_next_cursor"]
+    while cursor:
+        page = (
+            await client.get(f"/api/runs/{run_id}/mentions", params={"limit": 5, "cursor": cursor})
+        ).json()
+        tickers.extend(m["ticker"] for m in page["mentions"])
+        cursor = page["next_cursor"]
+
+    full = await db.get_run_mentions(run_id, limit=100)
+    assert tickers == [m["ticker"] for m in full]
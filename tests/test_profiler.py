@@ -0,0 +1,189 @@
+"""
+Tests für den Profiling-Modus (runtime/profiler.py) und seine Anbindung an
+Orchestrator und Dashboard-API.
+
+Die Sampling-Tests arbeiten mit echten Threads und Sleeps — die Prüfungen
+verlangen deshalb nur, dass eine Kategorie überhaupt gesampelt wurde.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from contextlib import ExitStack
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from wsb_crawler.api.response_cache import response_cache
+from wsb_crawler.api.server import app, set_database
+from wsb_crawler.models import CrawlResult
+from wsb_crawler.runtime import profiler as profiler_mod
+from wsb_crawler.runtime.profiler import (
+    LOOP_LAG_WARN_MS,
+    CrawlProfiler,
+    Profile,
+    load_profile_summary,
+    profile_path,
+    save_profile,
+)
+from wsb_crawler.storage.base import Storage
+
+_PHASE_LABEL = f"{__name__}._profiled_work"
+
+
+def _busy(seconds: float) -> None:
+    until = time.perf_counter() + seconds
+    while time.perf_counter() < until:
+        pass
+
+
+async def _ticks():
+    await asyncio.sleep(0.1)
+    yield 1
+
+
+async def _profiled_work() -> None:
+    _busy(0.15)  # blockiert den Loop → Loop-Lag
+    await asyncio.sleep(0.1)
+    await asyncio.to_thread(_busy, 0.1)
+    async for _ in _ticks():
+        pass
+
+
+async def _unprofiled_work() -> None:
+    await asyncio.sleep(0.3)
+
+
+class TestCrawlProfiler:
+    async def test_attributes_loop_awaits_and_threads(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setitem(profiler_mod._PHASES, _PHASE_LABEL, "work")
+        profiler = CrawlProfiler(interval=0.005, lag_interval=0.01)
+        profiler.start()
+        other = asyncio.create_task(_unprofiled_work())
+        await asyncio.create_task(_profiled_work(), context=profiler.context())
+        profile = await profiler.stop()
+        await other
+
+        assert profile.loop["work"] > 0  # Rechenzeit im Loop-Thread
+        assert profile.awaits[("work", "sleep")] > 0
+        assert profile.awaits[("work", "thread")] > 0
+        assert profile.threads["executor"] > 0
+        assert all(phase == "work" for phase, _ in profile.awaits)  # ohne _unprofiled_work
+        assert not any("_unprofiled_work" in stack for stack in profile.stacks)
+        # Das Warten im Async-Generator wird bis zum Sleep verfolgt
+        assert any(
+            stack.startswith("await;work;sleep;") and stack.endswith("_ticks;asyncio.tasks.sleep")
+            for stack in profile.stacks
+        )
+
+        summary = profile.summary()
+        assert summary["loop_lag"]["max_ms"] >= LOOP_LAG_WARN_MS
+        assert summary["loop_lag"]["over_threshold"] >= 1
+        assert summary["await_seconds"]["work"]["sleep"] > 0
+
+    async def test_stop_restores_task_factory(self):
+        loop = asyncio.get_running_loop()
+        previous = loop.get_task_factory()
+        profiler = CrawlProfiler()
+        profiler.start()
+        assert loop.get_task_factory() is not previous
+        await profiler.stop()
+        assert loop.get_task_factory() is previous
+
+
+class TestStorage:
+    @staticmethod
+    def _profile(run_id: str | None) -> Profile:
+        profile = Profile(started_at=datetime.now(tz=UTC), interval=0.01, run_id=run_id)
+        profile.stacks["loop;reddit;a.b;c.d"] = 3
+        profile.stacks["loop;idle"] = 5
+        profile.loop.update({"reddit": 3, "idle": 5})
+        return profile
+
+    def test_roundtrip_and_pruning(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(profiler_mod, "PROFILE_KEEP", 2)
+        run_ids = [f"{i:08x}-0000" for i in range(3)]
+        for i, run_id in enumerate(run_ids):
+            assert save_profile(self._profile(run_id), tmp_path) is not None
+            for path in tmp_path.glob(f"{run_id}.*"):
+                os.utime(path, (i, i))  # eindeutige Reihenfolge fürs Aufräumen
+
+        path = profile_path(run_ids[-1], tmp_path)
+        assert path is not None
+        assert path.read_text().splitlines() == ["loop;idle 5", "loop;reddit;a.b;c.d 3"]
+        summary = load_profile_summary(run_ids[-1], tmp_path)
+        assert summary is not None
+        assert summary["samples"] == 8
+        assert summary["loop_seconds"] == {"idle": 0.05, "reddit": 0.03}
+        assert len(list(tmp_path.glob("*.folded"))) == 2
+
+    def test_invalid_run_ids_are_rejected(self, tmp_path: Path):
+        assert save_profile(self._profile(None), tmp_path) is None
+        assert save_profile(self._profile("../../etc"), tmp_path) is None
+        assert profile_path("../x", tmp_path) is None
+        assert load_profile_summary("nope", tmp_path) is None
+
+
+class TestProfiledRun:
+    @pytest.fixture
+    async def db(self, storage: Storage) -> Storage:
+        await storage.set_setting("reddit_client_id", "test_id")
+        await storage.set_setting("reddit_client_secret", "test_secret")
+        await storage.set_setting("discord_webhook_url", "https://discord.com/api/webhooks/0/test")
+        set_database(storage)
+        response_cache.clear()
+        return storage
+
+    async def test_run_is_profiled_and_linked(
+        self, db: Storage, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        from wsb_crawler.crawler import runner
+
+        monkeypatch.setattr(profiler_mod, "PROFILES_DIR", tmp_path)
+
+        async def _crawl(run_id, units, on_done):
+            now = datetime.now(tz=UTC)
+            for unit in units:
+                await asyncio.sleep(0.05)
+                result = CrawlResult(
+                    run_id=run_id,
+                    started_at=now,
+                    finished_at=now,
+                    subreddits=[unit.subreddit],
+                    posts_scanned=10,
+                    mention_counts={"GME": 3},
+                )
+                await on_done(unit, result)
+
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_crawl))
+            )
+            for name in ("get_prices_bulk", "get_news_bulk", "resolve_names_bulk"):
+                stack.enter_context(
+                    patch(f"wsb_crawler.analysis.detector.{name}", new=AsyncMock(return_value={}))
+                )
+            await runner.run_single_crawl(db, dry_run=True, profile=True)
+
+        run_id = (await db.get_recent_runs())[0]["id"]
+        assert (tmp_path / f"{run_id}.folded").is_file()
+        summary = load_profile_summary(run_id)
+        assert summary is not None
+        assert summary["run_id"] == run_id
+        assert summary["duration_seconds"] > 0
+
+        transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            detail = (await client.get(f"/api/runs/{run_id}")).json()
+            assert detail["profile"]["flamegraph_url"] == f"/api/runs/{run_id}/profile"
+            assert detail["profile"]["summary"]["run_id"] == run_id
+            response = await client.get(detail["profile"]["flamegraph_url"])
+            assert response.status_code == 200
+            assert response.text == (tmp_path / f"{run_id}.folded").read_text()
+            missing = await client.get("/api/runs/00000000-0000/profile")
+            assert missing.status_code == 404
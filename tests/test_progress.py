@@ -0,0 +1,100 @@
+"""
+Tests für das unveränderliche, versionierte Fortschrittsmodell (runtime/progress.py).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from wsb_crawler.runtime import progress
+
+
+@pytest.fixture(autouse=True)
+def _fresh_progress(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(progress, "_current_run", None)
+    monkeypatch.setattr(progress, "_last_run", None)
+    monkeypatch.setattr(progress, "_dict_cache", None)
+
+
+def test_snapshot_is_shared_per_version_and_keeps_dict_shape() -> None:
+    progress.start_run("run-1234567890", ["wallstreetbets", "stocks"])
+    first = progress.snapshot()
+    second = progress.snapshot()
+    assert first is not None and second is not None
+    assert first["subreddit_progress"] is second["subreddit_progress"]
+    assert first["short_id"] == "run-1234"
+    assert first["steps"][0] == {"key": "starting", "label": "Start", "done": False}
+
+    progress.update_run(phase="save", message="speichern")
+    after = progress.snapshot()
+    assert after is not None
+    assert after["version"] > first["version"]
+    assert [s["done"] for s in after["steps"][:4]] == [True, True, True, False]
+    # Alte Referenzen bleiben unverändert (Copy-on-Write)
+    assert first["phase"] == "starting"
+
+
+def test_update_subreddit_maintains_totals_incrementally() -> None:
+    progress.start_run("run-1", ["a", "b"])
+    progress.update_subreddit("a", posts=10, comments=5)
+    progress.update_subreddit("a", posts=25, comments=8, done=True)
+    progress.update_subreddit("b", posts=4, comments=1, done=True, error="403")
+
+    run = progress.current()
+    assert run is not None
+    assert (run.posts_scanned, run.comments_scanned) == (29, 9)
+    assert run.subreddits_done == 2
+    assert run.progress == 40
+    assert run.diagnostics[-1].source == "r/b"
+
+
+def test_progress_never_moves_back() -> None:
+    progress.start_run("run-1", ["a", "b"])
+    progress.update_subreddit("a", posts=10, comments=5, done=True)
+    progress.update_run(phase="alerts", progress=86)
+    # Später fertige Einheit und erneute Analyse setzen den Balken nicht zurück
+    progress.update_subreddit("b", posts=4, comments=1, done=True)
+    progress.update_run(phase="analysis", progress=60)
+
+    run = progress.current()
+    assert run is not None
+    assert run.progress == 86
+    assert run.phase == "analysis"
+
+
+def test_changes_since_returns_only_changed_fields() -> None:
+    progress.start_run("run-1", ["a"])
+    base = progress.version()
+    progress.update_run(candidate_count=3)
+    progress.update_run(message="weiter")
+
+    delta = progress.changes_since(base)
+
+    assert delta["full"] is False
+    assert delta["version"] == progress.version()
+    assert set(delta["changes"]) == {"candidate_count", "message", "updated_at", "duration_s"}
+    assert progress.changes_since(progress.version())["changes"] == {}
+
+
+def test_changes_since_falls_back_to_full_snapshot() -> None:
+    progress.start_run("run-1", ["a"])
+    before_second_run = progress.version()
+    progress.finish_run(success=True, message="fertig")
+    progress.start_run("run-2", ["a"])
+
+    delta = progress.changes_since(before_second_run)
+
+    assert delta["full"] is True
+    assert delta["run"]["run_id"] == "run-2"
+
+
+def test_finish_run_keeps_last_run_immutable() -> None:
+    progress.start_run("run-1", ["a"])
+    progress.finish_run(success=False, message="kaputt", alerts_enqueued=0)
+
+    run = progress.current()
+    assert run is not None
+    assert not run.active and run.success is False
+    assert run.phase == "failed"
+    assert run.diagnostics[-1].message == "kaputt"
+    assert progress.snapshot() is progress.snapshot()
@@ -0,0 +1,134 @@
+"""
+Tests für die Kanal-Rate-Limiter (alerts/ratelimit.py) und den parallelen Dispatch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from wsb_crawler.alerts import dispatch
+from wsb_crawler.alerts.ratelimit import (
+    RateLimiter,
+    discord_limiter,
+    reset_limiters,
+    telegram_limiter,
+)
+from wsb_crawler.config import (
+    AlertSettings,
+    CrawlerSettings,
+    DiscordSettings,
+    NewsAPISettings,
+    RedditSettings,
+    Settings,
+    TelegramSettings,
+)
+from wsb_crawler.models import Alert, AlertReason, SpikeResult
+
+
+@pytest.fixture(autouse=True)
+def _fresh_limiters():
+    reset_limiters()
+    yield
+    reset_limiters()
+
+
+def _settings() -> Settings:
+    return Settings(
+        reddit=RedditSettings("i", "s", "ua"),
+        newsapi=NewsAPISettings(key=""),
+        discord=DiscordSettings("https://discord.com/api/webhooks/1/x"),
+        alerts=AlertSettings(),
+        crawler=CrawlerSettings(),
+        telegram=TelegramSettings(bot_token="t", chat_id="c"),
+    )
+
+
+def _alert(ticker: str) -> Alert:
+    spike = SpikeResult(
+        ticker=ticker,
+        current_mentions=30,
+        avg_mentions=5.0,
+        ratio=6.0,
+        delta=25,
+        is_new=False,
+        reason=AlertReason.SPIKE,
+    )
+    return Alert(ticker=ticker, reason=AlertReason.SPIKE, spike=spike)
+
+
+class TestRateLimiter:
+    async def test_allows_burst_up_to_limit(self):
+        limiter = RateLimiter(limit=3, period=10.0)
+        waited = [await limiter.acquire() for _ in range(3)]
+        assert waited == [0.0, 0.0, 0.0]
+
+    async def test_waits_when_window_full(self):
+        limiter = RateLimiter(limit=2, period=0.1)
+        await limiter.acquire()
+        await limiter.acquire()
+        started = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - started >= 0.05
+
+    async def test_exhausted_discord_bucket_blocks(self):
+        limiter = RateLimiter(limit=5, period=2.0)
+        limiter.update_from_headers(
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "0.1"}
+        )
+        assert await limiter.acquire() >= 0.05
+
+    def test_ignores_missing_headers(self):
+        limiter = RateLimiter(limit=5, period=2.0)
+        limiter.update_from_headers({})
+        assert limiter._wait_time(time.monotonic()) == 0.0
+
+    def test_registry_per_webhook_and_chat(self):
+        assert discord_limiter("a") is discord_limiter("a")
+        assert discord_limiter("a") is not discord_limiter("b")
+        assert telegram_limiter("-100").limit > telegram_limiter("42").limit
+
+
+class TestParallelDispatch:
+    async def test_channels_deliver_in_parallel(self):
+        async def _slow(*_args: object) -> bool:
+            await asyncio.sleep(0.05)
+            return True
+
+        alerts = [_alert("GME"), _alert("AMC")]
+        with (
+            patch(
+                "wsb_crawler.alerts.dispatch.discord.send_alert", new=AsyncMock(side_effect=_slow)
+            ),
+            patch(
+                "wsb_crawler.alerts.dispatch.telegram.send_alert", new=AsyncMock(side_effect=_slow)
+            ),
+        ):
+            started = time.monotonic()
+            sent = await dispatch.send_alerts(alerts, _settings())
+            elapsed = time.monotonic() - started
+
+        assert sent == 2
+        # 2 Alerts x 2 Kanäle seriell wären >= 0.2 s
+        assert elapsed < 0.18
+        assert set(alerts[0].delivery_ms) == {"discord", "telegram"}
+        assert alerts[1].latency_ms is not None
+        assert alerts[1].latency_ms >= alerts[0].latency_ms
+
+    async def test_channel_exception_does_not_abort_other_channel(self):
+        alerts = [_alert("GME")]
+        with (
+            patch(
+                "wsb_crawler.alerts.dispatch.discord.send_alert",
+                new=AsyncMock(side_effect=RuntimeError("boom")),
+            ),
+            patch(
+                "wsb_crawler.alerts.dispatch.telegram.send_alert", new=AsyncMock(return_value=True)
+            ),
+        ):
+            sent = await dispatch.send_alerts(alerts, _settings())
+        assert sent == 1
+        assert list(alerts[0].delivery_ms) == ["telegram"]
@@ -0,0 +1,108 @@
+"""
+Tests für den Stale-While-Revalidate-Refresher (enrichment/refresher.py).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from wsb_crawler.api.routers import dashboard as dashboard_router
+from wsb_crawler.enrichment import refresher
+from wsb_crawler.models import PriceData
+from wsb_crawler.storage.cache import name_cache, price_cache
+from wsb_crawler.storage.database import Database
+
+
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    price_cache.clear()
+    name_cache.clear()
+    yield
+    price_cache.clear()
+    name_cache.clear()
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> Database:
+    database = Database(tmp_path / "test.db")
+    await database.init()
+    dashboard_router.db = database
+    yield database
+    await database.close()
+
+
+def _price(ticker: str, value: float = 42.0) -> PriceData:
+    return PriceData(ticker=ticker, company_name=None, price=value)
+
+
+class TestPlanRefresh:
+    def test_missing_entries_come_first(self):
+        price_cache.set("GME", _price("GME"))
+        name_cache.set("GME", "GameStop")
+        plan = refresher.plan_refresh(["GME", "AMC"])
+        # GME ist frisch → nicht fällig; AMC fehlt komplett (Kurs + Name)
+        assert [(i.ticker, i.kind) for i in plan] == [("AMC", "price"), ("AMC", "name")]
+
+    def test_rank_breaks_ties(self):
+        plan = refresher.plan_refresh(["GME", "AMC", "TSLA"])
+        prices = [i.ticker for i in plan if i.kind == "price"]
+        assert prices == ["GME", "AMC", "TSLA"]
+
+    def test_expiring_soon_is_due(self):
+        price_cache.set("GME", _price("GME"))
+        name_cache.set("GME", "GameStop")
+        # ahead_seconds größer als TTL → alles gilt als "läuft bald ab"
+        plan = refresher.plan_refresh(["GME"], ahead_seconds=200_000)
+        assert {i.kind for i in plan} == {"price", "name"}
+
+
+class TestRefreshOnce:
+    async def test_refreshes_top_tickers_in_priority_order(self, db: Database):
+        run_id = await db.start_run(["wsb"])
+        await db.save_run_mentions(run_id, {"GME": 20, "AMC": 5})
+
+        calls: list[str] = []
+
+        async def _price_fetch(ticker: str, *, force: bool = False):
+            calls.append(f"price:{ticker}")
+            assert force is True
+            data = _price(ticker)
+            price_cache.set(ticker, data)
+            return data
+
+        async def _name_fetch(ticker: str, *, force: bool = False):
+            calls.append(f"name:{ticker}")
+            name_cache.set(ticker, f"{ticker} Corp.")
+            return f"{ticker} Corp."
+
+        with (
+            patch.object(refresher, "get_price", new=AsyncMock(side_effect=_price_fetch)),
+            patch.object(refresher, "resolve_name", new=AsyncMock(side_effect=_name_fetch)),
+            patch.object(refresher.asyncio, "sleep", new=AsyncMock()),
+        ):
+            count = await refresher.refresh_once(db)
+            # Zweiter Zyklus: alles frisch → nichts zu tun
+            assert await refresher.refresh_once(db) == 0
+
+        assert count == 4
+        assert calls == ["price:GME", "name:GME", "price:AMC", "name:AMC"]
+
+    async def test_dashboard_serves_stale_price_without_fetching(self, db: Database):
+        run_id = await db.start_run(["wsb"])
+        await db.save_run_mentions(run_id, {"GME": 20})
+        price_cache.set("GME", _price("GME", 12.5))
+        name_cache.set("GME", "GameStop Corp.")
+
+        # Frische-TTL abgelaufen, Stale-Phase noch aktiv
+        with (
+            patch.object(price_cache, "get", return_value=None),
+            patch("wsb_crawler.enrichment.prices.yf.Ticker") as yf_ticker,
+        ):
+            result = await dashboard_router.get_top_tickers(days=7)
+
+        yf_ticker.assert_not_called()
+        assert result[0]["price"] == 12.5
+        assert result[0]["company_name"] == "GameStop Corp."
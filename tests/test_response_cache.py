@@ -0,0 +1,115 @@
+"""
+Tests für Response-Cache und ETag/304 der Dashboard-Lese-Endpunkte (api/response_cache.py).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from wsb_crawler.api.response_cache import etag_matches, response_cache
+from wsb_crawler.api.server import app, set_database
+from wsb_crawler.storage.cache import price_cache
+from wsb_crawler.storage.database import Database
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> Database:
+    database = Database(tmp_path / "test.db")
+    await database.init()
+    set_database(database)
+    response_cache.clear()
+    yield database
+    await database.close()
+
+
+@pytest.fixture
+async def client(db: Database) -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+def test_etag_matching() -> None:
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"x", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+async def test_repeated_poll_is_served_from_cache(client: httpx.AsyncClient) -> None:
+    first = await client.get("/api/runs", params={"limit": 5})
+    hits = response_cache.hits
+    second = await client.get("/api/runs", params={"limit": 5})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert response_cache.hits == hits + 1
+
+
+async def test_if_none_match_returns_304(client: httpx.AsyncClient) -> None:
+    first = await client.get("/api/alerts")
+    etag = first.headers["ETag"]
+
+    second = await client.get("/api/alerts", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == etag
+
+
+async def test_db_writes_invalidate_cached_responses(
+    client: httpx.AsyncClient, db: Database
+) -> None:
+    empty = await client.get("/api/runs")
+    assert empty.json() == []
+
+    run_id = await db.start_run(["wsb"])
+    await db.finish_run(run_id, 10, 5)
+    fresh = await client.get("/api/runs", headers={"If-None-Match": empty.headers["ETag"]})
+
+    assert fresh.status_code == 200
+    assert [r["id"] for r in fresh.json()] == [run_id]
+
+
+async def test_price_refresh_invalidates_tickers(client: httpx.AsyncClient) -> None:
+    await client.get("/api/tickers")
+    misses = response_cache.misses
+
+    price_cache.invalidate("NOPE")  # nicht vorhanden → keine neue Version
+    await client.get("/api/tickers")
+    assert response_cache.misses == misses
+
+    price_cache.clear()
+    await client.get("/api/tickers")
+    assert response_cache.misses == misses + 1
+
+
+async def test_query_params_are_part_of_the_key(client: httpx.AsyncClient) -> None:
+    await client.get("/api/mentions/daily", params={"days": 7})
+    misses = response_cache.misses
+    response = await client.get("/api/mentions/daily", params={"days": 14})
+
+    assert response.json()["days"] == 14
+    assert response_cache.misses == misses + 1
+
+
+async def test_large_responses_are_cached_gzipped(client: httpx.AsyncClient, db: Database) -> None:
+    for _ in range(20):
+        run_id = await db.start_run(["wallstreetbets", "stocks"])
+        await db.finish_run(run_id, 100, 50)
+
+    plain = await client.get("/api/runs", headers={"Accept-Encoding": "identity"})
+    first = await client.get("/api/runs", headers={"Accept-Encoding": "gzip"})
+    hits = response_cache.hits
+    second = await client.get("/api/runs", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert first.headers["Content-Encoding"] == second.headers["Content-Encoding"] == "gzip"
+    assert response_cache.hits == hits + 1
+    assert second.json() == plain.json()
+    assert first.headers["ETag"] != plain.headers["ETag"]
@@ -2,7 +2,7 @@
 Integrationstest für den Crawl-Orchestrator (crawler/runner.py).
 
 Mockt das Netzwerk (Reddit-Crawl, Discord-Versand), testet aber die echte
-Reihenfolge Speichern → Analysieren → Alert → Cooldown → Cleanup.
+Reihenfolge Speichern → Analysieren → Outbox + Cooldown → Cleanup → Zustellung.
 """
 
 from __future__ import annotations
@@ -28,7 +28,7 @@ async def db(tmp_path: Path) -> Database:
     await database.close()
 
 
-def _crawl_result(counts: dict[str, int]) -> CrawlResult:
+def _crawl_result(counts: dict[str, int], subreddit: str = "wallstreetbets") -> CrawlResult:
     from datetime import UTC, datetime
 
     now = datetime.now(tz=UTC)
@@ -36,24 +36,37 @@ def _crawl_result(counts: dict[str, int]) -> CrawlResult:
         run_id="x",
         started_at=now,
         finished_at=now,
-        subreddits=["wallstreetbets"],
+        subreddits=[subreddit],
         posts_scanned=100,
         comments_scanned=50,
         mention_counts=counts,
     )
 
 
+def _fake_crawl(outcomes: dict[str, CrawlResult | Exception]) -> AsyncMock:
+    """Ersetzt crawl_units: meldet die Einheiten in der Reihenfolge von ``outcomes``."""
+
+    async def _crawl(run_id: str, units, on_done):
+        by_name = {unit.subreddit: unit for unit in units}
+        for sub, outcome in outcomes.items():
+            if sub in by_name:
+                await on_done(by_name[sub], outcome)
+
+    return AsyncMock(side_effect=_crawl)
+
+
 class TestRunSingleCrawl:
     async def test_new_ticker_triggers_alert_end_to_end(self, db: Database):
         """Der kritische Pfad: neuer Ticker mit vielen Nennungen → Alert + gespeichert."""
+        from wsb_crawler.alerts import outbox
+        from wsb_crawler.config import get_settings
         from wsb_crawler.crawler import runner
 
-        sent = AsyncMock(return_value=1)
         with (
             patch.object(
                 runner,
-                "crawl_all_subreddits",
-                new=AsyncMock(return_value=_crawl_result({"GME": 30})),
+                "crawl_units",
+                new=_fake_crawl({"wallstreetbets": _crawl_result({"GME": 30})}),
             ),
             patch(
                 "wsb_crawler.analysis.detector.get_prices_bulk",
@@ -67,44 +80,45 @@ class TestRunSingleCrawl:
                 "wsb_crawler.analysis.detector.resolve_names_bulk",
                 new=AsyncMock(return_value={"GME": None}),
             ),
-            patch.object(runner, "send_alerts", new=sent) as mock_send,
         ):
-            # send_alerts markiert Alerts als gesendet
-            async def _mark_sent(alerts, cfg):
-                for a in alerts:
-                    a.sent = True
-                return len(alerts)
-
-            mock_send.side_effect = _mark_sent
-
             await runner.run_single_crawl(db)
 
         # Mentions gespeichert
         assert await db.is_known_ticker("GME")
-        # Alert-History + Cooldown gesetzt
-        history = await db.get_alert_history()
-        assert len(history) == 1
+        # Alert liegt in der Outbox, Cooldown sofort gesetzt — noch nichts zugestellt
+        pending = await db.get_outbox(status="pending")
+        assert [row["ticker"] for row in pending] == ["GME"]
         assert await db.is_on_cooldown("GME")
+        assert await db.get_alert_history() == []
         # Lauf als gesund abgeschlossen
         runs = await db.get_recent_runs()
         assert runs[0]["finished_at"] is not None
         assert runs[0]["is_healthy"] == 1
 
+        # Der Outbox-Worker stellt zu (send_alerts markiert Alerts als gesendet)
+        async def _mark_sent(alerts, cfg):
+            for a in alerts:
+                a.sent = True
+            return len(alerts)
+
+        with patch.object(outbox, "send_alerts", new=AsyncMock(side_effect=_mark_sent)):
+            assert await outbox.deliver_due(db, await get_settings(db)) == 1
+
+        history = await db.get_alert_history()
+        assert len(history) == 1
+        assert (await db.get_outbox(status="sent"))[0]["ticker"] == "GME"
+
     async def test_lock_prevents_concurrent_runs(self, db: Database):
         """Ein zweiter Crawl während eines laufenden wird übersprungen."""
         from wsb_crawler.crawler import runner
 
         runner._crawl_lock  # noqa: B018 — sicherstellen dass das Lock existiert
 
-        async def _slow_crawl(run_id: str):
+        async def _slow_crawl(run_id: str, units, on_done):
             # Lock ist gehalten, während wir hier sind
             assert runner._crawl_lock.locked()
-            return _crawl_result({})
 
-        with (
-            patch.object(runner, "crawl_all_subreddits", new=AsyncMock(side_effect=_slow_crawl)),
-            patch.object(runner, "send_alerts", new=AsyncMock(return_value=0)),
-        ):
+        with patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_slow_crawl)):
             await runner.run_single_crawl(db)
 
         # Nach Abschluss ist das Lock wieder frei
@@ -116,12 +130,11 @@ class TestRunSingleCrawl:
 
         started = asyncio.Event()
 
-        async def _slow_crawl(run_id: str):
+        async def _slow_crawl(run_id: str, units, on_done):
             started.set()
             await asyncio.sleep(30)
-            return _crawl_result({})
 
-        with patch.object(runner, "crawl_all_subreddits", new=AsyncMock(side_effect=_slow_crawl)):
+        with patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_slow_crawl)):
             task = asyncio.create_task(runner.run_single_crawl(db))
             await asyncio.wait_for(started.wait(), timeout=1)
 
@@ -135,3 +148,112 @@ class TestRunSingleCrawl:
         runs = await db.get_recent_runs()
         assert runs[0]["finished_at"] is not None
         assert runs[0]["is_healthy"] == 1
+
+
+class TestCrawlUnits:
+    """Ein Subreddit = eine Einheit: eigene Zeilen, eigener Takt, eigene Fehler."""
+
+    @staticmethod
+    def _no_enrichment():
+        from contextlib import ExitStack
+
+        stack = ExitStack()
+        for name in ("get_prices_bulk", "get_news_bulk", "resolve_names_bulk"):
+            stack.enter_context(
+                patch(f"wsb_crawler.analysis.detector.{name}", new=AsyncMock(return_value={}))
+            )
+        return stack
+
+    async def test_failed_unit_keeps_other_units(self, db: Database):
+        from wsb_crawler.crawler import runner
+
+        outcomes = {
+            "wallstreetbets": _crawl_result({"GME": 3, "AMC": 1}),
+            "wallstreetbetsGER": RuntimeError("429 Too Many Requests"),
+        }
+        with patch.object(runner, "crawl_units", new=_fake_crawl(outcomes)):
+            await runner.run_single_crawl(db)
+
+        runs = await db.get_recent_runs()
+        assert runs[0]["is_healthy"] == 1
+        detail = await db.get_run_detail(runs[0]["id"])
+        assert detail["subreddit_totals"] == [
+            {"subreddit": "wallstreetbets", "tickers": 2, "mentions": 4}
+        ]
+        crawls = await db.get_subreddit_crawls()
+        assert crawls["wallstreetbets"]["succeeded_at"] is not None
+        assert crawls["wallstreetbetsGER"]["succeeded_at"] is None
+        assert "429" in crawls["wallstreetbetsGER"]["error"]
+
+    async def test_all_units_failed_marks_run_unhealthy(self, db: Database):
+        from wsb_crawler.crawler import runner
+
+        outcomes = {
+            "wallstreetbets": RuntimeError("boom"),
+            "wallstreetbetsGER": RuntimeError("boom"),
+        }
+        with patch.object(runner, "crawl_units", new=_fake_crawl(outcomes)):
+            await runner.run_single_crawl(db)
+
+        runs = await db.get_recent_runs()
+        assert runs[0]["finished_at"] is not None
+        assert runs[0]["is_healthy"] == 0
+
+    async def test_analysis_runs_before_slow_unit_finishes(self, db: Database):
+        """Der Alert aus dem schnellen Subreddit wartet nicht auf den langsamen."""
+        from wsb_crawler.crawler import runner
+
+        async def _crawl(run_id, units, on_done):
+            by_name = {unit.subreddit: unit for unit in units}
+            await on_done(by_name["wallstreetbets"], _crawl_result({"GME": 30}))
+            for _ in range(100):
+                if await db.get_outbox(status="pending"):
+                    break
+                await asyncio.sleep(0.01)
+            assert [r["ticker"] for r in await db.get_outbox(status="pending")] == ["GME"]
+            # Auch der langsame Subreddit nennt GME — kein zweiter Alert
+            await on_done(
+                by_name["wallstreetbetsGER"],
+                _crawl_result({"GME": 25, "TSLA": 40}, subreddit="wallstreetbetsGER"),
+            )
+
+        with (
+            patch.object(runner, "crawl_units", new=AsyncMock(side_effect=_crawl)),
+            self._no_enrichment(),
+        ):
+            await runner.run_single_crawl(db)
+
+        pending = await db.get_outbox(status="pending")
+        assert sorted(row["ticker"] for row in pending) == ["GME", "TSLA"]
+        run_id = (await db.get_recent_runs())[0]["id"]
+        mentions = {m["ticker"]: m["mentions"] for m in await db.get_run_mentions(run_id)}
+        assert mentions == {"GME": 55, "TSLA": 40}
+
+    async def test_max_per_run_spans_all_analysis_passes(self, db: Database):
+        from wsb_crawler.crawler import runner
+
+        await db.set_setting("alert_max_per_run", "1")
+        outcomes = {
+            "wallstreetbets": _crawl_result({"GME": 30}),
+            "wallstreetbetsGER": _crawl_result({"TSLA": 40}, subreddit="wallstreetbetsGER"),
+        }
+        with patch.object(runner, "crawl_units", new=_fake_crawl(outcomes)), self._no_enrichment():
+            await runner.run_single_crawl(db)
+
+        assert [row["ticker"] for row in await db.get_outbox(status="pending")] == ["GME"]
+
+    async def test_unit_interval_skips_until_due(self, db: Database):
+        from wsb_crawler.crawler import runner
+
+        await db.set_setting("subreddit_overrides", "wallstreetbetsGER interval=60")
+        await db.record_subreddit_crawl("wallstreetbetsGER", "previous")
+        fake = _fake_crawl({})
+
+        with patch.object(runner, "crawl_units", new=fake):
+            await runner.run_single_crawl(db)
+            units = fake.await_args.args[1]
+            assert [u.subreddit for u in units] == ["wallstreetbets"]
+
+            await runner.run_single_crawl(db, force=True)
+            units = fake.await_args.args[1]
+            assert [u.subreddit for u in units] == ["wallstreetbets", "wallstreetbetsGER"]
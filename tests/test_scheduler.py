@@ -1,8 +1,13 @@
-"""Tests für die Scheduler-Zeitplanung (_next_run_at in main.py)."""
+"""Tests für die Scheduler-Zeitplanung (schedule.py, market_calendar.py)."""
 
 from __future__ import annotations
 
+import os
 from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
 
 from wsb_crawler.config import (
     AlertSettings,
@@ -12,7 +17,13 @@ from wsb_crawler.config import (
     RedditSettings,
     Settings,
 )
-from wsb_crawler.main import _next_run_at
+from wsb_crawler.market_calendar import load_calendar
+from wsb_crawler.models import RateLimitState, RunActivity
+from wsb_crawler.schedule import decide_adaptive, market_next_run, plan_next_run
+from wsb_crawler.schedule import next_run_at as _next_run_at
+from wsb_crawler.storage.database import Database
+
+NEW_YORK = ZoneInfo("America/New_York")
 
 
 def _settings(**crawler_kwargs: object) -> Settings:
@@ -46,3 +57,170 @@ def test_cron_mode_empty_expression_falls_back_to_interval() -> None:
 def test_invalid_cron_falls_back_to_interval() -> None:
     cfg = _settings(schedule_mode="cron", cron_expression="not a cron", crawl_interval_minutes=45)
     assert _next_run_at(cfg, _NOW) == _NOW + timedelta(minutes=45)
+
+
+def test_cron_mode_uses_schedule_timezone() -> None:
+    # 14:24 UTC = 10:24 New York → morgen 09:30 EDT = 13:30 UTC
+    cfg = _settings(
+        schedule_mode="cron", cron_expression="30 9 * * 1-5", schedule_timezone="America/New_York"
+    )
+    got = _next_run_at(cfg, _NOW)
+    assert got.astimezone(UTC) == datetime(2026, 7, 7, 13, 30, tzinfo=UTC)
+
+
+def test_cron_mode_unknown_timezone_uses_utc() -> None:
+    cfg = _settings(schedule_mode="cron", cron_expression="0 */2 * * *", schedule_timezone="Mars/X")
+    assert _next_run_at(cfg, _NOW) == datetime(2026, 7, 6, 16, 0, tzinfo=UTC)
+
+
+class TestMarketMode:
+    NYSE = load_calendar("NYSE")
+
+    def _next(self, now: datetime) -> datetime:
+        return market_next_run(self.NYSE, now, dense_minutes=15, sparse_minutes=120)
+
+    def test_dense_during_session(self) -> None:
+        # Mo 2026-07-06 10:24 New York (Pre-Market ab 04:00, Schluss 16:00)
+        now = datetime(2026, 7, 6, 10, 24, tzinfo=NEW_YORK)
+        assert self._next(now) == now + timedelta(minutes=15)
+
+    def test_last_dense_run_at_close(self) -> None:
+        now = datetime(2026, 7, 6, 15, 50, tzinfo=NEW_YORK)
+        assert self._next(now) == datetime(2026, 7, 6, 16, 0, tzinfo=NEW_YORK)
+
+    def test_sparse_at_night(self) -> None:
+        now = datetime(2026, 7, 6, 20, 0, tzinfo=NEW_YORK)
+        assert self._next(now) == now + timedelta(minutes=120)
+
+    def test_sparse_run_never_skips_pre_market(self) -> None:
+        now = datetime(2026, 7, 7, 3, 0, tzinfo=NEW_YORK)
+        assert self._next(now) == datetime(2026, 7, 7, 4, 0, tzinfo=NEW_YORK)
+
+    def test_weekend_and_holiday_are_sparse(self) -> None:
+        # Sa 2026-07-04, Fr 2026-07-03 ist Feiertag (Independence Day observed)
+        for now in (
+            datetime(2026, 7, 4, 3, 0, tzinfo=NEW_YORK),
+            datetime(2026, 7, 3, 11, 0, tzinfo=NEW_YORK),
+        ):
+            assert self._next(now) == now + timedelta(minutes=120)
+
+    def test_early_close(self) -> None:
+        session = self.NYSE.session(datetime(2026, 11, 27).date())
+        assert session is not None
+        assert session.closes_at == datetime(2026, 11, 27, 13, 0, tzinfo=NEW_YORK)
+
+    def test_session_follows_dst(self) -> None:
+        summer = self.NYSE.session(datetime(2026, 7, 6).date())
+        winter = self.NYSE.session(datetime(2026, 12, 7).date())
+        assert summer is not None and winter is not None
+        assert summer.opens_at.astimezone(UTC).hour == 8
+        assert winter.opens_at.astimezone(UTC).hour == 9
+
+    def test_local_calendar_file_adds_holidays(self, tmp_path: Path) -> None:
+        (tmp_path / "xetra.txt").write_text("2028-12-27\n2028-12-28 14:00  verkürzt\nkaputt\n")
+        calendar = load_calendar("XETRA", tmp_path)
+        assert not calendar.is_trading_day(datetime(2028, 12, 27).date())
+        assert calendar.early_closes[datetime(2028, 12, 28).date()].hour == 14
+        assert not calendar.is_trading_day(datetime(2026, 4, 6).date())  # Ostermontag
+
+    def test_edited_calendar_file_is_reloaded(self, tmp_path: Path) -> None:
+        day = datetime(2028, 12, 27).date()
+        assert load_calendar("XETRA", tmp_path).is_trading_day(day)
+        local = tmp_path / "xetra.txt"
+        local.write_text("2028-12-27\n")
+        assert not load_calendar("XETRA", tmp_path).is_trading_day(day)
+        local.write_text("# wieder offen\n")
+        os.utime(local, ns=(0, 0))  # neue Signatur auch bei gleicher mtime-Auflösung
+        assert load_calendar("XETRA", tmp_path).is_trading_day(day)
+
+    def test_unknown_calendar_falls_back_to_interval(self) -> None:
+        with pytest.raises(ValueError):
+            load_calendar("NASDAQ-OMX")
+        cfg = _settings(schedule_mode="market", market_calendar="LSE", crawl_interval_minutes=30)
+        assert _next_run_at(cfg, _NOW) == _NOW + timedelta(minutes=30)
+
+    def test_market_mode_via_settings(self) -> None:
+        cfg = _settings(schedule_mode="market", market_calendar="XETRA", market_dense_minutes=10)
+        # 14:24 UTC = 16:24 Berlin → Xetra handelt bis 17:30
+        assert _next_run_at(cfg, _NOW) == _NOW + timedelta(minutes=10)
+
+
+def _history(*mentions: int, candidates: int = 0) -> list[RunActivity]:
+    """Läufe im 30-Minuten-Abstand, neueste zuerst."""
+    return [
+        RunActivity(
+            run_id=f"r{i}",
+            started_at=_NOW - timedelta(minutes=30 * i),
+            mentions=m,
+            candidates=candidates if i == 0 else 0,
+        )
+        for i, m in enumerate(mentions)
+    ]
+
+
+class TestAdaptive:
+    def test_too_little_history_uses_base(self) -> None:
+        minutes, reasons, _ = decide_adaptive(30, 5, 120, _history(100), None, _NOW)
+        assert minutes == 30
+        assert "Basisintervall" in reasons[0]
+
+    def test_squeeze_shortens_to_minimum(self) -> None:
+        history = _history(600, 100, 110, 90, 100, candidates=3)
+        minutes, reasons, signals = decide_adaptive(30, 5, 120, history, None, _NOW)
+        assert minutes == 5
+        assert signals["velocity"] == pytest.approx(6.0)
+        assert signals["mentions_per_minute"] == pytest.approx(20.0)
+        assert signals["candidates"] == 3
+        assert any("Untergrenze" in r for r in reasons)
+
+    def test_quiet_period_stretches_to_maximum(self) -> None:
+        minutes, reasons, _ = decide_adaptive(60, 5, 120, _history(10, 200, 180, 220), None, _NOW)
+        assert minutes == 120
+        assert any("Obergrenze" in r for r in reasons)
+
+    def test_normal_activity_keeps_base(self) -> None:
+        minutes, _, _ = decide_adaptive(30, 5, 120, _history(100, 100, 100, 100), None, _NOW)
+        assert minutes == 30
+
+    def test_velocity_is_per_minute_of_the_run_window(self) -> None:
+        # Nach 10 Minuten 100 Nennungen = dieselbe Rate wie 600 nach 60 Minuten
+        history = [
+            RunActivity(f"r{i}", _NOW - timedelta(minutes=minutes), mentions, 0)
+            for i, (minutes, mentions) in enumerate(
+                [(0, 100), (10, 600), (70, 600), (130, 600), (190, 0)]
+            )
+        ]
+        minutes, _, signals = decide_adaptive(30, 5, 120, history, None, _NOW)
+        assert signals["velocity"] == pytest.approx(1.0)
+        assert minutes == 30
+
+    def test_exhausted_rate_limit_waits_for_reset(self) -> None:
+        rate_limit = RateLimitState(remaining=20, used=580, reset_at=_NOW + timedelta(minutes=9))
+        history = _history(600, 100, 110, 90)
+        minutes, reasons, signals = decide_adaptive(30, 5, 120, history, rate_limit, _NOW)
+        assert minutes == pytest.approx(9)
+        assert signals["ratelimit_remaining"] == 20
+        assert "Rate-Limit" in reasons[-1]
+
+    async def test_plan_next_run_reads_history(self, tmp_path: Path) -> None:
+        async with Database(tmp_path / "test.db") as db:
+            for mentions in (100, 100, 100, 400):
+                run_id = await db.start_run(["wallstreetbets"])
+                await db.save_run_mentions(run_id, {"GME": mentions, "AMC": 5})
+                await db.finish_run(run_id, 10, 10)
+            cfg = _settings(schedule_mode="adaptive", crawl_interval_minutes=40)
+            decision = await plan_next_run(db, cfg, _NOW)
+        # Nennungen ×3.8 (405 vs. 105), 1 Kandidat (GME ≥ 20) → 40 / 3.86 / 1.5
+        assert decision.mode == "adaptive"
+        assert decision.signals["candidates"] == 1
+        assert decision.next_run_at - _NOW == pytest.approx(
+            timedelta(minutes=40 / (405 / 105) / 1.5), abs=timedelta(seconds=1)
+        )
+        payload = decision.to_dict()
+        assert payload["reasons"] and payload["interval_minutes"] == pytest.approx(6.9, abs=0.1)
+
+    async def test_other_modes_explain_themselves(self, tmp_path: Path) -> None:
+        async with Database(tmp_path / "test.db") as db:
+            decision = await plan_next_run(db, _settings(crawl_interval_minutes=30), _NOW)
+        assert decision.next_run_at == _NOW + timedelta(minutes=30)
+        assert decision.reasons == ("Intervall: 30 Minuten",)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
-from wsb_crawler.analysis.signals import compute_signals, score_sentiment
+from wsb_crawler.analysis.signals import compute_signals, merge_signals, score_sentiment
 from wsb_crawler.models import TickerMention
 
 
@@ -84,3 +84,13 @@ def test_negative_scores_clamped_to_zero_engagement() -> None:
 
 def test_empty_mentions_yield_empty_signals() -> None:
     assert compute_signals([]) == {}
+
+
+def test_merged_signals_equal_combined_computation() -> None:
+    first = [
+        _mention("GME", score=100, context="to the moon 🚀"),
+        _mention("AMC", score=5, context="puts"),
+    ]
+    second = [_mention("GME", score=900, context="bagholder crash")]
+    merged = merge_signals(compute_signals(first), compute_signals(second))
+    assert merged == compute_signals(first + second)
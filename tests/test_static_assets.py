@@ -0,0 +1,77 @@
+"""
+Tests für die vorkomprimierte Dashboard-Auslieferung (api/static_assets.py).
+"""
+
+from __future__ import annotations
+
+import gzip
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from wsb_crawler.api import static_assets
+from wsb_crawler.api.server import GZIP_MINIMUM_SIZE, STATIC_DIR, app, index_asset
+from wsb_crawler.api.static_assets import build_asset, choose_encoding
+
+
+def test_gzip_variant_roundtrips_and_is_smaller() -> None:
+    asset = index_asset()
+    raw = (STATIC_DIR / "index.html").read_bytes()
+    assert asset.variants["identity"] == raw
+    assert gzip.decompress(asset.variants["gzip"]) == raw
+    assert len(asset.variants["gzip"]) < len(raw) // 3
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, "identity"),
+        ("gzip, deflate", "gzip"),
+        ("gzip;q=0, identity", "identity"),
+        ("*", "gzip"),
+        ("br", "identity"),  # br nur, wenn die Variante existiert
+    ],
+)
+def test_choose_encoding(
+    monkeypatch: pytest.MonkeyPatch, header: str | None, expected: str
+) -> None:
+    monkeypatch.setattr(static_assets, "_brotli", None)
+    asset = build_asset(b"<html>" * 100, "text/html")
+    assert choose_encoding(asset, header) == expected
+
+
+def test_spa_route_serves_precompressed_index_with_etag() -> None:
+    client = TestClient(app)
+    response = client.get("/alerts", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert int(response.headers["Content-Length"]) == len(index_asset().variants["gzip"])
+    assert "<html" in response.text  # vom Client dekomprimiert
+
+    etag = response.headers["ETag"]
+    cached = client.get("/alerts", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_identity_and_gzip_have_different_etags() -> None:
+    client = TestClient(app)
+    plain = client.get("/logs", headers={"Accept-Encoding": "identity"})
+    packed = client.get("/logs", headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["ETag"] != packed.headers["ETag"]
+
+
+async def test_large_json_responses_are_gzipped() -> None:
+    transport = httpx.ASGITransport(app=app, client=("127.0.0.1", 50000))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Type"] == "application/json"
+    assert len(response.content) > GZIP_MINIMUM_SIZE
+    assert response.headers["Content-Encoding"] == "gzip"
@@ -0,0 +1,80 @@
+"""
+Tests für den Status-Hub (runtime/status_hub.py): JSON-Patch-Diff und Fan-out.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from wsb_crawler.runtime import progress
+from wsb_crawler.runtime.status_hub import StatusHub, json_diff
+
+
+def test_json_diff_reports_add_replace_remove() -> None:
+    old = {"a": 1, "b": {"c": 2, "gone": True}, "list": [1, 2]}
+    new = {"a": 1, "b": {"c": 3, "new": "x"}, "list": [1, 2, 3]}
+    ops = json_diff(old, new)
+    assert {"op": "remove", "path": "/b/gone"} in ops
+    assert {"op": "replace", "path": "/b/c", "value": 3} in ops
+    assert {"op": "add", "path": "/b/new", "value": "x"} in ops
+    assert {"op": "replace", "path": "/list", "value": [1, 2, 3]} in ops
+    assert len(ops) == 4
+
+
+def test_json_diff_escapes_keys_and_distinguishes_types() -> None:
+    assert json_diff({"a/b": 1}, {"a/b": 2}) == [{"op": "replace", "path": "/a~1b", "value": 2}]
+    assert json_diff({"x": 1}, {"x": True}) == [{"op": "replace", "path": "/x", "value": True}]
+    assert json_diff({"x": 1}, {"x": 1}) == []
+
+
+async def test_hub_sends_snapshot_then_patches_from_single_builder() -> None:
+    calls = 0
+    state: dict[str, Any] = {"crawl_running": False, "count": 0}
+
+    async def builder() -> dict[str, Any]:
+        nonlocal calls
+        calls += 1
+        return dict(state)
+
+    hub = StatusHub(builder)
+    first = await hub.subscribe()
+    second = await hub.subscribe()
+    try:
+        await hub.publish_once()
+        snap_a = await asyncio.wait_for(first.queue.get(), 1)
+        snap_b = await asyncio.wait_for(second.queue.get(), 1)
+        assert snap_a["type"] == snap_b["type"] == "snapshot"
+
+        before = calls
+        state["count"] = 5
+        await hub.publish_once()
+        assert calls == before + 1  # einmal berechnet, an beide verteilt
+        patch_a = first.queue.get_nowait()
+        patch_b = second.queue.get_nowait()
+        assert (
+            patch_a
+            == patch_b
+            == {
+                "type": "patch",
+                "ops": [{"op": "replace", "path": "/count", "value": 5}],
+            }
+        )
+
+        await hub.publish_once()  # unverändert → keine Nachricht
+        assert first.queue.empty()
+    finally:
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+    assert hub.subscriber_count == 0
+
+
+async def test_progress_updates_wake_the_hub() -> None:
+    woke = asyncio.Event()
+    progress.add_listener(woke.set)
+    try:
+        progress.start_run("test-run", ["wallstreetbets"])
+        assert woke.is_set()
+    finally:
+        progress.remove_listener(woke.set)
+        progress.finish_run(success=True, message="fertig")
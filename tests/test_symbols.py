@@ -0,0 +1,125 @@
+"""
+Tests für die lokalen Symbol-Stammdaten (enrichment/symbols.py + Resolver/Ticker-Filter).
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from wsb_crawler.crawler.ticker import extract_tickers
+from wsb_crawler.enrichment import resolver
+from wsb_crawler.enrichment import symbols as symbols_mod
+from wsb_crawler.models import RedditPost
+from wsb_crawler.storage.base import Storage
+from wsb_crawler.storage.cache import name_cache
+
+NASDAQ_LISTED = """Symbol|Security Name|Market Category|Test Issue|Financial Status|Round Lot Size|ETF|NextShares
+AAPL|Apple Inc. - Common Stock|Q|N|N|100|N|N
+QQQ|Invesco QQQ Trust, Series 1|G|N|N|100|Y|N
+ZXZZT|NASDAQ TEST STOCK|G|Y|N|100|N|N
+File Creation Time: 1019202608:31||||||
+"""
+
+OTHER_LISTED = """ACT Symbol|Security Name|Exchange|CQS Symbol|ETF|Round Lot Size|Test Issue|NASDAQ Symbol
+GME|GameStop Corporation Common Stock|N|GME|N|100|N|GME
+File Creation Time: 1019202608:31||||||
+"""
+
+CUSTOM_CSV = "symbol,name,exchange,type,currency\nsap,SAP SE,XETRA,stock,EUR\n"
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    name_cache.clear()
+    symbols_mod._last_signature = None
+    yield
+    name_cache.clear()
+    resolver._db = None
+
+
+@pytest.fixture
+def listing_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "symbols"
+    directory.mkdir()
+    (directory / "nasdaqlisted.txt").write_text(NASDAQ_LISTED)
+    (directory / "otherlisted.txt").write_text(OTHER_LISTED)
+    (directory / "custom.csv").write_text(CUSTOM_CSV)
+    return directory
+
+
+@pytest.fixture
+async def db(storage: Storage) -> Storage:
+    yield storage
+
+
+class TestParseListing:
+    def test_nasdaq_listed(self):
+        entries = {s.symbol: s for s in symbols_mod.parse_listing(NASDAQ_LISTED)}
+        assert set(entries) == {"AAPL", "QQQ"}  # Test-Issue übersprungen
+        assert entries["AAPL"].name == "Apple Inc."
+        assert entries["AAPL"].exchange == "NASDAQ"
+        assert entries["QQQ"].type == "etf"
+
+    def test_other_listed(self):
+        (gme,) = symbols_mod.parse_listing(OTHER_LISTED)
+        assert gme.name == "GameStop Corporation"
+        assert gme.exchange == "NYSE"
+
+    def test_custom_csv(self):
+        (sap,) = symbols_mod.parse_listing(CUSTOM_CSV)
+        assert sap.symbol == "SAP"
+        assert sap.currency == "EUR"
+
+
+class TestSync:
+    async def test_imports_once_until_files_change(self, db: Storage, listing_dir: Path):
+        assert await symbols_mod.sync_symbols(db, listing_dir) == 4
+        assert await symbols_mod.sync_symbols(db, listing_dir) == 0
+
+        (listing_dir / "custom.csv").write_text("symbol,name\nTSLA,Tesla Inc.\n")
+        assert await symbols_mod.sync_symbols(db, listing_dir) == 4
+        assert "SAP" not in await db.get_known_symbols()
+
+    async def test_missing_dir_is_noop(self, db: Storage, tmp_path: Path):
+        assert await symbols_mod.sync_symbols(db, tmp_path / "missing") == 0
+
+
+class TestResolverUsesLocalTable:
+    async def test_local_hit_skips_yahoo(self, db: Storage, listing_dir: Path):
+        await symbols_mod.sync_symbols(db, listing_dir)
+        resolver.set_database(db)
+        with patch.object(resolver, "_resolve_sync", return_value="Yahoo Name") as mock_sync:
+            names = await resolver.resolve_names_bulk(["GME", "AAPL", "ZZZZ"])
+        assert names == {"GME": "GameStop Corporation", "AAPL": "Apple Inc.", "ZZZZ": "Yahoo Name"}
+        # Nur das unbekannte Symbol ging an Yahoo
+        mock_sync.assert_called_once_with("ZZZZ")
+
+
+def _post(text: str) -> RedditPost:
+    return RedditPost(
+        id="p1",
+        subreddit="wallstreetbets",
+        title=text,
+        text="",
+        author="u",
+        score=1,
+        upvote_ratio=1.0,
+        created_utc=datetime.now(tz=UTC),
+        url="",
+    )
+
+
+class TestTickerValidation:
+    def test_implicit_ticker_must_be_listed(self):
+        post = _post("GME and LOLZ to the moon, also $WXYZ")
+        tickers = {m.ticker for m in extract_tickers(post, frozenset({"GME"}))}
+        # Cashtags bleiben auch ohne Listing erhalten
+        assert tickers == {"GME", "WXYZ"}
+
+    def test_without_table_everything_passes(self):
+        tickers = {m.ticker for m in extract_tickers(_post("GME and LOLZ"))}
+        assert tickers == {"GME", "LOLZ"}
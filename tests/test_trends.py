@@ -5,14 +5,14 @@ Tests für die Trend-Berechnung (analysis/trends.py).
 from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
-from pathlib import Path
 
 import pytest
 
+from tests.conftest import RawSQL
 from wsb_crawler.analysis.trends import _calculate_trend, get_top_tickers_cached
 from wsb_crawler.models import MarketStatus, PriceData, TickerHistory, TrendDirection
+from wsb_crawler.storage.base import Storage
 from wsb_crawler.storage.cache import name_cache, price_cache
-from wsb_crawler.storage.database import Database
 
 
 def _history(values: list[int]) -> TickerHistory:
@@ -42,13 +42,10 @@ class TestCalculateTrend:
 
 class TestTopTickersCached:
     @pytest.fixture
-    async def db(self, tmp_path: Path) -> Database:
-        database = Database(tmp_path / "t.db")
-        await database.init()
-        yield database
-        await database.close()
+    async def db(self, storage: Storage) -> Storage:
+        yield storage
 
-    async def test_network_free_enrichment(self, db: Database):
+    async def test_network_free_enrichment(self, db: Storage, raw_sql: RawSQL):
         """Trend kommt aus der DB, Kurs/Name nur aus dem Cache — kein Netzwerk."""
         price_cache.clear()
         name_cache.clear()
@@ -58,11 +55,10 @@ class TestTopTickersCached:
         for i, v in enumerate([1, 1, 1, 1, 10, 10, 20]):
             run_id = await db.start_run(["wsb"])
             await db.save_run_mentions(run_id, {"GME": v})
-            await db.conn.execute(
+            await raw_sql.execute(
                 "UPDATE ticker_mentions SET recorded_at = ? WHERE run_id = ?",
                 ((base - timedelta(days=6 - i)).isoformat(), run_id),
             )
-        await db.conn.commit()
 
         # Kurs im Cache → wird übernommen; Name fehlt → None
         price_cache.set(